@@ -0,0 +1,11 @@
+-- Provider quota usage (calls per provider per day)
+-- Written by the refresh planner from the shared rate limiter counters so that
+-- daily quotas are paced across processes and restarts.
+
+CREATE TABLE IF NOT EXISTS provider_quota_usage (
+    provider TEXT NOT NULL,
+    usage_date DATE NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (provider, usage_date)
+);
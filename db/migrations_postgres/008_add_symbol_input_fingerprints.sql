@@ -0,0 +1,14 @@
+-- Symbol input fingerprints (change-driven EOD recompute)
+-- Ingestion cursor + checksum of the recent daily bars recorded at each symbol's
+-- last successful downstream run; symbols whose fingerprint is unchanged skip
+-- indicators, signals, portfolio/watchlist updates and alerts.
+
+CREATE TABLE IF NOT EXISTS symbol_input_fingerprints (
+    symbol TEXT NOT NULL,
+    pipeline TEXT NOT NULL,
+    cursor_date DATE,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    checksum TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (symbol, pipeline)
+);
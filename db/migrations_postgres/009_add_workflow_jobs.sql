@@ -0,0 +1,45 @@
+-- Durable workflow job queue
+-- Worker processes on any host claim jobs with SELECT ... FOR UPDATE SKIP LOCKED,
+-- hold them under a heartbeat-extended lease, and retry or dead-letter failures.
+-- A job whose lease expires (crashed worker) is claimed again by another worker.
+
+CREATE TABLE IF NOT EXISTS workflow_jobs (
+    job_id TEXT PRIMARY KEY,
+    queue TEXT NOT NULL DEFAULT 'workflow',
+    job_type TEXT NOT NULL,
+    symbol TEXT,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    result JSONB,
+    status TEXT NOT NULL DEFAULT 'queued', -- queued, running, succeeded, dead
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 4,
+    run_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_by TEXT,
+    lease_expires_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    last_error TEXT,
+    dedupe_key TEXT,
+    batch_id TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMPTZ
+);
+
+-- Claim order: highest priority first, then oldest due
+CREATE INDEX IF NOT EXISTS idx_workflow_jobs_claim
+    ON workflow_jobs(queue, priority DESC, run_at)
+    WHERE status = 'queued';
+
+-- Expired leases of crashed workers
+CREATE INDEX IF NOT EXISTS idx_workflow_jobs_lease
+    ON workflow_jobs(queue, lease_expires_at)
+    WHERE status = 'running';
+
+CREATE INDEX IF NOT EXISTS idx_workflow_jobs_batch ON workflow_jobs(batch_id, status);
+
+-- At most one live job per dedupe key (e.g. one EOD job per symbol per day);
+-- dead jobs do not count, so a same-day re-run retries symbols whose jobs died
+CREATE UNIQUE INDEX IF NOT EXISTS idx_workflow_jobs_dedupe
+    ON workflow_jobs(dedupe_key)
+    WHERE dedupe_key IS NOT NULL AND status <> 'dead';
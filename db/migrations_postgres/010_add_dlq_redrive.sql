@@ -0,0 +1,47 @@
+-- Dead letter queue re-drive
+-- Deferred retries and transient failures record when they may be retried again;
+-- the scheduled re-drive job retries due items in batches and counts its attempts.
+
+-- Workflow runs and their dead letter queue (as in db/final_schema.sql; created here
+-- for databases built from these migrations alone)
+CREATE TABLE IF NOT EXISTS workflow_executions (
+    workflow_id TEXT PRIMARY KEY,
+    workflow_type TEXT NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('pending', 'running', 'completed', 'failed', 'paused', 'cancelled')),
+    current_stage TEXT,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_message TEXT,
+    metadata_json TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_status ON workflow_executions(status);
+CREATE INDEX IF NOT EXISTS idx_workflow_type ON workflow_executions(workflow_type);
+CREATE INDEX IF NOT EXISTS idx_workflow_created ON workflow_executions(created_at DESC);
+
+CREATE TABLE IF NOT EXISTS workflow_dlq (
+    dlq_id TEXT PRIMARY KEY,
+    workflow_id TEXT NOT NULL REFERENCES workflow_executions(workflow_id),
+    symbol TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    error_message TEXT NOT NULL,
+    error_type TEXT,
+    context_json TEXT,
+    retry_count INTEGER DEFAULT 0,
+    resolved BOOLEAN DEFAULT FALSE,
+    resolved_at TIMESTAMP,
+    resolved_by TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_dlq_symbol ON workflow_dlq(symbol, stage);
+CREATE INDEX IF NOT EXISTS idx_dlq_unresolved ON workflow_dlq(resolved, created_at DESC);
+
+ALTER TABLE workflow_dlq ADD COLUMN IF NOT EXISTS next_retry_at TIMESTAMP;
+ALTER TABLE workflow_dlq ADD COLUMN IF NOT EXISTS redrive_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_dlq_redrive
+    ON workflow_dlq(stage, error_type, next_retry_at)
+    WHERE resolved = FALSE;
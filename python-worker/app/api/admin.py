@@ -1222,7 +1222,21 @@ async def get_system_metrics():
             
         except Exception as e:
             metrics["ingestion_activity"] = [{"error": str(e)}]
-        
+
+        # Provider call efficiency (response cache hits, coalesced concurrent calls)
+        from app.utils.response_cache import get_response_cache
+        from app.data_sources.adapters import get_adapter_singleflight
+        metrics["provider_cache"] = get_response_cache().get_stats()
+        metrics["provider_singleflight"] = get_adapter_singleflight().get_stats()
+
+        # Buffered audit writer (flushed / dropped / spilled events)
+        from app.observability.audit_writer import get_audit_writer
+        metrics["audit_writer"] = get_audit_writer().get_stats()
+
+        # Shared provider instances, keep-alive pools and rate limiters
+        from app.data_sources import get_data_source_registry_stats
+        metrics["data_sources"] = get_data_source_registry_stats()
+
         return {
             "metrics_timestamp": datetime.now().isoformat(),
             "metrics": metrics
@@ -1233,6 +1247,25 @@ async def get_system_metrics():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/refresh/plan")
+async def get_refresh_plan(max_items: int = 100):
+    """
+    Dry-run the quota-aware refresh planner
+
+    Returns the refresh set the periodic worker would pick right now, what it
+    defers, and each provider's used / projected daily quota burn. Read-only:
+    nothing is written to the quota ledger.
+    """
+    try:
+        from app.data_management.refresh_planner import RefreshPlanner
+        plan = RefreshPlanner(DataRefreshManager()).plan(dry_run=True)
+        return plan.to_dict(max_items=max_items)
+
+    except Exception as e:
+        logger.error(f"Refresh plan failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/data-summary/symbol/{symbol}")
 async def get_symbol_data_summary(symbol: str):
     """Get data summary for a specific symbol across all tables"""
@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import Dict, Any, List
 import asyncio
+from sqlalchemy import text
 from app.config import settings
 from app.database import db
 import logging
@@ -53,7 +54,8 @@ async def start_bulk_load(request: BulkLoadRequest, background_tasks: Background
             'progress': 0,
             'total': 0,
             'loaded': 0,
-            'failed': 0
+            'failed': 0,
+            'concurrency': None  # Live AIMD window (see BulkStockLoader.load_stocks_batch)
         }
         
         # Start background task
@@ -159,8 +161,13 @@ async def run_bulk_load_background(task_id: str, symbols: List[str], batch_size:
             except Exception as e:
                 logger.error(f"Error clearing stocks: {e}")
         
-        # Run bulk load
-        results = await loader.load_stocks_batch(symbols, batch_size)
+        def on_progress(completed: int, concurrency: Dict[str, Any]) -> None:
+            bulk_tasks[task_id]['processed'] = completed
+            bulk_tasks[task_id]['progress'] = int(completed * 100 / len(symbols)) if symbols else 100
+            bulk_tasks[task_id]['concurrency'] = concurrency
+        
+        # Run bulk load (batch_size is the initial adaptive concurrency window)
+        results = await loader.load_stocks_batch(symbols, batch_size, on_progress=on_progress)
         
         # Update final status
         bulk_tasks[task_id].update({
@@ -170,6 +177,7 @@ async def run_bulk_load_background(task_id: str, symbols: List[str], batch_size:
             'loaded': results['loaded'],
             'failed': results['failed'],
             'skipped': results.get('skipped', 0),
+            'concurrency': results.get('concurrency'),
             'results': results['details'][:20]  # Last 20 details
         })
         
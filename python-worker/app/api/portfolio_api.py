@@ -524,141 +524,110 @@ async def analyze_portfolio(
     current_user: dict = Depends(get_current_user),
     db=Depends(get_db)
 ):
-    """Run analysis on all symbols in a portfolio"""
+    """
+    Run analysis on all symbols in a portfolio
+    
+    Market context is resolved once for the date, all holdings are loaded and
+    evaluated as one batch, and signal_history is written with one insert.
+    """
+    from app.services.portfolio_analysis_service import PortfolioAnalysisService
+    
+    analysis_date = target_date or datetime.now().date()
     
     # Verify portfolio ownership
-    portfolio = db.execute(
-        "SELECT id, name FROM portfolios WHERE id = %s AND user_id = %s",
-        (portfolio_id, current_user["id"])
-    ).fetchone()
+    portfolios = db.execute_query(
+        "SELECT id, name FROM portfolios WHERE id = :portfolio_id AND user_id = :user_id",
+        {"portfolio_id": portfolio_id, "user_id": current_user["id"]}
+    )
     
-    if not portfolio:
+    if not portfolios:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Portfolio not found"
         )
+    portfolio = portfolios[0]
     
     # Get portfolio holdings
-    holdings = db.execute(
-        """
-        SELECT symbol, asset_type FROM portfolio_holdings
-        WHERE portfolio_id = %s AND status = 'active'
-        """,
-        (portfolio_id,)
-    ).fetchall()
+    holdings = [
+        (row["symbol"], row["asset_type"])
+        for row in db.execute_query(
+            """
+            SELECT symbol, asset_type FROM portfolio_holdings
+            WHERE portfolio_id = :portfolio_id AND status = 'active'
+            """,
+            {"portfolio_id": portfolio_id}
+        )
+    ]
     
     if not holdings:
         return {"success": False, "error": "No holdings found in portfolio"}
     
     # Create analysis log
-    log_id = db.execute(
+    start_time = datetime.now()
+    log_id = db.execute_query(
         """
         INSERT INTO analysis_logs (user_id, portfolio_id, analysis_type, symbols_analyzed, start_time, status)
-        VALUES (%s, %s, %s, %s, %s, %s)
+        VALUES (:user_id, :portfolio_id, 'portfolio', :symbols_analyzed, :start_time, 'running')
         RETURNING id
         """,
-        (current_user["id"], portfolio_id, "portfolio", len(holdings), datetime.now(), "running")
-    ).fetchone()[0]
+        {
+            "user_id": current_user["id"],
+            "portfolio_id": portfolio_id,
+            "symbols_analyzed": len(holdings),
+            "start_time": start_time,
+        }
+    )[0]["id"]
     
     try:
-        # Import signal generation logic
-        from app.api.universal_backtest_api import generate_universal_signal
-        
-        signals_generated = 0
-        successful_analyses = []
+        analysis = PortfolioAnalysisService().analyze_holdings(
+            holdings,
+            analysis_date,
+            portfolio_id=portfolio_id,
+            user_id=current_user["id"]
+        )
         
-        for holding in holdings:
-            symbol, asset_type = holding
-            
-            try:
-                # Generate signal for this symbol
-                signal_data = generate_universal_signal(
-                    symbol=symbol,
-                    target_date=target_date or datetime.now().date(),
-                    asset_type=asset_type
-                )
-                
-                if signal_data and "error" not in signal_data:
-                    # Extract signal data
-                    signal = signal_data.get("signal", {})
-                    market_data = signal_data.get("market_data", {})
-                    analysis = signal_data.get("analysis", {})
-                    
-                    # Store in signal history (audit trail)
-                    db.execute(
-                        """
-                        INSERT INTO signal_history 
-                        (symbol, portfolio_id, user_id, signal_type, confidence, price,
-                         rsi, macd, macd_signal, sma_20, sma_50, ema_20, volume,
-                         ema_slope, volatility, vix_level, recent_change,
-                         fear_greed_state, fear_greed_bias, recovery_detected,
-                         engine_type, asset_type, strategy, reasoning, signal_date)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        (symbol, portfolio_id, current_user["id"],
-                         signal.get("signal", "HOLD"), signal.get("confidence", 0),
-                         market_data.get("price", 0), market_data.get("rsi", 0),
-                         market_data.get("macd", 0), market_data.get("macd_signal", 0),
-                         market_data.get("sma_20", 0), market_data.get("sma_50", 0),
-                         market_data.get("ema_20", 0), market_data.get("volume", 0),
-                         analysis.get("ema_slope", 0), analysis.get("real_volatility", 0),
-                         analysis.get("vix_level", 0), analysis.get("recent_change", 0),
-                         signal.get("metadata", {}).get("fear_greed_state"),
-                         signal.get("metadata", {}).get("fear_greed_bias"),
-                         signal.get("metadata", {}).get("recovery_detected", False),
-                         signal_data.get("engine", {}).get("engine_type"),
-                         asset_type, signal_data.get("engine", {}).get("engine_type"),
-                         json.dumps(signal.get("reasoning", [])),
-                         target_date or datetime.now().date())
-                    )
-                    
-                    signals_generated += 1
-                    successful_analyses.append({
-                        "symbol": symbol,
-                        "signal": signal.get("signal", "HOLD"),
-                        "confidence": signal.get("confidence", 0),
-                        "price": market_data.get("price", 0)
-                    })
-                
-            except Exception as e:
-                db.execute(
-                    "UPDATE analysis_logs SET error_message = %s WHERE id = %s",
-                    (f"Error analyzing {symbol}: {str(e)}", log_id)
-                )
+        signals_generated = len(analysis["results"])
+        success_rate = signals_generated / len(holdings) * 100
+        end_time = datetime.now()
         
         # Update analysis log
-        success_rate = (signals_generated / len(holdings) * 100) if holdings else 0
-        db.execute(
+        db.execute_update(
             """
             UPDATE analysis_logs 
-            SET signals_generated = %s, success_rate = %s, end_time = %s, 
-                duration_ms = %s, status = %s
-            WHERE id = %s
+            SET signals_generated = :signals_generated, success_rate = :success_rate, end_time = :end_time, 
+                duration_ms = :duration_ms, status = 'completed', error_message = :error_message
+            WHERE id = :log_id
             """,
-            (signals_generated, success_rate, datetime.now(),
-             (datetime.now() - datetime.now()).microseconds // 1000, "completed", log_id)
+            {
+                "signals_generated": signals_generated,
+                "success_rate": success_rate,
+                "end_time": end_time,
+                "duration_ms": int((end_time - start_time).total_seconds() * 1000),
+                "error_message": "; ".join(
+                    f"Error analyzing {symbol}: {error}" for symbol, error in analysis["errors"].items()
+                ) or None,
+                "log_id": log_id,
+            }
         )
         
-        db.commit()
-        
         return {
             "success": True,
             "portfolio_id": portfolio_id,
-            "portfolio_name": portfolio[1],
+            "portfolio_name": portfolio["name"],
             "symbols_analyzed": len(holdings),
             "signals_generated": signals_generated,
             "success_rate": success_rate,
-            "analysis_date": target_date or datetime.now().date(),
-            "results": successful_analyses
+            "analysis_date": analysis_date,
+            "market_context": analysis["market_context"],
+            "results": analysis["results"]
         }
         
     except Exception as e:
-        db.execute(
-            "UPDATE analysis_logs SET status = %s, error_message = %s WHERE id = %s",
-            ("failed", str(e), log_id)
+        logger.error(f"Portfolio analysis failed for portfolio {portfolio_id}: {e}")
+        db.execute_update(
+            "UPDATE analysis_logs SET status = 'failed', error_message = :error_message WHERE id = :log_id",
+            {"error_message": str(e), "log_id": log_id}
         )
-        db.commit()
         
         return {"success": False, "error": str(e)}
 
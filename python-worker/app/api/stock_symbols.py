@@ -12,8 +12,11 @@ from pydantic import BaseModel, Field
 
 from app.observability.logging import get_logger
 from app.observability.tracing import trace_function
-from app.data_sources.adapters import create_adapter
+from app.data_sources import get_data_source
 from app.config import settings
+from app.utils.http_session import get_http_session
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.response_cache import get_response_cache, make_cache_key
 
 
 # Pydantic models for API responses
@@ -61,50 +64,36 @@ class StockSymbolService:
         self._massive_adapter = None
         self._yahoo_adapter = None
         self._fallback_adapter = None
-        self._cache = {}  # Simple in-memory cache
-        self._cache_ttl = 300  # 5 minutes
+        self._cache = get_response_cache()  # Shared bounded LRU with per-dataset TTLs
     
     def _get_adapters(self):
-        """Lazy initialization of adapters"""
+        """Lazy lookup of the shared adapter instances (one per provider per process)"""
         if not self._massive_adapter:
             try:
-                self._massive_adapter = create_adapter("massive")
-                config = {
-                    "api_key": settings.massive_api_key,
-                    "rate_limit_calls": settings.massive_rate_limit_calls,
-                    "rate_limit_window": settings.massive_rate_limit_window
-                }
-                self._massive_adapter.initialize(config)
+                self._massive_adapter = get_data_source("massive", use_fallback=False)
             except Exception as e:
                 logger.warning(f"Failed to initialize Massive adapter: {e}")
         
         if not self._yahoo_adapter:
             try:
-                self._yahoo_adapter = create_adapter("yahoo_finance")
-                self._yahoo_adapter.initialize({"timeout": 30})
+                self._yahoo_adapter = get_data_source("yahoo_finance", use_fallback=False)
             except Exception as e:
                 logger.warning(f"Failed to initialize Yahoo adapter: {e}")
         
         if not self._fallback_adapter:
             try:
-                self._fallback_adapter = create_adapter("fallback")
-                self._fallback_adapter.initialize({"cache_enabled": True})
+                self._fallback_adapter = get_data_source("fallback", use_fallback=False)
             except Exception as e:
                 logger.warning(f"Failed to initialize Fallback adapter: {e}")
     
     def _get_from_cache(self, key: str) -> Optional[Dict[str, Any]]:
         """Get data from cache"""
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if datetime.now().timestamp() - timestamp < self._cache_ttl:
-                return data
-            else:
-                del self._cache[key]
-        return None
+        return self._cache.get("symbol_details", key)
     
     def _set_cache(self, key: str, data: Dict[str, Any]):
-        """Set data in cache"""
-        self._cache[key] = (data, datetime.now().timestamp())
+        """Set data in cache (unresolved symbols are retried after the quote TTL, not days later)"""
+        ttl = self._cache.ttl_for("quote") if data.get("source") == "none" else None
+        self._cache.set("symbol_details", key, data, ttl=ttl)
     
     @trace_function("get_symbol_details_massive")
     def _get_symbol_details_massive(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -113,13 +102,12 @@ class StockSymbolService:
             return None
         
         try:
-            # Use the Massive.com API endpoint directly
-            import requests
-            
+            # Use the Massive.com API endpoint directly (pooled session, shared Massive rate budget)
             url = f"https://api.massive.com/v3/reference/tickers/{symbol.upper()}"
             params = {"apiKey": settings.massive_api_key}
             
-            response = requests.get(url, params=params, timeout=30)
+            get_rate_limiter("Massive", settings.massive_rate_limit_calls, settings.massive_rate_limit_window).acquire()
+            response = get_http_session("massive").get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -188,7 +176,7 @@ class StockSymbolService:
         symbol = symbol.upper()
         
         # Check cache first
-        cache_key = f"symbol_details_{symbol}"
+        cache_key = make_cache_key("stock_symbols", "get_symbol_details", (symbol,))
         cached_data = self._get_from_cache(cache_key)
         if cached_data:
             return StockSymbolDetails(**cached_data)
@@ -319,7 +307,8 @@ async def health_check():
         "massive_available": service._massive_adapter and service._massive_adapter.is_available(),
         "yahoo_available": service._yahoo_adapter and service._yahoo_adapter.is_available(),
         "fallback_available": service._fallback_adapter and service._fallback_adapter.is_available(),
-        "cache_size": len(service._cache)
+        "cache_size": len(service._cache),
+        "cache": service._cache.get_stats()
     }
     
     return status
@@ -6,9 +6,9 @@ Central stock symbols management with auto-population of company information
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-import requests
 from app.config import settings
 from app.database import db
+from app.utils.http_session import get_http_session
 
 # ========================================
 # IMPORTANT: Router Configuration Rules
@@ -159,7 +159,7 @@ async def fetch_company_info(symbol: str) -> dict:
             "modules": "summaryDetail,assetProfile,defaultKeyStatistics"
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = get_http_session("yahoo_finance").get(url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -16,12 +16,13 @@ from sqlalchemy import create_engine
 from app.utils.database_helper import DatabaseQueryHelper
 from app.utils.market_data_utils import calculate_market_regime_context, calculate_ema_slope
 from app.services.comprehensive_data_loader import ComprehensiveDataLoader
+from app.services.portfolio_analysis_service import signal_config_for
 from app.observability.logging import get_logger, log_exception, log_with_context
 from app.config import settings  # Import centralized settings
 
 # Import signal engines (will extend as needed)
 from app.signal_engines.unified_tqqq_swing_engine import UnifiedTQQQSwingEngine
-from app.signal_engines.signal_calculator_core import SignalConfig, SignalResult, MarketConditions
+from app.signal_engines.signal_calculator_core import SignalResult, MarketConditions
 
 # ========================================
 # IMPORTANT: Router Configuration Rules
@@ -307,27 +308,8 @@ async def get_universal_signal(request: SignalRequest):
             ema_slope = 0.0
         
         # Use TQQQ engine for all (will extend later)
-        # Create appropriate config based on asset type
-        if request.asset_type == "3x_etf":
-            config = SignalConfig(
-                rsi_oversold=48,  # Higher threshold for 3x ETFs
-                rsi_overbought=70,
-                max_volatility=10.0  # Higher volatility tolerance
-            )
-        elif request.asset_type == "regular_etf":
-            config = SignalConfig(
-                rsi_oversold=35,  # Standard ETF threshold
-                rsi_overbought=70,
-                max_volatility=6.0  # Standard volatility
-            )
-        else:  # stock
-            config = SignalConfig(
-                rsi_oversold=30,  # Stock threshold
-                rsi_overbought=70,
-                max_volatility=8.0  # Stock volatility
-            )
-        
-        engine = UnifiedTQQQSwingEngine(config)
+        # Thresholds per asset type (shared with batch portfolio analysis)
+        engine = UnifiedTQQQSwingEngine(signal_config_for(request.asset_type))
         
         # Generate signal
         signal_result = engine.generate_signal(conditions)
@@ -37,6 +37,9 @@ def register_screener_endpoints(app):
         trend_filter: Optional[str] = None,
         min_market_cap: Optional[float] = None,
         max_pe_ratio: Optional[float] = None,
+        signal: Optional[str] = None,
+        min_confidence_score: Optional[float] = None,
+        sort_by: Optional[str] = None,
         limit: int = 100
     ):
         """
@@ -47,6 +50,7 @@ def register_screener_endpoints(app):
         Example: 
         - /api/v1/screener/stocks?price_below_sma50=true&has_good_fundamentals=true&limit=50
         - /api/v1/screener/stocks?price_below_sma200=true&is_growth_stock=true&limit=100
+        - /api/v1/screener/stocks?signal=BUY&min_confidence_score=0.7&sort_by=confidence_score&limit=20
         """
         try:
             results = stock_screener_service.screen_stocks(
@@ -61,6 +65,9 @@ def register_screener_endpoints(app):
                 trend_filter=trend_filter,
                 min_market_cap=min_market_cap,
                 max_pe_ratio=max_pe_ratio,
+                signal=signal,
+                min_confidence_score=min_confidence_score,
+                sort_by=sort_by,
                 limit=limit
             )
             
@@ -14,6 +14,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from app.database import db, init_database
+from app.observability import audit
 from app.data_management.refresh_manager import DataRefreshManager
 from app.data_management.refresh_strategy import RefreshMode, DataType
 from app.data_validation.signal_readiness import SignalReadinessValidator
@@ -131,6 +132,12 @@ async def startup_event():
     logger.info("✅ Python Worker API started")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drain buffered audit events on shutdown"""
+    audit.shutdown()
+
+
 # Health check
 @app.get("/health")
 async def health_check():
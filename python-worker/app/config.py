@@ -74,6 +74,7 @@ class Settings(BaseSettings):
     massive_enabled: bool = False
     massive_rate_limit_calls: int = 2  # Conservative: 2 calls per minute for daily operations
     massive_rate_limit_window: float = 60.0  # Seconds
+    massive_fundamentals_max_workers: int = 8  # Concurrent endpoint calls when loading fundamentals
     
     # Batch scheduler
     batch_schedule_hour: int = 1  # 1 AM
@@ -82,6 +83,39 @@ class Settings(BaseSettings):
     # Periodic/Live updates
     enable_live_updates: bool = False
     periodic_update_interval_minutes: int = 15  # How often to check for periodic updates
+    periodic_refresh_max_workers: int = 4  # Concurrent refreshes dispatched by the periodic scheduler
+    periodic_schedule_jitter: float = 0.1  # +/- fraction of each interval added to next-due times
+    periodic_symbol_sync_seconds: int = 300  # How often tracked symbols (holdings, alerts, ...) are re-read
+    intraday_bar_aggregation_enabled: bool = True  # Build 1m/5m/15m bars from current-price ticks
+    intraday_bar_intervals: str = "1m,5m,15m"  # Comma-separated bar intervals built from ticks
+    intraday_bar_ring_size: int = 390  # Closed bars kept in memory per symbol and interval
+    intraday_tick_max_gap_seconds: int = 120  # Max tick spacing for a symbol's bars to replace provider candles
+    intraday_bar_start_tolerance_seconds: int = 30  # A bar's first tick must be this close to its open unless ticks were already flowing
+
+    # Workflow orchestration (EOD pipeline stages)
+    workflow_max_workers: int = 4  # Symbols processed concurrently per workflow stage
+    workflow_stage_concurrency: str = ""  # Per-stage overrides, e.g. "ingestion:8,financial_data:2"
+    workflow_pipelined: bool = True  # Symbols advance to their next stage as soon as their own dependency passes
+    workflow_ledger_flush_every: int = 500  # Symbol state transitions buffered before a batched upsert
+    workflow_gate_batch_size: int = 50  # Symbols per gate check_many() call in pipelined runs
+    eod_change_window_days: int = 30  # Trailing days of bars hashed to detect changed EOD inputs
+    workflow_retry_max_idle_seconds: float = 5.0  # Max wait on retries alone before deferring them to the DLQ re-drive
+    dlq_redrive_enabled: bool = True  # Batch worker retries due transient DLQ items on a schedule
+    dlq_redrive_interval_minutes: int = 15  # How often the DLQ re-drive job runs
+    dlq_redrive_batch_size: int = 50  # Symbols re-run per re-drive batch
+    dlq_redrive_max_workers: int = 2  # Re-drive batches run concurrently
+    dlq_redrive_max_attempts: int = 3  # Re-drives per DLQ item before it is left for manual review
+    job_queue_enabled: bool = False  # Nightly EOD fans symbols out to queue workers (app.workers.queue_worker)
+    job_queue_name: str = "workflow"  # workflow_jobs.queue claimed by queue workers
+    job_queue_lease_seconds: int = 300  # Job lease; heartbeats extend it, expiry lets another worker reclaim
+    job_queue_worker_concurrency: int = 4  # Jobs run concurrently per queue worker process
+    job_queue_poll_seconds: float = 2.0  # Idle wait between claims (and batch completion polls)
+    job_queue_batch_timeout_seconds: int = 14400  # Max wait for a nightly EOD batch to drain
+    bulk_load_max_concurrency: int = 32  # Upper bound for the adaptive (AIMD) bulk-load window
+    refresh_tracking_max_entries: int = 50000  # Bounded (symbol, dataset, interval) refresh-state cache
+    refresh_chunk_size: int = 100  # Symbols per batched refresh-tracking flush
+    backfill_max_workers: int = 4  # Concurrent provider fetches when executing a gap backfill plan
+    screener_matrix_max_age_seconds: int = 300  # Screener feature matrix reloads in the background after this age
 
     # Financial Modeling Prep (FMP) API
     fmp_api_key: str = Field(default="", description="Financial Modeling Prep API key")
@@ -93,6 +127,40 @@ class Settings(BaseSettings):
     fmp_rate_limit_calls: int = Field(default=60, description="FMP rate limit calls per window")
     fmp_rate_limit_window: float = Field(default=60.0, description="FMP rate limit window in seconds")
 
+    # Provider response cache (shared by FMP, Massive, Alpha Vantage, Yahoo clients)
+    provider_cache_enabled: bool = Field(default=True, description="Serve identical provider lookups from cache")
+    provider_cache_max_entries: int = Field(default=5000, description="Max in-memory cache entries (LRU)")
+    provider_cache_dir: Optional[str] = Field(default=None, description="Directory for on-disk cache tier (disabled if unset)")
+    provider_singleflight_enabled: bool = Field(default=True, description="Coalesce concurrent identical adapter calls")
+    http_pool_connections: int = Field(default=10, description="Per-provider keep-alive pools (one per host)")
+    http_pool_maxsize: int = Field(default=32, description="Keep-alive connections per host in each provider pool")
+
+    # Cassette data source (record/replay provider responses for offline benchmarks)
+    cassette_dir: str = Field(default="cassettes", description="Directory holding recorded provider responses")
+    cassette_mode: str = Field(default="replay", description="'record' (call cassette_record_source and save) or 'replay'")
+    cassette_record_source: str = Field(default="fallback", description="Provider wrapped in record mode")
+    cassette_latency_ms: float = Field(default=0.0, description="Synthetic latency added to each replayed call")
+    cassette_latency_jitter_ms: float = Field(default=0.0, description="Uniform +/- jitter on replay latency")
+    cassette_error_rate: float = Field(default=0.0, description="Fraction of replayed calls that raise a provider error")
+    cassette_seed: int = Field(default=42, description="Seed for replay jitter and error injection")
+
+    # Quota-aware refresh planner (periodic worker)
+    refresh_planner_enabled: bool = Field(default=True, description="Plan periodic refreshes under provider quotas")
+    refresh_planner_cycle_minutes: float = Field(default=1.0, description="Minutes between planner cycles")
+    refresh_planner_max_items: int = Field(default=50, description="Max symbol x dataset refreshes per cycle")
+    refresh_planner_max_staleness: float = Field(default=10.0, description="Cap on staleness (in refresh intervals) used for scoring")
+    refresh_planner_include_universe: bool = Field(default=True, description="Plan screener-only symbols at lowest priority")
+    refresh_quota_burst_fraction: float = Field(default=0.1, description="Share of the daily quota usable ahead of the even-pace line")
+    fmp_daily_quota: Optional[int] = Field(default=250, description="FMP calls per day (None = unlimited)")
+    alphavantage_daily_quota: Optional[int] = Field(default=25, description="Alpha Vantage calls per day (None = unlimited)")
+
+    # Audit events (data_ingestion_events) - buffered background writer
+    audit_async_enabled: bool = Field(default=True, description="Batch audit events on a background thread")
+    audit_queue_size: int = Field(default=10000, description="Max buffered audit events before spill/drop")
+    audit_batch_size: int = Field(default=200, description="Audit events per multi-row insert")
+    audit_flush_interval_ms: int = Field(default=500, description="Max time an audit event waits before flush")
+    audit_spill_path: Optional[str] = Field(default=None, description="JSONL file for audit events under backpressure (dropped if unset)")
+
 
 settings = Settings()
 
@@ -0,0 +1,272 @@
+"""
+Intraday Bar Aggregator
+Folds current-price ticks into 1m/5m/15m OHLCV bars aligned to NYSE session times
+Performance: one small upsert per closed bar instead of re-downloading days of candles every cycle
+"""
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.observability.logging import get_logger
+from app.utils.trading_calendar import last_session_close, session_containing
+
+logger = get_logger("bar_aggregator")
+
+INTERVALS: Dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+}
+
+SessionLookup = Callable[[datetime], Optional[Tuple[datetime, datetime]]]
+
+
+@dataclass
+class Bar:
+    """
+    One OHLCV bar; volume is the change in the provider's cumulative day volume
+
+    complete is False when the ticks do not cover the whole bar (ticks started
+    mid-bar, a gap between ticks, or the last tick came long before the end):
+    its OHLC and volume then miss part of the bar.
+    """
+    symbol: str
+    interval: str
+    start: datetime  # UTC, bar open time
+    end: datetime  # UTC, capped at the session close
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: Optional[int] = None
+    ticks: int = 1
+    first_tick_at: Optional[datetime] = None
+    last_tick_at: Optional[datetime] = None
+    complete: bool = True
+
+
+class _SymbolBars:
+    """Open bar + ring buffer of closed bars per interval for one symbol"""
+
+    def __init__(self, intervals: Iterable[str], ring_size: int):
+        self.open: Dict[str, Optional[Bar]] = {i: None for i in intervals}
+        self.closed: Dict[str, Deque[Bar]] = {i: deque(maxlen=ring_size) for i in intervals}
+        self.last_tick_at: Optional[datetime] = None
+        self.last_cum_volume: Optional[int] = None
+        # Cumulative volume when each open bar started
+        self.volume_base: Dict[str, Optional[int]] = {i: None for i in intervals}
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _session_lookup(ts: datetime) -> Optional[Tuple[datetime, datetime]]:
+    bounds = session_containing(ts)
+    if bounds is None:
+        return None
+    return bounds[0].to_pydatetime(), bounds[1].to_pydatetime()
+
+
+class BarAggregator:
+    """
+    In-process OHLCV bars built from current-price ticks
+
+    - add_tick() folds a tick into the open bar of every interval and returns the
+      bars it closed; ticks outside a trading session (or older than the open bar)
+      are ignored
+    - Bar boundaries are offsets from the session open (09:30 ET), so early closes
+      cut the last bar short instead of spilling past the close
+    - close_due() closes bars whose end has passed without a newer tick
+    - A bar is complete only if its ticks cover it: the first tick came within
+      start_tolerance of the open or max_tick_gap of the previous tick, no gap
+      between its ticks exceeds max_tick_gap, and its last tick came within
+      max_tick_gap of the end; partial bars must not replace provider candles
+    - Closed bars stay in a fixed-size ring buffer per symbol and interval
+    - Provider candles are only needed to reconcile: see needs_reconcile()
+    """
+
+    def __init__(
+        self,
+        intervals: Iterable[str] = ("1m", "5m", "15m"),
+        ring_size: int = 390,
+        max_tick_gap: timedelta = timedelta(minutes=2),
+        start_tolerance: timedelta = timedelta(seconds=30),
+        session_lookup: SessionLookup = _session_lookup,
+    ):
+        unknown = [i for i in intervals if i not in INTERVALS]
+        if unknown:
+            raise ValueError(f"Unsupported bar intervals: {unknown}")
+        self.intervals = list(intervals)
+        self.ring_size = ring_size
+        self.max_tick_gap = max_tick_gap
+        self.start_tolerance = start_tolerance
+        self._session_lookup = session_lookup
+        self._symbols: Dict[str, _SymbolBars] = {}
+        self._reconciled_at: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stats = {"ticks": 0, "ignored_ticks": 0, "closed_bars": 0}
+
+    def add_tick(self, symbol: str, price: float, volume: Optional[int] = None, ts: Optional[datetime] = None) -> List[Bar]:
+        """Fold one tick (volume = cumulative day volume) into the symbol's bars"""
+        ts = _utc(ts or datetime.now(timezone.utc))
+        session = self._session_lookup(ts)
+        with self._lock:
+            if session is None:
+                self._stats["ignored_ticks"] += 1
+                return []
+            state = self._symbols.get(symbol)
+            if state is None:
+                state = self._symbols[symbol] = _SymbolBars(self.intervals, self.ring_size)
+            if state.last_tick_at is not None and ts < state.last_tick_at:
+                self._stats["ignored_ticks"] += 1
+                return []
+
+            session_open, session_close = session
+            # A new session resets the cumulative volume baseline
+            if state.last_tick_at is None or state.last_tick_at < session_open:
+                state.last_cum_volume = None
+
+            previous_tick_at = state.last_tick_at
+            if previous_tick_at is not None and previous_tick_at < session_open:
+                previous_tick_at = None
+
+            closed: List[Bar] = []
+            for interval in self.intervals:
+                length = INTERVALS[interval]
+                start = session_open + length * ((ts - session_open) // length)
+                bar = state.open[interval]
+                if bar is not None and bar.start != start:
+                    closed.append(self._close(state, interval))
+                    bar = None
+                if bar is None:
+                    state.volume_base[interval] = state.last_cum_volume if state.last_cum_volume is not None else volume
+                    state.open[interval] = Bar(
+                        symbol=symbol,
+                        interval=interval,
+                        start=start,
+                        end=min(start + length, session_close),
+                        open=price, high=price, low=price, close=price,
+                        volume=self._volume_delta(state.volume_base[interval], volume),
+                        first_tick_at=ts,
+                        last_tick_at=ts,
+                        complete=(
+                            ts - start <= self.start_tolerance
+                            or (previous_tick_at is not None and ts - previous_tick_at <= self.max_tick_gap)
+                        ),
+                    )
+                else:
+                    bar.high = max(bar.high, price)
+                    bar.low = min(bar.low, price)
+                    bar.close = price
+                    bar.ticks += 1
+                    if ts - bar.last_tick_at > self.max_tick_gap:
+                        bar.complete = False
+                    bar.last_tick_at = ts
+                    delta = self._volume_delta(state.volume_base[interval], volume)
+                    if delta is not None:
+                        bar.volume = delta
+
+            state.last_tick_at = ts
+            if volume is not None:
+                state.last_cum_volume = volume
+            self._stats["ticks"] += 1
+            return closed
+
+    def close_due(self, now: Optional[datetime] = None, symbols: Optional[Iterable[str]] = None) -> List[Bar]:
+        """Close open bars whose end time has passed (e.g. the last bar of the session)"""
+        now = _utc(now or datetime.now(timezone.utc))
+        closed: List[Bar] = []
+        with self._lock:
+            names = list(symbols) if symbols is not None else list(self._symbols)
+            for symbol in names:
+                state = self._symbols.get(symbol)
+                if state is None:
+                    continue
+                for interval in self.intervals:
+                    bar = state.open[interval]
+                    if bar is not None and bar.end <= now:
+                        closed.append(self._close(state, interval))
+        return closed
+
+    def recent_bars(self, symbol: str, interval: str, limit: Optional[int] = None) -> List[Bar]:
+        """Closed bars for a symbol, oldest first"""
+        with self._lock:
+            state = self._symbols.get(symbol)
+            if state is None or interval not in state.closed:
+                return []
+            bars = list(state.closed[interval])
+        return bars[-limit:] if limit else bars
+
+    def is_live(self, symbol: str, now: Optional[datetime] = None) -> bool:
+        """True if in-session ticks for the symbol arrive often enough to build bars"""
+        now = _utc(now or datetime.now(timezone.utc))
+        with self._lock:
+            state = self._symbols.get(symbol)
+            last = state.last_tick_at if state is not None else None
+        return last is not None and now - last <= self.max_tick_gap
+
+    def needs_reconcile(self, symbol: str, now: Optional[datetime] = None) -> bool:
+        """
+        Whether provider candles should be fetched for a symbol
+
+        - Never reconciled in this process: yes (seeds history and fills gaps)
+        - During a session: only when ticks are too sparse to build bars
+        - Outside a session: once after each session close
+        """
+        now = _utc(now or datetime.now(timezone.utc))
+        with self._lock:
+            reconciled_at = self._reconciled_at.get(symbol)
+        if reconciled_at is None:
+            return True
+        if self._session_lookup(now) is not None:
+            return not self.is_live(symbol, now)
+        close = last_session_close(now)
+        return close is not None and reconciled_at < close.to_pydatetime()
+
+    def mark_reconciled(self, symbol: str, now: Optional[datetime] = None) -> None:
+        with self._lock:
+            self._reconciled_at[symbol] = _utc(now or datetime.now(timezone.utc))
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["symbols"] = len(self._symbols)
+        return stats
+
+    def _close(self, state: _SymbolBars, interval: str) -> Bar:
+        bar = state.open[interval]
+        state.open[interval] = None
+        if bar.end - bar.last_tick_at > self.max_tick_gap:
+            bar.complete = False
+        state.closed[interval].append(bar)
+        self._stats["closed_bars"] += 1
+        return bar
+
+    @staticmethod
+    def _volume_delta(base: Optional[int], cumulative: Optional[int]) -> Optional[int]:
+        if base is None or cumulative is None or cumulative < base:
+            return None
+        return cumulative - base
+
+
+_aggregator: Optional[BarAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_bar_aggregator() -> BarAggregator:
+    """Get global bar aggregator instance (shared by every DataRefreshManager)"""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                from app.config import settings
+                _aggregator = BarAggregator(
+                    intervals=[i.strip() for i in settings.intraday_bar_intervals.split(",") if i.strip()],
+                    ring_size=settings.intraday_bar_ring_size,
+                    max_tick_gap=timedelta(seconds=settings.intraday_tick_max_gap_seconds),
+                    start_tolerance=timedelta(seconds=settings.intraday_bar_start_tolerance_seconds),
+                )
+    return _aggregator
@@ -0,0 +1,241 @@
+"""
+Universe Gap Scanner
+Set-based detection of missing daily/15m bars and batched backfill execution
+Performance: one calendar build + one anti-join per scan, instead of one SELECT per symbol
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from app.database import db
+from app.observability.logging import get_logger
+from app.utils.trading_calendar import expected_trading_days, expected_intraday_15m_timestamps
+
+logger = get_logger("gap_scanner")
+
+DAILY = "daily"
+INTRADAY_15M = "15m"
+
+
+@dataclass(frozen=True)
+class BackfillRange:
+    """A contiguous run of missing sessions (daily) or bars (15m) for one symbol"""
+    symbol: str
+    interval: str
+    start: Any  # date for daily, UTC pd.Timestamp for 15m
+    end: Any
+    missing: int
+
+
+@dataclass
+class BackfillPlan:
+    """Missing ranges across the universe, grouped by symbol"""
+    interval: str
+    ranges: Dict[str, List[BackfillRange]] = field(default_factory=dict)
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self.ranges)
+
+    @property
+    def total_missing(self) -> int:
+        return sum(r.missing for ranges in self.ranges.values() for r in ranges)
+
+    def fetch_window(self, symbol: str) -> tuple:
+        """Single fetch envelope covering every range for a symbol (upserts make overlap safe)"""
+        ranges = self.ranges[symbol]
+        return min(r.start for r in ranges), max(r.end for r in ranges)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "symbols": len(self.ranges),
+            "total_missing": self.total_missing,
+            "ranges": {
+                sym: [{"start": str(r.start), "end": str(r.end), "missing": r.missing} for r in ranges]
+                for sym, ranges in self.ranges.items()
+            },
+        }
+
+
+def group_contiguous(
+    symbol: str,
+    interval: str,
+    missing: Sequence[Any],
+    calendar: Sequence[Any],
+) -> List[BackfillRange]:
+    """
+    Group missing points into ranges that are contiguous in the expected calendar
+
+    Weekends/holidays don't split a range because contiguity is by session position.
+    """
+    position = {point: i for i, point in enumerate(calendar)}
+    ranges: List[BackfillRange] = []
+    run: List[Any] = []
+    for point in sorted(missing, key=position.__getitem__):
+        if run and position[point] != position[run[-1]] + 1:
+            ranges.append(BackfillRange(symbol, interval, run[0], run[-1], len(run)))
+            run = []
+        run.append(point)
+    if run:
+        ranges.append(BackfillRange(symbol, interval, run[0], run[-1], len(run)))
+    return ranges
+
+
+class GapScanner:
+    """
+    Detects missing bars for many symbols at once
+
+    - The expected session calendar is generated once per scan
+    - Present bars are anti-joined against (symbols x calendar) in a single SQL statement
+    - Results are returned as a BackfillPlan grouped by symbol and contiguous range
+    """
+
+    def scan_daily(self, symbols: Sequence[str], lookback_days: int = 10, end_date: Optional[date] = None) -> BackfillPlan:
+        """Find missing NYSE trading days in stock_market_metrics for the last N days"""
+        end_date = end_date or datetime.utcnow().date()
+        start_date = end_date - timedelta(days=int(lookback_days))
+        sessions = list(expected_trading_days(start_date, end_date))
+        plan = BackfillPlan(interval=DAILY)
+        if not symbols or not sessions:
+            return plan
+
+        rows = db.execute_query(
+            """
+            WITH universe AS (
+                SELECT u.symbol, s.id AS stock_id
+                FROM unnest(CAST(:symbols AS text[])) AS u(symbol)
+                LEFT JOIN stocks s ON s.symbol = u.symbol
+            ),
+            expected AS (
+                SELECT unnest(CAST(:sessions AS date[])) AS date
+            )
+            SELECT u.symbol, e.date
+            FROM universe u
+            CROSS JOIN expected e
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM stock_market_metrics m
+                WHERE m.stock_id = u.stock_id
+                  AND m.date = e.date
+            )
+            ORDER BY u.symbol, e.date
+            """,
+            {"symbols": list(dict.fromkeys(symbols)), "sessions": sessions},
+        )
+        return self._build_plan(plan, rows, key="date", calendar=sessions, normalize=_to_date)
+
+    def scan_intraday_15m(self, symbols: Sequence[str], lookback_days: int = 2, end_date: Optional[date] = None) -> BackfillPlan:
+        """Find missing 15m bars in raw_market_data_intraday for the last N days"""
+        end_date = end_date or datetime.utcnow().date()
+        start_date = end_date - timedelta(days=int(lookback_days))
+        expected_ts = [pd.Timestamp(t).tz_convert("UTC").floor("15min") for t in expected_intraday_15m_timestamps(start_date, end_date)]
+        plan = BackfillPlan(interval=INTRADAY_15M)
+        if not symbols or not expected_ts:
+            return plan
+
+        rows = db.execute_query(
+            """
+            WITH expected AS (
+                SELECT unnest(CAST(:expected AS timestamptz[])) AS ts
+            ),
+            present AS (
+                SELECT DISTINCT symbol, to_timestamp(floor(extract(epoch FROM ts) / 900) * 900) AS ts
+                FROM raw_market_data_intraday
+                WHERE symbol = ANY(:symbols)
+                  AND interval = '15m'
+                  AND ts >= :start_ts
+                  AND ts < :end_ts
+            )
+            SELECT u.symbol, e.ts
+            FROM unnest(CAST(:symbols AS text[])) AS u(symbol)
+            CROSS JOIN expected e
+            WHERE NOT EXISTS (
+                SELECT 1 FROM present p WHERE p.symbol = u.symbol AND p.ts = e.ts
+            )
+            ORDER BY u.symbol, e.ts
+            """,
+            {
+                "symbols": list(dict.fromkeys(symbols)),
+                "expected": [t.to_pydatetime() for t in expected_ts],
+                "start_ts": min(expected_ts).to_pydatetime(),
+                "end_ts": (max(expected_ts) + pd.Timedelta(minutes=15)).to_pydatetime(),
+            },
+        )
+        return self._build_plan(plan, rows, key="ts", calendar=expected_ts, normalize=_to_utc_bar)
+
+    @staticmethod
+    def _build_plan(
+        plan: BackfillPlan,
+        rows: List[Dict[str, Any]],
+        *,
+        key: str,
+        calendar: Sequence[Any],
+        normalize: Callable[[Any], Any],
+    ) -> BackfillPlan:
+        missing_by_symbol: Dict[str, List[Any]] = {}
+        known = set(calendar)
+        for row in rows or []:
+            point = normalize(row.get(key))
+            if row.get("symbol") and point in known:
+                missing_by_symbol.setdefault(row["symbol"], []).append(point)
+        for symbol, missing in missing_by_symbol.items():
+            plan.ranges[symbol] = group_contiguous(symbol, plan.interval, missing, calendar)
+        return plan
+
+
+class BackfillExecutor:
+    """
+    Executes a BackfillPlan with a bounded pool of fetch workers
+
+    One provider call per symbol covers all of its ranges; the caller-supplied
+    handler persists each result. Provider clients enforce their own rate limits.
+    """
+
+    def __init__(self, fetch_and_store: Callable[[str, Any, Any], int], max_workers: int = 4):
+        self.fetch_and_store = fetch_and_store
+        self.max_workers = max(1, int(max_workers))
+
+    def execute(self, plan: BackfillPlan) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"symbols": len(plan.ranges), "succeeded": 0, "failed": 0, "rows": 0, "errors": {}}
+        if not plan.ranges:
+            return summary
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(plan.ranges))) as pool:
+            futures = {
+                pool.submit(self.fetch_and_store, symbol, *plan.fetch_window(symbol)): symbol
+                for symbol in plan.symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    summary["rows"] += int(future.result() or 0)
+                    summary["succeeded"] += 1
+                except Exception as e:
+                    summary["failed"] += 1
+                    summary["errors"][symbol] = str(e)
+                    logger.warning(f"Backfill failed for {symbol} ({plan.interval}): {e}")
+        return summary
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _to_utc_bar(value: Any) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.floor("15min")
@@ -3,8 +3,9 @@ Data Refresh Manager
 Orchestrates data fetching with multiple refresh strategies
 Follows DRY and SOLID principles
 """
-from typing import Dict, Any, List, Optional, Set
-from datetime import datetime, timedelta, date
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, date, timezone
 from enum import Enum
 import pandas as pd
 import json
@@ -20,9 +21,14 @@ from app.data_management.refresh_strategy import (
 from app.data_management.refresh_result import (
     DataTypeRefreshResult, SymbolRefreshResult, RefreshStatus
 )
+from app.data_management.refresh_tracking import RefreshTrackingStore
+from app.data_management.bar_aggregator import Bar, get_bar_aggregator
+from app.data_management.gap_scanner import GapScanner, BackfillExecutor
+from app.config import settings
 from app.database import db
 from app.repositories.market_data_intraday_repository import IntradayBarUpsertRow, MarketDataIntradayRepository
-from app.utils.trading_calendar import expected_trading_days, expected_intraday_15m_timestamps
+from app.services.screener_engine import invalidate_screener_features
+from app.utils.intraday_bars import normalize_intraday_bars, intraday_bar_records
 from app.utils.json_sanitize import json_dumps_sanitized
 from app.observability import audit
 
@@ -41,7 +47,12 @@ class DataRefreshManager(BaseService):
         super().__init__()  # Initialize BaseService (sets up self.logger)
         self.data_source = data_source or get_data_source()
         self.strategies = strategies or self._default_strategies()
-        self._refresh_tracking: Dict[str, Dict[DataType, datetime]] = {}
+        # Bounded last-refresh cache + write-behind buffer for data_ingestion_state
+        self._refresh_tracking = RefreshTrackingStore(max_entries=settings.refresh_tracking_max_entries)
+        self._tracking_batch_depth = 0
+        self._pending_self_healing: Dict[DataType, Set[str]] = {}
+        # Process-wide tick -> 1m/5m/15m bar aggregator (fed by current-price refreshes)
+        self.bar_aggregator = get_bar_aggregator()
 
     def _default_strategies(self) -> Dict[RefreshMode, BaseRefreshStrategy]:
         """Create default refresh strategies"""
@@ -99,6 +110,10 @@ class DataRefreshManager(BaseService):
         failed = 0
         skipped = 0
 
+        if not force:
+            # One query for all data types (no-op when the cycle already preloaded them)
+            self.preload_refresh_state([symbol], data_types, only_missing=True)
+
         for data_type in data_types:
             dt_key = self._data_type_to_string(data_type)
             try:
@@ -120,15 +135,12 @@ class DataRefreshManager(BaseService):
 
                 if result.status == RefreshStatus.SUCCESS:
                     self._update_refresh_tracking(symbol, data_type, status='success')
-                    # Automated self-healing backfills (industry standard)
-                    if mode in (RefreshMode.SCHEDULED, RefreshMode.PERIODIC):
-                        try:
-                            if data_type == DataType.PRICE_HISTORICAL:
-                                self._auto_backfill_price_daily(symbol, lookback_days=10)
-                            elif data_type == DataType.PRICE_INTRADAY_15M:
-                                self._auto_backfill_intraday_15m(symbol, lookback_days=2)
-                        except Exception as e:
-                            self.logger.warning(f"Auto backfill failed for {symbol} {data_type}: {e}")
+                    # Automated self-healing backfills (industry standard);
+                    # inside a tracking_batch they run once for the whole chunk
+                    if mode in (RefreshMode.SCHEDULED, RefreshMode.PERIODIC) and data_type in (
+                        DataType.PRICE_HISTORICAL, DataType.PRICE_INTRADAY_15M
+                    ):
+                        self._pending_self_healing.setdefault(data_type, set()).add(symbol)
                     successful += 1
                     self.logger.info(f"✅ Refreshed {data_type} for {symbol}: {result.message}")
                 else:
@@ -161,6 +173,14 @@ class DataRefreshManager(BaseService):
                 self._update_refresh_tracking(symbol, data_type, status='failed', error=error_msg)
                 failed += 1
 
+        if self._tracking_batch_depth == 0:
+            self._run_pending_self_healing()
+            self.flush_refresh_tracking()
+
+        if successful:
+            # Newly ingested data reaches screens on the next feature matrix refresh
+            invalidate_screener_features()
+
         return SymbolRefreshResult(
             symbol=symbol,
             results=refresh_results,
@@ -170,124 +190,87 @@ class DataRefreshManager(BaseService):
             total_skipped=skipped,
         )
 
-    def _auto_backfill_price_daily(self, symbol: str, lookback_days: int = 10) -> None:
-        """Detect and backfill missing NYSE trading days for the last N days."""
-        end_date = datetime.utcnow().date()
-        start_date = end_date - timedelta(days=int(lookback_days))
-        expected = set(expected_trading_days(start_date, end_date))
+    def run_self_healing(
+        self,
+        symbols: List[str],
+        data_types: Optional[Iterable[DataType]] = None,
+        daily_lookback_days: int = 10,
+        intraday_lookback_days: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        Detect and backfill gaps for many symbols as one job
 
-        present_rows = db.execute_query(
-            """
-            SELECT m.date
-            FROM stock_market_metrics m
-            JOIN stocks s ON s.id = m.stock_id
-            WHERE s.symbol = :symbol
-              AND m.date >= :start_date
-              AND m.date <= :end_date
-            """,
-            {"symbol": symbol, "start_date": start_date, "end_date": end_date},
-        )
-        present = {r["date"] for r in present_rows if r.get("date")}
-        missing = sorted(expected - present)
-        if not missing:
-            return
+        One anti-join per dataset finds every missing session/bar across the universe;
+        the resulting plan is fetched with one provider call per affected symbol.
+
+        Returns:
+            Per-dataset summary: plan (ranges by symbol) and execution counts
+        """
+        data_types = list(data_types or (DataType.PRICE_HISTORICAL, DataType.PRICE_INTRADAY_15M))
+        scanner = GapScanner()
+        summary: Dict[str, Any] = {}
 
-        # Fetch a slightly wider range to let provider fill gaps (upsert makes this safe)
-        fetch_start = min(missing)
-        fetch_end = max(missing) + timedelta(days=1)
+        if DataType.PRICE_HISTORICAL in data_types:
+            plan = scanner.scan_daily(symbols, lookback_days=daily_lookback_days)
+            executor = BackfillExecutor(self._backfill_daily_window, max_workers=settings.backfill_max_workers)
+            summary["price_historical"] = {"plan": plan.to_dict(), "result": executor.execute(plan)}
 
+        if DataType.PRICE_INTRADAY_15M in data_types:
+            plan = scanner.scan_intraday_15m(symbols, lookback_days=intraday_lookback_days)
+            executor = BackfillExecutor(self._backfill_intraday_window, max_workers=settings.backfill_max_workers)
+            summary["price_intraday_15m"] = {"plan": plan.to_dict(), "result": executor.execute(plan)}
+
+        return summary
+
+    def _backfill_daily_window(self, symbol: str, start: date, end: date) -> int:
+        """Fetch and persist daily bars covering [start, end] (upsert makes overlap safe)."""
         from app.services.data_fetcher import DataFetcher
 
         df = self.data_source.fetch_price_data(
             symbol,
-            start_date=datetime.combine(fetch_start, datetime.min.time()),
-            end_date=datetime.combine(fetch_end, datetime.min.time()),
+            start_date=datetime.combine(start, datetime.min.time()),
+            end_date=datetime.combine(end + timedelta(days=1), datetime.min.time()),
             interval="1d",
         )
         if df is None or getattr(df, "empty", True):
-            return
+            return 0
 
-        fetcher = DataFetcher()
-        fetcher.save_raw_market_data(symbol, df)
+        rows = DataFetcher().save_raw_market_data(symbol, df)
         self._update_ingestion_window(
             symbol=symbol,
             dataset=self._dataset_for_data_type(DataType.PRICE_HISTORICAL),
             interval="daily",
             source=self.data_source.name,
-            historical_start_date=fetch_start,
-            historical_end_date=max(missing),
-            cursor_date=max(missing),
+            historical_start_date=start,
+            historical_end_date=end,
+            cursor_date=end,
         )
+        return rows
 
-    def _auto_backfill_intraday_15m(self, symbol: str, lookback_days: int = 2) -> None:
-        """Detect and backfill missing 15m bars for the last N trading days."""
-        end_date = datetime.utcnow().date()
-        start_date = end_date - timedelta(days=int(lookback_days))
-
-        expected_ts = expected_intraday_15m_timestamps(start_date, end_date)
-        if not expected_ts:
-            return
-
-        start_ts = min(expected_ts)
-        end_ts = max(expected_ts) + pd.Timedelta(minutes=15)
-
-        actual_rows = db.execute_query(
-            """
-            SELECT ts
-            FROM raw_market_data_intraday
-            WHERE symbol = :symbol
-              AND interval = '15m'
-              AND ts >= :start_ts
-              AND ts <= :end_ts
-            """,
-            {"symbol": symbol, "start_ts": start_ts.to_pydatetime(), "end_ts": end_ts.to_pydatetime()},
-        )
-        actual = {pd.to_datetime(r["ts"]).tz_convert("UTC").floor("15min") for r in actual_rows if r.get("ts")}
-        expected = {pd.to_datetime(t).tz_convert("UTC").floor("15min") for t in expected_ts}
-        missing = sorted(expected - actual)
-        if not missing:
-            return
-
-        # Fetch full range covering missing; upsert makes it idempotent.
+    def _backfill_intraday_window(self, symbol: str, start_ts: pd.Timestamp, end_ts: pd.Timestamp) -> int:
+        """Fetch and persist 15m bars covering [start_ts, end_ts] (bar start times)."""
         df = self.data_source.fetch_price_data(
             symbol,
-            start_date=min(missing).to_pydatetime(),
-            end_date=(max(missing) + pd.Timedelta(minutes=15)).to_pydatetime(),
+            start_date=start_ts.to_pydatetime(),
+            end_date=(end_ts + pd.Timedelta(minutes=15)).to_pydatetime(),
             interval="15m",
         )
         if df is None or getattr(df, "empty", True):
-            return
-
-        rows: List[IntradayBarUpsertRow] = []
-        for _, r in df.iterrows():
-            ts = r.get("ts")
-            if ts is None:
-                continue
-            ts = pd.to_datetime(ts)
-            if getattr(ts, "tzinfo", None) is None:
-                ts = ts.tz_localize("UTC")
-            rows.append(
-                IntradayBarUpsertRow(
-                    stock_symbol=symbol,
-                    ts=ts.to_pydatetime(),
-                    interval="15m",
-                    open=float(r.get("open")) if r.get("open") is not None else None,
-                    high=float(r.get("high")) if r.get("high") is not None else None,
-                    low=float(r.get("low")) if r.get("low") is not None else None,
-                    close=float(r.get("close")) if r.get("close") is not None else None,
-                    volume=int(r.get("volume")) if r.get("volume") is not None else None,
-                    source=self.data_source.name,
-                )
-            )
+            return 0
 
-        MarketDataIntradayRepository.upsert_many(rows)
-        self._update_ingestion_window(
-            symbol=symbol,
-            dataset=self._dataset_for_data_type(DataType.PRICE_INTRADAY_15M),
-            interval="15m",
-            source=self.data_source.name,
-            cursor_ts=max(pd.to_datetime(r.get("ts")).tz_convert("UTC") for r in df.to_dict("records") if r.get("ts")),
+        bars = normalize_intraday_bars(df)
+        rows = MarketDataIntradayRepository.upsert_records(
+            intraday_bar_records(bars, symbol=symbol, interval="15m", source=self.data_source.name)
         )
+        if not bars.empty:
+            self._update_ingestion_window(
+                symbol=symbol,
+                dataset=self._dataset_for_data_type(DataType.PRICE_INTRADAY_15M),
+                interval="15m",
+                source=self.data_source.name,
+                cursor_ts=bars["ts"].max(),
+            )
+        return rows
 
     def _update_ingestion_window(
         self,
@@ -356,6 +339,11 @@ class DataRefreshManager(BaseService):
             holdings = []
 
         symbols = [h.get("symbol") for h in holdings if h.get("symbol")]
+        try:
+            # Load the whole cycle's state in one query; decisions below are in-memory
+            self.preload_refresh_state(symbols, [data_type])
+        except Exception as e:
+            self.logger.warning(f"Refresh state preload failed, falling back to per-symbol lookups: {e}")
         to_refresh: List[str] = []
         for sym in symbols:
             try:
@@ -429,6 +417,15 @@ class DataRefreshManager(BaseService):
                     timestamp=start_time
                 )
             elif data_type == DataType.PRICE_INTRADAY_15M:
+                aggregated = self._flush_aggregated_bars(symbol)
+                if aggregated is not None:
+                    return DataTypeRefreshResult(
+                        data_type=data_type.value,
+                        status=RefreshStatus.SUCCESS,
+                        message=f"Saved {aggregated} bars aggregated from live ticks",
+                        rows_affected=aggregated,
+                        timestamp=start_time,
+                    )
                 rows = self._refresh_price_intraday_15m(symbol)
                 return DataTypeRefreshResult(
                     data_type=data_type.value,
@@ -719,74 +716,20 @@ class DataRefreshManager(BaseService):
                 error_message = "No intraday data returned"
                 return 0
 
-            # Normalize column names (providers may return Open/High/Low/Close/Volume)
-            col_map: Dict[str, str] = {}
-            try:
-                for c in list(getattr(data, "columns", [])):
-                    cl = str(c).strip().lower()
-                    if cl not in col_map:
-                        col_map[cl] = c
-            except Exception:
-                col_map = {}
-
-            def _get(r, name: str):
-                try:
-                    if name in getattr(r, "index", []):
-                        return r.get(name)
-                    key = col_map.get(name.lower())
-                    return r.get(key) if key is not None else r.get(name)
-                except Exception:
-                    return None
-
-            rows: List[IntradayBarUpsertRow] = []
-            for idx, r in data.iterrows():
-                ts = None
-                # Providers vary:
-                # - some return an explicit 'ts' column
-                # - many return a DatetimeIndex and no 'ts' column
-                try:
-                    ts = r.get("ts")
-                except Exception:
-                    ts = None
-                if ts is None:
-                    ts = idx
-                if ts is None:
-                    continue
-                ts = pd.to_datetime(ts)
-                if getattr(ts, "tzinfo", None) is None:
-                    ts = ts.tz_localize("UTC")
-                rows.append(
-                    IntradayBarUpsertRow(
-                        stock_symbol=symbol,
-                        ts=ts.to_pydatetime(),
-                        interval="15m",
-                        open=float(_get(r, "open")) if _get(r, "open") is not None else None,
-                        high=float(_get(r, "high")) if _get(r, "high") is not None else None,
-                        low=float(_get(r, "low")) if _get(r, "low") is not None else None,
-                        close=float(_get(r, "close")) if _get(r, "close") is not None else None,
-                        volume=int(_get(r, "volume")) if _get(r, "volume") is not None else None,
-                        source=self.data_source.name,
-                    )
-                )
-
-            if not rows:
+            # Vectorized: providers vary (Open/open, 'ts' column vs DatetimeIndex, naive vs aware)
+            bars = normalize_intraday_bars(data)
+            if bars.empty:
                 error_message = "No intraday rows parsed (missing timestamps/columns)"
                 return 0
 
-            rows_saved = MarketDataIntradayRepository.upsert_many(rows)
+            rows_saved = MarketDataIntradayRepository.upsert_records(
+                intraday_bar_records(bars, symbol=symbol, interval="15m", source=self.data_source.name)
+            )
             fetch_success = rows_saved > 0
             if rows_saved > 0:
-                # Compute cursor timestamp robustly for different provider shapes.
-                cursor_ts = None
-                try:
-                    if "ts" in getattr(data, "columns", []):
-                        cursor_ts = max(pd.to_datetime(t).tz_convert("UTC") for t in data["ts"].dropna())
-                    else:
-                        cursor_ts = pd.to_datetime(data.index.max())
-                        if getattr(cursor_ts, "tzinfo", None) is None:
-                            cursor_ts = cursor_ts.tz_localize("UTC")
-                except Exception:
-                    cursor_ts = None
+                if settings.intraday_bar_aggregation_enabled:
+                    self.bar_aggregator.mark_reconciled(symbol)
+                cursor_ts = bars["ts"].max()
                 self._update_ingestion_window(
                     symbol=symbol,
                     dataset=self._dataset_for_data_type(DataType.PRICE_INTRADAY_15M),
@@ -850,7 +793,8 @@ class DataRefreshManager(BaseService):
 
             rows_fetched = 1
             ts = datetime.utcnow()
-            row = IntradayBarUpsertRow(
+            volume = int(volume) if volume is not None else None
+            rows = [IntradayBarUpsertRow(
                 stock_symbol=symbol,
                 ts=ts,
                 interval="last",
@@ -858,10 +802,19 @@ class DataRefreshManager(BaseService):
                 high=price_f,
                 low=price_f,
                 close=price_f,
-                volume=int(volume) if volume is not None else None,  # ✅ Now includes volume!
+                volume=volume,  # ✅ Now includes volume!
                 source=self.data_source.name,
-            )
-            rows_saved = MarketDataIntradayRepository.upsert_many([row])
+            )]
+            if settings.intraday_bar_aggregation_enabled:
+                # Bars closed by this tick are written with the last price, in the same upsert,
+                # but only while ticks are live: sparse polls leave the bars to provider candles
+                tick_ts = ts.replace(tzinfo=timezone.utc)
+                live = self.bar_aggregator.is_live(symbol, tick_ts)
+                closed = self.bar_aggregator.add_tick(symbol, price_f, volume, tick_ts)
+                closed += self.bar_aggregator.close_due(tick_ts, [symbol])
+                if live:
+                    rows.extend(self._bar_rows(closed))
+            rows_saved = MarketDataIntradayRepository.upsert_many(rows)
             fetch_success = rows_saved > 0
             return fetch_success
         except Exception as e:
@@ -882,6 +835,40 @@ class DataRefreshManager(BaseService):
                 error_message=error_message
             )
 
+    def _flush_aggregated_bars(self, symbol: str) -> Optional[int]:
+        """
+        Persist closed tick-aggregated bars instead of re-downloading provider candles
+
+        Returns None when provider candles are needed (see BarAggregator.needs_reconcile),
+        otherwise the number of bars written.
+        """
+        if not settings.intraday_bar_aggregation_enabled:
+            return None
+        if self.bar_aggregator.needs_reconcile(symbol):
+            return None
+        closed = self.bar_aggregator.close_due(symbols=[symbol])
+        if not closed:
+            return 0
+        return MarketDataIntradayRepository.upsert_many(self._bar_rows(closed))
+
+    def _bar_rows(self, bars: List[Bar]) -> List[IntradayBarUpsertRow]:
+        """Upsert rows for complete bars; partial bars (ticks did not cover the bar) would overwrite provider candles"""
+        return [
+            IntradayBarUpsertRow(
+                stock_symbol=bar.symbol,
+                ts=bar.start,
+                interval=bar.interval,
+                open=bar.open,
+                high=bar.high,
+                low=bar.low,
+                close=bar.close,
+                volume=bar.volume,
+                source=self.data_source.name,
+            )
+            for bar in bars
+            if bar.complete
+        ]
+
     def _save_validation_report(self, report):
         """Save validation report to database
 
@@ -1747,15 +1734,88 @@ class DataRefreshManager(BaseService):
         else:
             return str(data_type)
 
+    def _tracking_key(self, symbol: str, data_type: DataType):
+        return (symbol, self._dataset_for_data_type(data_type), self._interval_for_data_type(data_type))
+
+    def preload_refresh_state(
+        self,
+        symbols: Iterable[str],
+        data_types: Iterable[DataType],
+        only_missing: bool = False,
+    ) -> int:
+        """
+        Load refresh state for every symbol x data type of a cycle in one query
+
+        Args:
+            symbols: Symbols in the cycle
+            data_types: Data types in the cycle
+            only_missing: Only query keys not already held in memory
+
+        Returns:
+            Number of keys loaded
+        """
+        data_types = list(data_types)
+        keys = [self._tracking_key(sym, dt) for sym in symbols for dt in data_types]
+        return self._refresh_tracking.preload(keys, only_missing=only_missing)
+
+    @contextmanager
+    def tracking_batch(self) -> Iterator[None]:
+        """
+        Defer refresh-tracking writes until the end of a chunk
+
+        Usage:
+            with refresh_manager.tracking_batch():
+                for symbol in chunk:
+                    refresh_manager.refresh_data(symbol, data_types, mode)
+            # one batched upsert here
+        """
+        self._tracking_batch_depth += 1
+        try:
+            yield
+        finally:
+            self._tracking_batch_depth -= 1
+            if self._tracking_batch_depth == 0:
+                self._run_pending_self_healing()
+                self.flush_refresh_tracking()
+
+    def _run_pending_self_healing(self) -> None:
+        """Backfill gaps for every symbol refreshed since the last run, one scan per dataset"""
+        pending, self._pending_self_healing = self._pending_self_healing, {}
+        for data_type, symbols in pending.items():
+            try:
+                self.run_self_healing(sorted(symbols), [data_type])
+            except Exception as e:
+                self.logger.warning(f"Auto backfill failed for {len(symbols)} symbols {data_type}: {e}")
+
+    def flush_refresh_tracking(self) -> int:
+        """Write buffered tracking updates to data_ingestion_state in batched upserts"""
+        return self._refresh_tracking.flush()
+
+    def last_refresh_times(
+        self,
+        symbols: Iterable[str],
+        data_types: Iterable[DataType],
+    ) -> Dict[Tuple[str, DataType], Optional[datetime]]:
+        """Last successful refresh for every symbol x data type (one preload query)"""
+        symbols = list(symbols)
+        data_types = list(data_types)
+        try:
+            self.preload_refresh_state(symbols, data_types, only_missing=True)
+        except Exception as e:
+            self.logger.warning(f"Refresh state preload failed, falling back to per-symbol lookups: {e}")
+        return {
+            (symbol, data_type): self._get_last_refresh(symbol, data_type)
+            for symbol in symbols
+            for data_type in data_types
+        }
+
     def _get_last_refresh(self, symbol: str, data_type: DataType) -> Optional[datetime]:
         """Get last refresh time for a symbol and data type"""
-        # Check in-memory cache first
-        if symbol in self._refresh_tracking:
-            if data_type in self._refresh_tracking[symbol]:
-                return self._refresh_tracking[symbol][data_type]
+        key = self._tracking_key(symbol, data_type)
+        known, last_refresh = self._refresh_tracking.lookup(key)
+        if known:
+            return last_refresh
 
-        dataset = self._dataset_for_data_type(data_type)
-        interval = self._interval_for_data_type(data_type)
         query = """
             SELECT last_success_at
             FROM data_ingestion_state
@@ -1763,80 +1823,16 @@ class DataRefreshManager(BaseService):
               AND dataset = :dataset
               AND interval = :interval
         """
-        result = db.execute_query(query, {"symbol": symbol, "dataset": dataset, "interval": interval})
-        if result and result[0].get("last_success_at"):
-            return result[0]["last_success_at"]
-
-        return None
+        result = db.execute_query(query, {"symbol": key[0], "dataset": key[1], "interval": key[2]})
+        last_refresh = result[0].get("last_success_at") if result else None
+        self._refresh_tracking.remember(key, last_refresh)
+        return last_refresh
 
     def _update_refresh_tracking(self, symbol: str, data_type: DataType, status: str = 'success', error: str = None):
-        """Update refresh tracking in database and memory"""
-        # Update in-memory cache
-        if symbol not in self._refresh_tracking:
-            self._refresh_tracking[symbol] = {}
-        self._refresh_tracking[symbol][data_type] = datetime.now()
-
-        dataset = self._dataset_for_data_type(data_type)
-        interval = self._interval_for_data_type(data_type)
-
-        # Update database tracking (single source of truth)
-        try:
-            next_retry_at = None
-            if status != 'success':
-                # Industry standard: staged retry plan for non-transient quality/provider issues
-                # Attempt 1: later same day (6h)
-                # Attempt 2: next day (24h)
-                # Attempt 3+: 48h
-                try:
-                    rc_row = db.execute_query(
-                        """
-                        SELECT retry_count
-                        FROM data_ingestion_state
-                        WHERE symbol = :symbol AND dataset = :dataset AND interval = :interval
-                        """,
-                        {"symbol": symbol, "dataset": dataset, "interval": interval},
-                    )
-                    current_retry_count = int(rc_row[0].get("retry_count") or 0) if rc_row else 0
-                except Exception:
-                    current_retry_count = 0
-
-                if current_retry_count <= 0:
-                    next_retry_at = datetime.utcnow() + timedelta(hours=6)
-                elif current_retry_count == 1:
-                    next_retry_at = datetime.utcnow() + timedelta(hours=24)
-                else:
-                    next_retry_at = datetime.utcnow() + timedelta(hours=48)
-
-            query = """
-                INSERT INTO data_ingestion_state
-                (symbol, dataset, interval, source, cursor_ts, last_attempt_at, last_success_at, status, error_message, retry_count)
-                VALUES (:symbol, :dataset, :interval, :source, :cursor_ts, :last_attempt_at, :last_success_at, :status, :error,
-                        CASE WHEN :status = 'success' THEN 0 ELSE 1 END)
-                ON CONFLICT (symbol, dataset, interval)
-                DO UPDATE SET
-                  source = EXCLUDED.source,
-                  cursor_ts = EXCLUDED.cursor_ts,
-                  last_attempt_at = EXCLUDED.last_attempt_at,
-                  last_success_at = EXCLUDED.last_success_at,
-                  status = EXCLUDED.status,
-                  error_message = EXCLUDED.error_message,
-                  retry_count = CASE WHEN EXCLUDED.status = 'success' THEN 0 ELSE data_ingestion_state.retry_count + 1 END,
-                  updated_at = NOW()
-            """
-
-            db.execute_update(
-                query,
-                {
-                    "symbol": symbol,
-                    "dataset": dataset,
-                    "interval": interval,
-                    "source": self.data_source.name,
-                    "cursor_ts": next_retry_at,
-                    "last_attempt_at": datetime.utcnow(),
-                    "last_success_at": datetime.utcnow() if status == 'success' else None,
-                    "status": status,
-                    "error": error
-                }
-            )
-        except Exception as e:
-            self.logger.error(f"Failed to update refresh tracking for {symbol}: {e}", exc_info=True)
+        """Update refresh tracking in memory; the DB write is flushed per chunk (see tracking_batch)"""
+        self._refresh_tracking.record(
+            self._tracking_key(symbol, data_type),
+            source=self.data_source.name,
+            status=status,
+            error=error,
+        )
@@ -0,0 +1,449 @@
+"""
+Quota-Aware Refresh Planner
+Chooses each cycle's refresh set to minimize priority-weighted staleness within provider budgets
+Performance: daily quotas are paced across the day instead of being exhausted by the first cycles
+"""
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.data_management.refresh_strategy import DataType, PeriodicRefreshStrategy
+from app.database import db
+from app.observability.logging import get_logger
+from app.utils.rate_limiter import get_rate_limiter_call_totals
+
+logger = get_logger("refresh_planner")
+
+# Symbol priorities: what a stale value costs the user
+PRIORITY_HOLDING = 4
+PRIORITY_ALERT = 3
+PRIORITY_WATCHLIST = 2
+PRIORITY_UNIVERSE = 1  # screener-only names
+
+# Provider calls one refresh of a dataset costs (fundamentals fan out to several endpoints)
+DATASET_CALL_COST: Dict[DataType, int] = {
+    DataType.PRICE_CURRENT: 1,
+    DataType.PRICE_INTRADAY_15M: 1,
+    DataType.NEWS: 1,
+    DataType.EARNINGS: 1,
+    DataType.FUNDAMENTALS: 3,
+}
+
+# Provider -> name of its shared RateLimiter (see app.utils.rate_limiter.get_rate_limiter)
+PROVIDER_LIMITERS: Dict[str, str] = {
+    "fmp": "FMP",
+    "alphavantage": "AlphaVantage",
+    "massive": "Massive",
+    "yahoo_finance": "YahooFinance",
+    "finnhub": "Finnhub",
+}
+
+
+def provider_for_source(source_name: str) -> str:
+    """Map a data source name to the provider whose quota it spends ('fmp+fallback' -> 'fmp')"""
+    primary = (source_name or "").split("+")[0]
+    if primary in ("fallback", "yahoo"):
+        return "yahoo_finance"
+    return primary
+
+
+def provider_limits(provider: str) -> Tuple[Optional[float], Optional[int]]:
+    """(calls per minute, calls per day) for a provider; None means unmetered"""
+    if provider == "fmp":
+        return settings.fmp_rate_limit_calls * 60.0 / settings.fmp_rate_limit_window, settings.fmp_daily_quota
+    if provider == "alphavantage":
+        return (
+            settings.alphavantage_rate_limit_calls * 60.0 / settings.alphavantage_rate_limit_window,
+            settings.alphavantage_daily_quota,
+        )
+    if provider == "massive":
+        return settings.massive_rate_limit_calls * 60.0 / settings.massive_rate_limit_window, None
+    return None, None
+
+
+@dataclass
+class ProviderBudget:
+    """One provider's quota position for a cycle"""
+    provider: str
+    per_minute: Optional[float]
+    per_day: Optional[int]
+    used_today: int = 0
+    cycle_budget: Optional[int] = None  # None = unmetered
+    planned: int = 0
+    cycle_planned: int = 0  # calls already planned earlier in the current cycle
+
+    @property
+    def remaining_today(self) -> Optional[int]:
+        return None if self.per_day is None else max(0, self.per_day - self.used_today)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "per_minute": self.per_minute,
+            "per_day": self.per_day,
+            "used_today": self.used_today,
+            "remaining_today": self.remaining_today,
+            "cycle_budget": self.cycle_budget,
+            "planned_calls": self.planned,
+            "cycle_planned_calls": self.cycle_planned,
+            "projected_used_today": self.used_today + self.planned,
+            "projected_burn_pct": (
+                round(100.0 * (self.used_today + self.planned) / self.per_day, 1) if self.per_day else None
+            ),
+        }
+
+
+def compute_cycle_budget(budget: ProviderBudget, now: datetime, cycle_minutes: float, burst_fraction: float) -> Optional[int]:
+    """
+    Calls a provider may spend this cycle
+
+    Daily quotas follow a burn line: by a fraction f of the day, at most
+    per_day * (f + burst_fraction) calls may have been used. The per-minute
+    limit caps each cycle on top of that. Both caps are reduced by what the
+    cycle already planned (those calls may not have reached the ledger yet).
+    """
+    caps: List[float] = []
+    if budget.per_minute:
+        caps.append(max(0.0, budget.per_minute * cycle_minutes - budget.cycle_planned))
+    if budget.per_day:
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        elapsed = (now - midnight).total_seconds() / 86400.0
+        allowed = budget.per_day * min(1.0, elapsed + burst_fraction)
+        caps.append(max(0.0, allowed - budget.used_today - budget.cycle_planned))
+    return int(math.floor(min(caps))) if caps else None
+
+
+def seconds_until_daily_room(budget: ProviderBudget, now: datetime, burst_fraction: float, cost: int = 1) -> float:
+    """
+    Seconds until the daily burn line allows cost more calls on top of what is used and planned
+
+    0 when there is room now (or the provider has no daily quota); the next
+    midnight when today's quota is spent.
+    """
+    if not budget.per_day:
+        return 0.0
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    needed = budget.used_today + budget.cycle_planned + budget.planned + cost
+    fraction = needed / budget.per_day - burst_fraction
+    if fraction > 1.0:
+        return (midnight + timedelta(days=1) - now).total_seconds()
+    return max(0.0, fraction * 86400.0 - (now - midnight).total_seconds())
+
+
+@dataclass(frozen=True)
+class PlannedRefresh:
+    symbol: str
+    data_type: DataType
+    provider: str
+    cost: int
+    priority: int
+    staleness: float  # intervals overdue (capped)
+    score: float  # priority x dataset weight x staleness
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "data_type": self.data_type.value,
+            "provider": self.provider,
+            "cost": self.cost,
+            "priority": self.priority,
+            "staleness": round(self.staleness, 2),
+            "score": round(self.score, 2),
+        }
+
+
+@dataclass
+class RefreshPlan:
+    """The refresh set for one cycle plus what was deferred to later cycles"""
+    created_at: datetime
+    cycle_minutes: float
+    items: List[PlannedRefresh] = field(default_factory=list)
+    deferred: List[PlannedRefresh] = field(default_factory=list)
+    budgets: Dict[str, ProviderBudget] = field(default_factory=dict)
+    retry_after_seconds: float = 0.0  # when deferred refreshes can next fit a budget
+
+    def by_data_type(self) -> Dict[DataType, List[str]]:
+        grouped: Dict[DataType, List[str]] = {}
+        for item in self.items:
+            grouped.setdefault(item.data_type, []).append(item.symbol)
+        return grouped
+
+    @property
+    def planned_score(self) -> float:
+        return sum(i.score for i in self.items)
+
+    @property
+    def deferred_score(self) -> float:
+        return sum(i.score for i in self.deferred)
+
+    def to_dict(self, max_items: int = 100) -> Dict[str, Any]:
+        return {
+            "created_at": self.created_at.isoformat(),
+            "cycle_minutes": self.cycle_minutes,
+            "planned": len(self.items),
+            "deferred": len(self.deferred),
+            "retry_after_seconds": round(self.retry_after_seconds, 1),
+            "planned_staleness_score": round(self.planned_score, 2),
+            "deferred_staleness_score": round(self.deferred_score, 2),
+            "budgets": {name: b.to_dict() for name, b in self.budgets.items()},
+            "items": [i.to_dict() for i in self.items[:max_items]],
+            "top_deferred": [i.to_dict() for i in self.deferred[:max_items]],
+        }
+
+
+class QuotaLedger:
+    """
+    Daily provider call counts in provider_quota_usage
+
+    Counts come from the shared rate limiters, so every call a process makes
+    (planned refreshes, on-demand API refreshes, loaders) is charged. Each
+    process adds its own delta, so the worker and the API see one total.
+    """
+
+    def __init__(self):
+        self._reported: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def sync(self, today: date) -> int:
+        """Write calls made since the last sync; returns calls written"""
+        totals = get_rate_limiter_call_totals()
+        deltas: List[Tuple[str, str, int]] = []
+        with self._lock:
+            for provider, limiter_name in PROVIDER_LIMITERS.items():
+                delta = totals.get(limiter_name, 0) - self._reported.get(limiter_name, 0)
+                if delta > 0:
+                    deltas.append((provider, limiter_name, delta))
+                    self._reported[limiter_name] = totals[limiter_name]
+        if not deltas:
+            return 0
+
+        values: List[str] = []
+        params: Dict[str, Any] = {"usage_date": today}
+        for i, (provider, _, delta) in enumerate(deltas):
+            values.append(f"(:provider_{i}, :usage_date, :calls_{i}, NOW())")
+            params[f"provider_{i}"] = provider
+            params[f"calls_{i}"] = delta
+        try:
+            db.execute_update(
+                f"""
+                INSERT INTO provider_quota_usage (provider, usage_date, calls, updated_at)
+                VALUES {", ".join(values)}
+                ON CONFLICT (provider, usage_date) DO UPDATE SET
+                    calls = provider_quota_usage.calls + EXCLUDED.calls,
+                    updated_at = NOW()
+                """,
+                params,
+            )
+        except Exception as e:
+            # Un-report so the calls are written on the next sync
+            with self._lock:
+                for _, limiter_name, delta in deltas:
+                    self._reported[limiter_name] -= delta
+            logger.warning(f"Quota usage sync failed: {e}")
+            return 0
+        return sum(d for _, _, d in deltas)
+
+    def used_today(self, providers: Iterable[str], today: date) -> Dict[str, int]:
+        providers = list(providers)
+        used = {p: 0 for p in providers}
+        try:
+            rows = db.execute_query(
+                """
+                SELECT provider, calls
+                FROM provider_quota_usage
+                WHERE usage_date = :usage_date
+                  AND provider = ANY(:providers)
+                """,
+                {"usage_date": today, "providers": providers},
+            )
+        except Exception as e:
+            logger.warning(f"Quota usage lookup failed, assuming none used: {e}")
+            return used
+        for row in rows or []:
+            used[row["provider"]] = int(row.get("calls") or 0)
+        return used
+
+
+# Process-wide ledger: the sync delta must be tracked once per process
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """Get global quota ledger instance"""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = QuotaLedger()
+    return _ledger
+
+
+def load_symbol_priorities(include_universe: bool = True) -> Dict[str, int]:
+    """Symbol -> priority (holdings > alerts > watchlists > screener universe)"""
+    sources = [
+        (PRIORITY_HOLDING, "SELECT DISTINCT stock_symbol AS symbol FROM holdings"),
+        (PRIORITY_ALERT, "SELECT DISTINCT stock_symbol AS symbol FROM alerts WHERE enabled AND stock_symbol IS NOT NULL"),
+        (PRIORITY_ALERT, "SELECT DISTINCT stock_symbol AS symbol FROM watchlist_alerts WHERE enabled AND stock_symbol IS NOT NULL"),
+        (PRIORITY_WATCHLIST, "SELECT DISTINCT stock_symbol AS symbol FROM watchlist_items"),
+    ]
+    if include_universe:
+        sources.append((PRIORITY_UNIVERSE, "SELECT symbol FROM stocks WHERE is_active = true"))
+
+    priorities: Dict[str, int] = {}
+    for priority, query in sources:
+        try:
+            rows = db.execute_query(query)
+        except Exception as e:
+            logger.debug(f"Skipping symbol source ({e})")
+            continue
+        for row in rows or []:
+            symbol = (row.get("symbol") or "").strip().upper()
+            if symbol and priorities.get(symbol, 0) < priority:
+                priorities[symbol] = priority
+    return priorities
+
+
+class RefreshPlanner:
+    """
+    Picks the refresh set that removes the most weighted staleness per provider call
+
+    - Candidates are (symbol, dataset) pairs at least one refresh interval overdue
+    - Value = symbol priority x dataset weight x intervals overdue (capped);
+      never-refreshed pairs count as max_staleness
+    - Budget = the provider's paced cycle budget (see compute_cycle_budget), shared
+      by every select() within one cycle_minutes window
+    - Candidates are taken in value-per-call order (greedy knapsack), skipping any
+      that no longer fit, until the budget or max_items is reached
+    """
+
+    def __init__(
+        self,
+        refresh_manager,
+        intervals: Optional[Dict[DataType, timedelta]] = None,
+        ledger: Optional[QuotaLedger] = None,
+        cycle_minutes: Optional[float] = None,
+        max_items: Optional[int] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.refresh_manager = refresh_manager
+        self.strategy = PeriodicRefreshStrategy(intervals)
+        self.ledger = ledger or get_quota_ledger()
+        self.cycle_minutes = cycle_minutes or settings.refresh_planner_cycle_minutes
+        self.max_items = max_items or settings.refresh_planner_max_items
+        self.max_staleness = settings.refresh_planner_max_staleness
+        self._clock = clock
+        self.last_plan: Optional[RefreshPlan] = None
+        self._cycle_started_at: Optional[datetime] = None
+        self._cycle_planned = 0
+
+    @property
+    def provider(self) -> str:
+        return provider_for_source(self.refresh_manager.data_source.name)
+
+    def plan(
+        self,
+        symbol_priorities: Optional[Dict[str, int]] = None,
+        data_types: Optional[Iterable[DataType]] = None,
+        dry_run: bool = False,
+    ) -> RefreshPlan:
+        """
+        Plan a cycle from scratch: load priorities and refresh state, then select
+
+        Args:
+            dry_run: Read-only preview (see select())
+        """
+        now = self._clock()  # naive local time, like the refresh strategies
+        if symbol_priorities is None:
+            symbol_priorities = load_symbol_priorities(settings.refresh_planner_include_universe)
+        data_types = list(data_types or self.strategy.intervals)
+
+        last_refresh = self.refresh_manager.last_refresh_times(list(symbol_priorities), data_types)
+        candidates: List[PlannedRefresh] = []
+        for symbol, priority in symbol_priorities.items():
+            for data_type in data_types:
+                staleness = self._staleness(now, last_refresh.get((symbol, data_type)), data_type)
+                if staleness >= 1.0:
+                    candidates.append(self.candidate(symbol, data_type, priority, staleness))
+        return self.select(candidates, now, dry_run=dry_run)
+
+    def candidate(self, symbol: str, data_type: DataType, priority: int, staleness: float) -> PlannedRefresh:
+        """Score one (symbol, dataset) refresh"""
+        staleness = min(self.max_staleness, staleness)
+        return PlannedRefresh(
+            symbol=symbol,
+            data_type=data_type,
+            provider=self.provider,
+            cost=DATASET_CALL_COST.get(data_type, 1),
+            priority=priority,
+            staleness=staleness,
+            score=priority * self.strategy.get_priority(data_type) * staleness,
+        )
+
+    def select(self, candidates: List[PlannedRefresh], now: Optional[datetime] = None, dry_run: bool = False) -> RefreshPlan:
+        """
+        Greedy value-per-call selection of candidates under this cycle's provider budget
+
+        Args:
+            dry_run: Do not sync quota usage to the ledger or charge the plan to
+                the current cycle (admin previews)
+        """
+        now = now or self._clock()
+        provider = self.provider
+        if not dry_run:
+            self.ledger.sync(now.date())
+        per_minute, per_day = provider_limits(provider)
+        started = self._cycle_started_at
+        in_cycle = started is not None and started <= now < started + timedelta(minutes=self.cycle_minutes)
+        cycle_started_at = started if in_cycle else now
+        budget = ProviderBudget(
+            provider=provider,
+            per_minute=per_minute,
+            per_day=per_day,
+            used_today=self.ledger.used_today([provider], now.date()).get(provider, 0),
+            cycle_planned=self._cycle_planned if in_cycle else 0,
+        )
+        budget.cycle_budget = compute_cycle_budget(budget, now, self.cycle_minutes, settings.refresh_quota_burst_fraction)
+
+        plan = RefreshPlan(created_at=now, cycle_minutes=self.cycle_minutes, budgets={provider: budget})
+        remaining = budget.cycle_budget
+        for candidate in sorted(candidates, key=lambda c: (c.score / c.cost, c.score), reverse=True):
+            fits = remaining is None or candidate.cost <= remaining
+            if fits and len(plan.items) < self.max_items:
+                plan.items.append(candidate)
+                budget.planned += candidate.cost
+                if remaining is not None:
+                    remaining -= candidate.cost
+            else:
+                plan.deferred.append(candidate)
+
+        if plan.deferred:
+            # Deferred work waits for the next cycle, or longer while the daily burn line is spent
+            cycle_end = cycle_started_at + timedelta(minutes=self.cycle_minutes)
+            plan.retry_after_seconds = max(
+                (cycle_end - now).total_seconds(),
+                seconds_until_daily_room(
+                    budget, now, settings.refresh_quota_burst_fraction,
+                    cost=min(item.cost for item in plan.deferred),
+                ),
+            )
+        if not dry_run:
+            self._cycle_started_at = cycle_started_at
+            self._cycle_planned = budget.cycle_planned + budget.planned
+            self.last_plan = plan
+        return plan
+
+    def _staleness(self, now: datetime, last: Optional[datetime], data_type: DataType) -> float:
+        if last is None:
+            return self.max_staleness
+        if last.tzinfo is not None:
+            last = last.astimezone().replace(tzinfo=None)
+        interval = self.strategy.get_refresh_interval(data_type).total_seconds()
+        if interval <= 0:
+            return self.max_staleness
+        return min(self.max_staleness, (now - last).total_seconds() / interval)
@@ -0,0 +1,237 @@
+"""
+Refresh Tracking Store
+Bounded in-memory view of data_ingestion_state for a refresh cycle
+Performance: one preload query per cycle, one batched upsert per chunk
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.database import db
+from app.observability.logging import get_logger
+
+logger = get_logger("refresh_tracking")
+
+TrackingKey = Tuple[str, str, str]  # (symbol, dataset, interval)
+
+# Rows per multi-row upsert statement (10 bind params per row)
+UPSERT_BATCH_ROWS = 500
+
+# Staged retry plan for failed datasets, indexed by the retry_count before the failure
+RETRY_DELAYS = (timedelta(hours=6), timedelta(hours=24), timedelta(hours=48))
+
+
+def retry_delay(previous_retry_count: int) -> timedelta:
+    """
+    Delay before the next attempt after a failure
+
+    Attempt 1: later same day (6h), attempt 2: next day (24h), attempt 3+: 48h
+    """
+    return RETRY_DELAYS[min(max(previous_retry_count, 0), len(RETRY_DELAYS) - 1)]
+
+
+@dataclass
+class PendingUpdate:
+    """A tracking update waiting for the next flush (one per key, latest wins)"""
+    source: str
+    status: str
+    error: Optional[str]
+    attempted_at: datetime
+    failures: int  # consecutive failures recorded since the last success in this buffer
+
+
+class RefreshTrackingStore:
+    """
+    Cache of last-success timestamps plus a write-behind buffer for tracking updates
+
+    - preload(): loads every (symbol, dataset, interval) for a cycle in one query;
+      keys with no row are cached as "never refreshed" so they don't hit the DB again
+    - record(): updates memory immediately and buffers the DB write
+    - flush(): writes all buffered updates as multi-row upserts; retry_count and the
+      next-retry cursor are computed in SQL, so no per-key SELECT is needed
+    - Memory is bounded by max_entries (least recently used keys are evicted)
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._last_refresh: "OrderedDict[TrackingKey, Optional[datetime]]" = OrderedDict()
+        self._pending: Dict[TrackingKey, PendingUpdate] = {}
+
+    def lookup(self, key: TrackingKey) -> Tuple[bool, Optional[datetime]]:
+        """Return (known, last_refresh); known=False means the caller must query the DB"""
+        with self._lock:
+            if key not in self._last_refresh:
+                return False, None
+            self._last_refresh.move_to_end(key)
+            return True, self._last_refresh[key]
+
+    def remember(self, key: TrackingKey, last_refresh: Optional[datetime]) -> None:
+        """Cache a last-refresh value loaded by the caller"""
+        with self._lock:
+            self._put(key, last_refresh)
+
+    def preload(self, keys: Iterable[TrackingKey], only_missing: bool = False) -> int:
+        """
+        Load last_success_at for many keys in a single query
+
+        Args:
+            keys: (symbol, dataset, interval) tuples for the cycle
+            only_missing: Skip the query for keys already held in memory
+
+        Returns:
+            Number of keys loaded
+        """
+        wanted = set(keys)
+        if only_missing:
+            with self._lock:
+                wanted = {k for k in wanted if k not in self._last_refresh}
+        if not wanted:
+            return 0
+
+        symbols = sorted({k[0] for k in wanted})
+        datasets = sorted({k[1] for k in wanted})
+        intervals = sorted({k[2] for k in wanted})
+        rows = db.execute_query(
+            """
+            SELECT symbol, dataset, interval, last_success_at
+            FROM data_ingestion_state
+            WHERE symbol = ANY(:symbols)
+              AND dataset = ANY(:datasets)
+              AND interval = ANY(:intervals)
+            """,
+            {"symbols": symbols, "datasets": datasets, "intervals": intervals},
+        )
+
+        loaded: Dict[TrackingKey, Optional[datetime]] = {k: None for k in wanted}
+        for row in rows or []:
+            key = (row.get("symbol"), row.get("dataset"), row.get("interval"))
+            if key in loaded:
+                loaded[key] = row.get("last_success_at")
+
+        with self._lock:
+            for key, value in loaded.items():
+                # An unflushed local update is newer than what the DB holds
+                if key in self._pending and key in self._last_refresh:
+                    continue
+                self._put(key, value)
+        return len(loaded)
+
+    def record(self, key: TrackingKey, source: str, status: str, error: Optional[str] = None) -> None:
+        """Record a refresh attempt in memory and buffer its DB write"""
+        with self._lock:
+            self._put(key, datetime.now())
+            previous = self._pending.get(key)
+            if status == "success":
+                failures = 0
+            else:
+                failures = (previous.failures if previous else 0) + 1
+            self._pending[key] = PendingUpdate(
+                source=source,
+                status=status,
+                error=error,
+                attempted_at=datetime.utcnow(),
+                failures=failures,
+            )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write buffered updates to data_ingestion_state
+
+        Returns:
+            Number of keys written (0 if nothing was pending or the write failed)
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending = list(self._pending.items())
+            self._pending.clear()
+
+        written = 0
+        for start in range(0, len(pending), UPSERT_BATCH_ROWS):
+            batch = pending[start:start + UPSERT_BATCH_ROWS]
+            try:
+                query, params = self._build_upsert(batch)
+                db.execute_update(query, params)
+                written += len(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} refresh tracking updates: {e}", exc_info=True)
+        return written
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._last_refresh),
+                "max_entries": self.max_entries,
+                "pending": len(self._pending),
+            }
+
+    # --- internals ---
+
+    def _put(self, key: TrackingKey, value: Optional[datetime]) -> None:
+        """Insert/refresh an entry and evict LRU entries (caller holds lock)"""
+        self._last_refresh[key] = value
+        self._last_refresh.move_to_end(key)
+        while len(self._last_refresh) > self.max_entries:
+            self._last_refresh.popitem(last=False)
+
+    @staticmethod
+    def _build_upsert(batch: List[Tuple[TrackingKey, PendingUpdate]]) -> Tuple[str, Dict[str, object]]:
+        """
+        Build one multi-row upsert for a batch of pending updates
+
+        On conflict, retry_count accumulates the buffered failures (reset on success),
+        and cursor_ts is the next-retry time derived from the stored retry_count.
+        """
+        values: List[str] = []
+        params: Dict[str, object] = {}
+        for i, ((symbol, dataset, interval), update) in enumerate(batch):
+            success = update.status == "success"
+            values.append(
+                f"(:symbol_{i}, :dataset_{i}, :interval_{i}, :source_{i}, :cursor_ts_{i}, "
+                f":last_attempt_at_{i}, :last_success_at_{i}, :status_{i}, :error_{i}, :retry_count_{i})"
+            )
+            params.update({
+                f"symbol_{i}": symbol,
+                f"dataset_{i}": dataset,
+                f"interval_{i}": interval,
+                f"source_{i}": update.source,
+                # New rows: the retry plan starts from the failures buffered in this chunk
+                f"cursor_ts_{i}": None if success else update.attempted_at + retry_delay(update.failures - 1),
+                f"last_attempt_at_{i}": update.attempted_at,
+                f"last_success_at_{i}": update.attempted_at if success else None,
+                f"status_{i}": update.status,
+                f"error_{i}": update.error,
+                f"retry_count_{i}": 0 if success else update.failures,
+            })
+
+        query = f"""
+            INSERT INTO data_ingestion_state
+            (symbol, dataset, interval, source, cursor_ts, last_attempt_at, last_success_at, status, error_message, retry_count)
+            VALUES {", ".join(values)}
+            ON CONFLICT (symbol, dataset, interval)
+            DO UPDATE SET
+              source = EXCLUDED.source,
+              cursor_ts = CASE
+                WHEN EXCLUDED.status = 'success' THEN NULL
+                WHEN data_ingestion_state.retry_count + EXCLUDED.retry_count - 1 <= 0
+                  THEN EXCLUDED.last_attempt_at + INTERVAL '6 hours'
+                WHEN data_ingestion_state.retry_count + EXCLUDED.retry_count - 1 = 1
+                  THEN EXCLUDED.last_attempt_at + INTERVAL '24 hours'
+                ELSE EXCLUDED.last_attempt_at + INTERVAL '48 hours'
+              END,
+              last_attempt_at = EXCLUDED.last_attempt_at,
+              last_success_at = EXCLUDED.last_success_at,
+              status = EXCLUDED.status,
+              error_message = EXCLUDED.error_message,
+              retry_count = CASE WHEN EXCLUDED.status = 'success' THEN 0
+                                 ELSE data_ingestion_state.retry_count + EXCLUDED.retry_count END,
+              updated_at = NOW()
+        """
+        return query, params
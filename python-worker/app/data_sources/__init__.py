@@ -2,11 +2,16 @@
 Data source implementations
 Supports multiple data providers with Strategy Pattern and Plugin System
 """
-from typing import Optional
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
 from app.data_sources.base import BaseDataSource
 from app.data_sources.yahoo_finance_source import YahooFinanceSource
 from app.data_sources.financial_modeling_prep_source import FinancialModelingPrepSource
 from app.data_sources.fallback_source import FallbackDataSource
+from app.data_sources.cassette_source import CassetteDataSource
 from app.config import settings
 from app.plugins import get_plugin_registry as get_registry
 from app.plugins.base import PluginType
@@ -41,6 +46,7 @@ DATA_SOURCES = {
     "yahoo_finance": YahooFinanceSource,
     "fmp": FinancialModelingPrepSource,
     "fallback": FallbackDataSource,  # Fallback source with Yahoo Finance + Finnhub
+    "cassette": CassetteDataSource,  # Record/replay wrapper (CASSETTE_* settings)
 }
 
 # Add Massive.com if available
@@ -152,10 +158,58 @@ if PRIMARY_DATA_SOURCE and not _is_source_available(PRIMARY_DATA_SOURCE):
 DEFAULT_DATA_SOURCE = PRIMARY_DATA_SOURCE
 
 
+# Process-wide source instances keyed by (name, use_fallback, config hash)
+_source_registry: Dict[Tuple[str, bool, str], BaseDataSource] = {}
+# Re-entrant: building a composite source resolves its fallback through get_data_source()
+_source_registry_lock = threading.RLock()
+
+
+def _adapter_config(name: str) -> Dict[str, Any]:
+    """Adapter configuration for a source name (from settings)"""
+    if name == "fmp":
+        return {
+            "api_key": settings.fmp_api_key,
+            "base_url": settings.fmp_base_url,
+            "timeout": settings.fmp_timeout,
+            "max_retries": settings.fmp_max_retries,
+            "retry_delay": settings.fmp_retry_delay,
+            "rate_limit_calls": settings.fmp_rate_limit_calls,
+            "rate_limit_window": settings.fmp_rate_limit_window
+        }
+    if name == "massive":
+        return {
+            "api_key": settings.massive_api_key,
+            "rate_limit_calls": settings.massive_rate_limit_calls,
+            "rate_limit_window": settings.massive_rate_limit_window
+        }
+    if name == "yahoo_finance":
+        return {
+            "timeout": getattr(settings, 'yahoo_finance_timeout', 30),
+            "retry_count": getattr(settings, 'yahoo_finance_retry_count', 3)
+        }
+    if name == "fallback":
+        return {
+            "cache_enabled": getattr(settings, 'fallback_cache_enabled', True),
+            "cache_ttl": getattr(settings, 'fallback_cache_ttl', 3600),
+            "primary_source": getattr(settings, 'fallback_primary_source', 'yahoo_finance')
+        }
+    return {}
+
+
+def _config_hash(name: str, use_fallback: bool) -> str:
+    config: Dict[str, Any] = {"source": _adapter_config(name)}
+    if use_fallback and name == PRIMARY_DATA_SOURCE and FALLBACK_DATA_SOURCE:
+        config["fallback"] = [FALLBACK_DATA_SOURCE, _adapter_config(FALLBACK_DATA_SOURCE)]
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
 def get_data_source(name: str = None, use_fallback: bool = True) -> BaseDataSource:
     """
-    Factory function to get a data source instance using new adapter architecture
+    Get the shared data source instance using new adapter architecture
     Industry Standard: Returns primary source, with automatic fallback capability
+    Performance: One instance per (name, use_fallback, config) for the whole process,
+    so every caller shares the provider's HTTP pool, rate limiter and caches
     
     Args:
         name: Name of data source (defaults to PRIMARY_DATA_SOURCE from config)
@@ -168,44 +222,52 @@ def get_data_source(name: str = None, use_fallback: bool = True) -> BaseDataSour
     if name is None:
         name = PRIMARY_DATA_SOURCE
     
+    key = (name, bool(use_fallback), _config_hash(name, use_fallback))
+    source = _source_registry.get(key)
+    if source is not None:
+        return source
+    
+    with _source_registry_lock:
+        source = _source_registry.get(key)
+        if source is None:
+            source = _build_data_source(name, use_fallback)
+            _source_registry[key] = source
+    return source
+
+
+def reset_data_sources() -> None:
+    """Drop shared source instances (tests, config reloads); new ones are built on next use"""
+    with _source_registry_lock:
+        _source_registry.clear()
+
+
+def get_data_source_registry_stats() -> Dict[str, Any]:
+    """Shared source instances, HTTP pools and rate limiters (for /system/metrics)"""
+    from app.utils.http_session import get_http_session_stats
+    from app.utils.rate_limiter import get_rate_limiter_stats
+    
+    with _source_registry_lock:
+        instances = [
+            {"name": name, "use_fallback": use_fallback, "type": type(source).__name__}
+            for (name, use_fallback, _), source in _source_registry.items()
+        ]
+    return {
+        "instances": instances,
+        "http_sessions": get_http_session_stats(),
+        "rate_limiters": get_rate_limiter_stats(),
+    }
+
+
+def _build_data_source(name: str, use_fallback: bool) -> BaseDataSource:
+    """Build a new data source instance (adapter first, then legacy sources)"""
     # Try new adapter factory first
     try:
         from app.data_sources.adapters import create_adapter
-        from app.config import settings
         from app.data_sources.composite_source import CompositeDataSource
         
         adapter = create_adapter(name)
         if adapter:
-            # Prepare configuration based on adapter type
-            config = {}
-            
-            if name == "fmp":
-                config = {
-                    "api_key": settings.fmp_api_key,
-                    "base_url": settings.fmp_base_url,
-                    "timeout": settings.fmp_timeout,
-                    "max_retries": settings.fmp_max_retries,
-                    "retry_delay": settings.fmp_retry_delay,
-                    "rate_limit_calls": settings.fmp_rate_limit_calls,
-                    "rate_limit_window": settings.fmp_rate_limit_window
-                }
-            elif name == "massive":
-                config = {
-                    "api_key": settings.massive_api_key,
-                    "rate_limit_calls": settings.massive_rate_limit_calls,
-                    "rate_limit_window": settings.massive_rate_limit_window
-                }
-            elif name == "yahoo_finance":
-                config = {
-                    "timeout": getattr(settings, 'yahoo_finance_timeout', 30),
-                    "retry_count": getattr(settings, 'yahoo_finance_retry_count', 3)
-                }
-            elif name == "fallback":
-                config = {
-                    "cache_enabled": getattr(settings, 'fallback_cache_enabled', True),
-                    "cache_ttl": getattr(settings, 'fallback_cache_ttl', 3600),
-                    "primary_source": getattr(settings, 'fallback_primary_source', 'yahoo_finance')
-                }
+            config = _adapter_config(name)
             
             # Initialize adapter with proper configuration
             adapter.initialize(config)
@@ -11,7 +11,9 @@ from .base_adapter import (
     AdapterError,
     AdapterInitializationError,
     AdapterUnavailableError,
-    PerformanceMetrics
+    PerformanceMetrics,
+    coalesced,
+    get_adapter_singleflight
 )
 
 # Specific adapter implementations
@@ -40,6 +42,8 @@ __all__ = [
     "AdapterInitializationError", 
     "AdapterUnavailableError",
     "PerformanceMetrics",
+    "coalesced",
+    "get_adapter_singleflight",
     
     # Adapter implementations
     "YahooFinanceAdapter",
@@ -7,6 +7,7 @@ Performance: Lazy loading, caching, connection pooling
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Union, Callable
 from functools import wraps
+import asyncio
 import time
 from datetime import datetime
 
@@ -14,6 +15,8 @@ from app.plugins.base import DataSourcePlugin, PluginMetadata, PluginType
 from app.observability.logging import get_logger
 from app.observability.metrics import get_metrics
 from app.observability.tracing import trace_function
+from app.utils.response_cache import make_cache_key
+from app.utils.single_flight import SingleFlight
 
 
 class AdapterError(Exception):
@@ -81,6 +84,39 @@ class PerformanceMetrics:
         return decorator
 
 
+# Process-wide: adapters are created per get_data_source() call, so the flight must outlive instances
+_adapter_flight = SingleFlight("adapter_singleflight")
+
+
+def get_adapter_singleflight() -> SingleFlight:
+    """Get the shared single-flight group for adapter calls (coalescing counters via get_stats())"""
+    return _adapter_flight
+
+
+def coalesced(func: Callable) -> Callable:
+    """
+    Decorator: concurrent callers with the same (provider, method, args) key
+    wait on one in-flight provider request and share its result
+    """
+    if getattr(func, "__coalesced__", False):
+        return func
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        from app.config import settings
+        if not settings.provider_singleflight_enabled:
+            return func(self, *args, **kwargs)
+        key = make_cache_key(self._adapter_name, func.__name__, args, kwargs)
+        return _adapter_flight.do(
+            key,
+            lambda: func(self, *args, **kwargs),
+            labels={"adapter": self._adapter_name, "method": func.__name__},
+        )
+
+    wrapper.__coalesced__ = True
+    return wrapper
+
+
 class BaseDataSourceAdapter(DataSourcePlugin):
     """
     SOLID: Single responsibility for adapter lifecycle management
@@ -97,6 +133,13 @@ class BaseDataSourceAdapter(DataSourcePlugin):
         self._metrics = PerformanceMetrics(adapter_name)
         self._logger = get_logger(f"adapter.{adapter_name}")
     
+    def __init_subclass__(cls, **kwargs):
+        """Route every fetch_* method a subclass defines through the single-flight layer"""
+        super().__init_subclass__(**kwargs)
+        for attr_name, attr in list(vars(cls).items()):
+            if attr_name.startswith("fetch_") and callable(attr):
+                setattr(cls, attr_name, coalesced(attr))
+    
     @property
     def name(self) -> str:
         """Get adapter name for compatibility"""
@@ -242,6 +285,7 @@ class BaseDataSourceAdapter(DataSourcePlugin):
     
     # Performance-tracked data methods
     @trace_function("adapter_fetch_price_data")
+    @coalesced
     def fetch_price_data(self, symbol: str, **kwargs):
         """Fetch price data with performance tracking"""
         if not self._initialized:
@@ -250,6 +294,7 @@ class BaseDataSourceAdapter(DataSourcePlugin):
         return self.source.fetch_price_data(symbol, **kwargs)
     
     @trace_function("adapter_fetch_current_price")
+    @coalesced
     def fetch_current_price(self, symbol: str):
         """Fetch current price with performance tracking"""
         if not self._initialized:
@@ -258,6 +303,7 @@ class BaseDataSourceAdapter(DataSourcePlugin):
         return self.source.fetch_current_price(symbol)
     
     @trace_function("adapter_fetch_fundamentals")
+    @coalesced
     def fetch_fundamentals(self, symbol: str):
         """Fetch fundamentals with performance tracking"""
         if not self._initialized:
@@ -266,6 +312,7 @@ class BaseDataSourceAdapter(DataSourcePlugin):
         return self.source.fetch_fundamentals(symbol)
     
     @trace_function("adapter_fetch_news")
+    @coalesced
     def fetch_news(self, symbol: str, limit: int = 10):
         """Fetch news with performance tracking"""
         if not self._initialized:
@@ -274,6 +321,7 @@ class BaseDataSourceAdapter(DataSourcePlugin):
         return self.source.fetch_news(symbol, limit)
     
     @trace_function("adapter_fetch_earnings")
+    @coalesced
     def fetch_earnings(self, symbol: str):
         """Fetch earnings with performance tracking"""
         if not self._initialized:
@@ -282,9 +330,24 @@ class BaseDataSourceAdapter(DataSourcePlugin):
         return self.source.fetch_earnings(symbol)
     
     @trace_function("adapter_fetch_industry_peers")
+    @coalesced
     def fetch_industry_peers(self, symbol: str):
         """Fetch industry peers with performance tracking"""
         if not self._initialized:
             raise AdapterError("Adapter not initialized")
         
         return self.source.fetch_industry_peers(symbol)
+    
+    async def fetch_async(self, method_name: str, *args, **kwargs):
+        """
+        Call a fetch_* method from asyncio code without blocking the event loop
+        Coroutines on the same loop share one worker-thread call, which in turn
+        coalesces with concurrent thread callers for the same key.
+        """
+        method = getattr(self, method_name)
+        key = make_cache_key(self._adapter_name, method_name, args, kwargs)
+        return await _adapter_flight.do_async(
+            key,
+            lambda: asyncio.to_thread(method, *args, **kwargs),
+            labels={"adapter": self._adapter_name, "method": method_name},
+        )
@@ -10,7 +10,18 @@ from datetime import datetime
 from app.data_sources.base import BaseDataSource
 from app.plugins.base import PluginMetadata, PluginType
 from app.observability.tracing import trace_function
-from .base_adapter import BaseDataSourceAdapter, AdapterInitializationError
+from app.utils.response_cache import get_response_cache, make_cache_key
+from .base_adapter import BaseDataSourceAdapter, AdapterError, AdapterInitializationError
+
+# Response cache dataset per fallback method (drives the TTL)
+_METHOD_DATASETS = {
+    "fetch_price_data": "price_data",
+    "fetch_current_price": "quote",
+    "fetch_fundamentals": "fundamentals",
+    "fetch_news": "news",
+    "fetch_earnings": "earnings",
+    "fetch_industry_peers": "industry_peers",
+}
 
 
 class FallbackAdapter(BaseDataSourceAdapter):
@@ -114,14 +125,7 @@ class FallbackAdapter(BaseDataSourceAdapter):
         if not self._initialized:
             raise AdapterError("Adapter not initialized")
         
-        # Try cache first if enabled
-        if self._cache_enabled:
-            cached_data = self._get_cached_data(f"price_data_{symbol}")
-            if cached_data:
-                self._logger.debug(f"Returning cached price data for {symbol}")
-                return cached_data
-        
-        # Try dependencies in order
+        # Cache first, then dependencies in order
         return self._try_dependencies("fetch_price_data", symbol, **kwargs)
     
     @trace_function("fallback_fetch_current_price")
@@ -130,20 +134,19 @@ class FallbackAdapter(BaseDataSourceAdapter):
         if not self._initialized:
             raise AdapterError("Adapter not initialized")
         
-        # Try cache first
-        if self._cache_enabled:
-            cached_price = self._get_cached_data(f"current_price_{symbol}")
-            if cached_price is not None:
-                self._logger.debug(f"Returning cached current price for {symbol}")
-                return cached_price
-        
-        # Try dependencies
+        # Cache first, then dependencies
         return self._try_dependencies("fetch_current_price", symbol)
     
     def _try_dependencies(self, method_name: str, *args, **kwargs):
-        """Try dependencies in order of preference"""
+        """Try cache, then dependencies in order of preference"""
         from app.data_sources.adapters import create_adapter
         
+        if self._cache_enabled:
+            cached = self._get_cached_data(method_name, *args, **kwargs)
+            if cached is not None:
+                self._logger.debug(f"Returning cached {method_name} result")
+                return cached
+        
         for dep in self._dependencies:
             adapter = create_adapter(dep)
             if adapter and adapter.is_available():
@@ -153,8 +156,7 @@ class FallbackAdapter(BaseDataSourceAdapter):
                     
                     # Cache successful result
                     if self._cache_enabled and result is not None:
-                        cache_key = f"{method_name}_{args[0] if args else 'unknown'}"
-                        self._cache_data(cache_key, result)
+                        self._cache_data(result, method_name, *args, **kwargs)
                     
                     self._logger.debug(f"Fallback to {dep} succeeded for {method_name}")
                     return result
@@ -166,16 +168,17 @@ class FallbackAdapter(BaseDataSourceAdapter):
         self._logger.error(f"All fallback sources failed for {method_name}")
         return None
     
-    def _get_cached_data(self, key: str):
-        """Get cached data - implementation would depend on cache system"""
-        # This would integrate with your caching system
-        # For now, return None to indicate no cache
-        return None
+    def _get_cached_data(self, method_name: str, *args, **kwargs):
+        """Get cached result of a fallback call from the shared response cache (None on miss)"""
+        key = make_cache_key(self._adapter_name, method_name, args, kwargs)
+        return get_response_cache().get(_METHOD_DATASETS.get(method_name, "price_data"), key)
     
-    def _cache_data(self, key: str, data):
-        """Cache data - implementation would depend on cache system"""
-        # This would integrate with your caching system
-        pass
+    def _cache_data(self, data, method_name: str, *args, **kwargs):
+        """Cache a fallback result; TTL is the dataset TTL capped by the configured cache_ttl"""
+        cache = get_response_cache()
+        dataset = _METHOD_DATASETS.get(method_name, "price_data")
+        key = make_cache_key(self._adapter_name, method_name, args, kwargs)
+        cache.set(dataset, key, data, ttl=min(cache.ttl_for(dataset), self._cache_ttl))
     
     # Implement other required methods with fallback strategy
     def fetch_fundamentals(self, symbol: str):
@@ -0,0 +1,111 @@
+"""
+Cassette Data Source
+Records real provider responses to compressed files and replays them offline
+Performance: deterministic, network-free ingestion runs for benchmarking and regression checks
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from app.data_sources.base import BaseDataSource
+from app.providers.cassette.client import (
+    CassetteClient,
+    CassetteMissError,
+    InjectedProviderError,
+)
+
+__all__ = ["CassetteDataSource", "CassetteMissError", "InjectedProviderError"]
+
+
+class CassetteDataSource(BaseDataSource):
+    """
+    Record/replay wrapper around any BaseDataSource (thin adapter over CassetteClient)
+
+    - record: calls the inner source (default: settings.cassette_record_source) and saves each response
+    - replay: serves saved responses with optional latency/error injection; never calls a provider
+    - Extra provider methods (e.g. fetch_enhanced_fundamentals) are recorded/replayed too,
+      so callers probing with hasattr() see the same surface as against the real provider
+    """
+
+    def __init__(
+        self,
+        inner: Optional[BaseDataSource] = None,
+        cassette_dir: Optional[str] = None,
+        mode: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        latency_jitter_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        self.client = CassetteClient.from_settings(
+            cassette_dir=cassette_dir,
+            mode=mode,
+            latency_ms=latency_ms,
+            latency_jitter_ms=latency_jitter_ms,
+            error_rate=error_rate,
+            seed=seed,
+            sleep=sleep,
+        )
+        self._inner = inner
+
+    @property
+    def name(self) -> str:
+        return "cassette"
+
+    @property
+    def inner(self) -> Optional[BaseDataSource]:
+        if self._inner is None and self.client.recording:
+            from app.config import settings
+            from app.data_sources import get_data_source
+            self._inner = get_data_source(settings.cassette_record_source, use_fallback=False)
+        return self._inner
+
+    def is_available(self) -> bool:
+        if self.client.recording:
+            return self.inner.is_available()
+        return self.client.is_available()
+
+    def fetch_price_data(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        period: str = "1y",
+        interval: str = "1d"
+    ) -> Optional[pd.DataFrame]:
+        return self._call("fetch_price_data", symbol, start_date=start_date, end_date=end_date, period=period, interval=interval)
+
+    def fetch_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self._call("fetch_current_price", symbol)
+
+    def fetch_fundamentals(self, symbol: str) -> Dict[str, Any]:
+        return self._call("fetch_fundamentals", symbol)
+
+    def fetch_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self._call("fetch_news", symbol, limit=limit)
+
+    def fetch_earnings(self, symbol: str) -> List[Dict[str, Any]]:
+        return self._call("fetch_earnings", symbol)
+
+    def fetch_industry_peers(self, symbol: str) -> Dict[str, Any]:
+        return self._call("fetch_industry_peers", symbol)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.client.get_stats()
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached for attributes not defined above
+        if not attr.startswith("fetch_") or "client" not in self.__dict__:
+            raise AttributeError(attr)
+        if self.client.recording:
+            if not callable(getattr(self.inner, attr, None)):
+                raise AttributeError(attr)
+        elif not self.client.has_recordings(attr):
+            raise AttributeError(attr)
+        return lambda *args, **kwargs: self._call(attr, *args, **kwargs)
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        live = getattr(self.inner, method) if self.client.recording else None
+        return self.client.call(method, args, kwargs, live=live)
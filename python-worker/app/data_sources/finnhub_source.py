@@ -6,11 +6,11 @@ Industry Standard: Professional market data API
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-import requests
 import pandas as pd
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.data_sources.base import BaseDataSource
+from app.utils.http_session import get_http_session
 import os
 
 logger = logging.getLogger(__name__)
@@ -63,7 +63,7 @@ class FinnhubSource(BaseDataSource):
                 "token": self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session("finnhub").get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
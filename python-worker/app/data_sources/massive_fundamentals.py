@@ -4,9 +4,10 @@ Comprehensive financial data loading using Massive Python client
 Stores all financial statements, ratios, and market data in database
 """
 import logging
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime, date
-import pandas as pd
 from sqlalchemy import text
 
 # Try to import massive library (optional)
@@ -21,10 +22,43 @@ from app.config import settings
 from app.observability.tracing import trace_function
 from app.observability.logging import get_logger
 from app.database import db
-from app.utils.rate_limiter import RateLimiter
+from app.utils.rate_limiter import get_rate_limiter
 
 logger = get_logger("massive_fundamentals")
 
+# Conflict keys per table (multi-row upserts must not repeat a key within one statement)
+TABLE_CONFLICT_KEYS: Dict[str, Tuple[str, ...]] = {
+    "massive_balance_sheets": ("symbol", "period_end", "fiscal_period"),
+    "massive_cash_flow_statements": ("symbol", "period_end", "fiscal_period"),
+    "massive_income_statements": ("symbol", "period_end", "fiscal_period"),
+    "massive_financial_ratios": ("symbol", "period_end", "fiscal_period"),
+    "massive_short_interest": ("symbol", "settlement_date"),
+    "massive_short_volume": ("symbol", "trading_date"),
+    "massive_technical_indicators": ("symbol", "indicator_type", "timestamp", "window", "short_window", "long_window", "signal_window"),
+}
+
+# (result key, loader method, target table) - independent endpoint calls per symbol
+FUNDAMENTALS_DATASETS: Tuple[Tuple[str, str, str], ...] = (
+    ("balance_sheets", "load_balance_sheets", "massive_balance_sheets"),
+    ("cash_flow_statements", "load_cash_flow_statements", "massive_cash_flow_statements"),
+    ("income_statements", "load_income_statements", "massive_income_statements"),
+    ("financial_ratios", "load_financial_ratios", "massive_financial_ratios"),
+    ("short_interest", "load_short_interest", "massive_short_interest"),
+    ("short_volume", "load_short_volume", "massive_short_volume"),
+    ("rsi", "load_rsi", "massive_technical_indicators"),
+    ("macd", "load_macd", "massive_technical_indicators"),
+    ("ema", "load_ema", "massive_technical_indicators"),
+    ("sma", "load_sma", "massive_technical_indicators"),
+)
+
+# Rows per multi-row INSERT statement
+UPSERT_BATCH_ROWS = 500
+
+
+def _quote(col: str) -> str:
+    """'window' is a reserved word in Postgres"""
+    return f'"{col}"' if col == "window" else col
+
 
 class MassiveFundamentalsLoader:
     """Comprehensive fundamentals data loader for Massive.com"""
@@ -38,8 +72,13 @@ class MassiveFundamentalsLoader:
             raise ValueError("Massive API key required")
         
         self.client = RESTClient(self.api_key)
-        # Conservative rate limiting for bulk operations
-        self.rate_limiter = RateLimiter(2, 60)  # 2 calls per minute
+        # Shared with MassiveClient and all worker threads: one budget for the Massive plan
+        self.rate_limiter = get_rate_limiter(
+            "Massive",
+            settings.massive_rate_limit_calls,
+            settings.massive_rate_limit_window,
+        )
+        self.max_workers = max(1, settings.massive_fundamentals_max_workers)
         
         logger.info("✅ Massive Fundamentals Loader initialized")
     
@@ -847,101 +886,40 @@ class MassiveFundamentalsLoader:
                 logger.error("Database session factory still not initialized after initialize() call")
                 raise RuntimeError("Database not properly initialized")
             
+            if table_name not in TABLE_CONFLICT_KEYS:
+                raise ValueError(f"Unknown fundamentals table: {table_name}")
+
+            conflict_keys = TABLE_CONFLICT_KEYS[table_name]
+            # Last row wins for duplicate keys, matching the old row-by-row upsert order
+            deduped = {tuple(row.get(k) for k in conflict_keys): row for row in data}
+            rows = list(deduped.values())
+
+            columns: List[str] = []
+            for row in rows:
+                for col in row:
+                    if col not in ('source', 'loaded_at') and col not in columns:
+                        columns.append(col)
+            update_clause = ", ".join(f"{_quote(col)} = EXCLUDED.{_quote(col)}" for col in columns)
+
             with db.get_session() as session:
-                # Convert to DataFrame for easier handling
-                df = pd.DataFrame(data)
-                
-                # Generate upsert SQL based on table
-                if table_name == "massive_balance_sheets":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
-                    
-                    sql = f"""
-                        INSERT INTO massive_balance_sheets ({", ".join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, period_end, fiscal_period) 
-                        DO UPDATE SET {update_clause}
-                    """
-                    
-                elif table_name == "massive_cash_flow_statements":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
-                    
-                    sql = f"""
-                        INSERT INTO massive_cash_flow_statements ({", ".join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, period_end, fiscal_period) 
-                        DO UPDATE SET {update_clause}
-                    """
-                    
-                elif table_name == "massive_income_statements":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
-                    
-                    sql = f"""
-                        INSERT INTO massive_income_statements ({", ".join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, period_end, fiscal_period) 
-                        DO UPDATE SET {update_clause}
-                    """
-                    
-                elif table_name == "massive_financial_ratios":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
-                    
-                    sql = f"""
-                        INSERT INTO massive_financial_ratios ({", ".join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, period_end, fiscal_period) 
-                        DO UPDATE SET {update_clause}
-                    """
-                    
-                elif table_name == "massive_short_interest":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
-                    
-                    sql = f"""
-                        INSERT INTO massive_short_interest ({", ".join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, settlement_date) 
-                        DO UPDATE SET {update_clause}
-                    """
-                    
-                elif table_name == "massive_short_volume":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f"{col} = EXCLUDED.{col}" for col in columns])
-                    
-                    sql = f"""
-                        INSERT INTO massive_short_volume ({", ".join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, trading_date) 
-                        DO UPDATE SET {update_clause}
-                    """
-                
-                elif table_name == "massive_technical_indicators":
-                    columns = [col for col in df.columns if col not in ['source', 'loaded_at']]
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    update_clause = ", ".join([f'"{col}" = EXCLUDED."{col}"' if col == 'window' else f"{col} = EXCLUDED.{col}" for col in columns])
-                    
+                for start in range(0, len(rows), UPSERT_BATCH_ROWS):
+                    batch = rows[start:start + UPSERT_BATCH_ROWS]
+                    values = []
+                    params: Dict[str, Any] = {}
+                    for i, row in enumerate(batch):
+                        values.append("(" + ", ".join(f":{col}_{i}" for col in columns) + ")")
+                        params.update({f"{col}_{i}": row.get(col) for col in columns})
+
                     sql = f"""
-                        INSERT INTO massive_technical_indicators ({", ".join([f'"{col}"' if col == 'window' else col for col in columns])})
-                        VALUES ({placeholders})
-                        ON CONFLICT (symbol, indicator_type, timestamp, "window", short_window, long_window, signal_window) 
+                        INSERT INTO {table_name} ({", ".join(_quote(col) for col in columns)})
+                        VALUES {", ".join(values)}
+                        ON CONFLICT ({", ".join(_quote(k) for k in conflict_keys)})
                         DO UPDATE SET {update_clause}
                     """
-                
-                # Execute upsert for all records
-                for _, row in df.iterrows():
-                    session.execute(text(sql), row.to_dict())
-                
+                    session.execute(text(sql), params)
+
                 session.commit()
-                logger.info(f"✅ Saved {len(data)} records to {table_name}")
+                logger.info(f"✅ Saved {len(rows)} records to {table_name}")
                 
         except Exception as e:
             logger.error(f"Error saving data to {table_name}: {e}")
@@ -950,77 +928,63 @@ class MassiveFundamentalsLoader:
     @trace_function("load_all_fundamentals")
     def load_all_fundamentals(self, symbol: str):
         """Load all fundamentals data for a symbol"""
-        logger.info(f"🔄 Loading all fundamentals for {symbol}")
+        return self.load_fundamentals_for_symbols([symbol])[symbol]
+
+    @trace_function("load_fundamentals_for_symbols")
+    def load_fundamentals_for_symbols(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load all fundamentals for many symbols
+
+        Every (symbol, endpoint) call is independent, so they run on a thread pool;
+        the shared rate limiter keeps the aggregate under the Massive plan limit.
+        Results are written per table as batched multi-row upserts.
+
+        Returns:
+            Per-symbol record counts (same shape as load_all_fundamentals)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        logger.info(f"🔄 Loading all fundamentals for {len(symbols)} symbols")
         
         # Create tables if they don't exist
         self.create_fundamentals_tables()
         
-        # Load all data types
-        balance_sheets = self.load_balance_sheets(symbol)
-        cash_flow_statements = self.load_cash_flow_statements(symbol)
-        income_statements = self.load_income_statements(symbol)
-        financial_ratios = self.load_financial_ratios(symbol)
-        short_interest = self.load_short_interest(symbol)
-        short_volume = self.load_short_volume(symbol)
-        
-        # Load technical indicators
-        rsi_data = self.load_rsi(symbol)
-        macd_data = self.load_macd(symbol)
-        ema_data = self.load_ema(symbol)
-        sma_data = self.load_sma(symbol)
-        
-        # Save to database
-        if balance_sheets:
-            self.save_to_database("massive_balance_sheets", balance_sheets)
-        
-        if cash_flow_statements:
-            self.save_to_database("massive_cash_flow_statements", cash_flow_statements)
-        
-        if income_statements:
-            self.save_to_database("massive_income_statements", income_statements)
-        
-        if financial_ratios:
-            self.save_to_database("massive_financial_ratios", financial_ratios)
-        
-        if short_interest:
-            self.save_to_database("massive_short_interest", short_interest)
+        counts: Dict[str, Dict[str, int]] = {sym: {} for sym in symbols}
+        rows_by_table: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         
-        if short_volume:
-            self.save_to_database("massive_short_volume", short_volume)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(getattr(self, method), sym): (sym, key, table)
+                for sym in symbols
+                for key, method, table in FUNDAMENTALS_DATASETS
+            }
+            for future in as_completed(futures):
+                sym, key, table = futures[future]
+                try:
+                    rows = future.result() or []
+                except Exception as e:
+                    logger.error(f"Error loading {key} for {sym}: {e}")
+                    rows = []
+                counts[sym][key] = len(rows)
+                rows_by_table[table].extend(rows)
         
-        # Save technical indicators
-        if rsi_data:
-            self.save_to_database("massive_technical_indicators", rsi_data)
+        # Save to database (one batched upsert per table)
+        for table, rows in rows_by_table.items():
+            if rows:
+                try:
+                    self.save_to_database(table, rows)
+                except Exception:
+                    # Logged in save_to_database; keep other tables loading
+                    continue
         
-        if macd_data:
-            self.save_to_database("massive_technical_indicators", macd_data)
+        results: Dict[str, Dict[str, Any]] = {}
+        for sym in symbols:
+            result: Dict[str, Any] = {"symbol": sym}
+            result.update({key: counts[sym].get(key, 0) for key, _, _ in FUNDAMENTALS_DATASETS})
+            result["total_records"] = sum(counts[sym].values())
+            results[sym] = result
+            logger.info(f"🎉 Loaded {result['total_records']} total fundamentals records for {sym}")
         
-        if ema_data:
-            self.save_to_database("massive_technical_indicators", ema_data)
-        
-        if sma_data:
-            self.save_to_database("massive_technical_indicators", sma_data)
-        
-        total_records = (len(balance_sheets) + len(cash_flow_statements) + len(income_statements) + 
-                        len(financial_ratios) + len(short_interest) + len(short_volume) + 
-                        len(rsi_data) + len(macd_data) + len(ema_data) + len(sma_data))
-        
-        logger.info(f"🎉 Loaded {total_records} total fundamentals records for {symbol}")
-        
-        return {
-            "symbol": symbol,
-            "balance_sheets": len(balance_sheets),
-            "cash_flow_statements": len(cash_flow_statements),
-            "income_statements": len(income_statements),
-            "financial_ratios": len(financial_ratios),
-            "short_interest": len(short_interest),
-            "short_volume": len(short_volume),
-            "rsi": len(rsi_data),
-            "macd": len(macd_data),
-            "ema": len(ema_data),
-            "sma": len(sma_data),
-            "total_records": total_records
-        }
+        return results
 
 
 # Convenience function for easy usage
@@ -1028,3 +992,9 @@ def load_symbol_fundamentals(symbol: str) -> Dict[str, Any]:
     """Load all fundamentals data for a symbol"""
     loader = MassiveFundamentalsLoader()
     return loader.load_all_fundamentals(symbol)
+
+
+def load_watchlist_fundamentals(symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Load all fundamentals data for many symbols concurrently"""
+    loader = MassiveFundamentalsLoader()
+    return loader.load_fundamentals_for_symbols(symbols)
@@ -97,165 +97,220 @@ class SignalReadinessValidator:
             SignalReadinessResult with readiness status and details
         """
         logger.info(f"🔍 Checking signal readiness for {symbol} (signal_type: {signal_type})")
+        reports = {symbol: validation_report} if validation_report is not None else None
+        result = self.check_readiness_many([symbol], signal_type, reports)[symbol]
+        logger.info(f"✅ Signal readiness check complete: {result.readiness_status.upper()} for {symbol}")
+        return result
+    
+    def check_readiness_many(
+        self,
+        symbols: List[str],
+        signal_type: str,
+        validation_reports: Optional[Dict[str, ValidationReport]] = None
+    ) -> Dict[str, SignalReadinessResult]:
+        """
+        Check signal readiness for many symbols
+        
+        Each input (validation report, row count, latest indicators) is one
+        query for all symbols, and the results are saved in one insert.
+        
+        Args:
+            symbols: Stock symbols
+            signal_type: Type of signal ('swing_trend', 'technical', 'hybrid_llm')
+            validation_reports: Optional reports by symbol (fetches latest if not provided)
+        
+        Returns:
+            symbol -> SignalReadinessResult
+        """
+        symbols = list(dict.fromkeys(symbols))
         
         # Get requirements for this signal type
         requirements = self.SIGNAL_REQUIREMENTS.get(signal_type)
         if not requirements:
-            return SignalReadinessResult(
-                symbol=symbol,
-                signal_type=signal_type,
-                readiness_status='not_ready',
-                required_indicators=[],
-                available_indicators=[],
-                missing_indicators=[],
-                data_quality_score=0.0,
-                validation_report_id=None,
-                readiness_reason=f"Unknown signal type: {signal_type}",
-                recommendations=[f"Use a valid signal type: {list(self.SIGNAL_REQUIREMENTS.keys())}"]
-            )
+            return {
+                symbol: SignalReadinessResult(
+                    symbol=symbol,
+                    signal_type=signal_type,
+                    readiness_status='not_ready',
+                    required_indicators=[],
+                    available_indicators=[],
+                    missing_indicators=[],
+                    data_quality_score=0.0,
+                    validation_report_id=None,
+                    readiness_reason=f"Unknown signal type: {signal_type}",
+                    recommendations=[f"Use a valid signal type: {list(self.SIGNAL_REQUIREMENTS.keys())}"]
+                )
+                for symbol in symbols
+            }
+        if not symbols:
+            return {}
         
-        # Get validation report if not provided
-        if validation_report is None:
-            validation_report = self._get_latest_validation_report(symbol)
+        # Get validation reports if not provided
+        if validation_reports is None:
+            validation_reports = self._get_latest_validation_reports(symbols)
         
         # Check data availability
-        data_available = self._check_data_availability(symbol, requirements['min_periods'])
+        data_available = self._check_data_availability_many(symbols, requirements['min_periods'])
         
         # Check indicator availability
-        indicator_status = self._check_indicator_availability(
-            symbol,
+        indicator_status = self._check_indicator_availability_many(
+            symbols,
             requirements['required_indicators'],
             requirements['min_valid_tail']
         )
         
-        # Calculate data quality score
-        data_quality_score = self._calculate_data_quality_score(validation_report)
-        
-        # Determine readiness status
-        readiness_status, reason, recommendations = self._determine_readiness(
-            symbol,
-            data_available,
-            indicator_status,
-            data_quality_score,
-            requirements,
-            validation_report
-        )
-        
-        result = SignalReadinessResult(
-            symbol=symbol,
-            signal_type=signal_type,
-            readiness_status=readiness_status,
-            required_indicators=requirements['required_indicators'],
-            available_indicators=indicator_status['available'],
-            missing_indicators=indicator_status['missing'],
-            data_quality_score=data_quality_score,
-            validation_report_id=validation_report.report_id if validation_report else None,
-            readiness_reason=reason,
-            recommendations=recommendations
-        )
+        results: Dict[str, SignalReadinessResult] = {}
+        for symbol in symbols:
+            validation_report = validation_reports.get(symbol)
+            
+            # Calculate data quality score
+            data_quality_score = self._calculate_data_quality_score(validation_report)
+            
+            # Determine readiness status
+            readiness_status, reason, recommendations = self._determine_readiness(
+                symbol,
+                data_available[symbol],
+                indicator_status[symbol],
+                data_quality_score,
+                requirements,
+                validation_report
+            )
+            
+            results[symbol] = SignalReadinessResult(
+                symbol=symbol,
+                signal_type=signal_type,
+                readiness_status=readiness_status,
+                required_indicators=requirements['required_indicators'],
+                available_indicators=indicator_status[symbol]['available'],
+                missing_indicators=indicator_status[symbol]['missing'],
+                data_quality_score=data_quality_score,
+                validation_report_id=validation_report.report_id if validation_report else None,
+                readiness_reason=reason,
+                recommendations=recommendations
+            )
         
         # Save to database
-        self._save_readiness_result(result)
+        self._save_readiness_results(list(results.values()))
         
-        logger.info(f"✅ Signal readiness check complete: {readiness_status.upper()} for {symbol}")
-        
-        return result
+        return results
     
     def _get_latest_validation_report(self, symbol: str) -> Optional[ValidationReport]:
         """Get latest validation report for symbol"""
+        return self._get_latest_validation_reports([symbol]).get(symbol)
+    
+    def _get_latest_validation_reports(self, symbols: List[str]) -> Dict[str, ValidationReport]:
+        """Get latest validation report per symbol (one query)"""
+        reports: Dict[str, ValidationReport] = {}
         try:
             query = """
-                SELECT report_id, report_json, validation_timestamp
-                FROM data_validation_reports
-                WHERE symbol = :symbol AND data_type = 'price_historical'
-                ORDER BY validation_timestamp DESC
-                LIMIT 1
+                SELECT symbol, report_id, report_json, validation_timestamp
+                FROM (
+                    SELECT symbol, report_id, report_json, validation_timestamp,
+                           ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY validation_timestamp DESC) AS rn
+                    FROM data_validation_reports
+                    WHERE symbol = ANY(:symbols) AND data_type = 'price_historical'
+                ) latest
+                WHERE rn = 1
             """
-            result = db.execute_query(query, {"symbol": symbol})
-            if result:
-                import json
-                from datetime import datetime
-                from app.data_validation.validator import ValidationReport, ValidationResult, ValidationIssue, ValidationSeverity
-                
-                row = result[0]
-                report_dict = json.loads(row['report_json'])
-                
-                # Reconstruct ValidationReport from dict
-                validation_results = []
-                for vr_dict in report_dict.get('validation_results', []):
-                    issues = []
-                    for issue_dict in vr_dict.get('issues', []):
-                        issue = ValidationIssue(
-                            check_name=issue_dict.get('check_name', ''),
-                            severity=ValidationSeverity(issue_dict.get('severity', 'info')),
-                            message=issue_dict.get('message', ''),
-                            affected_rows=issue_dict.get('affected_rows'),
-                            affected_columns=issue_dict.get('affected_columns'),
-                            metric_value=issue_dict.get('metric_value'),
-                            threshold=issue_dict.get('threshold'),
-                            recommendation=issue_dict.get('recommendation')
-                        )
-                        issues.append(issue)
-                    
-                    result_obj = ValidationResult(
-                        check_name=vr_dict.get('check_name', ''),
-                        passed=vr_dict.get('passed', False),
-                        severity=ValidationSeverity(vr_dict.get('severity', 'info')),
-                        issues=issues,
-                        metrics=vr_dict.get('metrics', {}),
-                        rows_checked=vr_dict.get('rows_checked', 0),
-                        rows_failed=vr_dict.get('rows_failed', 0)
-                    )
-                    validation_results.append(result_obj)
-                
-                # Parse timestamp
-                timestamp_str = row.get('validation_timestamp') or report_dict.get('timestamp')
-                if isinstance(timestamp_str, str):
-                    timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                else:
-                    timestamp = datetime.now()
-                
-                report = ValidationReport(
-                    symbol=report_dict.get('symbol', symbol),
-                    data_type=report_dict.get('data_type', 'price_historical'),
-                    timestamp=timestamp,
-                    total_rows=report_dict.get('total_rows', 0),
-                    total_columns=report_dict.get('total_columns', 0),
-                    rows_after_cleaning=report_dict.get('rows_after_cleaning', 0),
-                    rows_dropped=report_dict.get('rows_dropped', 0),
-                    validation_results=validation_results,
-                    overall_status=report_dict.get('overall_status', 'unknown'),
-                    critical_issues=report_dict.get('critical_issues', 0),
-                    warnings=report_dict.get('warnings', 0),
-                    recommendations=report_dict.get('recommendations', [])
-                )
-                # Set report_id from database
-                report.report_id = row.get('report_id')
-                return report
+            for row in db.execute_query(query, {"symbols": symbols}) or []:
+                try:
+                    reports[row['symbol']] = self._report_from_row(row, row['symbol'])
+                except Exception as e:
+                    logger.warning(f"Could not parse validation report for {row['symbol']}: {e}")
         except Exception as e:
-            logger.warning(f"Could not fetch validation report: {e}")
-        return None
+            logger.warning(f"Could not fetch validation reports: {e}")
+        return reports
+    
+    def _report_from_row(self, row: Dict[str, Any], symbol: str) -> ValidationReport:
+        """Reconstruct a ValidationReport from a data_validation_reports row"""
+        from app.data_validation.validator import ValidationResult, ValidationIssue, ValidationSeverity
+        
+        report_dict = json.loads(row['report_json'])
+        
+        # Reconstruct ValidationReport from dict
+        validation_results = []
+        for vr_dict in report_dict.get('validation_results', []):
+            issues = []
+            for issue_dict in vr_dict.get('issues', []):
+                issue = ValidationIssue(
+                    check_name=issue_dict.get('check_name', ''),
+                    severity=ValidationSeverity(issue_dict.get('severity', 'info')),
+                    message=issue_dict.get('message', ''),
+                    affected_rows=issue_dict.get('affected_rows'),
+                    affected_columns=issue_dict.get('affected_columns'),
+                    metric_value=issue_dict.get('metric_value'),
+                    threshold=issue_dict.get('threshold'),
+                    recommendation=issue_dict.get('recommendation')
+                )
+                issues.append(issue)
+            
+            result_obj = ValidationResult(
+                check_name=vr_dict.get('check_name', ''),
+                passed=vr_dict.get('passed', False),
+                severity=ValidationSeverity(vr_dict.get('severity', 'info')),
+                issues=issues,
+                metrics=vr_dict.get('metrics', {}),
+                rows_checked=vr_dict.get('rows_checked', 0),
+                rows_failed=vr_dict.get('rows_failed', 0)
+            )
+            validation_results.append(result_obj)
+        
+        # Parse timestamp
+        timestamp_str = row.get('validation_timestamp') or report_dict.get('timestamp')
+        if isinstance(timestamp_str, str):
+            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        else:
+            timestamp = datetime.now()
+        
+        report = ValidationReport(
+            symbol=report_dict.get('symbol', symbol),
+            data_type=report_dict.get('data_type', 'price_historical'),
+            timestamp=timestamp,
+            total_rows=report_dict.get('total_rows', 0),
+            total_columns=report_dict.get('total_columns', 0),
+            rows_after_cleaning=report_dict.get('rows_after_cleaning', 0),
+            rows_dropped=report_dict.get('rows_dropped', 0),
+            validation_results=validation_results,
+            overall_status=report_dict.get('overall_status', 'unknown'),
+            critical_issues=report_dict.get('critical_issues', 0),
+            warnings=report_dict.get('warnings', 0),
+            recommendations=report_dict.get('recommendations', [])
+        )
+        # Set report_id from database
+        report.report_id = row.get('report_id')
+        return report
     
     def _check_data_availability(self, symbol: str, min_periods: int) -> Dict[str, Any]:
         """Check if sufficient data is available"""
+        return self._check_data_availability_many([symbol], min_periods)[symbol]
+    
+    def _check_data_availability_many(self, symbols: List[str], min_periods: int) -> Dict[str, Dict[str, Any]]:
+        """Check if sufficient data is available for each symbol (one query)"""
         try:
             query = """
-                SELECT COUNT(*) as row_count
+                SELECT symbol, COUNT(*) as row_count
                 FROM raw_market_data
-                WHERE symbol = :symbol
+                WHERE symbol = ANY(:symbols)
+                GROUP BY symbol
             """
-            result = db.execute_query(query, {"symbol": symbol})
-            row_count = result[0]['row_count'] if result else 0
-            
+            counts = {row['symbol']: row['row_count'] for row in db.execute_query(query, {"symbols": symbols}) or []}
+        except Exception as e:
+            logger.error(f"Error checking data availability: {e}")
             return {
+                symbol: {'available': False, 'row_count': 0, 'min_required': min_periods, 'sufficient': False}
+                for symbol in symbols
+            }
+        
+        availability = {}
+        for symbol in symbols:
+            row_count = counts.get(symbol, 0)
+            availability[symbol] = {
                 'available': row_count >= min_periods,
                 'row_count': row_count,
                 'min_required': min_periods,
                 'sufficient': row_count >= min_periods
             }
-        except Exception as e:
-            logger.error(f"Error checking data availability: {e}")
-            return {'available': False, 'row_count': 0, 'min_required': min_periods, 'sufficient': False}
+        return availability
     
     def _check_indicator_availability(
         self,
@@ -264,37 +319,58 @@ class SignalReadinessValidator:
         min_valid_tail: int
     ) -> Dict[str, Any]:
         """Check if required indicators are available and valid"""
+        return self._check_indicator_availability_many([symbol], required_indicators, min_valid_tail)[symbol]
+    
+    def _check_indicator_availability_many(
+        self,
+        symbols: List[str],
+        required_indicators: List[str],
+        min_valid_tail: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Check required indicators on each symbol's latest aggregated_indicators row (one query)"""
         try:
-            # Check aggregated_indicators table
             query = """
-                SELECT 
-                    ema9, ema21, sma50, sma200, ema20, ema50,
-                    rsi, macd, macd_signal, atr
-                FROM aggregated_indicators
-                WHERE symbol = :symbol
-                ORDER BY date DESC
-                LIMIT 1
+                SELECT symbol, ema9, ema21, sma50, sma200, ema20, ema50,
+                       rsi, macd, macd_signal, atr
+                FROM (
+                    SELECT 
+                        symbol,
+                        ema9, ema21, sma50, sma200, ema20, ema50,
+                        rsi, macd, macd_signal, atr,
+                        ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS rn
+                    FROM aggregated_indicators
+                    WHERE symbol = ANY(:symbols)
+                ) latest
+                WHERE rn = 1
             """
-            result = db.execute_query(query, {"symbol": symbol})
-            
+            latest_rows = {row['symbol']: row for row in db.execute_query(query, {"symbols": symbols}) or []}
+        except Exception as e:
+            logger.error(f"Error checking indicator availability: {e}")
+            return {
+                symbol: {'available': [], 'missing': required_indicators.copy(), 'all_available': False}
+                for symbol in symbols
+            }
+        
+        # Map indicator names to database columns
+        indicator_map = {
+            'ema9': 'ema9',
+            'ema21': 'ema21',
+            'sma50': 'sma50',
+            'sma200': 'sma200',
+            'ema20': 'ema20',
+            'ema50': 'ema50',
+            'rsi': 'rsi',
+            'macd': 'macd',  # Database column is 'macd', not 'macd_line'
+            'atr': 'atr'
+        }
+        
+        status = {}
+        for symbol in symbols:
+            latest = latest_rows.get(symbol)
             available = []
             missing = []
             
-            if result:
-                latest = result[0]
-                # Map indicator names to database columns
-                indicator_map = {
-                    'ema9': 'ema9',
-                    'ema21': 'ema21',
-                    'sma50': 'sma50',
-                    'sma200': 'sma200',
-                    'ema20': 'ema20',
-                    'ema50': 'ema50',
-                    'rsi': 'rsi',
-                    'macd': 'macd',  # Database column is 'macd', not 'macd_line'
-                    'atr': 'atr'
-                }
-                
+            if latest:
                 for indicator in required_indicators:
                     db_col = indicator_map.get(indicator)
                     if db_col and latest.get(db_col) is not None:
@@ -310,18 +386,12 @@ class SignalReadinessValidator:
                 # No indicators calculated yet
                 missing = required_indicators.copy()
             
-            return {
+            status[symbol] = {
                 'available': available,
                 'missing': missing,
                 'all_available': len(missing) == 0
             }
-        except Exception as e:
-            logger.error(f"Error checking indicator availability: {e}")
-            return {
-                'available': [],
-                'missing': required_indicators.copy(),
-                'all_available': False
-            }
+        return status
     
     def _calculate_data_quality_score(self, validation_report: Optional[ValidationReport]) -> float:
         """Calculate data quality score (0.0 to 1.0)"""
@@ -464,31 +534,43 @@ class SignalReadinessValidator:
     
     def _save_readiness_result(self, result: SignalReadinessResult):
         """Save readiness result to database"""
+        self._save_readiness_results([result])
+    
+    def _save_readiness_results(self, results: List[SignalReadinessResult]):
+        """Save readiness results to database (one multi-row insert)"""
+        if not results:
+            return
         try:
-            readiness_id = f"{result.symbol}_{result.signal_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
-            query = """
-                INSERT OR REPLACE INTO signal_readiness
+            now = datetime.now()
+            values = []
+            params: Dict[str, Any] = {"timestamp": now}
+            for i, result in enumerate(results):
+                values.append(
+                    f"(:readiness_id_{i}, :symbol_{i}, :signal_type_{i}, :readiness_status_{i}, :required_indicators_{i}, "
+                    f":available_indicators_{i}, :missing_indicators_{i}, :data_quality_score_{i}, "
+                    f":validation_report_id_{i}, :timestamp, :reason_{i}, :recommendations_{i})"
+                )
+                params.update({
+                    f"readiness_id_{i}": f"{result.symbol}_{result.signal_type}_{now.strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
+                    f"symbol_{i}": result.symbol,
+                    f"signal_type_{i}": result.signal_type,
+                    f"readiness_status_{i}": result.readiness_status,
+                    f"required_indicators_{i}": json.dumps(result.required_indicators),
+                    f"available_indicators_{i}": json.dumps(result.available_indicators),
+                    f"missing_indicators_{i}": json.dumps(result.missing_indicators),
+                    f"data_quality_score_{i}": result.data_quality_score,
+                    f"validation_report_id_{i}": result.validation_report_id,
+                    f"reason_{i}": result.readiness_reason,
+                    f"recommendations_{i}": json.dumps(result.recommendations),
+                })
+            # readiness_id is unique per row (uuid suffix), so a plain insert is enough
+            query = f"""
+                INSERT INTO signal_readiness
                 (readiness_id, symbol, signal_type, readiness_status, required_indicators,
                  available_indicators, missing_indicators, data_quality_score,
                  validation_report_id, readiness_timestamp, readiness_reason, recommendations)
-                VALUES (:readiness_id, :symbol, :signal_type, :readiness_status, :required_indicators,
-                        :available_indicators, :missing_indicators, :data_quality_score,
-                        :validation_report_id, :timestamp, :reason, :recommendations)
+                VALUES {", ".join(values)}
             """
-            db.execute_update(query, {
-                "readiness_id": readiness_id,
-                "symbol": result.symbol,
-                "signal_type": result.signal_type,
-                "readiness_status": result.readiness_status,
-                "required_indicators": json.dumps(result.required_indicators),
-                "available_indicators": json.dumps(result.available_indicators),
-                "missing_indicators": json.dumps(result.missing_indicators),
-                "data_quality_score": result.data_quality_score,
-                "validation_report_id": result.validation_report_id,
-                "timestamp": datetime.now(),
-                "reason": result.readiness_reason,
-                "recommendations": json.dumps(result.recommendations)
-            })
+            db.execute_update(query, params)
         except Exception as e:
-            logger.warning(f"Failed to save readiness result (non-critical): {e}")
-
+            logger.warning(f"Failed to save readiness results (non-critical): {e}")
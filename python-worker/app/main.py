@@ -11,6 +11,7 @@ from app.config import settings
 from app.observability.logging import setup_logging, get_logger, log_config
 from app.database import init_database
 from app.observability.metrics import get_metrics
+from app.observability import audit
 from app.workers.batch_worker import BatchWorker
 from app.plugins import initialize_data_sources, get_registration_manager
 
@@ -155,6 +156,7 @@ def main():
     finally:
         # Always cleanup on exit
         cleanup_plugins()
+        audit.shutdown()
         logger.info("👋 Trading System Python AI/ML Worker stopped")
 
 
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 from typing import Any, Dict, Optional
 from uuid import UUID
 
 from sqlalchemy import text
 
+from app.config import settings
 from app.database import db
+from app.observability.audit_writer import build_insert, get_audit_writer
 from app.observability.context import get_ingestion_run_id
 from app.observability.logging import get_logger, log_exception
 
@@ -43,6 +45,9 @@ def start_run(
 
 
 def finish_run(run_id: UUID, *, status: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    # Land buffered events before the run is marked finished
+    flush()
+
     payload = {
         "run_id": str(run_id),
         "status": status,
@@ -96,6 +101,8 @@ def log_event(
 
     payload = {
         "run_id": str(rid),
+        # Captured at call time; the row is written later by the background writer
+        "event_ts": datetime.now(timezone.utc),
         "level": level,
         "provider": provider,
         "operation": operation,
@@ -111,28 +118,28 @@ def log_event(
         "context": json.dumps(context or {}),
     }
 
+    if settings.audit_async_enabled:
+        get_audit_writer().submit(payload)
+        return
+
     try:
+        query, params = build_insert([payload])
         with db.get_session() as session:
-            session.execute(
-                text(
-                    """
-                    INSERT INTO data_ingestion_events (
-                        run_id, event_ts, level, provider, operation, symbol,
-                        duration_ms, records_in, records_saved, message,
-                        error_type, error_message, root_cause_type, root_cause_message, context
-                    ) VALUES (
-                        CAST(:run_id AS uuid), NOW(), :level, :provider, :operation, :symbol,
-                        :duration_ms, :records_in, :records_saved, :message,
-                        :error_type, :error_message, :root_cause_type, :root_cause_message, CAST(:context AS jsonb)
-                    )
-                    """
-                ),
-                payload,
-            )
+            session.execute(text(query), params)
     except Exception as e:
         log_exception(logger, e, "audit.log_event")
 
 
+def flush(timeout: float = 5.0) -> None:
+    """Write buffered audit events now (blocking)"""
+    get_audit_writer().flush(timeout)
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    """Drain buffered audit events and stop the background writer"""
+    get_audit_writer().shutdown(timeout)
+
+
 def _root_exception(exc: Exception) -> Exception:
     current = exc
     while True:
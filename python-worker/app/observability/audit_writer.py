@@ -0,0 +1,269 @@
+"""
+Buffered Audit Event Writer
+Background thread that batches data_ingestion_events into multi-row inserts
+Performance: ingestion hot paths enqueue and return; they never wait on audit I/O
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.database import db
+from app.observability.logging import get_logger
+from app.observability.metrics import get_metrics
+
+
+logger = get_logger(__name__)
+
+EVENT_COLUMNS = (
+    "run_id", "event_ts", "level", "provider", "operation", "symbol",
+    "duration_ms", "records_in", "records_saved", "message",
+    "error_type", "error_message", "root_cause_type", "root_cause_message", "context",
+)
+
+_STOP = object()
+
+
+def build_insert(events: List[Dict[str, Any]]) -> tuple[str, Dict[str, Any]]:
+    """Build one multi-row INSERT INTO data_ingestion_events for a batch"""
+    rows: List[str] = []
+    params: Dict[str, Any] = {}
+    for i, event in enumerate(events):
+        rows.append(
+            f"(CAST(:run_id_{i} AS uuid), :event_ts_{i}, :level_{i}, :provider_{i}, :operation_{i}, :symbol_{i}, "
+            f":duration_ms_{i}, :records_in_{i}, :records_saved_{i}, :message_{i}, "
+            f":error_type_{i}, :error_message_{i}, :root_cause_type_{i}, :root_cause_message_{i}, "
+            f"CAST(:context_{i} AS jsonb))"
+        )
+        for column in EVENT_COLUMNS:
+            params[f"{column}_{i}"] = event.get(column)
+
+    query = f"""
+        INSERT INTO data_ingestion_events ({", ".join(EVENT_COLUMNS)})
+        VALUES {", ".join(rows)}
+    """
+    return query, params
+
+
+class AuditEventWriter:
+    """
+    Bounded queue + background flusher for audit events
+
+    - submit() never blocks: when the queue is full the event is spilled to a
+      local JSONL file (if configured) or dropped, and counted either way
+    - The flusher writes every batch_size events or flush_interval_ms, whichever comes first
+    - flush() drains synchronously and waits for batches the flusher is still
+      writing; shutdown() drains and stops (also registered atexit)
+    - A failed batch insert is retried row by row; only the rows that still
+      fail are spilled or dropped
+    - Counters: submitted, flushed, dropped, spilled, failed (get_stats() and metrics)
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval_ms: int = 500,
+        spill_path: Optional[str] = None,
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(1, int(flush_interval_ms)) / 1000.0
+        self.spill_path = spill_path
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        # Events submitted but not yet written, spilled or dropped (queued or in flight)
+        self._pending = 0
+        self._settled = threading.Condition()
+        self._stats: Dict[str, int] = defaultdict(int)
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """
+        Enqueue an event for the background writer
+
+        Returns:
+            True if queued, False if spilled or dropped under backpressure
+        """
+        if self._stopped:
+            # After shutdown there is no flusher; write inline rather than lose the event
+            self._write([event])
+            return True
+
+        self._ensure_started()
+        with self._settled:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._settle(1)
+            self._overflow([event], reason="queue_full")
+            return False
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Write everything currently queued (blocks the caller; not for hot paths)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            self._write(batch)
+            self._settle(len(batch))
+        # Wait for batches the background thread has dequeued but not written yet
+        with self._settled:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._settled.wait(remaining)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Drain the queue and stop the background thread"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+        self.flush(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            "queued": self._queue.qsize(),
+            "max_queue_size": self._queue.maxsize,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "spill_enabled": bool(self.spill_path),
+            "running": bool(self._thread and self._thread.is_alive()),
+        })
+        return stats
+
+    # --- internals ---
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._stopped or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                self._write(batch)
+                self._settle(len(batch))
+            if stop:
+                return
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < limit:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        return batch
+
+    def _settle(self, count: int) -> None:
+        with self._settled:
+            self._pending -= count
+            self._settled.notify_all()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._insert(batch)
+            self._count("flushed", len(batch))
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                logger.warning(f"Audit event insert failed: {e}")
+                self._count("failed")
+                self._overflow(batch, reason="write_failed")
+                return
+            logger.warning(f"Audit batch insert failed ({len(batch)} events), retrying row by row: {e}")
+        for event in batch:
+            self._write([event])
+
+    @staticmethod
+    def _insert(events: List[Dict[str, Any]]) -> None:
+        query, params = build_insert(events)
+        with db.get_session() as session:
+            session.execute(text(query), params)
+
+    def _overflow(self, events: List[Dict[str, Any]], *, reason: str) -> None:
+        """Spill events to the local file, or drop them if spilling is off or fails"""
+        if self.spill_path:
+            try:
+                with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as f:
+                    for event in events:
+                        f.write(json.dumps(event, default=str) + "\n")
+                self._count("spilled", len(events), reason=reason)
+                return
+            except OSError as e:
+                logger.warning(f"Audit spill to {self.spill_path} failed: {e}")
+        self._count("dropped", len(events), reason=reason)
+
+    def _count(self, outcome: str, value: int = 1, reason: Optional[str] = None) -> None:
+        with self._lock:
+            self._stats[outcome] += value
+        get_metrics().increment(f"audit_events_{outcome}", value=value, labels={"reason": reason} if reason else None)
+
+
+# Global writer instance
+_writer: Optional[AuditEventWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditEventWriter:
+    """Get global audit event writer (configured from settings, drained at exit)"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                from app.config import settings
+                _writer = AuditEventWriter(
+                    max_queue_size=settings.audit_queue_size,
+                    batch_size=settings.audit_batch_size,
+                    flush_interval_ms=settings.audit_flush_interval_ms,
+                    spill_path=settings.audit_spill_path,
+                )
+                atexit.register(_writer.shutdown)
+    return _writer
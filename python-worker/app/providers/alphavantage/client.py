@@ -13,7 +13,9 @@ from dataclasses import dataclass
 import pandas as pd
 
 from app.config import settings
-from app.utils.rate_limiter import RateLimiter
+from app.utils.http_session import get_http_session
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.response_cache import cached_response
 from app.observability.logging import get_logger
 
 logger = get_logger("alphavantage_client")
@@ -36,18 +38,15 @@ class AlphaVantageClient:
     Owns all HTTP logic, rate limiting, retries, and response normalization
     """
     
+    cache_namespace = "alphavantage"
+    
     def __init__(self, config: AlphaVantageConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.timeout = config.timeout
+        self.session = get_http_session("alphavantage")
         self.last_error: Optional[str] = None
         
         # Rate limiting for Alpha Vantage free tier
-        self.rate_limiter = RateLimiter(
-            max_calls=config.rate_limit_calls,
-            time_window=config.rate_limit_window,
-            name="AlphaVantage"
-        )
+        self.rate_limiter = get_rate_limiter("AlphaVantage", config.rate_limit_calls, config.rate_limit_window)
         
         logger.info(f"✅ Alpha Vantage Client initialized (rate limit: {config.rate_limit_calls}/{config.rate_limit_window}s)")
     
@@ -74,7 +73,7 @@ class AlphaVantageClient:
         
         for attempt in range(self.config.max_retries):
             try:
-                response = self.session.get(self.config.base_url, params=params)
+                response = self.session.get(self.config.base_url, params=params, timeout=self.config.timeout)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -102,6 +101,7 @@ class AlphaVantageClient:
                 # API error, don't retry
                 raise
     
+    @cached_response("price_data")
     def fetch_price_data(self, symbol: str, **kwargs) -> pd.DataFrame:
         """
         Fetch historical price data
@@ -148,6 +148,7 @@ class AlphaVantageClient:
         logger.info(f"✅ Fetched {len(df)} price records for {symbol}")
         return df
     
+    @cached_response("quote")
     def fetch_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
         Fetch current price (intraday)
@@ -184,6 +185,7 @@ class AlphaVantageClient:
             logger.warning(f"Failed to fetch current price for {symbol}: {e}")
             return None
     
+    @cached_response("symbol_details")
     def fetch_symbol_details(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch symbol details and company information
@@ -218,6 +220,7 @@ class AlphaVantageClient:
             "fifty_two_week_low": float(data.get("52WeekLow", 0)) if data.get("52WeekLow") and data["52WeekLow"] != "None" else None,
         }
     
+    @cached_response("fundamentals")
     def fetch_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch fundamental financial data
@@ -250,6 +253,7 @@ class AlphaVantageClient:
         
         return overview
     
+    @cached_response("news")
     def fetch_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Fetch recent news articles
@@ -260,6 +264,7 @@ class AlphaVantageClient:
         logger.warning("Alpha Vantage news endpoint is deprecated")
         return []
     
+    @cached_response("earnings")
     def fetch_earnings(self, symbol: str) -> List[Dict[str, Any]]:
         """
         Fetch earnings data
@@ -289,6 +294,7 @@ class AlphaVantageClient:
         logger.info(f"✅ Fetched {len(earnings)} earnings records for {symbol}")
         return earnings
     
+    @cached_response("technical_indicators")
     def fetch_technical_indicators(self, symbol: str, indicator_type: str = "SMA", **kwargs) -> Dict[str, Any]:
         """
         Fetch technical indicators
@@ -362,6 +368,7 @@ class AlphaVantageClient:
         logger.info(f"✅ Fetched {indicator_type} for {symbol}")
         return result
     
+    @cached_response("industry_peers")
     def fetch_industry_peers(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch industry peers information
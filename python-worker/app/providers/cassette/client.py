@@ -0,0 +1,166 @@
+"""Cassette Provider Client
+Stores provider responses as compressed files and replays them with synthetic
+latency and error injection. Used for offline, deterministic ingestion runs.
+"""
+
+import gzip
+import hashlib
+import os
+import pickle
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.exceptions import DataSourceError
+from app.observability.logging import get_logger
+from app.utils.response_cache import clone_response, make_cache_key
+
+logger = get_logger("cassette_client")
+
+RECORD = "record"
+REPLAY = "replay"
+CASSETTE_SUFFIX = ".pkl.gz"
+
+
+class CassetteMissError(DataSourceError):
+    """Replay requested a call that was never recorded"""
+
+
+class InjectedProviderError(DataSourceError):
+    """Synthetic provider failure raised in replay mode (error_rate)"""
+
+
+@dataclass
+class CassetteConfig:
+    cassette_dir: str = "cassettes"
+    mode: str = REPLAY
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 42
+
+
+class CassetteClient:
+    """
+    One gzip-compressed pickle per call: <cassette_dir>/<method>-<sha1 of call key>.pkl.gz
+
+    - record: runs the live call and stores its result (or the error it raised)
+    - replay: serves stored results only; unrecorded calls raise CassetteMissError
+    - latency_ms (+/- latency_jitter_ms) is slept before every replayed call and
+      error_rate injects InjectedProviderError, both seeded for repeatable runs
+    """
+
+    def __init__(self, config: CassetteConfig, sleep: Callable[[float], None] = time.sleep):
+        mode = (config.mode or REPLAY).lower()
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be '{RECORD}' or '{REPLAY}', got '{config.mode}'")
+        config.mode = mode
+        self.config = config
+        self._sleep = sleep
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"recorded": 0, "replayed": 0, "misses": 0, "injected_errors": 0}
+
+        if mode == RECORD:
+            os.makedirs(config.cassette_dir, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls, **overrides: Any) -> "CassetteClient":
+        values = {
+            "cassette_dir": settings.cassette_dir,
+            "mode": settings.cassette_mode,
+            "latency_ms": settings.cassette_latency_ms,
+            "latency_jitter_ms": settings.cassette_latency_jitter_ms,
+            "error_rate": settings.cassette_error_rate,
+            "seed": settings.cassette_seed,
+        }
+        values.update({k: v for k, v in overrides.items() if v is not None and k != "sleep"})
+        return cls(CassetteConfig(**values), sleep=overrides.get("sleep") or time.sleep)
+
+    @property
+    def recording(self) -> bool:
+        return self.config.mode == RECORD
+
+    def is_available(self) -> bool:
+        return os.path.isdir(self.config.cassette_dir)
+
+    def has_recordings(self, method: str) -> bool:
+        try:
+            return any(name.startswith(f"{method}-") for name in os.listdir(self.config.cassette_dir))
+        except OSError:
+            return False
+
+    def call(self, method: str, args: tuple, kwargs: Dict[str, Any], live: Optional[Callable[..., Any]] = None) -> Any:
+        """Record live(*args, **kwargs) or replay the stored result for the same call"""
+        key = make_cache_key("cassette", method, args, kwargs)
+        path = self._path(method, key)
+
+        if self.recording:
+            if live is None:
+                raise CassetteMissError(f"Record mode needs a live provider for {key}")
+            try:
+                value = live(*args, **kwargs)
+            except Exception as e:
+                self._write(path, {"key": key, "value": None, "error": e})
+                raise
+            self._write(path, {"key": key, "value": value, "error": None})
+            return value
+
+        self._apply_latency()
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            self._count("injected_errors")
+            raise InjectedProviderError(f"Injected provider error for {key}")
+
+        try:
+            with gzip.open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            logger.warning(f"Cassette miss: {key}")
+            raise CassetteMissError(f"No cassette recorded for {key}")
+        self._count("replayed")
+        if entry.get("error") is not None:
+            raise entry["error"]
+        return clone_response(entry["value"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            "mode": self.config.mode,
+            "cassette_dir": self.config.cassette_dir,
+            "latency_ms": self.config.latency_ms,
+            "error_rate": self.config.error_rate,
+        })
+        return stats
+
+    def _write(self, path: str, entry: Dict[str, Any]) -> None:
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable exception types are recorded as a plain provider error
+            entry = {**entry, "error": DataSourceError(str(entry["error"]))}
+            with gzip.open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._count("recorded")
+
+    def _path(self, method: str, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.config.cassette_dir, f"{method}-{digest}{CASSETTE_SUFFIX}")
+
+    def _apply_latency(self) -> None:
+        delay_ms = self.config.latency_ms
+        if self.config.latency_jitter_ms:
+            delay_ms += self._random.uniform(-self.config.latency_jitter_ms, self.config.latency_jitter_ms)
+        if delay_ms > 0:
+            self._sleep(delay_ms / 1000.0)
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
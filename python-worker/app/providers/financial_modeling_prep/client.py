@@ -14,7 +14,9 @@ import math
 import pandas as pd
 
 from app.config import settings
-from app.utils.rate_limiter import RateLimiter
+from app.utils.http_session import get_http_session
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.response_cache import cached_response
 from app.observability.logging import get_logger
 
 logger = get_logger("fmp_client")
@@ -37,18 +39,15 @@ class FinancialModelingPrepClient:
     Owns all HTTP logic, rate limiting, retries, and response normalization
     """
     
+    cache_namespace = "fmp"
+    
     def __init__(self, config: FinancialModelingPrepConfig):
         self.config = config
-        self.session = requests.Session()
-        self.session.timeout = config.timeout
+        self.session = get_http_session("fmp")
         self.last_error: Optional[str] = None
         
         # Rate limiting for FMP
-        self.rate_limiter = RateLimiter(
-            max_calls=config.rate_limit_calls,
-            time_window=config.rate_limit_window,
-            name="FMP"
-        )
+        self.rate_limiter = get_rate_limiter("FMP", config.rate_limit_calls, config.rate_limit_window)
         
         logger.info(f"✅ FMP Client initialized (rate limit: {config.rate_limit_calls}/{config.rate_limit_window}s)")
     
@@ -170,6 +169,7 @@ class FinancialModelingPrepClient:
     
     # === Core Data Methods ===
     
+    @cached_response("price_data")
     def fetch_price_data(self, symbol: str, **kwargs) -> pd.DataFrame:
         """
         Fetch historical price data
@@ -257,6 +257,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching price data for {symbol}: {e}")
             return pd.DataFrame()
     
+    @cached_response("quote")
     def fetch_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Fetch current/live price with volume"""
         try:
@@ -278,6 +279,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching current price for {symbol}: {e}")
             return None
     
+    @cached_response("symbol_details")
     def fetch_symbol_details(self, symbol: str) -> Dict[str, Any]:
         """Fetch symbol details"""
         try:
@@ -306,6 +308,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching symbol details for {symbol}: {e}")
             return {}
     
+    @cached_response("fundamentals")
     def fetch_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """Fetch fundamental data"""
         try:
@@ -346,10 +349,12 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching fundamentals for {symbol}: {e}")
             return {}
     
+    @cached_response("fundamentals")
     def fetch_enhanced_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """Fetch enhanced fundamentals with additional metrics"""
         return self.fetch_fundamentals(symbol)
     
+    @cached_response("news")
     def fetch_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Fetch recent news articles"""
         try:
@@ -379,6 +384,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching news for {symbol}: {e}")
             return []
     
+    @cached_response("earnings")
     def fetch_earnings(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch earnings data"""
         try:
@@ -412,6 +418,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching earnings for {symbol}: {e}")
             return []
     
+    @cached_response("earnings_calendar")
     def fetch_earnings_calendar(self, symbols: List[str] = None, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
         """Fetch earnings calendar"""
         try:
@@ -457,10 +464,12 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching earnings calendar: {e}")
             return []
     
+    @cached_response("earnings_calendar")
     def fetch_earnings_for_date(self, earnings_date: str, symbols: List[str] = None) -> List[Dict[str, Any]]:
         """Fetch earnings for a specific date"""
         return self.fetch_earnings_calendar(symbols, earnings_date, earnings_date)
     
+    @cached_response("industry_peers")
     def fetch_industry_peers(self, symbol: str) -> Dict[str, Any]:
         """Fetch industry peers"""
         try:
@@ -478,6 +487,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching industry peers for {symbol}: {e}")
             return {}
     
+    @cached_response("corporate_actions")
     def fetch_actions(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch corporate actions (dividends and splits)"""
         try:
@@ -515,6 +525,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching actions for {symbol}: {e}")
             return []
     
+    @cached_response("corporate_actions")
     def fetch_dividends(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch dividend history"""
         try:
@@ -537,6 +548,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching dividends for {symbol}: {e}")
             return []
     
+    @cached_response("corporate_actions")
     def fetch_splits(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch stock split history"""
         try:
@@ -559,6 +571,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching splits for {symbol}: {e}")
             return []
     
+    @cached_response("financial_statements")
     def fetch_financial_statements(self, symbol: str, *, quarterly: bool = True) -> Dict[str, Any]:
         """Fetch financial statements"""
         try:
@@ -590,6 +603,7 @@ class FinancialModelingPrepClient:
                 "cash_flow": []
             }
     
+    @cached_response("earnings")
     def fetch_quarterly_earnings_history(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch quarterly earnings history"""
         try:
@@ -616,6 +630,7 @@ class FinancialModelingPrepClient:
             logger.error(f"Error fetching quarterly earnings history for {symbol}: {e}")
             return []
     
+    @cached_response("analyst_recommendations")
     def fetch_analyst_recommendations(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch analyst recommendations"""
         try:
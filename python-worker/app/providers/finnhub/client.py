@@ -8,10 +8,10 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import requests
 
 from app.config import settings
-from app.utils.rate_limiter import RateLimiter
+from app.utils.http_session import get_http_session
+from app.utils.rate_limiter import get_rate_limiter
 from app.observability.logging import get_logger
 
 logger = get_logger("finnhub_client")
@@ -34,12 +34,8 @@ class FinnhubClient:
             raise ValueError("Finnhub API key is required")
 
         self.config = config
-        self.session = requests.Session()
-        self._rate_limiter = RateLimiter(
-            max_calls=config.rate_limit_calls,
-            time_window=config.rate_limit_window,
-            name="Finnhub",
-        )
+        self.session = get_http_session("finnhub")
+        self._rate_limiter = get_rate_limiter("Finnhub", config.rate_limit_calls, config.rate_limit_window)
 
     @classmethod
     def from_settings(cls, api_key: Optional[str] = None) -> "FinnhubClient":
@@ -7,7 +7,8 @@ import pandas as pd
 
 from app.config import settings
 from app.exceptions import DataSourceError
-from app.utils.rate_limiter import RateLimiter
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.response_cache import cached_response
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,8 @@ class MassiveClientConfig:
 
 
 class MassiveClient:
+    cache_namespace = "massive"
+
     def __init__(self, config: MassiveClientConfig):
         if not MASSIVE_AVAILABLE:
             raise ImportError("Massive library not available")
@@ -37,7 +40,7 @@ class MassiveClient:
 
         self._config = config
         self._client = RESTClient(config.api_key)
-        self._rate_limiter = RateLimiter(config.rate_limit_calls, config.rate_limit_window)
+        self._rate_limiter = get_rate_limiter("Massive", config.rate_limit_calls, config.rate_limit_window)
 
         logger.info(
             f"Initialized Massive.com client with conservative rate limit: "
@@ -54,6 +57,7 @@ class MassiveClient:
         )
         return cls(config)
 
+    @cached_response("price_data")
     def fetch_price_data(self, symbol: str, **kwargs) -> pd.DataFrame:
         try:
             self._rate_limiter.acquire()
@@ -130,6 +134,7 @@ class MassiveClient:
             logger.error(f"Error fetching price data for {symbol} from Massive.com: {e}")
             raise DataSourceError(f"Failed to fetch price data from Massive.com: {e}") from e
 
+    @cached_response("quote")
     def fetch_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         try:
             trade = self._client.get_last_trade(ticker=symbol.upper())
@@ -157,6 +162,7 @@ class MassiveClient:
             logger.error(f"Error fetching current price for {symbol} from Massive.com: {e}")
             return None
 
+    @cached_response("symbol_details")
     def fetch_symbol_details(self, symbol: str) -> Dict[str, Any]:
         try:
             details = self._client.get_ticker_details(ticker=symbol.upper())
@@ -195,6 +201,7 @@ class MassiveClient:
             logger.error(f"Error fetching symbol details for {symbol} from Massive.com: {e}")
             return {}
 
+    @cached_response("news")
     def fetch_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
         try:
             from massive.rest.models import TickerNews
@@ -240,6 +247,7 @@ class MassiveClient:
             logger.error(f"Error fetching news for {symbol} from Massive.com: {e}")
             return []
 
+    @cached_response("earnings")
     def fetch_earnings(self, symbol: str) -> List[Dict[str, Any]]:
         try:
             if not self._config.api_key:
@@ -274,6 +282,7 @@ class MassiveClient:
             logger.error(f"Error fetching earnings for {symbol} from Massive.com: {e}")
             return []
 
+    @cached_response("technical_indicators")
     def fetch_technical_indicators(self, symbol: str, days: int = 90) -> Dict[str, Any]:
         try:
             indicators: Dict[str, Any] = {}
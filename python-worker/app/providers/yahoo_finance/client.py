@@ -5,7 +5,6 @@ Follows the clean architecture pattern
 """
 import logging
 import time
-import requests
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -15,7 +14,9 @@ import pandas as pd
 import yfinance as yf
 
 from app.config import settings
-from app.utils.rate_limiter import RateLimiter
+from app.utils.http_session import get_http_session
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.response_cache import cached_response
 from app.observability.logging import get_logger
 
 logger = get_logger("yahoo_finance_client")
@@ -36,9 +37,11 @@ class YahooFinanceClient:
     Owns all HTTP logic, rate limiting, retries, and response normalization
     """
     
+    cache_namespace = "yahoo_finance"
+    
     def __init__(self, config: YahooFinanceConfig):
         self.config = config
-        self.session = requests.Session()
+        self.session = get_http_session("yahoo_finance")
         # requests.Session doesn't have a reliable global timeout; pass timeout per request.
 
         # Suppress the noisy 404 error from fundamentals-timeseries endpoint
@@ -46,11 +49,7 @@ class YahooFinanceClient:
         logging.getLogger("yfinance").setLevel(logging.ERROR)
         
         # Rate limiting (conservative for Yahoo Finance)
-        self.rate_limiter = RateLimiter(
-            max_calls=config.rate_limit_calls,
-            time_window=config.rate_limit_window,
-            name="YahooFinance"
-        )
+        self.rate_limiter = get_rate_limiter("YahooFinance", config.rate_limit_calls, config.rate_limit_window)
         
         logger.info(f"✅ Yahoo Finance Client initialized (rate limit: {config.rate_limit_calls}/{config.rate_limit_window}s)")
     
@@ -181,6 +180,7 @@ class YahooFinanceClient:
         out = out.reset_index(drop=True)
         return out
     
+    @cached_response("price_data")
     def fetch_price_data(self, symbol: str, **kwargs) -> pd.DataFrame:
         """
         Fetch historical price data
@@ -243,6 +243,7 @@ class YahooFinanceClient:
             logger.error(f"Failed to fetch price data for {symbol}: {e}")
             raise
     
+    @cached_response("quote")
     def fetch_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
         Fetch current price with volume data
@@ -281,6 +282,7 @@ class YahooFinanceClient:
             logger.warning(f"Failed to fetch current price for {symbol}: {e}")
             return None
     
+    @cached_response("symbol_details")
     def fetch_symbol_details(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch symbol details and company information
@@ -397,6 +399,7 @@ class YahooFinanceClient:
             logger.error(f"Failed to fetch symbol details for {symbol}: {e}")
             raise
     
+    @cached_response("fundamentals")
     def fetch_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch fundamental financial data
@@ -632,6 +635,7 @@ class YahooFinanceClient:
             # Return basic details if financial statements fail
             return self.fetch_symbol_details(symbol)
     
+    @cached_response("news")
     def fetch_news(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Fetch recent news articles
@@ -677,6 +681,7 @@ class YahooFinanceClient:
             logger.error(f"Failed to fetch news for {symbol}: {e}")
             return []
     
+    @cached_response("earnings")
     def fetch_earnings(self, symbol: str) -> List[Dict[str, Any]]:
         """
         Fetch earnings data using the correct calendar API
@@ -737,6 +742,7 @@ class YahooFinanceClient:
         month = datetime.now().month
         return (month - 1) // 3 + 1
     
+    @cached_response("technical_indicators")
     def fetch_technical_indicators(self, symbol: str, indicator_type: str = "SMA", **kwargs) -> Dict[str, Any]:
         """
         Fetch technical indicators (calculated from historical data)
@@ -829,6 +835,7 @@ class YahooFinanceClient:
             logger.error(f"Failed to calculate technical indicators for {symbol}: {e}")
             raise
     
+    @cached_response("industry_peers")
     def fetch_industry_peers(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch industry peers using niche identification from business summary and industryKey.
@@ -932,6 +939,7 @@ class YahooFinanceClient:
             logger.error(f"Failed to fetch industry peers for {symbol}: {e}")
             return {"symbol": symbol, "peers": [], "error": str(e)}
 
+    @cached_response("corporate_actions")
     def fetch_actions(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch corporate actions (dividends/splits) from Yahoo via yfinance."""
         try:
@@ -959,6 +967,7 @@ class YahooFinanceClient:
             logger.warning(f"Failed to fetch actions for {symbol}: {e}")
             return []
 
+    @cached_response("corporate_actions")
     def fetch_dividends(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch dividend time series from Yahoo via yfinance."""
         try:
@@ -980,6 +989,7 @@ class YahooFinanceClient:
             logger.warning(f"Failed to fetch dividends for {symbol}: {e}")
             return []
 
+    @cached_response("corporate_actions")
     def fetch_splits(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch stock split time series from Yahoo via yfinance."""
         try:
@@ -1029,6 +1039,7 @@ class YahooFinanceClient:
 
         return records
 
+    @cached_response("financial_statements")
     def fetch_financial_statements(self, symbol: str, *, quarterly: bool = True) -> Dict[str, Any]:
         """Fetch income statement, balance sheet, and cash flow statements."""
         try:
@@ -1062,6 +1073,7 @@ class YahooFinanceClient:
                 "error": str(e),
             }
 
+    @cached_response("technical_indicators")
     def fetch_daily_indicator_bundle(self, symbol: str, *, period: str = "1y") -> Dict[str, Any]:
         """Compute a standard daily indicator bundle from historical prices.
 
@@ -1195,6 +1207,7 @@ class YahooFinanceClient:
         tmp = tmp[tmp["earnings_date"].notna()]
         return tmp.to_dict(orient="records")
 
+    @cached_response("earnings_calendar")
     def fetch_earnings_for_date(self, earnings_date: str, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         try:
             from yahoo_fin import stock_info as si
@@ -1265,6 +1278,7 @@ class YahooFinanceClient:
             logger.error(f"Failed to fetch earnings calendar (fallback): {e}")
             return []
     
+    @cached_response("earnings_calendar")
     def fetch_earnings_calendar(self, symbols: List[str] = None, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
         """
         Fetch earnings calendar data for multiple symbols and date range.
@@ -1335,6 +1349,7 @@ class YahooFinanceClient:
             logger.error(f"Yahoo Finance service unavailable: {e}")
             return False
 
+    @cached_response("earnings")
     def fetch_quarterly_earnings_history(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch quarterly earnings history from Yahoo income_stmt and cash_flow."""
         ticker = yf.Ticker(symbol)
@@ -1379,6 +1394,7 @@ class YahooFinanceClient:
             pass
         return None
 
+    @cached_response("analyst_recommendations")
     def fetch_analyst_recommendations(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch analyst recommendations via Finnhub fallback if Yahoo not available."""
         # First try Yahoo (if they provide it in the future)
@@ -1388,17 +1404,20 @@ class YahooFinanceClient:
     def _fetch_finnhub_analyst_recommendations(self, symbol: str) -> List[Dict[str, Any]]:
         """Fetch analyst recommendations from Finnhub."""
         import os
-        import requests
+        from app.providers.finnhub.client import FinnhubConfig
 
         api_key = os.getenv("FINNHUB_API_KEY")
         if not api_key:
             logger.info("FINNHUB_API_KEY not set; analyst recommendations unavailable")
             return []  # No mock data
 
-        url = "https://finnhub.io/api/v1/stock/recommendation"
+        # Same pooled session and rate budget as FinnhubClient
+        finnhub = FinnhubConfig(api_key=api_key)
+        url = f"{finnhub.base_url}/stock/recommendation"
         params = {"symbol": symbol, "token": api_key}
         try:
-            response = requests.get(url, params=params, timeout=10)
+            get_rate_limiter("Finnhub", finnhub.rate_limit_calls, finnhub.rate_limit_window).acquire()
+            response = get_http_session("finnhub").get(url, params=params, timeout=finnhub.timeout)
             response.raise_for_status()
             data = response.json()
             if not isinstance(data, list):
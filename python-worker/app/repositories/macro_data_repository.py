@@ -7,6 +7,7 @@ from __future__ import annotations
 from datetime import date
 from typing import Any, Dict, Optional
 
+from app.database import db
 from app.exceptions import DatabaseError
 from app.repositories.base_repository import BaseRepository
 
@@ -27,6 +28,23 @@ class MacroDataRepository(BaseRepository):
         except Exception as e:
             raise DatabaseError(f"Failed to fetch latest macro data: {e}") from e
 
+    @staticmethod
+    def fetch_as_of(as_of: date) -> Optional[Dict[str, Any]]:
+        """Latest macro row on or before as_of."""
+        try:
+            rows = db.execute_query(
+                """
+                SELECT * FROM macro_market_data
+                WHERE data_date <= :as_of
+                ORDER BY data_date DESC
+                LIMIT 1
+                """,
+                {"as_of": as_of},
+            )
+            return rows[0] if rows else None
+        except Exception as e:
+            raise DatabaseError(f"Failed to fetch macro data as of {as_of}: {e}") from e
+
     @staticmethod
     def save_macro_data(payload: Dict[str, Any]) -> int:
         """Upsert macro data by data_date."""
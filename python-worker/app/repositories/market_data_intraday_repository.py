@@ -44,16 +44,21 @@ class MarketDataIntradayRepository(BaseRepository):
             }
             for r in rows
         ]
+        return MarketDataIntradayRepository.upsert_records(rows_list)
+
+    @staticmethod
+    def upsert_records(rows: List[Dict[str, Any]]) -> int:
+        """Upsert rows already keyed by table column (see app.utils.intraday_bars.intraday_bar_records)."""
         try:
             return BaseRepository.upsert_many(
                 table="raw_market_data_intraday",
                 unique_columns=["symbol", "ts", "interval", "data_source"],  # Include data_source to match actual constraint
-                rows=rows_list,
+                rows=rows,
             )
         except Exception as e:
             raise DatabaseError(
                 f"Failed to upsert intraday market data: {e}",
-                details={"rows": len(rows_list)},
+                details={"rows": len(rows)},
             ) from e
 
     @staticmethod
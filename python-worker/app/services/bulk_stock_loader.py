@@ -6,10 +6,11 @@ Populate stocks table with comprehensive stock information from various sources
 import asyncio
 import aiohttp
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 import logging
 from sqlalchemy import create_engine, text
 from app.config import settings
+from app.utils.adaptive_concurrency import AIMDController, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,8 @@ class BulkStockLoader:
         self.engine = create_engine(settings.database_url)
         self.loaded_symbols = set()
         self.failed_symbols = []
+        # Adaptive concurrency window (created per load; exposed in bulk task status)
+        self.controller: Optional[AIMDController] = None
         
     def get_existing_symbols(self) -> set:
         """Get symbols already in the database"""
@@ -98,72 +101,88 @@ class BulkStockLoader:
             "DIS", "NFLX", "UBER", "LYFT", "TWTR", "SNAP", "EA", "ATVI"
         ]
     
-    async def fetch_yahoo_finance_info(self, session: aiohttp.ClientSession, symbol: str) -> Dict[str, Any]:
-        """Fetch stock information from Yahoo Finance API with retry logic"""
+    async def fetch_yahoo_finance_info(
+        self,
+        session: aiohttp.ClientSession,
+        symbol: str,
+        controller: Optional[AIMDController] = None,
+    ) -> Dict[str, Any]:
+        """Fetch stock information from Yahoo Finance API with retry logic
+
+        With a controller, concurrency and backoff are adaptive: 429/5xx halve the
+        window and Retry-After pauses new requests; otherwise fixed exponential backoff.
+        """
         max_retries = 3
         base_delay = 2.0  # Start with 2 second delay
+        controller = controller or AIMDController(initial=1, max_limit=1)
         
         for attempt in range(max_retries):
+            started_at = None
+            backoff = None
             try:
                 url = f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
                 params = {
                     "modules": "summaryDetail,assetProfile,defaultKeyStatistics,price"
                 }
                 
-                # Add delay between requests to avoid rate limiting
-                if attempt > 0:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    await asyncio.sleep(delay)
-                
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        result = data.get('quoteSummary', {}).get('result', [])
-                        if result:
-                            quote_data = result[0]
-                            
-                            # Extract information from different modules
-                            summary_detail = quote_data.get('summaryDetail', {})
-                            asset_profile = quote_data.get('assetProfile', {})
-                            key_stats = quote_data.get('defaultKeyStatistics', {})
-                            price_info = quote_data.get('price', {})
-                            
-                            return {
-                                'symbol': symbol,
-                                'company_name': asset_profile.get('longName') or asset_profile.get('shortName') or symbol,
-                                'sector': asset_profile.get('sector'),
-                                'industry': asset_profile.get('industry'),
-                                'market_cap': summary_detail.get('marketCap', {}).get('raw'),
-                                'country': asset_profile.get('country'),
-                                'currency': summary_detail.get('currency', 'USD'),
-                                'exchange': price_info.get('exchangeName') or summary_detail.get('exchange'),
-                                'current_price': price_info.get('regularMarketPrice', {}).get('raw'),
-                                'success': True
-                            }
-                    
-                    elif response.status == 429:
-                        # Rate limited - wait and retry
-                        if attempt < max_retries - 1:
-                            wait_time = base_delay * (2 ** attempt)
-                            logger.warning(f"Rate limited for {symbol}, waiting {wait_time}s (attempt {attempt + 1}/{max_retries})")
-                            await asyncio.sleep(wait_time)
-                            continue
+                async with controller.slot() as started_at:
+                    async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                        if response.status == 429 or response.status >= 500:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            controller.on_throttle(started_at, retry_after)
+                            if attempt == max_retries - 1:
+                                if response.status == 429:
+                                    return {'symbol': symbol, 'success': False, 'error': 'Rate limit exceeded after retries'}
+                                return {'symbol': symbol, 'success': False, 'error': f'HTTP {response.status}'}
+                            wait_time = retry_after if retry_after is not None else base_delay * (2 ** attempt)
+                            logger.warning(f"HTTP {response.status} for {symbol}, retrying in {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
+                            # Retry-After is enforced by the controller for every caller
+                            backoff = 0.0 if retry_after is not None else wait_time
                         else:
-                            return {'symbol': symbol, 'success': False, 'error': 'Rate limit exceeded after retries'}
-                    
-                    return {'symbol': symbol, 'success': False, 'error': f'HTTP {response.status}'}
+                            controller.on_success(started_at)
+                            if response.status == 200:
+                                data = await response.json()
+                                
+                                result = data.get('quoteSummary', {}).get('result', [])
+                                if result:
+                                    quote_data = result[0]
+                                    
+                                    # Extract information from different modules
+                                    summary_detail = quote_data.get('summaryDetail', {})
+                                    asset_profile = quote_data.get('assetProfile', {})
+                                    key_stats = quote_data.get('defaultKeyStatistics', {})
+                                    price_info = quote_data.get('price', {})
+                                    
+                                    return {
+                                        'symbol': symbol,
+                                        'company_name': asset_profile.get('longName') or asset_profile.get('shortName') or symbol,
+                                        'sector': asset_profile.get('sector'),
+                                        'industry': asset_profile.get('industry'),
+                                        'market_cap': summary_detail.get('marketCap', {}).get('raw'),
+                                        'country': asset_profile.get('country'),
+                                        'currency': summary_detail.get('currency', 'USD'),
+                                        'exchange': price_info.get('exchangeName') or summary_detail.get('exchange'),
+                                        'current_price': price_info.get('regularMarketPrice', {}).get('raw'),
+                                        'success': True
+                                    }
+                            
+                            return {'symbol': symbol, 'success': False, 'error': f'HTTP {response.status}'}
                     
             except asyncio.TimeoutError:
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(base_delay * (attempt + 1))
-                    continue
-                return {'symbol': symbol, 'success': False, 'error': 'Timeout after retries'}
+                # Blame the round trip that timed out, so concurrent timeouts shrink the window once
+                if started_at is not None:
+                    controller.on_error(started_at)
+                backoff = base_delay * (attempt + 1)
+                if attempt == max_retries - 1:
+                    return {'symbol': symbol, 'success': False, 'error': 'Timeout after retries'}
             except Exception as e:
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(base_delay * (attempt + 1))
-                    continue
-                return {'symbol': symbol, 'success': False, 'error': str(e)}
+                backoff = base_delay * (attempt + 1)
+                if attempt == max_retries - 1:
+                    return {'symbol': symbol, 'success': False, 'error': str(e)}
+            
+            # Back off outside the slot so a waiting retry doesn't hold concurrency
+            if backoff:
+                await asyncio.sleep(backoff)
         
         return {'symbol': symbol, 'success': False, 'error': 'Max retries exceeded'}
     
@@ -210,8 +229,22 @@ class BulkStockLoader:
             logger.error(f"Error inserting {stock_info['symbol']}: {e}")
             return False
     
-    async def load_stocks_batch(self, symbols: List[str], batch_size: int = 5) -> Dict[str, Any]:
-        """Load stocks in batches to avoid rate limiting"""
+    async def load_stocks_batch(
+        self,
+        symbols: List[str],
+        batch_size: int = 5,
+        on_progress: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Load stocks with an adaptive concurrency window
+
+        batch_size is the starting window; AIMD grows it while the provider is fast and
+        halves it on throttling, so there are no fixed sleeps between requests.
+
+        Args:
+            symbols: Symbols to load
+            batch_size: Initial concurrency window
+            on_progress: Optional callback(completed_count, controller_snapshot)
+        """
         results = {
             'total': len(symbols),
             'loaded': 0,
@@ -221,71 +254,74 @@ class BulkStockLoader:
         }
         
         existing_symbols = self.get_existing_symbols()
+        self.controller = AIMDController(initial=batch_size, max_limit=settings.bulk_load_max_concurrency)
+        controller = self.controller
+        completed = 0
         
         async with aiohttp.ClientSession() as session:
-            for i in range(0, len(symbols), batch_size):
-                batch = symbols[i:i + batch_size]
+            async def fetch(symbol: str) -> Dict[str, Any]:
+                nonlocal completed
+                if symbol in existing_symbols:
+                    result = {'symbol': symbol, 'success': True, 'existing': True}
+                else:
+                    result = await self.fetch_yahoo_finance_info(session, symbol, controller)
+                completed += 1
+                if on_progress:
+                    on_progress(completed, controller.snapshot())
+                return result
+            
+            # The controller gates how many of these are in flight at once
+            batch_results = await asyncio.gather(
+                *(fetch(symbol) for symbol in symbols), return_exceptions=True
+            )
+            
+            for result in batch_results:
+                if isinstance(result, Exception):
+                    logger.error(f"Exception in batch processing: {result}")
+                    results['failed'] += 1
+                    continue
                 
-                logger.info(f"Processing batch {i//batch_size + 1}/{(len(symbols) + batch_size - 1)//batch_size}")
+                symbol = result['symbol']
                 
-                # Fetch batch data sequentially to avoid rate limiting
-                batch_results = []
-                for symbol in batch:
-                    result = await self.fetch_yahoo_finance_info(session, symbol)
-                    batch_results.append(result)
-                    # Add delay between individual requests
-                    await asyncio.sleep(1.0)  # 1 second between requests
+                # Skip if already exists
+                if symbol in existing_symbols:
+                    results['skipped'] += 1
+                    results['details'].append({
+                        'symbol': symbol,
+                        'status': 'skipped',
+                        'reason': 'Already exists'
+                    })
+                    continue
                 
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Exception in batch processing: {result}")
-                        results['failed'] += 1
-                        continue
-                    
-                    symbol = result['symbol']
-                    
-                    # Skip if already exists
-                    if symbol in existing_symbols:
-                        results['skipped'] += 1
+                # Process successful fetch
+                if result.get('success'):
+                    if self.insert_stock_data(result):
+                        results['loaded'] += 1
                         results['details'].append({
                             'symbol': symbol,
-                            'status': 'skipped',
-                            'reason': 'Already exists'
+                            'status': 'loaded',
+                            'company': result.get('company_name'),
+                            'sector': result.get('sector')
                         })
-                        continue
-                    
-                    # Process successful fetch
-                    if result.get('success'):
-                        if self.insert_stock_data(result):
-                            results['loaded'] += 1
-                            results['details'].append({
-                                'symbol': symbol,
-                                'status': 'loaded',
-                                'company': result.get('company_name'),
-                                'sector': result.get('sector')
-                            })
-                            logger.info(f"✅ Loaded: {symbol} - {result.get('company_name')}")
-                        else:
-                            results['failed'] += 1
-                            results['details'].append({
-                                'symbol': symbol,
-                                'status': 'failed',
-                                'reason': 'Database insert failed'
-                            })
+                        logger.info(f"✅ Loaded: {symbol} - {result.get('company_name')}")
                     else:
                         results['failed'] += 1
-                        self.failed_symbols.append(symbol)
                         results['details'].append({
                             'symbol': symbol,
                             'status': 'failed',
-                            'reason': result.get('error', 'Unknown error')
+                            'reason': 'Database insert failed'
                         })
-                        logger.warning(f"❌ Failed: {symbol} - {result.get('error')}")
-                
-                # Rate limiting - longer delay between batches
-                if i + batch_size < len(symbols):
-                    await asyncio.sleep(3.0)  # 3 seconds between batches
-        
+                else:
+                    results['failed'] += 1
+                    self.failed_symbols.append(symbol)
+                    results['details'].append({
+                        'symbol': symbol,
+                        'status': 'failed',
+                        'reason': result.get('error', 'Unknown error')
+                    })
+                    logger.warning(f"❌ Failed: {symbol} - {result.get('error')}")
+    
+        results['concurrency'] = controller.snapshot()
         return results
     
     async def load_all_popular_stocks(self) -> Dict[str, Any]:
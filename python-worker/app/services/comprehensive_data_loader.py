@@ -18,6 +18,8 @@ from app.observability import audit
 from app.observability.context import get_ingestion_run_id, set_ingestion_run_id
 from app.utils.technical_calculator import TechnicalIndicatorCalculator
 from app.utils.data_converter import DataConverter, SafeDatabaseOperations
+from app.utils.intraday_bars import normalize_intraday_bars, intraday_bar_records
+from app.repositories.market_data_intraday_repository import MarketDataIntradayRepository
 from sqlalchemy import text
 
 logger = get_logger("comprehensive_data_loader")
@@ -508,75 +510,20 @@ class ComprehensiveDataLoader(BaseService):
             duration = (datetime.now() - start_time).total_seconds()
             return LoadResult(False, 0, "earnings", "alphavantage", str(e), duration)
     
-    def _save_intraday_data(self, price_data: pd.DataFrame, symbol: str, source: str) -> int:
-        """Save intraday price data to database"""
+    def _save_intraday_data(self, price_data: pd.DataFrame, symbol: str, source: str, interval: str = "15m") -> int:
+        """Save intraday price data to database (vectorized normalize + one bulk upsert)"""
         try:
-            records = []
-            
-            for timestamp, row in price_data.iterrows():
-                records.append({
-                    'symbol': symbol,
-                    'timestamp': timestamp,
-                    'open_price': float(row['open']),
-                    'high_price': float(row['high']),
-                    'low_price': float(row['low']),
-                    'close_price': float(row['close']),
-                    'volume': int(row['volume']),
-                    'data_source': source,
-                    'created_at': datetime.now()
-                })
-            
+            bars = normalize_intraday_bars(price_data)
+            records = intraday_bar_records(bars, symbol=symbol, interval=interval, source=source)
+            if not records:
+                return 0
+
             logger.info(f"💾 Saving {len(records)} intraday price records to database...")
-            
-            with db.get_session() as session:
-                saved_count = 0
-                for i, record in enumerate(records):
-                    try:
-                        # Try simple INSERT first, ignore duplicates
-                        session.execute(text("""
-                            INSERT INTO raw_market_data_intraday (
-                                symbol, timestamp, open_price, high_price, low_price, close_price, volume,
-                                data_source, created_at
-                            ) VALUES (
-                                :symbol, :timestamp, :open_price, :high_price, :low_price, :close_price, :volume,
-                                :data_source, :created_at
-                            )
-                        """), record)
-                        saved_count += 1
-                        
-                        # Commit every 50 records to avoid large transactions
-                        if (i + 1) % 50 == 0:
-                            session.commit()
-                            logger.debug(f"Committed {saved_count} intraday records so far...")
-                            
-                    except Exception as e:
-                        # Check if it's a duplicate key error and ignore it
-                        if "duplicate key" in str(e).lower() or "unique constraint" in str(e).lower():
-                            logger.debug(f"Ignoring duplicate intraday record: {record}")
-                        else:
-                            logger.error(f"Error saving intraday record {record}: {type(e).__name__}: {str(e)}")
-                        
-                        # Rollback the current transaction and start fresh
-                        try:
-                            session.rollback()
-                        except Exception as rollback_error:
-                            logger.error(f"Error during rollback: {rollback_error}")
-                        continue
-                
-                # Final commit for any remaining records
-                try:
-                    session.commit()
-                    logger.info(f"✅ Successfully saved {saved_count} intraday price records to database")
-                except Exception as final_commit_error:
-                    logger.error(f"Error during final commit: {final_commit_error}")
-                    try:
-                        session.rollback()
-                    except Exception as rollback_error:
-                        logger.error(f"Error during final rollback: {rollback_error}")
-                    return 0
-                
-                return saved_count
-                
+            # Upsert makes re-loads idempotent (no per-row duplicate-key handling needed)
+            saved_count = MarketDataIntradayRepository.upsert_records(records)
+            logger.info(f"✅ Successfully saved {saved_count} intraday price records to database")
+            return saved_count
+
         except Exception as e:
             logger.error(f"❌ Error saving intraday price data: {type(e).__name__}: {str(e)}")
             import traceback
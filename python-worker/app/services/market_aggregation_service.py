@@ -0,0 +1,113 @@
+"""
+Market Aggregation Service
+Sector, industry and market-cap performance of the tracked universe in one aggregation pass
+Performance: one GROUPING SETS query over per-symbol returns feeds sector performance and market trends
+"""
+from typing import Dict, Any, List
+
+from app.database import db
+from app.services.base import BaseService
+from app.exceptions import DatabaseError
+
+# Market-cap tiers reported by market trends
+MARKET_CAP_CATEGORIES = ('mega', 'large', 'mid', 'small', 'micro')
+
+# Change (percent) beyond which a stock counts as a gainer / loser
+GAINER_THRESHOLD = 5
+
+
+class MarketAggregationService(BaseService):
+    """
+    Group performance for sectors, industries and market-cap tiers
+
+    Every symbol in holdings or watchlist items is classified once (holdings
+    first, then watchlist items) and gets one return (its watchlist
+    price_change_percent_since_added), so a stock on several watchlists is
+    weighted once in every group.
+    """
+
+    def __init__(self):
+        """Initialize market aggregation service"""
+        super().__init__()
+
+    def calculate_group_performance(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Performance per sector, industry and market-cap category
+
+        Returns:
+            {'sector': [...], 'industry': [...], 'market_cap': [...]}; each entry has
+            category, total_stocks, priced_stocks, avg_price_change_percent (None
+            when no stock of the group has a return), gainers/losers/neutral counts
+            and top_stocks (best five by change)
+        """
+        try:
+            rows = db.execute_query(
+                f"""
+                WITH members AS (
+                    SELECT stock_symbol, NULLIF(sector, '') AS sector, NULLIF(industry, '') AS industry,
+                           NULLIF(market_cap_category, '') AS market_cap_category, 0 AS source
+                    FROM holdings
+                    UNION ALL
+                    SELECT stock_symbol, NULLIF(sector, ''), NULLIF(industry, ''),
+                           NULLIF(market_cap_category, ''), 1
+                    FROM watchlist_items
+                ),
+                classified AS (
+                    SELECT stock_symbol,
+                           (ARRAY_AGG(sector ORDER BY source) FILTER (WHERE sector IS NOT NULL))[1] AS sector,
+                           (ARRAY_AGG(industry ORDER BY source) FILTER (WHERE industry IS NOT NULL))[1] AS industry,
+                           (ARRAY_AGG(market_cap_category ORDER BY source)
+                               FILTER (WHERE market_cap_category IS NOT NULL))[1] AS market_cap_category
+                    FROM members
+                    GROUP BY stock_symbol
+                ),
+                returns AS (
+                    SELECT stock_symbol,
+                           (ARRAY_AGG(price_change_percent_since_added)
+                               FILTER (WHERE price_change_percent_since_added IS NOT NULL))[1] AS change_pct
+                    FROM watchlist_items
+                    GROUP BY stock_symbol
+                ),
+                universe AS (
+                    SELECT c.stock_symbol, c.sector, c.industry, c.market_cap_category, r.change_pct
+                    FROM classified c
+                    LEFT JOIN returns r ON r.stock_symbol = c.stock_symbol
+                )
+                SELECT
+                    CASE WHEN GROUPING(sector) = 0 THEN 'sector'
+                         WHEN GROUPING(industry) = 0 THEN 'industry'
+                         ELSE 'market_cap' END AS group_type,
+                    COALESCE(sector, industry, market_cap_category) AS category,
+                    COUNT(*) AS total_stocks,
+                    COUNT(change_pct) AS priced_stocks,
+                    AVG(change_pct) AS avg_change,
+                    COUNT(*) FILTER (WHERE change_pct > {GAINER_THRESHOLD}) AS gainers_count,
+                    COUNT(*) FILTER (WHERE change_pct < -{GAINER_THRESHOLD}) AS losers_count,
+                    COUNT(*) FILTER (WHERE change_pct BETWEEN -{GAINER_THRESHOLD} AND {GAINER_THRESHOLD}) AS neutral_count,
+                    (ARRAY_AGG(stock_symbol ORDER BY change_pct DESC) FILTER (WHERE change_pct IS NOT NULL))[1:5] AS top_symbols,
+                    (ARRAY_AGG(change_pct ORDER BY change_pct DESC) FILTER (WHERE change_pct IS NOT NULL))[1:5] AS top_changes
+                FROM universe
+                GROUP BY GROUPING SETS ((sector), (industry), (market_cap_category))
+                HAVING COALESCE(sector, industry, market_cap_category) IS NOT NULL
+                """
+            )
+        except Exception as e:
+            self.log_error("Error calculating group performance", e)
+            raise DatabaseError(f"Failed to calculate group performance: {str(e)}") from e
+
+        groups: Dict[str, List[Dict[str, Any]]] = {'sector': [], 'industry': [], 'market_cap': []}
+        for r in rows or []:
+            groups[r['group_type']].append({
+                "category": r['category'],
+                "total_stocks": int(r['total_stocks']),
+                "priced_stocks": int(r['priced_stocks']),
+                "avg_price_change_percent": float(r['avg_change']) if r['avg_change'] is not None else None,
+                "gainers_count": int(r['gainers_count']),
+                "losers_count": int(r['losers_count']),
+                "neutral_count": int(r['neutral_count']),
+                "top_stocks": [
+                    {"symbol": symbol, "change_percent": float(change)}
+                    for symbol, change in zip(r.get('top_symbols') or [], r.get('top_changes') or [])
+                ]
+            })
+        return groups
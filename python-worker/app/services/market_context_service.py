@@ -4,7 +4,7 @@ Detects market regime and provides market context for signal engines
 """
 
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pandas as pd
 import numpy as np
 
@@ -21,16 +21,19 @@ class MarketContextService:
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
     
-    def get_market_context(self) -> MarketContext:
+    def get_market_context(self, as_of: Optional[date] = None) -> MarketContext:
         """
         Get current market context with regime detection
         
+        Args:
+            as_of: Use the macro data of this date (latest on or before it) instead of the latest
+        
         Returns:
             MarketContext with current market state
         """
         try:
             # Get macro data
-            macro_data = self._get_latest_macro_data()
+            macro_data = self._get_latest_macro_data(as_of)
             
             # Detect market regime
             regime, regime_confidence = self._detect_market_regime(macro_data)
@@ -72,11 +75,11 @@ class MarketContextService:
                 timestamp=datetime.utcnow()
             )
     
-    def _get_latest_macro_data(self) -> Dict[str, Any]:
-        """Get latest macro data from database"""
+    def _get_latest_macro_data(self, as_of: Optional[date] = None) -> Dict[str, Any]:
+        """Get latest macro data (on or before as_of) from database"""
         try:
             # Get most recent macro data
-            macro_data = MacroDataRepository.fetch_latest()
+            macro_data = MacroDataRepository.fetch_as_of(as_of) if as_of else MacroDataRepository.fetch_latest()
             
             if not macro_data:
                 # Return defaults if no data available
@@ -2,11 +2,14 @@
 Market Movers Service
 Identifies top gainers, losers, and most active stocks
 Industry Standard: Market movers calculation
+Performance: one window-function query for the whole universe, one bulk snapshot insert
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from datetime import datetime, date, timedelta
 from enum import Enum
 
+import numpy as np
+
 from app.database import db
 from app.services.base import BaseService
 from app.exceptions import DatabaseError, ValidationError
@@ -29,6 +32,17 @@ class Period(Enum):
     YTD = "ytd"
 
 
+def _top_indices(values: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the limit largest values, largest first (argpartition, then sort only those)"""
+    if limit <= 0 or values.size == 0:
+        return np.array([], dtype=int)
+    if values.size > limit:
+        candidates = np.argpartition(-values, limit - 1)[:limit]
+    else:
+        candidates = np.arange(values.size)
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
 class MarketMoversService(BaseService):
     """
     Service for calculating and retrieving market movers
@@ -57,19 +71,10 @@ class MarketMoversService(BaseService):
             end_date = date.today()
             start_date = self._get_start_date_for_period(period, end_date)
             
-            # Get all symbols with price data in the period
-            query = """
-                SELECT DISTINCT stock_symbol
-                FROM live_prices
-                WHERE timestamp >= :start_date
-                ORDER BY stock_symbol
-            """
-            symbols_result = db.execute_query(query, {
-                "start_date": start_date.isoformat()
-            })
-            symbols = [s['stock_symbol'] for s in symbols_result]
+            # Change, volume and sector for every symbol with prices in the period (one query)
+            movers = self._calculate_movers(start_date, end_date, period)
             
-            if not symbols:
+            if not movers:
                 return {
                     "gainers": [],
                     "losers": [],
@@ -78,38 +83,23 @@ class MarketMoversService(BaseService):
                     "timestamp": datetime.now().isoformat()
                 }
             
-            # Calculate movers for each symbol
-            movers = []
-            for symbol in symbols:
-                mover_data = self._calculate_symbol_mover(symbol, start_date, end_date, period)
-                if mover_data:
-                    movers.append(mover_data)
-            
-            # Sort and get top movers
-            gainers = sorted(
-                [m for m in movers if m['price_change_percent'] > 0],
-                key=lambda x: x['price_change_percent'],
-                reverse=True
-            )[:limit]
+            # Top movers: partial selection instead of sorting the whole universe
+            change_percent = np.array([m['price_change_percent'] for m in movers], dtype=float)
+            volume = np.array([m.get('volume') or 0 for m in movers], dtype=float)
             
-            losers = sorted(
-                [m for m in movers if m['price_change_percent'] < 0],
-                key=lambda x: x['price_change_percent']
-            )[:limit]
-            
-            most_active = sorted(
-                movers,
-                key=lambda x: x.get('volume', 0),
-                reverse=True
-            )[:limit]
+            gainers_idx = np.flatnonzero(change_percent > 0)
+            gainers_idx = gainers_idx[_top_indices(change_percent[gainers_idx], limit)]
+            losers_idx = np.flatnonzero(change_percent < 0)
+            losers_idx = losers_idx[_top_indices(-change_percent[losers_idx], limit)]
+            most_active_idx = _top_indices(volume, limit)
             
             # Save to database
             self._save_market_movers(movers, period)
             
             return {
-                "gainers": gainers,
-                "losers": losers,
-                "most_active": most_active,
+                "gainers": [movers[i] for i in gainers_idx],
+                "losers": [movers[i] for i in losers_idx],
+                "most_active": [movers[i] for i in most_active_idx],
                 "period": period,
                 "timestamp": datetime.now().isoformat()
             }
@@ -192,103 +182,102 @@ class MarketMoversService(BaseService):
             self.log_error("Error getting market movers", e, context={'period': period})
             raise DatabaseError(f"Failed to get market movers: {str(e)}", details={'period': period}) from e
     
-    def _calculate_symbol_mover(self, symbol: str, start_date: date, end_date: date, period: str) -> Optional[Dict[str, Any]]:
-        """Calculate mover data for a single symbol"""
-        try:
-            # Get first and last price in period
-            query = """
-                SELECT price, volume, timestamp
-                FROM live_prices
-                WHERE stock_symbol = :symbol
-                  AND date(timestamp) >= :start_date
-                  AND date(timestamp) <= :end_date
-                ORDER BY timestamp ASC
-                LIMIT 1
-            """
-            first_result = db.execute_query(query, {
-                "symbol": symbol,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat()
-            })
-            
-            query = """
-                SELECT price, volume, timestamp
-                FROM live_prices
-                WHERE stock_symbol = :symbol
-                  AND date(timestamp) >= :start_date
-                  AND date(timestamp) <= :end_date
-                ORDER BY timestamp DESC
-                LIMIT 1
+    def _calculate_movers(self, start_date: date, end_date: date, period: str) -> List[Dict[str, Any]]:
+        """
+        Mover data for every symbol with live prices in [start_date, end_date]
+        
+        First/last price and total volume come from window functions over the
+        period's price rows; sector/industry from holdings, else watchlist items.
+        """
+        rows = db.execute_query(
             """
-            last_result = db.execute_query(query, {
-                "symbol": symbol,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat()
-            })
-            
-            if not first_result or not last_result:
-                return None
-            
-            first_price = first_result[0]['price']
-            last_price = last_result[0]['price']
-            
-            # Get total volume
-            volume_query = """
-                SELECT COALESCE(SUM(volume), 0) as total_volume
+            WITH windowed AS (
+                SELECT stock_symbol,
+                       FIRST_VALUE(price) OVER w AS first_price,
+                       LAST_VALUE(price) OVER w AS last_price,
+                       SUM(COALESCE(volume, 0)) OVER w AS total_volume,
+                       ROW_NUMBER() OVER (PARTITION BY stock_symbol ORDER BY timestamp DESC) AS rn
                 FROM live_prices
-                WHERE stock_symbol = :symbol
-                  AND date(timestamp) >= :start_date
-                  AND date(timestamp) <= :end_date
-            """
-            volume_result = db.execute_query(volume_query, {
-                "symbol": symbol,
+                WHERE timestamp >= :start_date AND timestamp < :end_date
+                WINDOW w AS (
+                    PARTITION BY stock_symbol ORDER BY timestamp
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                )
+            ),
+            classification AS (
+                SELECT DISTINCT ON (stock_symbol) stock_symbol, sector, industry
+                FROM (
+                    SELECT stock_symbol, sector, industry, 0 AS source FROM holdings WHERE sector IS NOT NULL
+                    UNION ALL
+                    SELECT stock_symbol, sector, industry, 1 AS source FROM watchlist_items WHERE sector IS NOT NULL
+                ) tagged
+                ORDER BY stock_symbol, source
+            )
+            SELECT w.stock_symbol,
+                   w.last_price - w.first_price AS price_change,
+                   CASE WHEN w.first_price > 0
+                        THEN (w.last_price - w.first_price) / w.first_price * 100
+                        ELSE 0 END AS price_change_percent,
+                   w.total_volume,
+                   c.sector,
+                   c.industry
+            FROM windowed w
+            LEFT JOIN classification c ON c.stock_symbol = w.stock_symbol
+            WHERE w.rn = 1
+            ORDER BY w.stock_symbol
+            """,
+            {
                 "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat()
-            })
-            total_volume = volume_result[0]['total_volume'] if volume_result else 0
-            
-            price_change = last_price - first_price
-            price_change_percent = (price_change / first_price * 100) if first_price > 0 else 0
-            
-            # Get sector/industry from holdings or watchlists
-            sector_query = """
-                SELECT sector FROM holdings WHERE stock_symbol = :symbol LIMIT 1
-                UNION
-                SELECT sector FROM watchlist_items WHERE stock_symbol = :symbol LIMIT 1
-            """
-            sector_result = db.execute_query(sector_query, {"symbol": symbol})
-            sector = sector_result[0]['sector'] if sector_result else None
-            
-            return {
-                "symbol": symbol,
-                "price_change": price_change,
-                "price_change_percent": price_change_percent,
-                "volume": total_volume,
-                "sector": sector,
+                "end_date": (end_date + timedelta(days=1)).isoformat()
+            }
+        )
+        return [
+            {
+                "symbol": r['stock_symbol'],
+                "price_change": float(r['price_change']),
+                "price_change_percent": float(r['price_change_percent']),
+                "volume": int(r['total_volume'] or 0),
+                "sector": r.get('sector'),
+                "industry": r.get('industry'),
                 "period": period
             }
-            
-        except Exception as e:
-            self.log_warning(f"Error calculating mover for {symbol}", context={'symbol': symbol, 'error': str(e)})
-            return None
+            for r in rows or []
+        ]
     
     def _save_market_movers(self, movers: List[Dict[str, Any]], period: str):
-        """Save market movers to database"""
+        """Save the market movers snapshot to database (one statement)"""
         try:
-            for mover in movers:
-                query = """
-                    INSERT OR REPLACE INTO market_movers
-                    (stock_symbol, period, price_change, price_change_percent, volume, sector, timestamp)
-                    VALUES (:symbol, :period, :price_change, :price_change_percent, :volume, :sector, CURRENT_TIMESTAMP)
+            db.execute_update(
                 """
-                db.execute_update(query, {
-                    "symbol": mover['symbol'],
+                INSERT INTO market_movers
+                (stock_symbol, period, price_change, price_change_percent, volume, sector, industry, timestamp)
+                SELECT m.stock_symbol, :period, m.price_change, m.price_change_percent, m.volume,
+                       m.sector, m.industry, CURRENT_TIMESTAMP
+                FROM unnest(
+                    CAST(:symbols AS text[]),
+                    CAST(:price_changes AS real[]),
+                    CAST(:price_change_percents AS real[]),
+                    CAST(:volumes AS bigint[]),
+                    CAST(:sectors AS text[]),
+                    CAST(:industries AS text[])
+                ) AS m(stock_symbol, price_change, price_change_percent, volume, sector, industry)
+                ON CONFLICT (stock_symbol, period, timestamp) DO UPDATE SET
+                    price_change = EXCLUDED.price_change,
+                    price_change_percent = EXCLUDED.price_change_percent,
+                    volume = EXCLUDED.volume,
+                    sector = EXCLUDED.sector,
+                    industry = EXCLUDED.industry
+                """,
+                {
                     "period": period,
-                    "price_change": mover['price_change'],
-                    "price_change_percent": mover['price_change_percent'],
-                    "volume": mover.get('volume', 0),
-                    "sector": mover.get('sector')
-                })
+                    "symbols": [m['symbol'] for m in movers],
+                    "price_changes": [m['price_change'] for m in movers],
+                    "price_change_percents": [m['price_change_percent'] for m in movers],
+                    "volumes": [m.get('volume', 0) for m in movers],
+                    "sectors": [m.get('sector') for m in movers],
+                    "industries": [m.get('industry') for m in movers]
+                }
+            )
         except Exception as e:
             self.log_error("Error saving market movers", e, context={'period': period})
             # Don't raise - this is non-critical
@@ -2,6 +2,7 @@
 Market Trends Service
 Calculates market trends for heat maps and trend analysis
 Industry Standard: Market trend analysis and visualization
+Performance: built from the shared grouping-sets aggregation, saved with one bulk upsert
 """
 import logging
 from typing import Dict, Any, List, Optional
@@ -9,11 +10,25 @@ from datetime import datetime, date
 
 from app.database import db
 from app.services.base import BaseService
+from app.services.market_aggregation_service import MARKET_CAP_CATEGORIES, MarketAggregationService
 from app.exceptions import DatabaseError, ValidationError
 
 logger = logging.getLogger(__name__)
 
 
+def _strength(trend_score: float) -> str:
+    """Strength label for a trend score (-100 to 100)"""
+    if abs(trend_score) >= 80:
+        return "very_strong"
+    elif abs(trend_score) >= 50:
+        return "strong"
+    elif abs(trend_score) >= 20:
+        return "moderate"
+    elif abs(trend_score) >= 10:
+        return "weak"
+    return "very_weak"
+
+
 class MarketTrendsService(BaseService):
     """
     Service for calculating market trends
@@ -25,12 +40,18 @@ class MarketTrendsService(BaseService):
         """Initialize market trends service"""
         super().__init__()
     
-    def calculate_market_trends(self, snapshot_date: date = None) -> Dict[str, Any]:
+    def calculate_market_trends(
+        self,
+        snapshot_date: date = None,
+        groups: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate market trends for sectors, industries, and market cap categories
         
         Args:
             snapshot_date: Date for snapshot (default: today)
+            groups: Precomputed MarketAggregationService.calculate_group_performance()
+                result (computed here if not given)
         
         Returns:
             Dictionary with trend data
@@ -39,14 +60,30 @@ class MarketTrendsService(BaseService):
             snapshot_date = date.today()
         
         try:
-            # Calculate sector trends
-            sector_trends = self._calculate_sector_trends(snapshot_date)
+            # Sector, industry and market cap performance come from one aggregation pass
+            if groups is None:
+                groups = MarketAggregationService().calculate_group_performance()
+            
+            # Calculate sector trends (sectors without returns count as flat)
+            sector_trends = [
+                self._build_trend(group['category'], group['avg_price_change_percent'] or 0)
+                for group in groups.get('sector', [])
+            ]
             
             # Calculate industry trends
-            industry_trends = self._calculate_industry_trends(snapshot_date)
+            industry_trends = [
+                self._build_trend(group['category'], group['avg_price_change_percent'])
+                for group in groups.get('industry', [])
+                if group['avg_price_change_percent'] is not None
+            ]
             
-            # Calculate market cap trends
-            market_cap_trends = self._calculate_market_cap_trends(snapshot_date)
+            # Calculate market cap trends (in tier order)
+            by_tier = {group['category']: group for group in groups.get('market_cap', [])}
+            market_cap_trends = [
+                self._build_trend(tier, by_tier[tier]['avg_price_change_percent'])
+                for tier in MARKET_CAP_CATEGORIES
+                if tier in by_tier and by_tier[tier]['avg_price_change_percent'] is not None
+            ]
             
             # Calculate overall market trend
             overall_trend = self._calculate_overall_trend(sector_trends)
@@ -119,147 +156,17 @@ class MarketTrendsService(BaseService):
             logger.error(f"Error getting market trends: {e}", exc_info=True)
             raise DatabaseError(f"Failed to get market trends: {str(e)}") from e
     
-    def _calculate_sector_trends(self, snapshot_date: date) -> List[Dict[str, Any]]:
-        """Calculate trends for each sector"""
-        try:
-            from app.services.sector_performance_service import SectorPerformanceService
-            sector_service = SectorPerformanceService()
-            sector_performance = sector_service.calculate_sector_performance(snapshot_date)
-            
-            trends = []
-            for sector_data in sector_performance.get('sectors', []):
-                avg_change = sector_data.get('avg_price_change_percent', 0)
-                
-                # Calculate trend score (-100 to 100)
-                trend_score = min(max(avg_change * 10, -100), 100)  # Scale to -100/100
-                
-                # Determine strength
-                if abs(trend_score) >= 80:
-                    strength = "very_strong"
-                elif abs(trend_score) >= 50:
-                    strength = "strong"
-                elif abs(trend_score) >= 20:
-                    strength = "moderate"
-                elif abs(trend_score) >= 10:
-                    strength = "weak"
-                else:
-                    strength = "very_weak"
-                
-                trends.append({
-                    "category": sector_data['sector'],
-                    "trend_score": trend_score,
-                    "price_change_avg": avg_change,
-                    "momentum_score": abs(trend_score),
-                    "strength": strength
-                })
-            
-            return trends
-            
-        except Exception as e:
-            logger.error(f"Error calculating sector trends: {e}", exc_info=True)
-            return []
-    
-    def _calculate_industry_trends(self, snapshot_date: date) -> List[Dict[str, Any]]:
-        """Calculate trends for each industry"""
-        try:
-            # Get industries from holdings and watchlists
-            query = """
-                SELECT DISTINCT industry, sector
-                FROM holdings
-                WHERE industry IS NOT NULL AND industry != ''
-                UNION
-                SELECT DISTINCT industry, sector
-                FROM watchlist_items
-                WHERE industry IS NOT NULL AND industry != ''
-            """
-            industries_result = db.execute_query(query)
-            
-            trends = []
-            for industry_data in industries_result:
-                industry = industry_data['industry']
-                
-                # Get average price change for this industry
-                query = """
-                    SELECT AVG(price_change_percent_since_added) as avg_change
-                    FROM watchlist_items
-                    WHERE industry = :industry
-                """
-                result = db.execute_query(query, {"industry": industry})
-                
-                if result and result[0].get('avg_change') is not None:
-                    avg_change = result[0]['avg_change']
-                    trend_score = min(max(avg_change * 10, -100), 100)
-                    
-                    # Determine strength
-                    if abs(trend_score) >= 80:
-                        strength = "very_strong"
-                    elif abs(trend_score) >= 50:
-                        strength = "strong"
-                    elif abs(trend_score) >= 20:
-                        strength = "moderate"
-                    elif abs(trend_score) >= 10:
-                        strength = "weak"
-                    else:
-                        strength = "very_weak"
-                    
-                    trends.append({
-                        "category": industry,
-                        "trend_score": trend_score,
-                        "price_change_avg": avg_change,
-                        "momentum_score": abs(trend_score),
-                        "strength": strength
-                    })
-            
-            return trends
-            
-        except Exception as e:
-            logger.error(f"Error calculating industry trends: {e}", exc_info=True)
-            return []
-    
-    def _calculate_market_cap_trends(self, snapshot_date: date) -> List[Dict[str, Any]]:
-        """Calculate trends by market cap category"""
-        try:
-            market_cap_categories = ['mega', 'large', 'mid', 'small', 'micro']
-            trends = []
-            
-            for category in market_cap_categories:
-                # Get average price change for this market cap category
-                query = """
-                    SELECT AVG(price_change_percent_since_added) as avg_change
-                    FROM watchlist_items
-                    WHERE market_cap_category = :category
-                """
-                result = db.execute_query(query, {"category": category})
-                
-                if result and result[0].get('avg_change') is not None:
-                    avg_change = result[0]['avg_change']
-                    trend_score = min(max(avg_change * 10, -100), 100)
-                    
-                    # Determine strength
-                    if abs(trend_score) >= 80:
-                        strength = "very_strong"
-                    elif abs(trend_score) >= 50:
-                        strength = "strong"
-                    elif abs(trend_score) >= 20:
-                        strength = "moderate"
-                    elif abs(trend_score) >= 10:
-                        strength = "weak"
-                    else:
-                        strength = "very_weak"
-                    
-                    trends.append({
-                        "category": category,
-                        "trend_score": trend_score,
-                        "price_change_avg": avg_change,
-                        "momentum_score": abs(trend_score),
-                        "strength": strength
-                    })
-            
-            return trends
-            
-        except Exception as e:
-            logger.error(f"Error calculating market cap trends: {e}", exc_info=True)
-            return []
+    def _build_trend(self, category: str, avg_change: float) -> Dict[str, Any]:
+        """Trend entry for a category from its average price change (percent)"""
+        # Calculate trend score (-100 to 100)
+        trend_score = min(max(avg_change * 10, -100), 100)  # Scale to -100/100
+        return {
+            "category": category,
+            "trend_score": trend_score,
+            "price_change_avg": avg_change,
+            "momentum_score": abs(trend_score),
+            "strength": _strength(trend_score)
+        }
     
     def _calculate_overall_trend(self, sector_trends: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate overall market trend"""
@@ -275,16 +182,7 @@ class MarketTrendsService(BaseService):
             avg_trend_score = sum(t.get('trend_score', 0) for t in sector_trends) / len(sector_trends)
             
             # Determine strength
-            if abs(avg_trend_score) >= 80:
-                strength = "very_strong"
-            elif abs(avg_trend_score) >= 50:
-                strength = "strong"
-            elif abs(avg_trend_score) >= 20:
-                strength = "moderate"
-            elif abs(avg_trend_score) >= 10:
-                strength = "weak"
-            else:
-                strength = "very_weak"
+            strength = _strength(avg_trend_score)
             
             # Determine direction
             if avg_trend_score > 10:
@@ -309,77 +207,52 @@ class MarketTrendsService(BaseService):
             }
     
     def _save_trends(self, trends: Dict[str, Any], snapshot_date: date):
-        """Save trends to database"""
+        """Save trends to database (one statement for every trend type)"""
         try:
-            # Save sector trends
-            for sector_trend in trends.get('sectors', []):
-                query = """
-                    INSERT OR REPLACE INTO market_trends
-                    (date, trend_type, category, trend_score, price_change_avg,
-                     momentum_score, strength)
-                    VALUES (:date, 'sector', :category, :trend_score, :price_change_avg,
-                            :momentum_score, :strength)
-                """
-                db.execute_update(query, {
-                    "date": snapshot_date.isoformat(),
-                    "category": sector_trend['category'],
-                    "trend_score": sector_trend['trend_score'],
-                    "price_change_avg": sector_trend['price_change_avg'],
-                    "momentum_score": sector_trend['momentum_score'],
-                    "strength": sector_trend['strength']
-                })
+            rows = [
+                (trend_type, t['category'], t['trend_score'], t['price_change_avg'], t['momentum_score'], t['strength'])
+                for trend_type, key in (('sector', 'sectors'), ('industry', 'industries'), ('market_cap', 'market_cap'))
+                for t in trends.get(key, [])
+            ]
             
-            # Save industry trends
-            for industry_trend in trends.get('industries', []):
-                query = """
-                    INSERT OR REPLACE INTO market_trends
-                    (date, trend_type, category, trend_score, price_change_avg,
-                     momentum_score, strength)
-                    VALUES (:date, 'industry', :category, :trend_score, :price_change_avg,
-                            :momentum_score, :strength)
-                """
-                db.execute_update(query, {
-                    "date": snapshot_date.isoformat(),
-                    "category": industry_trend['category'],
-                    "trend_score": industry_trend['trend_score'],
-                    "price_change_avg": industry_trend['price_change_avg'],
-                    "momentum_score": industry_trend['momentum_score'],
-                    "strength": industry_trend['strength']
-                })
+            # Overall trend
+            overall = trends.get('overall', {})
+            rows.append((
+                'overall', 'market', overall.get('trend_score', 0), None,
+                abs(overall.get('trend_score', 0)), overall.get('strength', 'very_weak')
+            ))
             
-            # Save market cap trends
-            for market_cap_trend in trends.get('market_cap', []):
-                query = """
-                    INSERT OR REPLACE INTO market_trends
-                    (date, trend_type, category, trend_score, price_change_avg,
-                     momentum_score, strength)
-                    VALUES (:date, 'market_cap', :category, :trend_score, :price_change_avg,
-                            :momentum_score, :strength)
+            db.execute_update(
                 """
-                db.execute_update(query, {
+                INSERT INTO market_trends
+                (date, trend_type, category, trend_score, price_change_avg, momentum_score, strength)
+                SELECT CAST(:date AS date), t.trend_type, t.category, t.trend_score, t.price_change_avg,
+                       t.momentum_score, t.strength
+                FROM unnest(
+                    CAST(:trend_types AS text[]),
+                    CAST(:categories AS text[]),
+                    CAST(:trend_scores AS real[]),
+                    CAST(:price_change_avgs AS real[]),
+                    CAST(:momentum_scores AS real[]),
+                    CAST(:strengths AS text[])
+                ) AS t(trend_type, category, trend_score, price_change_avg, momentum_score, strength)
+                ON CONFLICT (date, trend_type, category) DO UPDATE SET
+                    trend_score = EXCLUDED.trend_score,
+                    price_change_avg = EXCLUDED.price_change_avg,
+                    momentum_score = EXCLUDED.momentum_score,
+                    strength = EXCLUDED.strength
+                """,
+                {
                     "date": snapshot_date.isoformat(),
-                    "category": market_cap_trend['category'],
-                    "trend_score": market_cap_trend['trend_score'],
-                    "price_change_avg": market_cap_trend['price_change_avg'],
-                    "momentum_score": market_cap_trend['momentum_score'],
-                    "strength": market_cap_trend['strength']
-                })
-            
-            # Save overall trend
-            overall = trends.get('overall', {})
-            query = """
-                INSERT OR REPLACE INTO market_trends
-                (date, trend_type, category, trend_score, momentum_score, strength)
-                VALUES (:date, 'overall', 'market', :trend_score, :momentum_score, :strength)
-            """
-            db.execute_update(query, {
-                "date": snapshot_date.isoformat(),
-                "trend_score": overall.get('trend_score', 0),
-                "momentum_score": abs(overall.get('trend_score', 0)),
-                "strength": overall.get('strength', 'very_weak')
-            })
+                    "trend_types": [r[0] for r in rows],
+                    "categories": [r[1] for r in rows],
+                    "trend_scores": [r[2] for r in rows],
+                    "price_change_avgs": [r[3] for r in rows],
+                    "momentum_scores": [r[4] for r in rows],
+                    "strengths": [r[5] for r in rows]
+                }
+            )
             
         except Exception as e:
             logger.error(f"Error saving trends: {e}", exc_info=True)
             # Don't raise - this is non-critical
-
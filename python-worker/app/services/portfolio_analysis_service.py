@@ -0,0 +1,311 @@
+"""
+Portfolio Analysis Service
+Universal swing-engine signals for every holding of a portfolio as one batch
+Performance: market context once per date, one query for all holdings' bars and indicators, one signal_history insert
+"""
+import json
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.database import db
+from app.exceptions import DatabaseError
+from app.services.base import BaseService
+from app.services.market_context_service import MarketContextService
+from app.signal_engines.signal_calculator_core import MarketConditions, SignalConfig
+from app.signal_engines.unified_tqqq_swing_engine import UnifiedTQQQSwingEngine
+
+# Daily bars per symbol behind volatility, recent change and the 20-day volume average
+LOOKBACK_BARS = 30
+
+# Fallbacks of the universal signal endpoint when a symbol has too little history
+DEFAULT_VOLATILITY = 2.0
+DEFAULT_VIX = 20.0
+
+SIGNAL_HISTORY_COLUMNS = (
+    'symbol', 'portfolio_id', 'user_id', 'signal_type', 'confidence', 'price',
+    'rsi', 'macd', 'macd_signal', 'sma_20', 'sma_50', 'ema_20', 'volume',
+    'ema_slope', 'volatility', 'vix_level', 'recent_change',
+    'fear_greed_state', 'fear_greed_bias', 'recovery_detected',
+    'engine_type', 'asset_type', 'strategy', 'reasoning', 'signal_date',
+)
+
+# Largest magnitudes the signal_history DECIMAL columns hold (DECIMAL(5,2), DECIMAL(8,6))
+SIGNAL_HISTORY_LIMITS = {
+    'rsi': 999.99, 'volatility': 999.99, 'vix_level': 999.99, 'recent_change': 999.99,
+    'ema_slope': 99.999999,
+}
+
+
+def signal_config_for(asset_type: str) -> SignalConfig:
+    """Swing-engine thresholds per asset type ('3x_etf', 'regular_etf', anything else is a stock)"""
+    if asset_type == "3x_etf":
+        return SignalConfig(rsi_oversold=48, rsi_overbought=70, max_volatility=10.0)
+    if asset_type == "regular_etf":
+        return SignalConfig(rsi_oversold=35, rsi_overbought=70, max_volatility=6.0)
+    return SignalConfig(rsi_oversold=30, rsi_overbought=70, max_volatility=8.0)
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    return default if value is None else float(value)
+
+
+def _history_value(column: str, value: Any) -> Any:
+    """Clamp a value into its signal_history column; non-finite numbers are stored as NULL"""
+    limit = SIGNAL_HISTORY_LIMITS.get(column)
+    if limit is None or value is None:
+        return value
+    value = float(value)
+    if not np.isfinite(value):
+        return None
+    return max(-limit, min(limit, value))
+
+
+def symbol_inputs(bars: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Signal inputs of one symbol from its recent bars (oldest first)
+
+    Same definitions as the universal signal endpoint: latest bar with
+    indicators, volatility = stdev of daily returns (%), 3-day change (%),
+    20-day average volume and the EMA20 change since the previous indicator row.
+
+    Returns:
+        None when no bar has indicators
+    """
+    with_indicators = [bar for bar in bars if bar.get('has_indicators')]
+    if not with_indicators:
+        return None
+    row = with_indicators[-1]
+
+    closes = np.array([_float(bar['close'], np.nan) for bar in bars])
+    if len(closes) < 5:
+        volatility, recent_change = DEFAULT_VOLATILITY, 0.0
+    else:
+        volatility = float(np.nanstd(np.diff(closes) / closes[:-1], ddof=1) * 100)
+        recent_change = float((closes[-1] - closes[-4]) / closes[-4] * 100)
+
+    window_start = row['date'] - timedelta(days=20)
+    volumes = [_float(bar['volume']) for bar in bars if window_start <= bar['date'] <= row['date']]
+    ema_slope = 0.0
+    if len(with_indicators) >= 2 and row['ema_20'] is not None and with_indicators[-2]['ema_20'] is not None:
+        ema_slope = float(row['ema_20']) - float(with_indicators[-2]['ema_20'])
+
+    return {
+        'date': row['date'],
+        'close': _float(row['close']),
+        'rsi_14': _float(row['rsi_14']),
+        'sma_50': _float(row['sma_50']),
+        'ema_20': _float(row['ema_20']),
+        'macd': _float(row['macd']),
+        'macd_signal': _float(row['macd_signal']),
+        'volume': _float(row['volume']),
+        'avg_volume_20d': float(np.mean(volumes)) if volumes else 0.0,
+        'volatility': volatility,
+        'recent_change': recent_change,
+        'ema_slope': ema_slope,
+    }
+
+
+class PortfolioAnalysisService(BaseService):
+    """
+    Analyzes all holdings of a portfolio for one date
+
+    - Market context (VIX, NASDAQ trend, regime) is resolved once per analysis
+    - Every holding's recent bars and indicator rows come from one query
+    - One swing engine per asset type evaluates all holdings of that type
+    - Signals are recorded with a single multi-row signal_history insert,
+      falling back to per-row inserts when one row is rejected
+    """
+
+    def __init__(self, market_context_service: Optional[MarketContextService] = None):
+        """Initialize portfolio analysis service"""
+        super().__init__()
+        self.market_context_service = market_context_service or MarketContextService()
+
+    def analyze_holdings(
+        self,
+        holdings: List[Tuple[str, str]],
+        target_date: date,
+        portfolio_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        record: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Generate signals for (symbol, asset_type) holdings
+
+        Args:
+            record: Write the signals to signal_history
+
+        Returns:
+            Dict with market_context, results (symbol, signal, confidence, price)
+            and errors (symbol -> message, including signals that could not be recorded)
+        """
+        context = self.market_context_service.get_market_context(as_of=target_date)
+        vix_level = _float(context.vix, DEFAULT_VIX)
+        bars = self._load_bars([symbol for symbol, _ in holdings], target_date)
+
+        engines: Dict[str, UnifiedTQQQSwingEngine] = {}
+        results: List[Dict[str, Any]] = []
+        history_rows: List[Dict[str, Any]] = []
+        errors: Dict[str, str] = {}
+        for symbol, asset_type in holdings:
+            try:
+                inputs = symbol_inputs(bars.get(symbol.upper(), []))
+                if inputs is None:
+                    errors[symbol] = f"No indicator data for {symbol} on or before {target_date}"
+                    continue
+                conditions = MarketConditions(
+                    rsi=inputs['rsi_14'],
+                    sma_20=inputs['ema_20'],
+                    sma_50=inputs['sma_50'],
+                    ema_20=inputs['ema_20'],
+                    current_price=inputs['close'],
+                    recent_change=inputs['recent_change'] / 100,
+                    macd=inputs['macd'],
+                    macd_signal=inputs['macd_signal'],
+                    volatility=inputs['volatility'],
+                    vix_level=vix_level,
+                    volatility_trend='stable',
+                    volume=inputs['volume'],
+                    avg_volume_20d=inputs['avg_volume_20d'],
+                )
+                engine = engines.get(asset_type)
+                if engine is None:
+                    engine = engines[asset_type] = UnifiedTQQQSwingEngine(signal_config_for(asset_type))
+                signal = engine.generate_signal(conditions)
+            except Exception as e:
+                self.log_warning(f"Signal generation failed for {symbol}: {e}")
+                errors[symbol] = str(e)
+                continue
+
+            metadata = signal.metadata or {}
+            results.append({
+                'symbol': symbol,
+                'signal': signal.signal.value,
+                'confidence': signal.confidence,
+                'price': inputs['close'],
+            })
+            history_rows.append({
+                'symbol': symbol,
+                'portfolio_id': portfolio_id,
+                'user_id': user_id,
+                'signal_type': signal.signal.value,
+                'confidence': signal.confidence,
+                'price': inputs['close'],
+                'rsi': inputs['rsi_14'],
+                'macd': inputs['macd'],
+                'macd_signal': inputs['macd_signal'],
+                'sma_20': conditions.sma_20,
+                'sma_50': inputs['sma_50'],
+                'ema_20': inputs['ema_20'],
+                'volume': inputs['volume'],
+                'ema_slope': inputs['ema_slope'],
+                'volatility': inputs['volatility'],
+                'vix_level': vix_level,
+                'recent_change': inputs['recent_change'],
+                'fear_greed_state': metadata.get('fear_greed_state'),
+                'fear_greed_bias': metadata.get('fear_greed_bias'),
+                'recovery_detected': bool(metadata.get('recovery_detected', False)),
+                'engine_type': metadata.get('engine'),
+                'asset_type': asset_type,
+                'strategy': metadata.get('regime'),
+                'reasoning': json.dumps(signal.reasoning or []),
+                'signal_date': target_date,
+            })
+
+        if record:
+            self._save_signal_history(history_rows, errors)
+
+        return {
+            'market_context': {
+                'vix_level': vix_level,
+                'nasdaq_trend': context.nasdaq_trend,
+                'regime': context.regime.value,
+                'regime_confidence': float(context.regime_confidence),
+            },
+            'results': results,
+            'errors': errors,
+        }
+
+    def _load_bars(self, symbols: List[str], target_date: date) -> Dict[str, List[Dict[str, Any]]]:
+        """Last LOOKBACK_BARS daily bars (with that day's indicators) per symbol, oldest first"""
+        if not symbols:
+            return {}
+        try:
+            rows = db.execute_query(
+                """
+                SELECT r.symbol, r.date, r.close, r.volume,
+                       i.symbol IS NOT NULL AS has_indicators,
+                       i.rsi_14, i.sma_50, i.ema_20, i.macd, i.macd_signal
+                FROM (
+                    SELECT symbol, date, close, volume,
+                           ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS rn
+                    FROM raw_market_data_daily
+                    WHERE symbol = ANY(:symbols) AND date <= :target_date
+                ) r
+                LEFT JOIN LATERAL (
+                    SELECT symbol, rsi_14, sma_50, ema_20, macd, macd_signal
+                    FROM indicators_daily
+                    WHERE symbol = r.symbol AND date = r.date
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                ) i ON TRUE
+                WHERE r.rn <= :lookback
+                ORDER BY r.symbol, r.date
+                """,
+                {
+                    'symbols': list({symbol.upper() for symbol in symbols}),
+                    'target_date': target_date,
+                    'lookback': LOOKBACK_BARS,
+                }
+            )
+        except Exception as e:
+            self.log_error("Error loading portfolio bars", e, context={'symbols': len(symbols)})
+            raise DatabaseError(f"Failed to load bars for portfolio analysis: {str(e)}") from e
+
+        bars: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows or []:
+            bars.setdefault(row['symbol'], []).append(row)
+        return bars
+
+    def _save_signal_history(self, rows: List[Dict[str, Any]], errors: Optional[Dict[str, str]] = None) -> int:
+        """
+        Insert all signals with one multi-row statement
+
+        Values are clamped to their column ranges. If the statement still fails
+        (e.g. a symbol missing from symbol_master), the rows are inserted one by
+        one so a single bad row costs only its own history; rows that fail are
+        reported in errors (symbol -> message).
+        """
+        if not rows:
+            return 0
+        rows = [{column: _history_value(column, row[column]) for column in SIGNAL_HISTORY_COLUMNS} for row in rows]
+        try:
+            return self._insert_signal_history(rows)
+        except Exception as e:
+            self.log_warning(f"Multi-row signal history insert failed, inserting {len(rows)} rows one by one: {e}")
+
+        saved = 0
+        for row in rows:
+            try:
+                saved += self._insert_signal_history([row])
+            except Exception as e:
+                self.log_error("Error saving signal history", e, context={'symbol': row['symbol']})
+                if errors is not None:
+                    errors[row['symbol']] = f"Signal not recorded: {e}"
+        return saved
+
+    def _insert_signal_history(self, rows: List[Dict[str, Any]]) -> int:
+        values: List[str] = []
+        params: Dict[str, Any] = {}
+        for i, row in enumerate(rows):
+            values.append("(" + ", ".join(f":{column}_{i}" for column in SIGNAL_HISTORY_COLUMNS) + ")")
+            params.update({f"{column}_{i}": row[column] for column in SIGNAL_HISTORY_COLUMNS})
+        return db.execute_update(
+            f"""
+            INSERT INTO signal_history ({", ".join(SIGNAL_HISTORY_COLUMNS)})
+            VALUES {", ".join(values)}
+            """,
+            params
+        )
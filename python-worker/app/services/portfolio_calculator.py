@@ -13,6 +13,14 @@ from app.services.base import BaseService
 from app.exceptions import DatabaseError, ValidationError
 from app.utils.exception_handler import handle_database_errors
 
+# Market-cap floors (USD) per category, largest first; anything smaller is 'micro'
+MARKET_CAP_TIERS = (
+    ('mega', 200_000_000_000),
+    ('large', 10_000_000_000),
+    ('mid', 2_000_000_000),
+    ('small', 300_000_000),
+)
+
 
 class PortfolioCalculatorService(BaseService):
     """
@@ -141,21 +149,91 @@ class PortfolioCalculatorService(BaseService):
         Returns:
             Number of holdings updated
         """
-        # Get all holdings
-        query = "SELECT holding_id FROM holdings WHERE portfolio_id = :portfolio_id AND is_closed = 0"
-        holdings = db.execute_query(query, {"portfolio_id": portfolio_id})
+        return self.update_holdings([portfolio_id])
+    
+    def update_holdings(self, portfolio_ids: Optional[List[str]] = None) -> int:
+        """
+        Recompute metrics of every open holding in one statement
+        
+        Price is the latest daily close and sector/industry/market cap/dividend
+        yield come from the latest fundamentals snapshot; allocation is the
+        holding's share of its portfolio's freshly computed total. Holdings
+        without a stored price keep their previous metrics (and value, which
+        still counts towards their portfolio's total).
         
-        updated_count = 0
-        for holding in holdings:
-            try:
-                if self.update_holding_metrics(holding['holding_id']):
-                    updated_count += 1
-            except Exception as e:
-                self.log_error(f"Error updating holding {holding['holding_id']}", e, 
-                              context={'holding_id': holding['holding_id'], 'symbol': holding.get('stock_symbol')})
-                # Continue with other holdings (fail-fast per holding, not all)
+        Args:
+            portfolio_ids: Portfolios to update (default: all)
+        
+        Returns:
+            Number of holdings updated
+        """
+        if portfolio_ids is not None and not portfolio_ids:
+            return 0
+        scope = "AND h.portfolio_id = ANY(:portfolio_ids)" if portfolio_ids is not None else ""
+        market_cap_category = "CASE " + " ".join(
+            f"WHEN market_cap >= {floor} THEN '{category}'" for category, floor in MARKET_CAP_TIERS
+        ) + " WHEN market_cap > 0 THEN 'micro' END"
         
-        return updated_count
+        try:
+            return db.execute_update(
+                f"""
+                WITH open_holdings AS (
+                    SELECT h.holding_id, h.portfolio_id, h.stock_symbol, h.quantity,
+                           h.avg_entry_price, h.current_value
+                    FROM holdings h
+                    WHERE h.is_closed = 0 {scope}
+                ),
+                prices AS (
+                    SELECT DISTINCT ON (symbol) symbol, close
+                    FROM raw_market_data_daily
+                    WHERE symbol IN (SELECT stock_symbol FROM open_holdings)
+                    ORDER BY symbol, date DESC
+                ),
+                fundamentals AS (
+                    SELECT DISTINCT ON (symbol) symbol,
+                           NULLIF(COALESCE(payload->>'sector', payload->>'industry'), '') AS sector,
+                           NULLIF(payload->>'industry', '') AS industry,
+                           CAST(NULLIF(COALESCE(payload->>'market_cap', payload->>'marketCap'), '') AS DOUBLE PRECISION) AS market_cap,
+                           CAST(NULLIF(COALESCE(payload->>'dividend_yield', payload->>'dividendYield'), '') AS DOUBLE PRECISION) AS dividend_yield
+                    FROM fundamentals_snapshots
+                    WHERE symbol IN (SELECT stock_symbol FROM open_holdings)
+                    ORDER BY symbol, as_of_date DESC
+                ),
+                valued AS (
+                    SELECT o.holding_id, p.close AS current_price,
+                           o.quantity * p.close AS current_value,
+                           o.quantity * o.avg_entry_price AS cost_basis,
+                           SUM(COALESCE(o.quantity * p.close, o.current_value, 0))
+                               OVER (PARTITION BY o.portfolio_id) AS portfolio_total,
+                           f.sector, f.industry, f.dividend_yield,
+                           {market_cap_category} AS market_cap_category
+                    FROM open_holdings o
+                    LEFT JOIN prices p ON p.symbol = o.stock_symbol
+                    LEFT JOIN fundamentals f ON f.symbol = o.stock_symbol
+                )
+                UPDATE holdings h SET
+                    current_price = v.current_price,
+                    current_value = v.current_value,
+                    cost_basis = v.cost_basis,
+                    unrealized_gain_loss = v.current_value - v.cost_basis,
+                    unrealized_gain_loss_percent = CASE WHEN v.cost_basis > 0
+                        THEN (v.current_value - v.cost_basis) / v.cost_basis * 100 ELSE 0 END,
+                    sector = COALESCE(v.sector, h.sector),
+                    industry = COALESCE(v.industry, h.industry),
+                    market_cap_category = COALESCE(v.market_cap_category, h.market_cap_category),
+                    dividend_yield = COALESCE(v.dividend_yield * 100, h.dividend_yield),
+                    allocation_percent = CASE WHEN v.portfolio_total > 0
+                        THEN v.current_value / v.portfolio_total * 100 ELSE 0 END,
+                    last_updated_price = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM valued v
+                WHERE h.holding_id = v.holding_id AND v.current_price IS NOT NULL
+                """,
+                {"portfolio_ids": portfolio_ids} if portfolio_ids is not None else {}
+            )
+        except Exception as e:
+            self.log_error("Error updating holdings", e, context={'portfolios': len(portfolio_ids or [])})
+            raise DatabaseError(f"Failed to update holdings: {str(e)}") from e
     
     def calculate_portfolio_performance(self, portfolio_id: str, snapshot_date: date = None) -> Dict[str, Any]:
         """
@@ -266,17 +344,7 @@ class PortfolioCalculatorService(BaseService):
         if not market_cap or market_cap == 0:
             return None
         
-        # Market cap in billions
-        market_cap_b = market_cap / 1_000_000_000
-        
-        if market_cap_b >= 200:
-            return 'mega'
-        elif market_cap_b >= 10:
-            return 'large'
-        elif market_cap_b >= 2:
-            return 'mid'
-        elif market_cap_b >= 0.3:
-            return 'small'
-        else:
-            return 'micro'
-
+        for category, floor in MARKET_CAP_TIERS:
+            if market_cap >= floor:
+                return category
+        return 'micro'
@@ -0,0 +1,457 @@
+"""
+Screener Engine
+In-memory columnar feature matrix (one row per symbol) behind the stock screener
+Performance: filters are vectorized boolean masks and top-K is a partial sort, so a screen never touches the database
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.database import db
+from app.services.fundamental_scorer import FundamentalScorer
+
+logger = logging.getLogger(__name__)
+
+# Latest row of every feature per active stock, one query per refresh.
+# Technicals keep 6 trading days so the trend regimes get their SMA slopes.
+FEATURE_QUERY = """
+    WITH quarterly AS (
+        SELECT stock_id, eps, net_margin, debt_to_equity,
+               ROW_NUMBER() OVER (PARTITION BY stock_id ORDER BY fiscal_period DESC) AS rn
+        FROM (
+            SELECT DISTINCT ON (stock_id, fiscal_period)
+                   stock_id, fiscal_period, eps, net_margin, debt_to_equity
+            FROM stock_financials
+            WHERE period_type = 'quarterly'
+            ORDER BY stock_id, fiscal_period DESC, created_at DESC
+        ) q
+    ),
+    fundamentals AS (
+        SELECT stock_id,
+               SUM(eps) FILTER (WHERE rn <= 4) AS ttm_eps,
+               COUNT(eps) FILTER (WHERE rn <= 4) AS ttm_quarters,
+               SUM(eps) FILTER (WHERE rn BETWEEN 5 AND 8) AS prior_ttm_eps,
+               COUNT(eps) FILTER (WHERE rn BETWEEN 5 AND 8) AS prior_quarters,
+               MAX(net_margin) FILTER (WHERE rn = 1) AS net_margin,
+               MAX(debt_to_equity) FILTER (WHERE rn = 1) AS debt_to_equity
+        FROM quarterly
+        WHERE rn <= 8
+        GROUP BY stock_id
+    ),
+    latest_signals AS (
+        SELECT DISTINCT ON (stock_symbol) stock_symbol, signal, confidence
+        FROM stock_signals_snapshots
+        WHERE engine_name = 'aggregated'
+        ORDER BY stock_symbol, signal_date DESC
+    )
+    SELECT
+        s.symbol, s.sector, s.market_cap,
+        m.date, m.close_price,
+        t.sma_20, t.sma_50, t.sma_200, t.rsi_14,
+        t.sma_20_prev, t.sma_50_prev, t.sma_200_prev,
+        d.revenue_growth_yoy,
+        f.ttm_eps, f.ttm_quarters, f.prior_ttm_eps, f.prior_quarters, f.net_margin, f.debt_to_equity,
+        sig.signal, sig.confidence
+    FROM stocks s
+    LEFT JOIN LATERAL (
+        SELECT date, close_price
+        FROM stock_market_metrics
+        WHERE stock_id = s.id
+        ORDER BY date DESC
+        LIMIT 1
+    ) m ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT (ARRAY_AGG(sma_20 ORDER BY date DESC))[1] AS sma_20,
+               (ARRAY_AGG(sma_50 ORDER BY date DESC))[1] AS sma_50,
+               (ARRAY_AGG(sma_200 ORDER BY date DESC))[1] AS sma_200,
+               (ARRAY_AGG(rsi_14 ORDER BY date DESC))[1] AS rsi_14,
+               (ARRAY_AGG(sma_20 ORDER BY date DESC))[4] AS sma_20_prev,
+               (ARRAY_AGG(sma_50 ORDER BY date DESC))[4] AS sma_50_prev,
+               (ARRAY_AGG(sma_200 ORDER BY date DESC))[6] AS sma_200_prev
+        FROM (
+            SELECT DISTINCT ON (date) date, sma_20, sma_50, sma_200, rsi_14
+            FROM stock_technical_indicators
+            WHERE stock_id = s.id
+            ORDER BY date DESC, updated_at DESC
+            LIMIT 6
+        ) recent
+    ) t ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT revenue_growth_yoy
+        FROM stock_derived_metrics
+        WHERE stock_id = s.id
+        ORDER BY date DESC
+        LIMIT 1
+    ) d ON TRUE
+    LEFT JOIN fundamentals f ON f.stock_id = s.id
+    LEFT JOIN latest_signals sig ON sig.stock_symbol = s.symbol
+    WHERE s.is_active
+    ORDER BY s.symbol
+"""
+
+FLOAT_COLUMNS = (
+    'current_price', 'sma50', 'sma200', 'rsi', 'market_cap', 'pe_ratio',
+    'confidence_score', 'fundamental_score', 'discount_from_sma50_pct', 'discount_from_sma200_pct',
+)
+BOOL_COLUMNS = (
+    'has_good_fundamentals', 'is_growth_stock', 'is_exponential_growth',
+    'price_below_sma50', 'price_below_sma200',
+)
+OBJECT_COLUMNS = ('date', 'signal', 'long_term_trend', 'medium_term_trend', 'sector')
+
+# Columns a screen can be ranked by (descending, missing values last); None keeps symbol order
+SORT_COLUMNS = (
+    'confidence_score', 'fundamental_score', 'market_cap', 'rsi',
+    'discount_from_sma50_pct', 'discount_from_sma200_pct',
+)
+
+# Same regimes as app.indicators.trend (buffer around the slow average plus slope confirmation)
+LONG_TERM_TREND_BUFFER = 0.02
+MEDIUM_TERM_TREND_BUFFER = 0.01
+
+
+def _floats(rows: List[Dict[str, Any]], key: str) -> np.ndarray:
+    return np.array([np.nan if r.get(key) is None else float(r[key]) for r in rows], dtype=np.float64)
+
+
+def _trend(
+    fast: np.ndarray,
+    slow: np.ndarray,
+    slow_prev: np.ndarray,
+    buffer_pct: float,
+    fast_prev: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """'bullish' / 'bearish' / 'neutral' per row; rows missing an input are neutral"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distance = (fast - slow) / slow
+    rising = slow > slow_prev
+    falling = slow < slow_prev
+    if fast_prev is not None:
+        rising &= fast > fast_prev
+        falling &= fast < fast_prev
+    trend = np.full(len(fast), 'neutral', dtype=object)
+    trend[(distance > buffer_pct) & rising] = 'bullish'
+    trend[(distance < -buffer_pct) & falling] = 'bearish'
+    return trend
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    """
+    Immutable snapshot of screener features, one row per symbol (sorted by symbol)
+
+    Refreshes build a new matrix and swap the reference, so a screen always
+    reads one consistent snapshot.
+    """
+    symbols: np.ndarray
+    columns: Dict[str, np.ndarray]
+    generation: int = 0
+    loaded_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]], generation: int = 0) -> 'FeatureMatrix':
+        """
+        Build the matrix from FEATURE_QUERY rows
+
+        Flags and fundamental_score come from FundamentalScorer, scored once per
+        refresh from TTM P/E, revenue growth, TTM EPS growth, net margin and
+        debt/equity.
+        """
+        rows = sorted(rows, key=lambda r: r['symbol'])
+        n = len(rows)
+        price = _floats(rows, 'close_price')
+        sma20 = _floats(rows, 'sma_20')
+        sma50 = _floats(rows, 'sma_50')
+        sma200 = _floats(rows, 'sma_200')
+        ttm_eps = _floats(rows, 'ttm_eps')
+        prior_ttm_eps = _floats(rows, 'prior_ttm_eps')
+        full_ttm = np.array([(r.get('ttm_quarters') or 0) == 4 for r in rows], dtype=bool)
+        full_prior = np.array([(r.get('prior_quarters') or 0) == 4 for r in rows], dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pe_ratio = np.where(full_ttm & (ttm_eps > 0), price / ttm_eps, np.nan)
+            eps_growth = np.where(
+                full_ttm & full_prior & (prior_ttm_eps != 0),
+                (ttm_eps - prior_ttm_eps) / np.abs(prior_ttm_eps) * 100,
+                np.nan,
+            )
+            discount50 = (sma50 - price) / sma50 * 100
+            discount200 = (sma200 - price) / sma200 * 100
+        revenue_growth = _floats(rows, 'revenue_growth_yoy') * 100
+        net_margin = _floats(rows, 'net_margin')
+        debt_to_equity = _floats(rows, 'debt_to_equity')
+
+        scorer = FundamentalScorer()
+        fundamental_score = np.zeros(n)
+        flags = {name: np.zeros(n, dtype=bool) for name in ('has_good_fundamentals', 'is_growth_stock', 'is_exponential_growth')}
+        for i in range(n):
+            inputs = {
+                key: float(values[i])
+                for key, values in (
+                    ('pe_ratio', pe_ratio), ('revenue_growth_yoy', revenue_growth), ('eps_growth_yoy', eps_growth),
+                    ('profit_margin', net_margin), ('debt_to_equity', debt_to_equity),
+                )
+                if not np.isnan(values[i])
+            }
+            scored = scorer.score_fundamentals(inputs)
+            fundamental_score[i] = scored['fundamental_score']
+            for name in flags:
+                flags[name][i] = scored[name]
+
+        signal = np.array([(r.get('signal') or '').upper() or None for r in rows], dtype=object)
+        columns: Dict[str, np.ndarray] = {
+            'current_price': price,
+            'sma50': sma50,
+            'sma200': sma200,
+            'rsi': _floats(rows, 'rsi_14'),
+            'market_cap': _floats(rows, 'market_cap'),
+            'pe_ratio': pe_ratio,
+            'confidence_score': _floats(rows, 'confidence'),
+            'fundamental_score': fundamental_score,
+            'discount_from_sma50_pct': discount50,
+            'discount_from_sma200_pct': discount200,
+            'price_below_sma50': price < sma50,
+            'price_below_sma200': price < sma200,
+            'date': np.array([r.get('date') for r in rows], dtype=object),
+            'signal': signal,
+            'long_term_trend': _trend(price, sma200, _floats(rows, 'sma_200_prev'), LONG_TERM_TREND_BUFFER),
+            # EMA20 is not persisted; SMA20 stands in as the fast average
+            'medium_term_trend': _trend(
+                sma20, sma50, _floats(rows, 'sma_50_prev'), MEDIUM_TERM_TREND_BUFFER, fast_prev=_floats(rows, 'sma_20_prev')
+            ),
+            'sector': np.array([r.get('sector') for r in rows], dtype=object),
+            **flags,
+        }
+        return cls(
+            symbols=np.array([r['symbol'] for r in rows], dtype=object),
+            columns=columns,
+            generation=generation,
+            loaded_at=time.monotonic(),
+        )
+
+    def mask(
+        self,
+        symbols: Optional[List[str]] = None,
+        price_below_sma50: Optional[bool] = None,
+        price_below_sma200: Optional[bool] = None,
+        has_good_fundamentals: Optional[bool] = None,
+        is_growth_stock: Optional[bool] = None,
+        is_exponential_growth: Optional[bool] = None,
+        min_fundamental_score: Optional[float] = None,
+        min_rsi: Optional[float] = None,
+        max_rsi: Optional[float] = None,
+        trend_filter: Optional[str] = None,
+        min_market_cap: Optional[float] = None,
+        max_pe_ratio: Optional[float] = None,
+        signal: Optional[str] = None,
+        min_confidence_score: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Rows matching every given criterion (None = not filtered)
+
+        Numeric bounds never match a missing value, e.g. max_pe_ratio excludes
+        stocks without a positive TTM EPS.
+        """
+        c = self.columns
+        mask = np.ones(len(self), dtype=bool)
+        if symbols is not None:
+            mask &= np.isin(self.symbols, np.array(symbols, dtype=object))
+        for name, wanted in (
+            ('price_below_sma50', price_below_sma50),
+            ('price_below_sma200', price_below_sma200),
+            ('has_good_fundamentals', has_good_fundamentals),
+            ('is_growth_stock', is_growth_stock),
+            ('is_exponential_growth', is_exponential_growth),
+        ):
+            if wanted is not None:
+                mask &= c[name] == bool(wanted)
+        for name, bound in (
+            ('fundamental_score', min_fundamental_score),
+            ('rsi', min_rsi),
+            ('market_cap', min_market_cap),
+            ('confidence_score', min_confidence_score),
+        ):
+            if bound is not None:
+                mask &= c[name] >= bound
+        for name, bound in (('rsi', max_rsi), ('pe_ratio', max_pe_ratio)):
+            if bound is not None:
+                mask &= c[name] <= bound
+        if trend_filter is not None:
+            mask &= c['long_term_trend'] == trend_filter
+        if signal is not None:
+            mask &= c['signal'] == signal.upper()
+        return mask
+
+    def top_k(self, mask: np.ndarray, limit: int, sort_by: Optional[str] = None) -> np.ndarray:
+        """
+        Row indices of the best `limit` matches
+
+        Without sort_by the matches keep symbol order; otherwise they are ranked
+        by that column descending (missing values last) with a partial sort.
+        """
+        rows = np.flatnonzero(mask)
+        if sort_by is None or len(rows) == 0:
+            return rows[:limit]
+        keys = -self.columns[sort_by][rows]
+        keys[np.isnan(keys)] = np.inf
+        if len(rows) > limit:
+            best = np.sort(np.argpartition(keys, limit - 1)[:limit])
+        else:
+            best = np.arange(len(rows))
+        # Stable sort of the K winners keeps equal scores in symbol order
+        return rows[best[np.argsort(keys[best], kind='stable')]]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """One screened stock in the StockScreenerService result shape"""
+        c = self.columns
+
+        def value(name):
+            v = c[name][i]
+            if isinstance(v, np.bool_):
+                return bool(v)
+            if isinstance(v, np.floating):
+                return None if np.isnan(v) else float(v)
+            return v
+
+        stock = {
+            'symbol': self.symbols[i],
+            'date': value('date'),
+            'current_price': value('current_price'),
+            'sma50': value('sma50'),
+            'sma200': value('sma200'),
+            'rsi': value('rsi'),
+            'signal': value('signal'),
+            'confidence_score': value('confidence_score'),
+            'long_term_trend': value('long_term_trend'),
+            'medium_term_trend': value('medium_term_trend'),
+            'fundamental_score': value('fundamental_score'),
+            'has_good_fundamentals': value('has_good_fundamentals'),
+            'is_growth_stock': value('is_growth_stock'),
+            'is_exponential_growth': value('is_exponential_growth'),
+            'price_below_sma50': value('price_below_sma50'),
+            'price_below_sma200': value('price_below_sma200'),
+            'sector': value('sector'),
+        }
+        fundamentals = {
+            name: value(name) for name in ('market_cap', 'pe_ratio') if value(name) is not None
+        }
+        if fundamentals:
+            stock['fundamentals'] = fundamentals
+        for name in ('discount_from_sma50_pct', 'discount_from_sma200_pct'):
+            if value(name) is not None:
+                stock[name] = value(name)
+        return stock
+
+
+def load_feature_matrix(generation: int = 0) -> FeatureMatrix:
+    """Load a fresh feature matrix from the database"""
+    return FeatureMatrix.from_rows(db.execute_query(FEATURE_QUERY) or [], generation=generation)
+
+
+class ScreenerEngine:
+    """
+    Holds the current FeatureMatrix and keeps it fresh
+
+    - invalidate() marks the matrix stale (after EOD runs and data ingestion);
+      so does reaching screener_matrix_max_age_seconds, which covers updates
+      made by other processes
+    - A stale matrix keeps serving while one background refresh loads its
+      replacement; only the very first screen waits for a load
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[int], FeatureMatrix]] = None,
+        max_age_seconds: Optional[float] = None,
+    ):
+        self._loader = loader or load_feature_matrix
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None else settings.screener_matrix_max_age_seconds
+        )
+        self._matrix: Optional[FeatureMatrix] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+
+    def matrix(self) -> FeatureMatrix:
+        """Current feature matrix (loaded on first use)"""
+        matrix = self._matrix
+        if matrix is None:
+            return self.refresh()
+        if self._is_stale(matrix):
+            self._refresh_in_background()
+        return matrix
+
+    def refresh(self) -> FeatureMatrix:
+        """
+        Load a new matrix and swap it in
+
+        Callers that waited for another refresh get its matrix instead of loading
+        again, unless it was invalidated meanwhile.
+        """
+        requested_at = time.monotonic()
+        with self._load_lock:
+            with self._lock:
+                generation = self._generation
+            current = self._matrix
+            if current is not None and current.generation == generation and current.loaded_at >= requested_at:
+                return current
+            start = time.monotonic()
+            matrix = self._loader(generation)
+            self._matrix = matrix
+        logger.info(f"Screener feature matrix refreshed: {len(matrix)} symbols in {time.monotonic() - start:.2f}s")
+        return matrix
+
+    def invalidate(self):
+        """Mark the current matrix stale; the next screen triggers a refresh"""
+        with self._lock:
+            self._generation += 1
+
+    def _is_stale(self, matrix: FeatureMatrix) -> bool:
+        return matrix.generation != self._generation or time.monotonic() - matrix.loaded_at > self.max_age_seconds
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Screener feature matrix refresh failed, serving previous snapshot: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="screener-refresh", daemon=True).start()
+
+
+_engine: Optional[ScreenerEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_screener_engine() -> ScreenerEngine:
+    """Process-wide screener engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ScreenerEngine()
+    return _engine
+
+
+def invalidate_screener_features():
+    """Mark the screener feature matrix stale (no-op before the first screen)"""
+    if _engine is not None:
+        _engine.invalidate()
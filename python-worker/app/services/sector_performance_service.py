@@ -2,6 +2,7 @@
 Sector Performance Service
 Calculates sector and industry performance metrics
 Industry Standard: Sector analysis and heat maps
+Performance: built from the shared grouping-sets aggregation, saved with one bulk upsert
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime, date
@@ -9,6 +10,7 @@ import json
 
 from app.database import db
 from app.services.base import BaseService
+from app.services.market_aggregation_service import MarketAggregationService
 from app.exceptions import DatabaseError, ValidationError
 from app.utils.exception_handler import handle_database_errors
 
@@ -25,12 +27,18 @@ class SectorPerformanceService(BaseService):
         super().__init__()
     
     @handle_database_errors
-    def calculate_sector_performance(self, snapshot_date: date = None) -> Dict[str, Any]:
+    def calculate_sector_performance(
+        self,
+        snapshot_date: date = None,
+        groups: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate performance for all sectors
         
         Args:
             snapshot_date: Date for snapshot (default: today)
+            groups: Precomputed MarketAggregationService.calculate_group_performance()
+                result (computed here if not given)
         
         Returns:
             Dictionary with sector performance data
@@ -39,32 +47,31 @@ class SectorPerformanceService(BaseService):
             snapshot_date = date.today()
         
         try:
-            # Get all sectors from holdings and watchlists
-            query = """
-                SELECT DISTINCT sector
-                FROM holdings
-                WHERE sector IS NOT NULL AND sector != ''
-                UNION
-                SELECT DISTINCT sector
-                FROM watchlist_items
-                WHERE sector IS NOT NULL AND sector != ''
-            """
-            sectors_result = db.execute_query(query)
-            sectors = [s['sector'] for s in sectors_result]
+            if groups is None:
+                groups = MarketAggregationService().calculate_group_performance()
             
-            if not sectors:
+            sector_performances = [
+                {
+                    "sector": group['category'],
+                    "total_stocks": group['total_stocks'],
+                    "avg_price_change": group['avg_price_change_percent'] or 0,
+                    "avg_price_change_percent": group['avg_price_change_percent'] or 0,  # Already in percent
+                    "gainers_count": group['gainers_count'],
+                    "losers_count": group['losers_count'],
+                    "neutral_count": group['neutral_count'],
+                    "top_stocks": group['top_stocks']
+                }
+                for group in groups.get('sector', [])
+            ]
+            
+            if not sector_performances:
                 return {
                     "sectors": [],
                     "timestamp": datetime.now().isoformat()
                 }
             
-            sector_performances = []
-            for sector in sectors:
-                performance = self._calculate_single_sector_performance(sector, snapshot_date)
-                if performance:
-                    sector_performances.append(performance)
-                    # Save to database
-                    self._save_sector_performance(performance, snapshot_date)
+            # Save to database
+            self._save_sector_performances(sector_performances, snapshot_date)
             
             # Sort by average price change
             sector_performances.sort(
@@ -135,104 +142,48 @@ class SectorPerformanceService(BaseService):
             self.log_error("Error getting sector performance", e, context={'sector': sector})
             raise DatabaseError(f"Failed to get sector performance: {str(e)}") from e
     
-    def _calculate_single_sector_performance(self, sector: str, snapshot_date: date) -> Optional[Dict[str, Any]]:
-        """Calculate performance for a single sector"""
+    def _save_sector_performances(self, performances: List[Dict[str, Any]], snapshot_date: date):
+        """Save the sector performance snapshot to database (one statement)"""
         try:
-            # Get all stocks in this sector from holdings and watchlists
-            query = """
-                SELECT DISTINCT stock_symbol
-                FROM holdings
-                WHERE sector = :sector
-                UNION
-                SELECT DISTINCT stock_symbol
-                FROM watchlist_items
-                WHERE sector = :sector
-            """
-            symbols_result = db.execute_query(query, {"sector": sector})
-            symbols = [s['stock_symbol'] for s in symbols_result]
-            
-            if not symbols:
-                return None
-            
-            # Calculate aggregate metrics
-            total_stocks = len(symbols)
-            price_changes = []
-            gainers = 0
-            losers = 0
-            neutral = 0
-            top_stocks = []
-            
-            for symbol in symbols:
-                # Get price change from live_prices or holdings
-                price_change_query = """
-                    SELECT price_change_percent_since_added
-                    FROM watchlist_items
-                    WHERE stock_symbol = :symbol
-                    LIMIT 1
+            db.execute_update(
                 """
-                result = db.execute_query(price_change_query, {"symbol": symbol})
-                
-                if result and result[0].get('price_change_percent_since_added') is not None:
-                    change_pct = result[0]['price_change_percent_since_added']
-                    price_changes.append(change_pct)
-                    
-                    if change_pct > 5:
-                        gainers += 1
-                    elif change_pct < -5:
-                        losers += 1
-                    else:
-                        neutral += 1
-                    
-                    top_stocks.append({
-                        "symbol": symbol,
-                        "change_percent": change_pct
-                    })
-            
-            # Calculate averages
-            avg_price_change = sum(price_changes) / len(price_changes) if price_changes else 0
-            avg_price_change_percent = avg_price_change  # Already in percent
-            
-            # Sort top stocks
-            top_stocks.sort(key=lambda x: x['change_percent'], reverse=True)
-            top_stocks = top_stocks[:5]
-            
-            return {
-                "sector": sector,
-                "total_stocks": total_stocks,
-                "avg_price_change": avg_price_change,
-                "avg_price_change_percent": avg_price_change_percent,
-                "gainers_count": gainers,
-                "losers_count": losers,
-                "neutral_count": neutral,
-                "top_stocks": top_stocks
-            }
-            
-        except Exception as e:
-            self.log_warning(f"Error calculating performance for sector {sector}", context={'sector': sector, 'error': str(e)})
-            return None
-    
-    def _save_sector_performance(self, performance: Dict[str, Any], snapshot_date: date):
-        """Save sector performance to database"""
-        try:
-            query = """
-                INSERT OR REPLACE INTO sector_performance
+                INSERT INTO sector_performance
                 (sector, date, total_stocks, avg_price_change, avg_price_change_percent,
                  gainers_count, losers_count, neutral_count, top_stocks)
-                VALUES (:sector, :date, :total_stocks, :avg_price_change, :avg_price_change_percent,
-                        :gainers_count, :losers_count, :neutral_count, :top_stocks)
-            """
-            db.execute_update(query, {
-                "sector": performance['sector'],
-                "date": snapshot_date.isoformat(),
-                "total_stocks": performance['total_stocks'],
-                "avg_price_change": performance['avg_price_change'],
-                "avg_price_change_percent": performance['avg_price_change_percent'],
-                "gainers_count": performance['gainers_count'],
-                "losers_count": performance['losers_count'],
-                "neutral_count": performance['neutral_count'],
-                "top_stocks": json.dumps(performance['top_stocks'])
-            })
+                SELECT p.sector, CAST(:date AS date), p.total_stocks, p.avg_price_change, p.avg_price_change_percent,
+                       p.gainers_count, p.losers_count, p.neutral_count, CAST(p.top_stocks AS json)
+                FROM unnest(
+                    CAST(:sectors AS text[]),
+                    CAST(:total_stocks AS integer[]),
+                    CAST(:avg_price_changes AS real[]),
+                    CAST(:avg_price_change_percents AS real[]),
+                    CAST(:gainers_counts AS integer[]),
+                    CAST(:losers_counts AS integer[]),
+                    CAST(:neutral_counts AS integer[]),
+                    CAST(:top_stocks AS text[])
+                ) AS p(sector, total_stocks, avg_price_change, avg_price_change_percent,
+                       gainers_count, losers_count, neutral_count, top_stocks)
+                ON CONFLICT (sector, date) DO UPDATE SET
+                    total_stocks = EXCLUDED.total_stocks,
+                    avg_price_change = EXCLUDED.avg_price_change,
+                    avg_price_change_percent = EXCLUDED.avg_price_change_percent,
+                    gainers_count = EXCLUDED.gainers_count,
+                    losers_count = EXCLUDED.losers_count,
+                    neutral_count = EXCLUDED.neutral_count,
+                    top_stocks = EXCLUDED.top_stocks
+                """,
+                {
+                    "date": snapshot_date.isoformat(),
+                    "sectors": [p['sector'] for p in performances],
+                    "total_stocks": [p['total_stocks'] for p in performances],
+                    "avg_price_changes": [p['avg_price_change'] for p in performances],
+                    "avg_price_change_percents": [p['avg_price_change_percent'] for p in performances],
+                    "gainers_counts": [p['gainers_count'] for p in performances],
+                    "losers_counts": [p['losers_count'] for p in performances],
+                    "neutral_counts": [p['neutral_count'] for p in performances],
+                    "top_stocks": [json.dumps(p['top_stocks']) for p in performances]
+                }
+            )
         except Exception as e:
-            self.log_error("Error saving sector performance", e, context={'sector': performance.get('sector')})
+            self.log_error("Error saving sector performance", e, context={'sectors': len(performances)})
             # Don't raise - this is non-critical
-
@@ -6,10 +6,9 @@ Industry Standard: Similar to Finviz, TradingView, Yahoo Finance screeners
 from typing import Dict, Any, List, Optional
 from datetime import date, datetime
 
-from app.database import db
 from app.services.base import BaseService
+from app.services.screener_engine import SORT_COLUMNS, ScreenerEngine, get_screener_engine
 from app.exceptions import DatabaseError, ValidationError
-from app.utils.exception_handler import handle_database_errors
 from app.utils.validation_patterns import validate_numeric_range
 
 
@@ -23,14 +22,17 @@ class StockScreenerService(BaseService):
     - Technical filters (RSI, MACD, trend)
     - Custom combinations
     
+    Screens are evaluated against the shared in-memory feature matrix of
+    ScreenerEngine, so every filter is supported and no query runs per request.
+    
     Industry Standard: Similar to Finviz, TradingView, Yahoo Finance screeners
     """
     
-    def __init__(self):
+    def __init__(self, engine: Optional[ScreenerEngine] = None):
         """Initialize stock screener service"""
         super().__init__()
+        self.engine = engine or get_screener_engine()
     
-    @handle_database_errors
     def screen_stocks(
         self,
         symbols: Optional[List[str]] = None,
@@ -47,13 +49,14 @@ class StockScreenerService(BaseService):
         max_pe_ratio: Optional[float] = None,
         signal: Optional[str] = None,
         min_confidence_score: Optional[float] = None,
+        sort_by: Optional[str] = None,
         limit: int = 100
     ) -> Dict[str, Any]:
         """
         Screen stocks based on criteria
         
         Args:
-            symbols: Optional list of symbols to restrict the universe
+            symbols: Optional list of symbols to restrict the universe (default: all active stocks)
             price_below_sma50: Filter for stocks below 50-day average
             price_below_sma200: Filter for stocks below 200-day average
             has_good_fundamentals: Filter for good fundamentals
@@ -67,6 +70,7 @@ class StockScreenerService(BaseService):
             max_pe_ratio: Maximum P/E ratio
             signal: Filter by model/indicator signal (e.g. BUY/HOLD/SELL)
             min_confidence_score: Minimum confidence score for signal
+            sort_by: Rank by this feature, highest first (default: symbol order)
             limit: Maximum number of results
         
         Returns:
@@ -86,196 +90,48 @@ class StockScreenerService(BaseService):
         
         limit = int(validate_numeric_range(limit, min_value=1, max_value=1000, param_name="limit"))
         
-        # Build query against the normalized schema with indicators.
-        query = """
-            WITH latest_metrics AS (
-                SELECT DISTINCT ON (s.id)
-                    s.symbol AS stock_symbol,
-                    sm.date AS trade_date,
-                    sm.open_price,
-                    sm.high_price,
-                    sm.low_price,
-                    sm.close_price AS current_price,
-                    sm.volume,
-                    s.market_cap,
-                    s.sector,
-                    s.industry
-                FROM stocks s
-                LEFT JOIN stock_market_metrics sm
-                    ON sm.stock_id = s.id
-                WHERE s.symbol = ANY(:symbols)
-                ORDER BY s.id, sm.date DESC
-            ),
-            latest_indicators AS (
-                SELECT DISTINCT ON (i.stock_id)
-                    i.stock_id,
-                    i.sma_50,
-                    i.sma_200,
-                    i.rsi_14
-                FROM stock_technical_indicators i
-                ORDER BY i.stock_id, i.date DESC
-            )
-            SELECT
-                m.stock_symbol,
-                m.trade_date as date,
-                m.current_price,
-                COALESCE(i.sma_50, NULL) as sma50,
-                COALESCE(i.sma_200, NULL) as sma200,
-                COALESCE(i.rsi_14, NULL) as rsi,
-                NULL as signal,
-                NULL as confidence_score,
-                'bullish' as long_term_trend,
-                'bullish' as medium_term_trend,
-                0 as fundamental_score,
-                false as has_good_fundamentals,
-                false as is_growth_stock,
-                COALESCE(m.current_price < i.sma_50, false) as price_below_sma50,
-                COALESCE(m.current_price < i.sma_200, false) as price_below_sma200,
-                m.market_cap,
-                NULL as pe_ratio
-            FROM latest_metrics m
-            LEFT JOIN latest_indicators i ON i.stock_id = (
-                SELECT id FROM stocks s2 WHERE s2.symbol = m.stock_symbol
-            )
-            WHERE 1=1
-        """
+        if trend_filter and trend_filter not in ['bullish', 'bearish', 'neutral']:
+            raise ValidationError(f"Invalid trend_filter: {trend_filter}. Must be 'bullish', 'bearish', or 'neutral'")
         
-        conditions = []
-        params = {}
-
+        if sort_by is not None and sort_by not in SORT_COLUMNS:
+            raise ValidationError(f"Invalid sort_by: {sort_by}. Must be one of {', '.join(SORT_COLUMNS)}")
+        
+        symbols_norm = None
         if symbols:
             symbols_norm = [s.strip().upper() for s in symbols if s and s.strip()]
             symbols_norm = list(dict.fromkeys(symbols_norm))
-            if symbols_norm:
-                params['symbols'] = symbols_norm
-        else:
-            # If no symbols provided, use empty list to return no results
-            params['symbols'] = []
-        
-        # Add filters
-        if price_below_sma50 is not None:
-            # Skip this filter for now - would need calculation
-            pass
-        
-        if price_below_sma200 is not None:
-            # Skip this filter for now - would need calculation
-            pass
-        
-        if has_good_fundamentals is not None:
-            # Skip this filter for now - would need calculation
-            pass
-        
-        if is_growth_stock is not None:
-            # Skip this filter for now - would need calculation
-            pass
-        
-        if is_exponential_growth is not None:
-            # Skip this filter for now - would need calculation
-            pass
-        
-        if min_fundamental_score is not None:
-            # Skip this filter for now - would need calculation
-            pass
-        
-        if min_rsi is not None:
-            conditions.append("rsi_14 >= :min_rsi")
-            params['min_rsi'] = min_rsi
         
-        if max_rsi is not None:
-            conditions.append("rsi_14 <= :max_rsi")
-            params['max_rsi'] = max_rsi
-        
-        if trend_filter:
-            if trend_filter not in ['bullish', 'bearish', 'neutral']:
-                raise ValidationError(f"Invalid trend_filter: {trend_filter}. Must be 'bullish', 'bearish', or 'neutral'")
-            # Skip this filter for now - would need calculation
-            pass
-        
-        # Add fundamental filters that use actual columns
-        if min_market_cap is not None:
-            conditions.append("market_cap >= :min_market_cap")
-            params['min_market_cap'] = min_market_cap
-        
-        # Skip PE ratio filter for now - not available in normalized schema
-
-        # Skip signal/confidence filters for now - not in technical indicators table
-        
-        # Add conditions to query
-        if conditions:
-            query += " AND " + " AND ".join(conditions)
-        
-        # Order by stock_symbol (stable ordering)
-        query += " ORDER BY stock_symbol ASC"
-        query += " LIMIT :limit"
-        params['limit'] = limit
+        criteria = {
+            'symbols': symbols_norm,
+            'price_below_sma50': price_below_sma50,
+            'price_below_sma200': price_below_sma200,
+            'has_good_fundamentals': has_good_fundamentals,
+            'is_growth_stock': is_growth_stock,
+            'is_exponential_growth': is_exponential_growth,
+            'min_fundamental_score': min_fundamental_score,
+            'min_rsi': min_rsi,
+            'max_rsi': max_rsi,
+            'trend_filter': trend_filter or None,
+            'min_market_cap': min_market_cap,
+            'max_pe_ratio': max_pe_ratio,
+            'signal': signal.upper() if signal else None,
+            'min_confidence_score': min_confidence_score,
+        }
         
         try:
-            results = db.execute_query(query, params)
-            
-            # Process results
-            screened_stocks = []
-            for row in results:
-                stock_data = {
-                    'symbol': row['stock_symbol'],
-                    'date': row['date'],
-                    'current_price': row['current_price'],
-                    'sma50': row['sma50'],
-                    'sma200': row['sma200'],
-                    'rsi': row['rsi'],
-                    'signal': row.get('signal'),
-                    'confidence_score': row.get('confidence_score'),
-                    'long_term_trend': row['long_term_trend'],
-                    'medium_term_trend': row['medium_term_trend'],
-                    'fundamental_score': row['fundamental_score'],
-                    'has_good_fundamentals': bool(row['has_good_fundamentals']),
-                    'is_growth_stock': bool(row['is_growth_stock']),
-                    'is_exponential_growth': False,  # Placeholder - not calculated
-                    'price_below_sma50': False,  # Placeholder - not calculated
-                    'price_below_sma200': False,  # Placeholder - not calculated
-                }
-                
-                # Add fundamental data if available
-                fundamentals = {}
-                if row.get('market_cap') is not None:
-                    fundamentals['market_cap'] = row['market_cap']
-                if row.get('pe_ratio') is not None:
-                    fundamentals['pe_ratio'] = row['pe_ratio']
-                
-                if fundamentals:
-                    stock_data['fundamentals'] = fundamentals
-                
-                # Calculate discount percentages
-                if row['current_price'] and row['sma50']:
-                    stock_data['discount_from_sma50_pct'] = ((row['sma50'] - row['current_price']) / row['sma50']) * 100
-                
-                if row['current_price'] and row['sma200']:
-                    stock_data['discount_from_sma200_pct'] = ((row['sma200'] - row['current_price']) / row['sma200']) * 100
-                
-                screened_stocks.append(stock_data)
-            
-            return {
-                'stocks': screened_stocks,
-                'count': len(screened_stocks),
-                'criteria': {
-                    'symbols': params.get('symbols'),
-                    'price_below_sma50': price_below_sma50,
-                    'price_below_sma200': price_below_sma200,
-                    'has_good_fundamentals': has_good_fundamentals,
-                    'is_growth_stock': is_growth_stock,
-                    'is_exponential_growth': is_exponential_growth,
-                    'min_fundamental_score': min_fundamental_score,
-                    'min_rsi': min_rsi,
-                    'max_rsi': max_rsi,
-                    'trend_filter': trend_filter,
-                    'signal': params.get('signal'),
-                    'min_confidence_score': min_confidence_score,
-                    'limit': limit
-                }
-            }
-            
+            # Filters and ranking run on the in-memory feature matrix
+            matrix = self.engine.matrix()
+            rows = matrix.top_k(matrix.mask(**criteria), limit, sort_by)
+            screened_stocks = [matrix.row(i) for i in rows]
         except Exception as e:
-            self.log_error("Error screening stocks", e, context=params)
-            raise DatabaseError(f"Failed to screen stocks: {str(e)}", details=params) from e
+            self.log_error("Error screening stocks", e, context=criteria)
+            raise DatabaseError(f"Failed to screen stocks: {str(e)}", details=criteria) from e
+        
+        return {
+            'stocks': screened_stocks,
+            'count': len(screened_stocks),
+            'criteria': {**criteria, 'sort_by': sort_by, 'limit': limit}
+        }
     
     def get_screener_presets(self) -> Dict[str, Dict[str, Any]]:
         """
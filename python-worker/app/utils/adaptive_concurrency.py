@@ -0,0 +1,185 @@
+"""
+Adaptive Concurrency (AIMD)
+Finds the fastest request rate a provider tolerates
+Industry Standard: TCP-style additive increase / multiplicative decrease, honoring Retry-After
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from app.observability.logging import get_logger
+
+logger = get_logger("adaptive_concurrency")
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds
+
+    Accepts delta-seconds ("30") or an HTTP-date ("Wed, 21 Oct 2015 07:28:00 GMT").
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class AIMDController:
+    """
+    Concurrency window for async provider calls
+
+    - Additive increase: +1 slot after a full window of fast, successful responses
+    - Multiplicative decrease: window * decrease_factor on 429/5xx or when latency
+      rises above latency_tolerance x the best observed latency
+    - At most one decrease per round trip: responses to requests started before the
+      last decrease don't shrink the window again
+    - Retry-After pauses all new requests until the provider's deadline
+    """
+
+    def __init__(
+        self,
+        initial: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        ewma_alpha: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(max(int(initial), self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.ewma_alpha = ewma_alpha
+        self._clock = clock
+
+        self.in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._successes_in_window = 0
+        self._last_decrease_at = float("-inf")
+        self._paused_until = 0.0
+        self._latency_ewma: Optional[float] = None
+        self._latency_baseline: Optional[float] = None
+        self._stats: Dict[str, int] = {"successes": 0, "throttled": 0, "errors": 0, "increases": 0, "decreases": 0}
+
+    @property
+    def window(self) -> int:
+        return int(self.limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Hold one concurrency slot; yields the request start time for on_* callbacks"""
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                pause = self._paused_until - self._clock()
+                if pause > 0:
+                    # Waits release the lock, so finishing requests are never blocked
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=pause)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.window:
+                    break
+                await condition.wait()
+            self.in_flight += 1
+
+        started_at = self._clock()
+        try:
+            yield started_at
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def on_success(self, started_at: float) -> None:
+        """Record a successful response; grows the window or backs off on latency"""
+        latency = self._clock() - started_at
+        self._stats["successes"] += 1
+        self._observe_latency(latency)
+
+        if (
+            self._latency_baseline is not None
+            and self._latency_ewma is not None
+            and self._latency_ewma > self._latency_baseline * self.latency_tolerance
+        ):
+            self._decrease(started_at, reason="latency")
+            return
+
+        self._successes_in_window += 1
+        if self._successes_in_window >= self.window and self.limit < self.max_limit:
+            self.limit = min(self.limit + 1, self.max_limit)
+            self._successes_in_window = 0
+            self._stats["increases"] += 1
+            # Waiters are woken when the caller's slot is released
+
+    def on_throttle(self, started_at: float, retry_after: Optional[float] = None) -> None:
+        """Record a 429/5xx; halves the window and honors Retry-After"""
+        self._stats["throttled"] += 1
+        if retry_after:
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+        self._decrease(started_at, reason="throttled")
+
+    def on_error(self, started_at: float) -> None:
+        """Record a non-throttling failure (timeouts count as congestion)"""
+        self._stats["errors"] += 1
+        self._decrease(started_at, reason="error")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current window and counters (for task status endpoints)"""
+        paused_for = max(0.0, self._paused_until - self._clock())
+        return {
+            "window": self.window,
+            "in_flight": self.in_flight,
+            "min_window": self.min_limit,
+            "max_window": self.max_limit,
+            "latency_ewma_ms": round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None,
+            "latency_baseline_ms": round(self._latency_baseline * 1000, 1) if self._latency_baseline is not None else None,
+            "paused_for_seconds": round(paused_for, 2),
+            **self._stats,
+        }
+
+    # --- internals ---
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the controller can be built outside the event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _observe_latency(self, latency: float) -> None:
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self._latency_ewma
+        if self._latency_baseline is None or self._latency_ewma < self._latency_baseline:
+            self._latency_baseline = self._latency_ewma
+
+    def _decrease(self, started_at: float, *, reason: str) -> None:
+        if started_at < self._last_decrease_at:
+            return  # already reacted to this round trip
+        previous = self.window
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self._last_decrease_at = self._clock()
+        self._successes_in_window = 0
+        if reason == "latency" and self._latency_ewma is not None:
+            # Re-anchor to the slow level so one slow period doesn't keep halving the window
+            self._latency_baseline = max(self._latency_baseline or 0.0, self._latency_ewma)
+        self._stats["decreases"] += 1
+        logger.info(f"AIMD window {previous} -> {self.window} ({reason})")
@@ -0,0 +1,85 @@
+"""
+Shared HTTP Sessions
+One keep-alive requests.Session per provider, with a tuned connection pool
+Performance: TCP/TLS handshakes happen once per pooled connection, not once per call
+"""
+import atexit
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.observability.logging import get_logger
+
+logger = get_logger("http_session")
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def get_http_session(
+    provider: str,
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+) -> requests.Session:
+    """
+    Get the process-wide session for a provider
+
+    Every client talking to the same provider shares one pool, so concurrent
+    workers reuse warm connections instead of opening their own.
+
+    Args:
+        provider: Pool name (e.g. 'finnhub', 'fmp', 'massive')
+        pool_connections: Number of per-host pools (defaults to settings.http_pool_connections)
+        pool_maxsize: Connections kept alive per host (defaults to settings.http_pool_maxsize)
+    """
+    session = _sessions.get(provider)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            from app.config import settings
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections or settings.http_pool_connections,
+                pool_maxsize=pool_maxsize or settings.http_pool_maxsize,
+                pool_block=False,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+            logger.debug(f"Created pooled HTTP session for {provider}")
+    return session
+
+
+def get_http_session_stats() -> Dict[str, Any]:
+    """Pool sizes per provider session (for /system/metrics)"""
+    with _lock:
+        sessions = dict(_sessions)
+    stats = {}
+    for provider, session in sessions.items():
+        adapter = session.get_adapter("https://")
+        stats[provider] = {
+            "pool_connections": getattr(adapter, "_pool_connections", None),
+            "pool_maxsize": getattr(adapter, "_pool_maxsize", None),
+            "host_pools": len(adapter.poolmanager.pools) if hasattr(adapter, "poolmanager") else 0,
+        }
+    return stats
+
+
+def close_http_sessions() -> None:
+    """Close every pooled session (process shutdown, tests)"""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"Error closing HTTP session: {e}")
+
+
+atexit.register(close_http_sessions)
@@ -0,0 +1,92 @@
+"""
+Intraday Bar Normalization
+Vectorized provider frame -> raw_market_data_intraday rows
+Performance: column mapping, timestamp localization and dtype coercion run once per frame, not per row
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BAR_PRICE_COLUMNS = ("open", "high", "low", "close")
+BAR_COLUMNS = ("ts",) + BAR_PRICE_COLUMNS + ("volume",)
+
+
+def _column(data: pd.DataFrame, name: str) -> Optional[pd.Series]:
+    """Find a column case-insensitively (providers return Open/open/OPEN)"""
+    if name in data.columns:
+        return data[name]
+    for col in data.columns:
+        if str(col).strip().lower() == name:
+            return data[col]
+    return None
+
+
+def normalize_intraday_bars(data: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Normalize a provider OHLCV frame into a canonical bar frame
+
+    - Timestamps come from a 'ts' column, falling back to the (Datetime)Index per row
+    - Naive timestamps are treated as UTC; aware ones are converted to UTC
+    - Prices are float64 and volume is nullable Int64; unparseable values become missing
+    - Rows without a timestamp are dropped; duplicate timestamps keep the last bar
+
+    Returns:
+        DataFrame with columns ts, open, high, low, close, volume (possibly empty)
+    """
+    if data is None or getattr(data, "empty", True):
+        return pd.DataFrame(columns=list(BAR_COLUMNS))
+
+    ts_col = _column(data, "ts")
+    ts = pd.to_datetime(ts_col, utc=True, errors="coerce") if ts_col is not None else None
+    if ts is None or ts.isna().any():
+        index_ts = pd.Series(pd.to_datetime(data.index, utc=True, errors="coerce"), index=data.index)
+        ts = index_ts if ts is None else ts.fillna(index_ts)
+
+    bars = pd.DataFrame({"ts": ts.to_numpy()}, index=range(len(data)))
+    for name in BAR_PRICE_COLUMNS:
+        col = _column(data, name)
+        bars[name] = (
+            pd.to_numeric(col, errors="coerce").to_numpy(dtype="float64")
+            if col is not None else np.nan
+        )
+    volume = _column(data, "volume")
+    bars["volume"] = (
+        pd.to_numeric(volume, errors="coerce").round().astype("Int64").array
+        if volume is not None else pd.array([pd.NA] * len(data), dtype="Int64")
+    )
+
+    bars = bars[bars["ts"].notna()]
+    return bars.drop_duplicates(subset="ts", keep="last").reset_index(drop=True)
+
+
+def intraday_bar_records(bars: pd.DataFrame, *, symbol: str, interval: str, source: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Convert a normalized bar frame into raw_market_data_intraday upsert rows
+
+    Values are native Python types (datetime, float, int, None) so they bind without per-value adaptation.
+    """
+    if bars.empty:
+        return []
+
+    ts_values = bars["ts"].dt.to_pydatetime()
+    columns = {
+        name: bars[name].astype(object).where(bars[name].notna(), None).tolist()
+        for name in BAR_PRICE_COLUMNS
+    }
+    volumes = [None if v is pd.NA else int(v) for v in bars["volume"].array]
+
+    return [
+        {
+            "symbol": symbol,
+            "ts": ts_values[i],
+            "interval": interval,
+            "open": columns["open"][i],
+            "high": columns["high"][i],
+            "low": columns["low"][i],
+            "close": columns["close"][i],
+            "volume": volumes[i],
+            "data_source": source,
+        }
+        for i in range(len(bars))
+    ]
@@ -5,7 +5,7 @@ Industry Standard: Prevents API rate limit violations
 """
 import time
 import threading
-from typing import Optional
+from typing import Dict, Optional
 from collections import deque
 import logging
 
@@ -43,6 +43,7 @@ class RateLimiter:
         # Thread-safe call tracking
         self._lock = threading.Lock()
         self._call_times = deque()  # Timestamps of recent calls
+        self.total_calls = 0  # Calls granted since process start (quota accounting)
         
         logger.info(
             f"Initialized {name}: {max_calls} calls per {time_window}s "
@@ -76,6 +77,7 @@ class RateLimiter:
                 if len(self._call_times) < self.max_calls:
                     # We have capacity, record the call
                     self._call_times.append(current_time)
+                    self.total_calls += 1
                     logger.debug(
                         f"{self.name}: Call allowed. "
                         f"Used: {len(self._call_times)}/{self.max_calls} calls"
@@ -148,6 +150,7 @@ class RateLimiter:
                 "current_calls": len(self._call_times),
                 "available_calls": max(0, self.max_calls - len(self._call_times)),
                 "calls_per_minute": self.max_calls / (self.time_window / 60),
+                "total_calls": self.total_calls,
             }
 
 
@@ -181,3 +184,52 @@ class RateLimitedClient:
         else:
             return attr
 
+
+
+# Process-wide limiters, one per provider name: every client of a provider draws from the same budget
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, max_calls: int, time_window: float = 60.0) -> RateLimiter:
+    """
+    Get the shared RateLimiter for a provider
+
+    Clients created per request (or per worker) previously each had their own
+    limiter, so N instances could spend N x the provider's quota. A caller
+    asking for different limits than the existing limiter gets the same limiter;
+    a warning is logged and the stricter of the two rates is kept.
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                limiter = RateLimiter(max_calls=max_calls, time_window=time_window, name=name)
+                _limiters[name] = limiter
+                return limiter
+    if (limiter.max_calls, limiter.time_window) != (int(max_calls), float(time_window)):
+        with limiter._lock:
+            stricter = max_calls / time_window < limiter.max_calls / limiter.time_window
+            logger.warning(
+                f"{name}: requested {max_calls} calls per {time_window}s but the shared limiter allows "
+                f"{limiter.max_calls} per {limiter.time_window}s; keeping the "
+                f"{'requested' if stricter else 'existing'} (stricter) limit"
+            )
+            if stricter:
+                limiter.max_calls, limiter.time_window = int(max_calls), float(time_window)
+    return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, dict]:
+    """Stats for every shared limiter, keyed by name"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters}
+
+
+def get_rate_limiter_call_totals() -> Dict[str, int]:
+    """Calls granted since process start per limiter name"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.total_calls for limiter in limiters}
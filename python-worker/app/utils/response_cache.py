@@ -0,0 +1,344 @@
+"""
+Provider Response Cache
+Size-bounded LRU with per-dataset TTLs and an optional on-disk tier
+Industry Standard: Cache-aside in front of paid provider APIs
+"""
+import copy
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping, Sequence, Set
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.observability.logging import get_logger
+from app.observability.metrics import get_metrics
+
+logger = get_logger("response_cache")
+
+# TTLs in seconds per dataset. Reference data changes rarely, quotes change constantly.
+DEFAULT_DATASET_TTLS: Dict[str, float] = {
+    "symbol_details": 7 * 24 * 3600,
+    "industry_peers": 24 * 3600,
+    "corporate_actions": 24 * 3600,
+    "financial_statements": 12 * 3600,
+    "earnings": 12 * 3600,
+    "fundamentals": 6 * 3600,
+    "analyst_recommendations": 6 * 3600,
+    "earnings_calendar": 3600,
+    "news": 900,
+    "price_data": 300,
+    "technical_indicators": 300,
+    "quote": 15,
+}
+
+# Entries shorter-lived than this are not worth a disk round-trip
+DISK_MIN_TTL = 60.0
+
+_MISS = object()
+
+
+def make_cache_key(namespace: str, method: str, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a deterministic cache key for a provider call
+
+    Args:
+        namespace: Provider name (e.g. 'fmp', 'yahoo_finance')
+        method: Method name (e.g. 'fetch_fundamentals')
+        args: Positional arguments
+        kwargs: Keyword arguments (order-independent)
+    """
+    parts = [repr(a) for a in args]
+    if kwargs:
+        parts.extend(f"{k}={kwargs[k]!r}" for k in sorted(kwargs))
+    return f"{namespace}:{method}({','.join(parts)})"
+
+
+def clone_response(value: Any) -> Any:
+    """Return a defensive copy so callers cannot mutate cached entries"""
+    if hasattr(value, "copy") and hasattr(value, "columns"):
+        return value.copy()
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+# Top-level keys of provider error payloads (FMP "Error Message", Alpha Vantage throttling
+# "Note"/"Information", client wrappers' "error")
+ERROR_KEYS = ("error", "Error Message", "Note", "Information")
+
+
+def _has_data(value: Any) -> bool:
+    """False for None, empty frames/strings and containers holding nothing but such values"""
+    if value is None:
+        return False
+    if getattr(value, "empty", False) is True:
+        return False
+    if isinstance(value, str):
+        return bool(value)
+    if isinstance(value, Mapping):
+        return any(_has_data(v) for v in value.values())
+    if isinstance(value, (Sequence, Set)):
+        return any(_has_data(v) for v in value)
+    return True
+
+
+def _is_cacheable(value: Any) -> bool:
+    """
+    Error payloads and empty results usually mean a transient failure - don't pin them
+
+    Rejects None, empty frames, dicts/lists with no data in them (e.g. statements
+    whose lists are all empty) and dicts carrying a provider error key.
+    """
+    if isinstance(value, Mapping) and any(value.get(key) for key in ERROR_KEYS):
+        return False
+    return _has_data(value)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache for provider responses
+
+    - Per-dataset TTLs (symbol details: days, fundamentals: hours, quotes: seconds)
+    - Bounded by max_entries; least recently used entries are evicted first
+    - Optional disk tier (pickle files) so long-lived entries survive restarts
+    - Hit/miss/eviction counters exposed via get_stats() and the metrics collector
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        dataset_ttls: Optional[Dict[str, float]] = None,
+        disk_dir: Optional[str] = None,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.dataset_ttls = dict(DEFAULT_DATASET_TTLS)
+        if dataset_ttls:
+            self.dataset_ttls.update(dataset_ttls)
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._stats: Dict[str, int] = defaultdict(int)
+        self._dataset_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+        self.disk_dir = disk_dir
+        if disk_dir:
+            try:
+                os.makedirs(disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Disabling disk cache tier, cannot create {disk_dir}: {e}")
+                self.disk_dir = None
+
+    def ttl_for(self, dataset: str) -> float:
+        """Get TTL (seconds) for a dataset, defaulting to the price_data TTL"""
+        return self.dataset_ttls.get(dataset, self.dataset_ttls["price_data"])
+
+    def get(self, dataset: str, key: str, default: Any = None) -> Any:
+        """Get a cached value or default"""
+        value = self.lookup(dataset, key)
+        return default if value is _MISS else value
+
+    def lookup(self, dataset: str, key: str) -> Any:
+        """
+        Get a cached value, returning the module-level miss sentinel on a miss
+        Prefer get_or_fetch() or get() from call sites.
+        """
+        if not self.enabled:
+            return _MISS
+
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._record(dataset, "hits")
+                    self._stats["memory_hits"] += 1
+                    return clone_response(value)
+                del self._entries[key]
+                self._stats["expirations"] += 1
+
+        if self.disk_dir:
+            disk_entry = self._read_disk(key, now)
+            if disk_entry is not None:
+                expires_at, value = disk_entry
+                with self._lock:
+                    self._store(key, dataset, expires_at, value)
+                    self._record(dataset, "hits")
+                    self._stats["disk_hits"] += 1
+                return clone_response(value)
+
+        with self._lock:
+            self._record(dataset, "misses")
+        return _MISS
+
+    def set(self, dataset: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; None and empty frames are skipped"""
+        if not self.enabled or not _is_cacheable(value):
+            return
+
+        ttl = self.ttl_for(dataset) if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        expires_at = self._clock() + ttl
+        stored = clone_response(value)
+        with self._lock:
+            self._store(key, dataset, expires_at, stored)
+            self._stats["sets"] += 1
+
+        if self.disk_dir and ttl >= DISK_MIN_TTL:
+            self._write_disk(key, expires_at, stored)
+
+    def get_or_fetch(self, dataset: str, key: str, fetch: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Cache-aside helper: return cached value or call fetch() and cache its result"""
+        value = self.lookup(dataset, key)
+        if value is not _MISS:
+            return value
+        value = fetch()
+        self.set(dataset, key, value, ttl=ttl)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single key from both tiers"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_dir:
+            self._remove_disk(self._disk_path(key))
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (disk tier is left intact)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics for health checks and dashboards"""
+        with self._lock:
+            hits = self._stats["hits"]
+            misses = self._stats["misses"]
+            total = hits + misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": bool(self.disk_dir),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "memory_hits": self._stats["memory_hits"],
+                "disk_hits": self._stats["disk_hits"],
+                "sets": self._stats["sets"],
+                "evictions": self._stats["evictions"],
+                "expirations": self._stats["expirations"],
+                "datasets": {name: dict(counts) for name, counts in self._dataset_stats.items()},
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # --- internals (caller holds self._lock where noted) ---
+
+    def _store(self, key: str, dataset: str, expires_at: float, value: Any) -> None:
+        """Insert/refresh an entry and evict LRU entries (caller holds lock)"""
+        self._entries[key] = (expires_at, dataset, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _record(self, dataset: str, outcome: str) -> None:
+        """Count a hit/miss (caller holds lock)"""
+        self._stats[outcome] += 1
+        self._dataset_stats[dataset][outcome] += 1
+        get_metrics().increment(f"provider_cache_{outcome}", labels={"dataset": dataset})
+
+    def _disk_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.pkl")
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                stored_key, expires_at, value = pickle.load(f)
+        except Exception as e:
+            logger.debug(f"Discarding unreadable disk cache entry {path}: {e}")
+            self._remove_disk(path)
+            return None
+        if stored_key != key or expires_at <= now:
+            self._remove_disk(path)
+            return None
+        return expires_at, value
+
+    def _write_disk(self, key: str, expires_at: float, value: Any) -> None:
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"Failed to write disk cache entry for {key}: {e}")
+            self._remove_disk(tmp_path)
+
+    @staticmethod
+    def _remove_disk(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def cached_response(dataset: str, namespace: Optional[str] = None):
+    """
+    Decorator for provider client methods: serve identical lookups from the response cache
+
+    The cache namespace defaults to the instance's `cache_namespace` attribute
+    (falling back to the class name), so FMP and Yahoo never share entries.
+
+    Usage:
+        @cached_response("fundamentals")
+        def fetch_fundamentals(self, symbol: str): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = get_response_cache()
+            if not cache.enabled:
+                return func(self, *args, **kwargs)
+            ns = namespace or getattr(self, "cache_namespace", None) or type(self).__name__
+            key = make_cache_key(ns, func.__name__, args, kwargs)
+            return cache.get_or_fetch(dataset, key, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Global cache instance
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get global provider response cache (configured from settings)"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                from app.config import settings
+                _response_cache = ResponseCache(
+                    max_entries=settings.provider_cache_max_entries,
+                    disk_dir=settings.provider_cache_dir,
+                    enabled=settings.provider_cache_enabled,
+                )
+    return _response_cache
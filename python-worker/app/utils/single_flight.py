@@ -0,0 +1,176 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers with the same key share one in-flight call
+Industry Standard: Go's singleflight pattern, for both threads and asyncio
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.observability.logging import get_logger
+from app.observability.metrics import get_metrics
+from app.utils.response_cache import clone_response
+
+logger = get_logger("single_flight")
+
+
+class _InFlightCall:
+    """A call being executed by a leader thread"""
+
+    __slots__ = ("done", "result", "error", "owner", "followers")
+
+    def __init__(self, owner: int):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.owner = owner
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one execution
+
+    - do(): thread callers block on the leader's call and share its result
+    - do_async(): coroutines on the same event loop await one shared future
+    - A shared result is snapshotted before waiters are released; every caller,
+      the leader included, gets its own copy of that snapshot (or the exception)
+    - Re-entrant calls for the same key from the leader thread run directly
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._async_calls: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._stats: Dict[str, int] = defaultdict(int)
+
+    def do(self, key: str, fn: Callable[[], Any], labels: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Execute fn() once per key across concurrent threads
+
+        Args:
+            key: Call identity (e.g. provider + method + args)
+            fn: Zero-argument callable performing the real call
+            labels: Optional metric labels (adapter, method)
+        """
+        me = threading.get_ident()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _InFlightCall(owner=me)
+                self._calls[key] = call
+                leader = True
+            elif call.owner == me:
+                # Re-entrant call from the leader itself - waiting would deadlock
+                leader = None
+            else:
+                call.followers += 1
+                leader = False
+            self._stats["calls"] += 1
+
+        if leader is None:
+            return fn()
+
+        if not leader:
+            self._count("coalesced", labels)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return clone_response(call.result)
+
+        self._count("executed", labels)
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            self._count("errors", labels)
+            raise
+        else:
+            with self._lock:
+                self._calls.pop(key, None)
+                followers = call.followers
+            if not followers:
+                return result
+            # Snapshot before releasing followers: the leader's caller may mutate its result
+            call.result = clone_response(result)
+            return clone_response(call.result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """
+        Await fn() once per key across concurrent coroutines on the running loop
+
+        Args:
+            key: Call identity
+            fn: Zero-argument coroutine function performing the real call
+            labels: Optional metric labels
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            if future is None:
+                future = loop.create_future()
+                self._async_calls[loop_key] = future
+                leader = True
+            else:
+                leader = False
+            self._stats["calls"] += 1
+
+        if not leader:
+            self._count("coalesced", labels)
+            # shield: a cancelled follower must not cancel the shared call
+            return clone_response(await asyncio.shield(future))
+
+        self._count("executed", labels)
+        try:
+            # Snapshot before waking followers: the leader's caller may mutate its result
+            snapshot = clone_response(await fn())
+            future.set_result(snapshot)
+            return clone_response(snapshot)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._count("errors", labels)
+            future.set_exception(e)
+            future.exception()  # mark retrieved when there are no followers
+            raise
+        finally:
+            with self._lock:
+                self._async_calls.pop(loop_key, None)
+
+    def in_flight(self) -> int:
+        """Number of calls currently being executed"""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        with self._lock:
+            calls = self._stats["calls"]
+            coalesced = self._stats["coalesced"]
+            return {
+                "name": self.name,
+                "calls": calls,
+                "executed": self._stats["executed"],
+                "coalesced": coalesced,
+                "errors": self._stats["errors"],
+                "coalesced_ratio": round(coalesced / calls, 4) if calls else 0.0,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+    def _count(self, outcome: str, labels: Optional[Dict[str, str]]) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+        get_metrics().increment(f"{self.name}_{outcome}", labels=labels)
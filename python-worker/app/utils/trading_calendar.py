@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time
-from typing import Iterable, List, Optional
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 
 import pandas as pd
 
+MARKET_TZ = "America/New_York"
+
 
 def _get_xnys_calendar():
     try:
@@ -58,3 +61,52 @@ def expected_intraday_15m_timestamps(start: date, end: date) -> List[pd.Timestam
         rng = pd.date_range(open_ts, close_ts - pd.Timedelta(minutes=15), freq="15min", tz=open_ts.tz)
         out.extend([ts.tz_convert("UTC") for ts in rng])
     return out
+
+
+@lru_cache(maxsize=64)
+def session_bounds(day: date) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return (open, close) in UTC for the NYSE session on `day`, or None if the market is closed.
+
+    Early closes are honored when exchange_calendars is available; the fallback is
+    09:30-16:00 America/New_York on business days.
+    """
+    cal = _get_xnys_calendar()
+    if cal is not None:
+        session = pd.Timestamp(day)
+        try:
+            if not cal.is_session(session):
+                return None
+            return cal.session_open(session).tz_convert("UTC"), cal.session_close(session).tz_convert("UTC")
+        except Exception:
+            pass  # outside the calendar's bounds
+
+    if pd.Timestamp(day).dayofweek >= 5:
+        return None
+    open_dt = pd.Timestamp(datetime.combine(day, time(9, 30)), tz=MARKET_TZ)
+    close_dt = pd.Timestamp(datetime.combine(day, time(16, 0)), tz=MARKET_TZ)
+    return open_dt.tz_convert("UTC"), close_dt.tz_convert("UTC")
+
+
+def session_containing(ts: datetime) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return the (open, close) UTC bounds of the session `ts` falls in, or None outside market hours.
+
+    Naive timestamps are treated as UTC.
+    """
+    stamp = pd.Timestamp(ts)
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+    bounds = session_bounds(stamp.tz_convert(MARKET_TZ).date())
+    if bounds is None or not (bounds[0] <= stamp < bounds[1]):
+        return None
+    return bounds
+
+
+def last_session_close(ts: datetime, lookback_days: int = 10) -> Optional[pd.Timestamp]:
+    """Return the most recent session close at or before `ts` (UTC)."""
+    stamp = pd.Timestamp(ts)
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+    day = stamp.tz_convert(MARKET_TZ).date()
+    for offset in range(lookback_days + 1):
+        bounds = session_bounds(day - timedelta(days=offset))
+        if bounds is not None and bounds[1] <= stamp:
+            return bounds[1]
+    return None
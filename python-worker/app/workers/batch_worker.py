@@ -6,6 +6,7 @@ SOLID: Single Responsibility - orchestrates batch jobs
 DRY: Reuses EODWorkflow and UpdateStrategy
 """
 import logging
+import uuid
 from datetime import datetime
 from typing import List
 import schedule
@@ -13,12 +14,15 @@ import time
 
 from app.config import settings
 from app.database import init_database
+from app.workflows.data_frequency import DataFrequency
 from app.workflows.eod_workflow import EODWorkflow
+from app.workflows.job_queue import JobQueue, new_batch_id
 from app.workflows.update_strategy import UpdateStrategy
 from app.services.market_movers_service import MarketMoversService
 from app.services.sector_performance_service import SectorPerformanceService
 from app.services.market_overview_service import MarketOverviewService
 from app.services.market_trends_service import MarketTrendsService
+from app.services.market_aggregation_service import MarketAggregationService
 from app.observability.metrics import get_metrics, track_duration
 
 logger = logging.getLogger(__name__)
@@ -50,6 +54,7 @@ class BatchWorker:
         self.sector_performance_service = SectorPerformanceService()
         self.market_overview_service = MarketOverviewService()
         self.market_trends_service = MarketTrendsService()
+        self.market_aggregation_service = MarketAggregationService()
         self.running = False
     
     @track_duration('batch_job_duration_seconds')
@@ -83,8 +88,11 @@ class BatchWorker:
             except Exception as e:
                 logger.warning(f"⚠️ Macro snapshot refresh failed (non-fatal): {e}")
             
-            # Execute EOD workflow (stages 1-6)
-            eod_result = self.eod_workflow.execute_daily_eod_workflow(symbols)
+            # Execute EOD workflow (stages 1-6), in-process or fanned out to queue workers
+            if settings.job_queue_enabled:
+                eod_result = self._run_eod_via_queue(symbols)
+            else:
+                eod_result = self.eod_workflow.execute_daily_eod_workflow(symbols)
             
             if not eod_result.get('success'):
                 logger.error(f"❌ EOD workflow failed: {eod_result.get('error')}")
@@ -108,19 +116,42 @@ class BatchWorker:
                     DataType.CASH_FLOW_STATEMENTS,
                 ]
 
-                for symbol in symbols:
+                chunk_size = max(1, settings.refresh_chunk_size)
+                for start in range(0, len(symbols), chunk_size):
+                    chunk = symbols[start:start + chunk_size]
                     try:
-                        refresh_manager.refresh_data(
-                            symbol=symbol,
-                            data_types=extra_types,
-                            mode=RefreshMode.SCHEDULED,
-                            force=False,
-                        )
+                        # One state query per chunk; tracking writes flushed once per chunk
+                        refresh_manager.preload_refresh_state(chunk, extra_types)
                     except Exception as e:
-                        logger.warning(f"⚠️ Nightly extended refresh failed for {symbol}: {e}")
+                        logger.warning(f"⚠️ Refresh state preload failed for chunk: {e}")
+                    with refresh_manager.tracking_batch():
+                        for symbol in chunk:
+                            try:
+                                refresh_manager.refresh_data(
+                                    symbol=symbol,
+                                    data_types=extra_types,
+                                    mode=RefreshMode.SCHEDULED,
+                                    force=False,
+                                )
+                            except Exception as e:
+                                logger.warning(f"⚠️ Nightly extended refresh failed for {symbol}: {e}")
             except Exception as e:
                 logger.warning(f"⚠️ Nightly extended refresh stage failed to run: {e}")
             
+            # Stage 6.6: Universe-wide gap self-healing (one scan per dataset, batched backfill)
+            try:
+                from app.data_management.refresh_manager import DataRefreshManager
+
+                healing = DataRefreshManager().run_self_healing(symbols)
+                for dataset, outcome in healing.items():
+                    logger.info(
+                        f"🩹 Self-healing {dataset}: {outcome['plan']['total_missing']} missing across "
+                        f"{outcome['plan']['symbols']} symbols, {outcome['result']['succeeded']} backfilled, "
+                        f"{outcome['result']['failed']} failed"
+                    )
+            except Exception as e:
+                logger.warning(f"⚠️ Gap self-healing stage failed to run: {e}")
+            
             # Stage 7: Market aggregations (movers, sectors, trends, overview)
             logger.info("📈 Calculating market aggregations...")
             self._calculate_market_aggregations()
@@ -139,6 +170,84 @@ class BatchWorker:
             logger.error(f"❌ Error in EOD batch job: {e}", exc_info=True)
             raise
     
+    def _run_eod_via_queue(self, symbols: List[str]) -> dict:
+        """
+        EOD stages 1-4 as one 'eod_symbol' job per symbol on the workflow job queue,
+        then stages 5-6 here for the symbols whose inputs changed.
+
+        The batch is recorded as a workflow run so that jobs the queue gives up on
+        land in the dead letter queue. Dead or still-pending jobs make the run
+        partial ('success' only while at least one job succeeded).
+        """
+        start_time = datetime.now()
+        queue = JobQueue(settings.job_queue_name, lease_seconds=settings.job_queue_lease_seconds)
+        batch_id = new_batch_id('eod')
+        workflow_id = str(uuid.uuid4())
+        orchestrator = self.eod_workflow.orchestrator
+        try:
+            orchestrator._create_workflow_execution(workflow_id, 'daily_batch', symbols, DataFrequency.DAILY)
+            # One live job per symbol per day; a same-day re-run skips symbols that are
+            # queued, running or done but retries the ones whose jobs died
+            enqueued = queue.enqueue_many(
+                'eod_symbol', symbols, payload={'workflow_id': workflow_id},
+                dedupe_prefix=f"eod:{start_time.date().isoformat()}", batch_id=batch_id
+            )
+            logger.info(f"📬 Queued {len(enqueued)}/{len(symbols)} EOD symbol jobs (batch {batch_id})")
+            jobs = queue.wait_for_batch(
+                batch_id,
+                timeout=settings.job_queue_batch_timeout_seconds,
+                poll_interval=settings.job_queue_poll_seconds,
+            )
+        except Exception as e:
+            logger.error(f"❌ EOD job queue failed: {e}", exc_info=True)
+            return {'success': False, 'workflow_id': workflow_id, 'error': str(e)}
+
+        succeeded = [job for job in jobs if job.status == 'succeeded']
+        dead = [job.symbol for job in jobs if job.status == 'dead']
+        pending = [job.symbol for job in jobs if job.status not in ('succeeded', 'dead')]
+        if pending:
+            logger.warning(f"⚠️ {len(pending)} EOD jobs still pending after {settings.job_queue_batch_timeout_seconds}s")
+        if dead:
+            logger.warning(f"⚠️ {len(dead)} EOD jobs dead (see workflow_dlq for workflow {workflow_id})")
+        changed = [job.symbol for job in succeeded if (job.result or {}).get('changed')]
+
+        downstream = self.eod_workflow.update_downstream(changed)
+        stage_counts = {'succeeded': len(succeeded), 'failed': len(dead), 'pending': len(pending)}
+        success = bool(succeeded) or not jobs
+        partial = bool(dead or pending)
+        orchestrator._update_workflow_status(
+            workflow_id,
+            'completed' if success else 'failed',
+            {'batch_id': batch_id, 'stage_counts': stage_counts, 'dead_symbols': dead, 'pending_symbols': pending},
+        )
+        return {
+            'success': success,
+            'partial': partial,
+            'workflow_id': workflow_id,
+            'batch_id': batch_id,
+            'stages': {
+                'price_loading': stage_counts,
+                'indicator_recomputation': stage_counts,
+                'signal_generation': stage_counts,
+                **downstream
+            },
+            'changed_symbols': len(changed),
+            'dead_symbols': dead,
+            'pending_symbols': pending,
+            'elapsed_seconds': (datetime.now() - start_time).total_seconds(),
+            **({} if success else {'error': f"all {len(jobs)} EOD jobs dead or pending"})
+        }
+
+    def run_dlq_redrive(self):
+        """Retry due transient failures from the dead letter queue (between nightly runs)"""
+        try:
+            result = self.eod_workflow.redrive_dead_letters()
+            metrics.increment('dlq_redrive_runs_total')
+            if result['items']:
+                logger.info(f"🔁 DLQ re-drive resolved {result['resolved']}/{result['items']} items")
+        except Exception as e:
+            logger.error(f"❌ DLQ re-drive failed: {e}", exc_info=True)
+    
     def _calculate_market_aggregations(self):
         """Calculate market-level aggregations (movers, sectors, trends, overview)"""
         try:
@@ -147,8 +256,15 @@ class BatchWorker:
         except Exception as e:
             logger.error(f"Error calculating market movers: {e}")
         
+        # Sector, industry and market-cap groups: one aggregation query shared by sectors and trends
+        groups = None
+        try:
+            groups = self.market_aggregation_service.calculate_group_performance()
+        except Exception as e:
+            logger.error(f"Error calculating group performance: {e}")
+        
         try:
-            sector_perf = self.sector_performance_service.calculate_sector_performance()
+            sector_perf = self.sector_performance_service.calculate_sector_performance(groups=groups)
             logger.info(f"✅ Sector performance: {len(sector_perf.get('sectors', []))} sectors")
         except Exception as e:
             logger.error(f"Error calculating sector performance: {e}")
@@ -160,7 +276,7 @@ class BatchWorker:
             logger.error(f"Error calculating market overview: {e}")
         
         try:
-            trends = self.market_trends_service.calculate_market_trends()
+            trends = self.market_trends_service.calculate_market_trends(groups=groups)
             logger.info(f"✅ Market trends: {trends.get('overall', {}).get('direction', 'N/A')}")
         except Exception as e:
             logger.error(f"Error calculating market trends: {e}")
@@ -172,6 +288,8 @@ class BatchWorker:
         schedule.every().day.at(
             f"{settings.batch_schedule_hour:02d}:{settings.batch_schedule_minute:02d}"
         ).do(self.run_nightly_batch)
+        if settings.dlq_redrive_enabled:
+            schedule.every(settings.dlq_redrive_interval_minutes).minutes.do(self.run_dlq_redrive)
         
         logger.info(
             f"📅 Batch scheduler started. Nightly job scheduled for "
@@ -6,16 +6,22 @@ Runs in parallel with batch worker
 import logging
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from app.config import settings
-from app.database import db, init_database
+from app.database import init_database
 from app.data_management.refresh_manager import DataRefreshManager
+from app.data_management.refresh_planner import PRIORITY_HOLDING, RefreshPlanner, load_symbol_priorities
 from app.data_management.refresh_strategy import RefreshMode, DataType
+from app.workers.refresh_scheduler import RefreshScheduler, ScheduledRefresh
 
 logger = logging.getLogger(__name__)
 
+# Refreshes per data type per minute when the planner is off (the pre-planner loop's caps)
+LEGACY_REFRESHES_PER_MINUTE = {RefreshMode.PERIODIC: 10, RefreshMode.LIVE: 5}
+
 
 class PeriodicWorker:
     """Worker for periodic and live data updates"""
@@ -34,10 +40,22 @@ class PeriodicWorker:
             DataType.FUNDAMENTALS: timedelta(hours=12),  # Every 12 hours
         }
         
-        # Define live refresh intervals (for real-time data)
+        # Define live refresh intervals (for real-time data, holdings only)
         self.live_intervals = {
             DataType.PRICE_CURRENT: timedelta(minutes=1),  # Every minute
         }
+        
+        # Chooses which due refreshes to spend provider quota on
+        self.planner = RefreshPlanner(self.refresh_manager, intervals=self.periodic_intervals)
+        
+        # Next-due time per (symbol, data type); the loop sleeps until the earliest one
+        self.scheduler = RefreshScheduler(jitter_fraction=settings.periodic_schedule_jitter)
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._symbol_priorities: Dict[str, int] = {}
+        self._next_symbol_sync = 0.0
+        self._next_plan_at = 0.0
+        self._legacy_window_end = 0.0
+        self._legacy_counts: Dict[Tuple[RefreshMode, DataType], int] = {}
     
     def start(self):
         """Start the periodic worker"""
@@ -46,6 +64,16 @@ class PeriodicWorker:
             return
         
         self.running = True
+        self.scheduler = RefreshScheduler(jitter_fraction=settings.periodic_schedule_jitter)
+        self._symbol_priorities = {}
+        self._next_symbol_sync = 0.0
+        self._next_plan_at = 0.0
+        self._legacy_window_end = 0.0
+        self._legacy_counts = {}
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.periodic_refresh_max_workers,
+            thread_name_prefix="periodic-refresh",
+        )
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         logger.info("🔄 Periodic worker started")
@@ -53,103 +81,160 @@ class PeriodicWorker:
     def stop(self):
         """Stop the periodic worker"""
         self.running = False
+        self.scheduler.stop()
         if self.thread:
             self.thread.join(timeout=10)
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
         logger.info("Periodic worker stopped")
     
     def _run_loop(self):
-        """Main loop for periodic updates"""
+        """
+        Main loop: sleep until the next refresh is due, dispatch, re-insert
+
+        With the planner on, every due entry is planned together once per planner
+        cycle; without it, dispatches are capped like the pre-planner loop.
+        """
         while self.running:
             try:
-                # Run periodic updates
-                self._run_periodic_updates()
-                
-                # Run live updates (if enabled)
-                if settings.enable_live_updates:
-                    self._run_live_updates()
+                if time.monotonic() >= self._next_symbol_sync:
+                    self._sync_schedule()
                 
-                # Sleep for a short interval before next check
-                time.sleep(60)  # Check every minute
+                until_sync = max(0.0, self._next_symbol_sync - time.monotonic())
+                planned = settings.refresh_planner_enabled
+                if planned and time.monotonic() < self._next_plan_at:
+                    self.scheduler.wait(min(until_sync, self._next_plan_at - time.monotonic()))
+                    continue
+                due = self.scheduler.next_due(timeout=until_sync)
+                if due:
+                    if planned:
+                        self._next_plan_at = time.monotonic() + self.planner.cycle_minutes * 60
+                    try:
+                        self._dispatch(due)
+                    except Exception:
+                        # Keep failed dispatches on the schedule (no-op for keys already re-inserted)
+                        for entry in due:
+                            self.scheduler.reschedule(entry)
+                        raise
                 
             except Exception as e:
                 logger.error(f"Error in periodic worker loop: {e}")
                 time.sleep(60)  # Wait before retrying
     
-    def _run_periodic_updates(self):
-        """Run periodic data updates"""
-        symbols = self._get_active_symbols()
+    def _refresh_intervals(self, symbol: str, priority: int) -> Dict[DataType, Tuple[timedelta, RefreshMode]]:
+        """Interval and mode per data type (live intervals override for holdings)"""
+        intervals = {dt: (interval, RefreshMode.PERIODIC) for dt, interval in self.periodic_intervals.items()}
+        if settings.enable_live_updates and priority >= PRIORITY_HOLDING:
+            for dt, interval in self.live_intervals.items():
+                intervals[dt] = (interval, RefreshMode.LIVE)
+        return intervals
+    
+    def _sync_schedule(self):
+        """Add newly tracked symbols to the heap and drop untracked ones"""
+        self._next_symbol_sync = time.monotonic() + settings.periodic_symbol_sync_seconds
+        include_universe = settings.refresh_planner_enabled and settings.refresh_planner_include_universe
+        priorities = load_symbol_priorities(include_universe)
+        if not settings.refresh_planner_enabled:
+            # Without the planner only holdings are kept fresh, as before the planner
+            priorities = {s: p for s, p in priorities.items() if p >= PRIORITY_HOLDING}
         
-        for data_type, interval in self.periodic_intervals.items():
-            try:
-                # Get symbols that need refreshing
-                symbols_to_refresh = self.refresh_manager.get_symbols_to_refresh(
-                    data_type, RefreshMode.PERIODIC
+        for symbol in set(self._symbol_priorities) - set(priorities):
+            self.scheduler.unschedule(symbol)
+        
+        added = [s for s, p in priorities.items() if self._symbol_priorities.get(s) != p]
+        self._symbol_priorities = priorities
+        if not added:
+            return
+        
+        now = datetime.now()
+        last_refresh = self.refresh_manager.last_refresh_times(added, list(self.periodic_intervals))
+        for symbol in added:
+            priority = priorities[symbol]
+            for data_type, (interval, mode) in self._refresh_intervals(symbol, priority).items():
+                last = last_refresh.get((symbol, data_type))
+                if last is not None and last.tzinfo is not None:
+                    last = last.astimezone().replace(tzinfo=None)
+                seconds = interval.total_seconds()
+                due_in = 0.0 if last is None else (last + interval - now).total_seconds()
+                # Overdue and never-refreshed keys are spread out instead of all firing at once
+                delay = due_in if due_in > 0 else self.scheduler.spread(seconds)
+                self.scheduler.schedule(
+                    symbol, data_type, interval,
+                    delay=delay, mode=mode, priority=priority, last_refresh=last,
                 )
-                
-                if not symbols_to_refresh:
-                    continue
-                
-                logger.info(f"🔄 Refreshing {data_type} for {len(symbols_to_refresh)} symbols (periodic)")
-                
-                for symbol in symbols_to_refresh[:10]:  # Limit to 10 at a time
-                    try:
-                        results = self.refresh_manager.refresh_data(
-                            symbol=symbol,
-                            data_types=[data_type],
-                            mode=RefreshMode.PERIODIC,
-                            force=False
-                        )
-                        dt_key = data_type.value if hasattr(data_type, "value") else str(data_type)
-                        if results.results.get(dt_key) and results.results[dt_key].status.value == "success":
-                            logger.debug(f"✅ Refreshed {data_type} for {symbol}")
-                    except Exception as e:
-                        logger.error(f"Error refreshing {data_type} for {symbol}: {e}")
-                
-            except Exception as e:
-                logger.error(f"Error in periodic update for {data_type}: {e}")
+        logger.info(f"📅 Scheduled {len(added)} symbols ({len(self.scheduler)} refresh keys)")
     
-    def _run_live_updates(self):
-        """Run live/real-time data updates"""
-        symbols = self._get_active_symbols()
+    def _dispatch(self, due: List[ScheduledRefresh]):
+        """Run due refreshes on the executor (through the quota planner, or capped when it is off)"""
+        if settings.refresh_planner_enabled:
+            to_run = self._plan(due)
+        else:
+            to_run = self._cap_legacy(due)
         
-        for data_type in self.live_intervals.keys():
-            try:
-                # Get symbols that need refreshing
-                symbols_to_refresh = self.refresh_manager.get_symbols_to_refresh(
-                    data_type, RefreshMode.LIVE
-                )
-                
-                if not symbols_to_refresh:
-                    continue
-                
-                # Limit live updates to prevent API rate limits
-                for symbol in symbols_to_refresh[:5]:  # Only top 5 symbols
-                    try:
-                        results = self.refresh_manager.refresh_data(
-                            symbol=symbol,
-                            data_types=[data_type],
-                            mode=RefreshMode.LIVE,
-                            force=False
-                        )
-                        dt_key = data_type.value if hasattr(data_type, "value") else str(data_type)
-                        if results.results.get(dt_key) and results.results[dt_key].status.value == "success":
-                            logger.debug(f"⚡ Live update: {data_type} for {symbol}")
-                    except Exception as e:
-                        logger.error(f"Error in live update for {data_type} for {symbol}: {e}")
-                
-            except Exception as e:
-                logger.error(f"Error in live update for {data_type}: {e}")
+        if not to_run:
+            return
+        
+        with self.refresh_manager.tracking_batch():
+            futures = {self.executor.submit(self._refresh, entry): entry for entry in to_run}
+            for future in as_completed(futures):
+                entry = futures[future]
+                succeeded = False
+                try:
+                    succeeded = future.result()
+                except Exception as e:
+                    logger.error(f"Error refreshing {entry.data_type} for {entry.symbol}: {e}")
+                self.scheduler.reschedule(entry, last_refresh=datetime.now() if succeeded else None)
     
-    def _get_active_symbols(self) -> List[str]:
-        """Get list of active symbols (from holdings)"""
-        query = """
-            SELECT DISTINCT stock_symbol
-            FROM holdings
-            WHERE stock_symbol IS NOT NULL AND stock_symbol != ''
-            ORDER BY stock_symbol
-        """
-        holdings = db.execute_query(query)
-        return [h['stock_symbol'] for h in holdings]
+    def _plan(self, due: List[ScheduledRefresh]) -> List[ScheduledRefresh]:
+        """Spend this cycle's budget on the highest-value due entries; defer the rest"""
+        now = datetime.now()
+        entries = {entry.key: entry for entry in due}
+        plan = self.planner.select([
+            self.planner.candidate(e.symbol, e.data_type, e.priority, e.staleness(now))
+            for e in due
+        ], now)
+        # Deferred entries come back once a budget has room, spread over one cycle
+        cycle_seconds = self.planner.cycle_minutes * 60
+        for item in plan.deferred:
+            entry = entries[(item.symbol, item.data_type)]
+            self.scheduler.reschedule(entry, delay=plan.retry_after_seconds + self.scheduler.spread(cycle_seconds))
+        if plan.deferred:
+            logger.info(
+                f"⏸️ Deferred {len(plan.deferred)} refreshes for {plan.retry_after_seconds:.0f}s "
+                f"(budgets: {[b.to_dict() for b in plan.budgets.values()]})"
+            )
+        return [entries[(item.symbol, item.data_type)] for item in plan.items]
+    
+    def _cap_legacy(self, due: List[ScheduledRefresh]) -> List[ScheduledRefresh]:
+        """Planner off: at most LEGACY_REFRESHES_PER_MINUTE per data type, the rest wait for the next minute"""
+        now = time.monotonic()
+        if now >= self._legacy_window_end:
+            self._legacy_window_end, self._legacy_counts = now + 60.0, {}
+        to_run: List[ScheduledRefresh] = []
+        for entry in due:
+            key = (entry.mode, entry.data_type)
+            if self._legacy_counts.get(key, 0) < LEGACY_REFRESHES_PER_MINUTE[entry.mode]:
+                self._legacy_counts[key] = self._legacy_counts.get(key, 0) + 1
+                to_run.append(entry)
+            else:
+                self.scheduler.reschedule(entry, delay=self._legacy_window_end - now + self.scheduler.spread(60.0))
+        return to_run
+    
+    def _refresh(self, entry: ScheduledRefresh) -> bool:
+        """Refresh one due key; returns True on success"""
+        results = self.refresh_manager.refresh_data(
+            symbol=entry.symbol,
+            data_types=[entry.data_type],
+            mode=entry.mode,
+            force=True  # the schedule already decided this key is due
+        )
+        dt_key = entry.data_type.value if hasattr(entry.data_type, "value") else str(entry.data_type)
+        result = results.results.get(dt_key)
+        if result and result.status.value == "success":
+            logger.debug(f"✅ Refreshed {entry.data_type} for {entry.symbol} ({entry.mode.value})")
+            return True
+        return False
 
 
 def main():
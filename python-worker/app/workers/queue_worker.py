@@ -0,0 +1,183 @@
+"""
+Workflow queue worker
+Claims per-symbol workflow jobs from the Postgres job queue; run more processes (on any host) to add capacity
+Industry Standard: competing consumers with heartbeat leases, retries and a dead letter queue
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.database import init_database
+from app.workflows.job_queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Job], Optional[Dict[str, Any]]]
+
+
+def handle_eod_symbol(job: Job) -> Dict[str, Any]:
+    """'eod_symbol' job: EOD stages 1-4 for one symbol"""
+    from app.workflows.eod_workflow import EODWorkflow
+
+    run = EODWorkflow().process_symbols([job.symbol], force=bool(job.payload.get("force")))
+    if not run["success"]:
+        raise RuntimeError(run["error"] or f"EOD workflow failed for {job.symbol}")
+    return {"workflow_id": run["workflow_id"], "changed": job.symbol in run["changed"]}
+
+
+DEFAULT_HANDLERS: Dict[str, JobHandler] = {
+    "eod_symbol": handle_eod_symbol,
+}
+
+
+class QueueWorker:
+    """
+    Worker process for the workflow job queue
+
+    - Claims at most as many jobs as it has free slots, so a slow worker never
+      holds jobs another worker could be running
+    - A heartbeat thread extends the leases of running jobs every lease/3
+      seconds; if this process dies its jobs are claimed again once the lease expires
+    - Handler exceptions go to JobQueue.fail() (retry with backoff, then DLQ)
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.queue = queue or JobQueue(settings.job_queue_name, lease_seconds=settings.job_queue_lease_seconds)
+        self.handlers = dict(handlers or DEFAULT_HANDLERS)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = max(1, concurrency or settings.job_queue_worker_concurrency)
+        self.poll_interval = poll_interval if poll_interval is not None else settings.job_queue_poll_seconds
+        self.heartbeat_interval = max(1.0, self.queue.lease_seconds / 3)
+        self.running = False
+        self._in_flight: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._threads: list = []
+
+    def start(self):
+        """Start the claim loop and heartbeat threads"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="queue-job")
+        self._threads = [
+            threading.Thread(target=self._claim_loop, name="queue-claim", daemon=True),
+            threading.Thread(target=self._heartbeat_loop, name="queue-heartbeat", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"✅ Queue worker {self.worker_id} started ({self.concurrency} slots on {self.queue.queue})")
+
+    def stop(self):
+        """Stop claiming, let running jobs finish"""
+        self.running = False
+        self._stop_event.set()
+        if self._pool:
+            self._pool.shutdown(wait=True)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        logger.info(f"Queue worker {self.worker_id} stopped")
+
+    def run_once(self, pool: Optional[ThreadPoolExecutor] = None) -> int:
+        """
+        Claim jobs for the free slots and run them (inline when no pool is given)
+
+        Returns:
+            Number of jobs claimed
+        """
+        with self._lock:
+            free = self.concurrency - len(self._in_flight)
+        jobs = self.queue.claim(self.worker_id, limit=free)
+        for job in jobs:
+            with self._lock:
+                self._in_flight[job.job_id] = job
+            if pool is None:
+                self._execute(job)
+            else:
+                pool.submit(self._execute, job)
+        return len(jobs)
+
+    def _claim_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                claimed = self.run_once(self._pool)
+            except Exception as e:
+                logger.error(f"Error claiming jobs: {e}", exc_info=True)
+                claimed = 0
+            with self._lock:
+                full = len(self._in_flight) >= self.concurrency
+            if not claimed or full:
+                self._stop_event.wait(self.poll_interval)
+
+    def _heartbeat_loop(self):
+        while not self._stop_event.wait(self.heartbeat_interval):
+            with self._lock:
+                job_ids = list(self._in_flight)
+            try:
+                for job_id in self.queue.heartbeat(self.worker_id, job_ids):
+                    logger.warning(f"Lost lease on job {job_id}; another worker may run it again")
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for {len(job_ids)} jobs: {e}")
+
+    def _execute(self, job: Job):
+        start = time.monotonic()
+        try:
+            handler = self.handlers.get(job.job_type)
+            if handler is None:
+                raise ValueError(f"No handler registered for job type {job.job_type}")
+            result = handler(job)
+            self.queue.complete(job, self.worker_id, result)
+            logger.info(f"✅ Job {job.job_id} ({job.job_type} {job.symbol}) done in {time.monotonic() - start:.1f}s")
+        except Exception as e:
+            logger.warning(f"Job {job.job_id} ({job.job_type} {job.symbol}) failed: {e}")
+            try:
+                self.queue.fail(job, self.worker_id, e)
+            except Exception as fail_error:
+                # Lease expiry hands the job to another worker
+                logger.error(f"Could not record failure of job {job.job_id}: {fail_error}")
+        finally:
+            with self._lock:
+                self._in_flight.pop(job.job_id, None)
+
+
+def main():
+    """Main entry point for the queue worker"""
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    logger.info("🚀 Starting Queue Worker...")
+
+    # Initialize database
+    init_database()
+
+    worker = QueueWorker()
+
+    try:
+        worker.start()
+        # Keep running
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        logger.info("Shutting down queue worker...")
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
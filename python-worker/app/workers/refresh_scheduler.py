@@ -0,0 +1,200 @@
+"""
+Refresh Scheduler
+Min-heap of next-due times per (symbol, data type) for the periodic worker
+Performance: O(log n) per scheduled refresh; the worker sleeps until the next item is due
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.data_management.refresh_strategy import DataType, RefreshMode
+
+ScheduleKey = Tuple[str, DataType]  # (symbol, data type)
+
+
+@dataclass(order=True)
+class ScheduledRefresh:
+    """One heap entry; ordered by due time, then insertion order"""
+    due: float  # scheduler clock (monotonic seconds)
+    seq: int
+    symbol: str = field(compare=False)
+    data_type: DataType = field(compare=False)
+    mode: RefreshMode = field(compare=False)
+    interval: timedelta = field(compare=False)
+    priority: int = field(default=1, compare=False)
+    last_refresh: Optional[datetime] = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+    @property
+    def key(self) -> ScheduleKey:
+        return (self.symbol, self.data_type)
+
+    def staleness(self, now: datetime) -> float:
+        """Refresh intervals elapsed since the last success (None = never refreshed)"""
+        if self.last_refresh is None:
+            return float("inf")
+        last = self.last_refresh
+        if last.tzinfo is not None:
+            last = last.astimezone().replace(tzinfo=None)
+        seconds = self.interval.total_seconds()
+        return (now - last).total_seconds() / seconds if seconds > 0 else float("inf")
+
+
+class RefreshScheduler:
+    """
+    Next-due times for every (symbol, data type) the worker keeps fresh
+
+    - schedule()/reschedule() push an entry (O(log n)); a key has at most one live
+      entry, replaced entries are marked cancelled and skipped when they surface
+    - next_due() blocks until the earliest entry is due (or stop()/a new earlier
+      entry wakes it) and pops every due entry
+    - Next-due times are jittered by +/- jitter_fraction of the interval so
+      refreshes spread out instead of piling up on the same instant
+    """
+
+    def __init__(
+        self,
+        jitter_fraction: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.jitter_fraction = max(0.0, jitter_fraction)
+        self._clock = clock
+        self._random = rng or random.Random()
+        self._heap: List[ScheduledRefresh] = []
+        self._entries: Dict[ScheduleKey, ScheduledRefresh] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def __contains__(self, key: ScheduleKey) -> bool:
+        with self._cond:
+            return key in self._entries
+
+    def schedule(
+        self,
+        symbol: str,
+        data_type: DataType,
+        interval: timedelta,
+        delay: float = 0.0,
+        mode: RefreshMode = RefreshMode.PERIODIC,
+        priority: int = 1,
+        last_refresh: Optional[datetime] = None,
+    ) -> ScheduledRefresh:
+        """Schedule (or move) a key to run after delay seconds"""
+        with self._cond:
+            previous = self._entries.get((symbol, data_type))
+            if previous is not None:
+                previous.cancelled = True
+            entry = ScheduledRefresh(
+                due=self._clock() + max(0.0, delay),
+                seq=next(self._seq),
+                symbol=symbol,
+                data_type=data_type,
+                mode=mode,
+                interval=interval,
+                priority=priority,
+                last_refresh=last_refresh,
+            )
+            self._entries[entry.key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._cond.notify()
+            return entry
+
+    def reschedule(self, entry: ScheduledRefresh, delay: Optional[float] = None, last_refresh: Optional[datetime] = None) -> Optional[ScheduledRefresh]:
+        """
+        Put a popped entry back: after one jittered interval by default
+
+        Entries unscheduled (or replaced) while they were running are dropped.
+        """
+        with self._cond:
+            if self._entries.get(entry.key) is not entry:
+                return None
+        if delay is None:
+            delay = self.jittered(entry.interval.total_seconds())
+        return self.schedule(
+            entry.symbol,
+            entry.data_type,
+            entry.interval,
+            delay=delay,
+            mode=entry.mode,
+            priority=entry.priority,
+            last_refresh=last_refresh or entry.last_refresh,
+        )
+
+    def unschedule(self, symbol: str, data_type: Optional[DataType] = None) -> int:
+        """Drop a key (or every data type of a symbol); returns entries removed"""
+        with self._cond:
+            keys = [k for k in self._entries if k[0] == symbol and (data_type is None or k[1] == data_type)]
+            for key in keys:
+                self._entries.pop(key).cancelled = True
+            return len(keys)
+
+    def next_due(self, timeout: Optional[float] = None, max_items: Optional[int] = None) -> List[ScheduledRefresh]:
+        """
+        Sleep until the earliest entry is due and pop every due entry
+
+        Popped entries stay registered until reschedule()/unschedule(), so a
+        key is never run twice concurrently. Returns [] on timeout or stop().
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while not self._stopped:
+                self._drop_cancelled()
+                now = self._clock()
+                if self._heap and self._heap[0].due <= now:
+                    due: List[ScheduledRefresh] = []
+                    while self._heap and self._heap[0].due <= now and (max_items is None or len(due) < max_items):
+                        entry = heapq.heappop(self._heap)
+                        if not entry.cancelled:
+                            due.append(entry)
+                    return due
+                wait = None if not self._heap else self._heap[0].due - now
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return []
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+            return []
+
+    def wait(self, timeout: float) -> None:
+        """Sleep up to timeout seconds; stop() or a new earliest entry wakes it early"""
+        with self._cond:
+            if not self._stopped and timeout > 0:
+                self._cond.wait(timeout)
+
+    def seconds_until_next(self) -> Optional[float]:
+        with self._cond:
+            self._drop_cancelled()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0].due - self._clock())
+
+    def jittered(self, seconds: float) -> float:
+        if not self.jitter_fraction:
+            return seconds
+        return seconds * (1.0 + self._random.uniform(-self.jitter_fraction, self.jitter_fraction))
+
+    def spread(self, seconds: float) -> float:
+        """Random offset in [0, jitter_fraction * seconds] for initial/overdue entries"""
+        return self._random.uniform(0.0, self.jitter_fraction * seconds) if self.jitter_fraction else 0.0
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _drop_cancelled(self) -> None:
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
@@ -9,7 +9,10 @@ from app.workflows.gates import (
     IndicatorComputationGate,
     SignalGenerationGate
 )
-from app.workflows.recovery import RetryPolicy, WorkflowCheckpoint, DeadLetterQueue
+from app.workflows.recovery import RetryPolicy, DelayQueue, WorkflowCheckpoint, DeadLetterQueue
+from app.workflows.state_ledger import WorkflowStateLedger
+from app.workflows.change_tracker import SymbolChangeTracker
+from app.workflows.job_queue import Job, JobQueue
 from app.workflows.data_frequency import (
     DataFrequency,
     DuplicatePreventionStrategy,
@@ -28,8 +31,13 @@ __all__ = [
     'IndicatorComputationGate',
     'SignalGenerationGate',
     'RetryPolicy',
+    'DelayQueue',
     'WorkflowCheckpoint',
     'DeadLetterQueue',
+    'WorkflowStateLedger',
+    'SymbolChangeTracker',
+    'Job',
+    'JobQueue',
     'DataFrequency',
     'DuplicatePreventionStrategy',
     'IdempotentDataSaver',
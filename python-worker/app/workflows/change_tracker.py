@@ -0,0 +1,145 @@
+"""
+Symbol Change Tracker
+Detects symbols whose daily price inputs changed since their last successful downstream run
+Performance: EOD indicators → signals → portfolios/watchlists → alerts only run for changed symbols
+"""
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InputFingerprint:
+    """A symbol's daily ingestion cursor plus a checksum of its most recent bars"""
+    cursor_date: Optional[date]
+    row_count: int
+    checksum: Optional[str]
+
+
+class SymbolChangeTracker:
+    """
+    Change detection keyed on the ingestion cursor and row checksums
+
+    - changed(symbols) computes current fingerprints with one query and returns
+      the symbols whose fingerprint differs from the stored one (or was never
+      stored). Bars are hashed over the window_days before each symbol's latest
+      bar, so late corrections and split re-adjustments are detected too.
+    - commit(symbols) stores the fingerprints computed for those symbols; call it
+      only for symbols whose downstream stages completed, so a failed symbol is
+      picked up again by the next run
+    - If fingerprints cannot be computed every symbol counts as changed
+    """
+
+    def __init__(self, pipeline: str = "eod", window_days: int = 30):
+        self.pipeline = pipeline
+        self.window_days = window_days
+        self._current: Dict[str, InputFingerprint] = {}
+
+    def fingerprints(self, symbols: List[str]) -> Dict[str, InputFingerprint]:
+        """Current fingerprint per symbol (symbols without bars are absent)"""
+        if not symbols:
+            return {}
+        rows = db.execute_query(
+            """
+            WITH recent AS (
+                SELECT stock_symbol, date, open, high, low, close, volume,
+                       MAX(date) OVER (PARTITION BY stock_symbol) AS latest_date
+                FROM raw_market_data
+                WHERE stock_symbol = ANY(:symbols)
+            )
+            SELECT r.stock_symbol AS symbol,
+                   MAX(s.cursor_date) AS cursor_date,
+                   COUNT(*) AS row_count,
+                   md5(string_agg(concat_ws('|', r.date, r.open, r.high, r.low, r.close, r.volume), ',' ORDER BY r.date)) AS checksum
+            FROM recent r
+            LEFT JOIN data_ingestion_state s
+              ON s.symbol = r.stock_symbol AND s.dataset = 'price_historical' AND s.interval = 'daily'
+            WHERE r.date > r.latest_date - :window_days
+            GROUP BY r.stock_symbol
+            """,
+            {"symbols": symbols, "window_days": self.window_days},
+        )
+        return {
+            row["symbol"]: InputFingerprint(row.get("cursor_date"), int(row["row_count"]), row.get("checksum"))
+            for row in rows or []
+        }
+
+    def stored(self, symbols: List[str]) -> Dict[str, InputFingerprint]:
+        """Fingerprints recorded at each symbol's last successful run"""
+        if not symbols:
+            return {}
+        rows = db.execute_query(
+            """
+            SELECT symbol, cursor_date, row_count, checksum
+            FROM symbol_input_fingerprints
+            WHERE pipeline = :pipeline AND symbol = ANY(:symbols)
+            """,
+            {"pipeline": self.pipeline, "symbols": symbols},
+        )
+        return {
+            row["symbol"]: InputFingerprint(row.get("cursor_date"), int(row["row_count"]), row.get("checksum"))
+            for row in rows or []
+        }
+
+    def changed(self, symbols: List[str]) -> List[str]:
+        """Symbols whose inputs changed since their last successful run"""
+        symbols = list(dict.fromkeys(symbols))
+        try:
+            current = self.fingerprints(symbols)
+            previous = self.stored(symbols)
+        except Exception as e:
+            logger.warning(f"Change detection unavailable, treating {len(symbols)} symbols as changed: {e}")
+            return symbols
+
+        self._current.update(current)
+        changed = [s for s in symbols if s not in current or current[s] != previous.get(s)]
+        logger.info(f"🔎 {len(changed)}/{len(symbols)} symbols have changed inputs ({self.pipeline})")
+        return changed
+
+    def commit(self, symbols: Iterable[str]) -> int:
+        """Record the fingerprints computed by changed()/track() for symbols that completed"""
+        batch = [(s, self._current[s]) for s in dict.fromkeys(symbols) if s in self._current]
+        if not batch:
+            return 0
+
+        values: List[str] = []
+        params: Dict[str, object] = {"pipeline": self.pipeline}
+        for i, (symbol, fp) in enumerate(batch):
+            values.append(f"(:symbol_{i}, :pipeline, :cursor_date_{i}, :row_count_{i}, :checksum_{i}, NOW())")
+            params.update({
+                f"symbol_{i}": symbol,
+                f"cursor_date_{i}": fp.cursor_date,
+                f"row_count_{i}": fp.row_count,
+                f"checksum_{i}": fp.checksum,
+            })
+        try:
+            db.execute_update(
+                f"""
+                INSERT INTO symbol_input_fingerprints
+                (symbol, pipeline, cursor_date, row_count, checksum, updated_at)
+                VALUES {", ".join(values)}
+                ON CONFLICT (symbol, pipeline)
+                DO UPDATE SET
+                  cursor_date = EXCLUDED.cursor_date,
+                  row_count = EXCLUDED.row_count,
+                  checksum = EXCLUDED.checksum,
+                  updated_at = EXCLUDED.updated_at
+                """,
+                params,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record input fingerprints for {len(batch)} symbols: {e}")
+            return 0
+        return len(batch)
+
+    def track(self, symbols: List[str]) -> None:
+        """Compute fingerprints without comparing (forced runs), so commit() can record them"""
+        try:
+            self._current.update(self.fingerprints(list(dict.fromkeys(symbols))))
+        except Exception as e:
+            logger.warning(f"Could not compute input fingerprints: {e}")
@@ -9,9 +9,12 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 from enum import Enum
 
+from app.config import settings
+from app.workflows.change_tracker import SymbolChangeTracker
 from app.workflows.orchestrator import WorkflowOrchestrator
 from app.workflows.data_frequency import DataFrequency
 from app.database import db
+from app.services.screener_engine import invalidate_screener_features
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +60,7 @@ class EODWorkflow:
             'analyst_ratings',  # Event-based
         ]
     
-    def execute_daily_eod_workflow(self, symbols: List[str]) -> Dict[str, Any]:
+    def execute_daily_eod_workflow(self, symbols: List[str], force: bool = False) -> Dict[str, Any]:
         """
         Execute daily EOD workflow
         
@@ -71,8 +74,13 @@ class EODWorkflow:
         - Earnings (quarterly/event-based)
         - Analyst ratings (event-based)
         
+        Change-driven: after ingestion, only symbols whose inputs (ingestion
+        cursor + bar checksums) changed since their last successful run go
+        through indicators, signals, portfolio/watchlist updates and alerts.
+        
         Args:
             symbols: List of symbols to process
+            force: Run every downstream stage for every ingested symbol
         
         Returns:
             Dict with workflow results
@@ -81,85 +89,30 @@ class EODWorkflow:
         start_time = datetime.now()
         
         try:
-            # Stage 1: Load Daily Price + Volume (Raw OHLCV)
-            logger.info("📥 Stage 1: Loading daily price and volume data...")
-            price_result = self.orchestrator.execute_workflow(
-                workflow_type='daily_eod',
-                symbols=symbols,
-                data_frequency=DataFrequency.DAILY,
-                force=False
-            )
-            
-            if not price_result.success:
-                logger.error(f"❌ Price data loading failed: {price_result.error}")
+            # Stages 1-4: per-symbol work (price → indicators → signals)
+            run = self.process_symbols(symbols, force)
+            if not run['success']:
                 return {
                     'success': False,
-                    'error': price_result.error,
-                    'workflow_id': price_result.workflow_id
+                    'error': run['error'],
+                    'workflow_id': run['workflow_id']
                 }
             
-            # Stage 2: Validate & Adjust (handled by DataIngestionGate)
-            # Already done in Stage 1 via gate
-            
-            # Stage 3: Recompute Indicators (from fresh price data)
-            # Industry Standard: Always recompute from fresh price data, never use stale indicators
-            logger.info("📊 Stage 3: Recomputing indicators from fresh price data...")
-            indicator_symbols = [s for s in symbols if self._symbol_passed_stage(price_result.workflow_id, s, 'ingestion')]
-            
-            indicator_results = {
-                'succeeded': 0,
-                'failed': 0
-            }
-            
-            for symbol in indicator_symbols:
-                try:
-                    # Recompute indicators from fresh price data
-                    from app.services.indicator_service import IndicatorService
-                    service = IndicatorService()
-                    success = service.calculate_indicators(symbol)
-                    if success:
-                        indicator_results['succeeded'] += 1
-                    else:
-                        indicator_results['failed'] += 1
-                        logger.warning(f"⚠️ Failed to recompute indicators for {symbol}")
-                except Exception as e:
-                    indicator_results['failed'] += 1
-                    logger.error(f"❌ Error recomputing indicators for {symbol}: {e}")
-            
-            logger.info(f"✅ Recomputed indicators for {indicator_results['succeeded']}/{len(indicator_symbols)} symbols")
-            
-            # Stage 4: Generate Signals (from indicators)
-            logger.info("🎯 Stage 4: Generating signals from indicators...")
-            signal_results = self._generate_signals_for_symbols(indicator_symbols)
-            
-            # Stage 5: Update Watchlists & Portfolios
-            logger.info("💼 Stage 5: Updating watchlists and portfolios...")
-            portfolio_results = self._update_portfolios_and_watchlists()
-            
-            # Stage 6: Trigger Alerts
-            logger.info("🔔 Stage 6: Triggering alerts...")
-            alert_results = self._trigger_alerts(symbols)
-            
-            # Stage 7: Generate Reports (optional, LLM)
-            # Skip for now - can be done on-demand or separately
-            # logger.info("📝 Stage 7: Generating reports...")
-            # report_results = self._generate_reports(symbols)
+            # Stages 5-6: portfolios/watchlists and alerts for changed symbols
+            downstream = self.update_downstream(run['changed'], force)
             
             elapsed = (datetime.now() - start_time).total_seconds()
             
             return {
                 'success': True,
-                'workflow_id': price_result.workflow_id,
+                'workflow_id': run['workflow_id'],
                 'stages': {
-                    'price_loading': {
-                        'succeeded': price_result.symbols_succeeded,
-                        'failed': price_result.symbols_failed
-                    },
-                    'indicator_recomputation': indicator_results,
-                    'signal_generation': signal_results,
-                    'portfolio_updates': portfolio_results,
-                    'alerts': alert_results
+                    'price_loading': run['price_loading'],
+                    'indicator_recomputation': run['indicator_recomputation'],
+                    'signal_generation': run['signal_generation'],
+                    **downstream
                 },
+                'changed_symbols': len(run['changed']),
                 'elapsed_seconds': elapsed
             }
             
@@ -171,6 +124,147 @@ class EODWorkflow:
                 'elapsed_seconds': (datetime.now() - start_time).total_seconds()
             }
     
+    def process_symbols(self, symbols: List[str], force: bool = False) -> Dict[str, Any]:
+        """
+        EOD stages 1-4 for a set of symbols (also the unit of work of a queued 'eod_symbol' job)
+        
+        Returns:
+            Dict with success/error, workflow_id, per-stage counts and the
+            symbols whose inputs changed ('changed')
+        """
+        tracker = SymbolChangeTracker(pipeline='eod', window_days=settings.eod_change_window_days)
+        
+        # Stage 1: Load Daily Price + Volume (Raw OHLCV)
+        # Indicators and signals run inside the same workflow, for changed symbols only
+        logger.info("📥 Stage 1: Loading daily price and volume data...")
+        price_result = self.orchestrator.execute_workflow(
+            workflow_type='daily_eod',
+            symbols=symbols,
+            data_frequency=DataFrequency.DAILY,
+            force=False,
+            change_filter=None if force else tracker.changed
+        )
+        
+        if not price_result.success:
+            logger.error(f"❌ Price data loading failed: {price_result.error}")
+            return {
+                'success': False,
+                'error': price_result.error,
+                'workflow_id': price_result.workflow_id,
+                'changed': []
+            }
+        
+        # Stage 2: Validate & Adjust (handled by DataIngestionGate)
+        # Already done in Stage 1 via gate
+        
+        states = self._symbol_stage_statuses(price_result.workflow_id)
+        ingested = [s for s in symbols if states.get((s, 'ingestion')) == 'completed']
+        changed = [s for s in ingested if states.get((s, 'indicators')) != 'skipped']
+        if force:
+            tracker.track(changed)
+        logger.info(f"🔎 {len(changed)}/{len(ingested)} ingested symbols have changed inputs")
+        
+        # Stage 3: Recompute Indicators (from fresh price data)
+        # Industry Standard: Always recompute from fresh price data, never use stale indicators
+        # The workflow's indicator stage already covered changed symbols; retry the ones it did not complete
+        logger.info("📊 Stage 3: Recomputing indicators from fresh price data...")
+        indicator_symbols = changed
+        
+        indicator_results = {
+            'succeeded': 0,
+            'failed': 0,
+            'skipped': len(ingested) - len(changed)
+        }
+        
+        for symbol in indicator_symbols:
+            if states.get((symbol, 'indicators')) == 'completed':
+                indicator_results['succeeded'] += 1
+                continue
+            try:
+                # Recompute indicators from fresh price data
+                from app.services.indicator_service import IndicatorService
+                service = IndicatorService()
+                success = service.calculate_indicators(symbol)
+                if success:
+                    indicator_results['succeeded'] += 1
+                else:
+                    indicator_results['failed'] += 1
+                    logger.warning(f"⚠️ Failed to recompute indicators for {symbol}")
+            except Exception as e:
+                indicator_results['failed'] += 1
+                logger.error(f"❌ Error recomputing indicators for {symbol}: {e}")
+        
+        logger.info(f"✅ Recomputed indicators for {indicator_results['succeeded']}/{len(indicator_symbols)} symbols")
+        
+        # Stage 4: Generate Signals (from indicators)
+        logger.info("🎯 Stage 4: Generating signals from indicators...")
+        signal_results = self._generate_signals_for_symbols(indicator_symbols)
+        
+        # Record inputs for symbols that made it through signals; the rest are retried next run
+        tracker.commit(s for s in changed if states.get((s, 'signals')) == 'completed')
+        if changed:
+            invalidate_screener_features()
+        
+        return {
+            'success': True,
+            'workflow_id': price_result.workflow_id,
+            'price_loading': {
+                'succeeded': price_result.symbols_succeeded,
+                'failed': price_result.symbols_failed
+            },
+            'indicator_recomputation': indicator_results,
+            'signal_generation': signal_results,
+            'changed': changed
+        }
+    
+    def update_downstream(self, changed: List[str], force: bool = False) -> Dict[str, Any]:
+        """EOD stages 5-6 for symbols whose inputs changed (all portfolios/watchlists if force)"""
+        # Stage 5: Update Watchlists & Portfolios (only those holding changed symbols)
+        logger.info("💼 Stage 5: Updating watchlists and portfolios...")
+        portfolio_results = self._update_portfolios_and_watchlists(None if force else changed)
+        
+        # Stage 6: Trigger Alerts
+        logger.info("🔔 Stage 6: Triggering alerts...")
+        alert_results = self._trigger_alerts(changed)
+        
+        # Stage 7: Generate Reports (optional, LLM)
+        # Skip for now - can be done on-demand or separately
+        # logger.info("📝 Stage 7: Generating reports...")
+        # report_results = self._generate_reports(symbols)
+        
+        return {
+            'portfolio_updates': portfolio_results,
+            'alerts': alert_results
+        }
+    
+    def redrive_dead_letters(self) -> Dict[str, int]:
+        """
+        Retry due transient DLQ items of the EOD stages (scheduled by the batch worker)
+        
+        Each batch re-runs stages 1-6 for its symbols; a DLQ item is resolved
+        once its symbol completes (or is skipped as unchanged in) that stage.
+        """
+        stages = [stage.name for stage in self.orchestrator._workflow_stages(DataFrequency.DAILY, False)]
+        
+        def rerun(symbols: List[str]) -> tuple:
+            run = self.process_symbols(symbols)
+            run_ids = [run['workflow_id']] if run.get('workflow_id') else []
+            if not run['success']:
+                logger.warning(f"⚠️ DLQ re-drive run failed for {len(symbols)} symbols: {run['error']}")
+                return run_ids, []
+            self.update_downstream(run['changed'])
+            states = self._symbol_stage_statuses(run['workflow_id'])
+            return run_ids, [key for key, status in states.items() if status in ('completed', 'skipped')]
+        
+        return self.orchestrator.dlq.redrive(
+            rerun,
+            stages,
+            batch_size=settings.dlq_redrive_batch_size,
+            max_workers=settings.dlq_redrive_max_workers,
+            max_redrives=settings.dlq_redrive_max_attempts,
+            retry_policy=self.orchestrator.retry_policy
+        )
+    
     def execute_periodic_updates(self, symbols: List[str]) -> Dict[str, Any]:
         """
         Execute periodic updates (quarterly, event-based)
@@ -226,23 +320,35 @@ class EODWorkflow:
         
         return {'succeeded': succeeded, 'failed': failed}
     
-    def _update_portfolios_and_watchlists(self) -> Dict[str, int]:
-        """Update portfolio and watchlist metrics"""
+    def _update_portfolios_and_watchlists(self, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+        """Update portfolio and watchlist metrics (only those containing symbols, if given)"""
         from app.services.portfolio_calculator import PortfolioCalculatorService
         from app.services.watchlist_calculator import WatchlistCalculatorService
         
         portfolio_calc = PortfolioCalculatorService()
         watchlist_calc = WatchlistCalculatorService()
         
-        portfolios = self._get_all_portfolios()
-        watchlists = self._get_all_watchlists()
+        if symbols is None:
+            portfolios = self._get_all_portfolios()
+            watchlists = self._get_all_watchlists()
+        elif symbols:
+            portfolios = self._get_portfolios_holding(symbols)
+            watchlists = self._get_watchlists_containing(symbols)
+        else:
+            portfolios, watchlists = [], []
         
         portfolio_count = 0
         watchlist_count = 0
         
+        # Holding metrics of every affected portfolio are recomputed by one statement
+        if portfolios:
+            try:
+                portfolio_calc.update_holdings([portfolio['portfolio_id'] for portfolio in portfolios])
+            except Exception as e:
+                logger.error(f"Error updating holdings of {len(portfolios)} portfolios: {e}")
+
         for portfolio in portfolios:
             try:
-                portfolio_calc.update_portfolio_holdings(portfolio['portfolio_id'])
                 portfolio_calc.calculate_portfolio_performance(portfolio['portfolio_id'])
                 portfolio_count += 1
             except Exception as e:
@@ -272,16 +378,16 @@ class EODWorkflow:
         
         return {'alerts_triggered': 0}  # Placeholder
     
-    def _symbol_passed_stage(self, workflow_id: str, symbol: str, stage: str) -> bool:
-        """Check if symbol passed a stage"""
-        result = db.execute_query(
+    def _symbol_stage_statuses(self, workflow_id: str) -> Dict[tuple, str]:
+        """(symbol, stage) -> status for every symbol state of a workflow (one query)"""
+        rows = db.execute_query(
             """
-            SELECT status FROM workflow_symbol_states
-            WHERE workflow_id = :workflow_id AND symbol = :symbol AND stage = :stage
+            SELECT symbol, stage, status FROM workflow_symbol_states
+            WHERE workflow_id = :workflow_id
             """,
-            {"workflow_id": workflow_id, "symbol": symbol, "stage": stage}
+            {"workflow_id": workflow_id}
         )
-        return result and result[0]['status'] == 'completed'
+        return {(row['symbol'], row['stage']): row['status'] for row in rows or []}
     
     def _get_all_portfolios(self) -> List[dict]:
         """Get all portfolios"""
@@ -290,4 +396,28 @@ class EODWorkflow:
     def _get_all_watchlists(self) -> List[dict]:
         """Get all watchlists"""
         return db.execute_query("SELECT watchlist_id FROM watchlists WHERE is_archived = 0")
+    
+    def _get_portfolios_holding(self, symbols: List[str]) -> List[dict]:
+        """Get portfolios with an open holding in any of the symbols"""
+        return db.execute_query(
+            """
+            SELECT DISTINCT p.portfolio_id
+            FROM portfolios p
+            JOIN holdings h ON h.portfolio_id = p.portfolio_id
+            WHERE p.is_archived = 0 AND h.is_closed = 0 AND h.stock_symbol = ANY(:symbols)
+            """,
+            {"symbols": symbols}
+        )
+    
+    def _get_watchlists_containing(self, symbols: List[str]) -> List[dict]:
+        """Get watchlists containing any of the symbols"""
+        return db.execute_query(
+            """
+            SELECT DISTINCT w.watchlist_id
+            FROM watchlists w
+            JOIN watchlist_items wi ON wi.watchlist_id = w.watchlist_id
+            WHERE w.is_archived = 0 AND wi.stock_symbol = ANY(:symbols)
+            """,
+            {"symbols": symbols}
+        )
 
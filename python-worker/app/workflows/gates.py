@@ -1,9 +1,10 @@
 """
 Workflow Gates - Fail-Fast Validation
 Industry Standard: Pre-flight checks before proceeding to next stage
+Performance: check_many() evaluates a whole stage with one query per check instead of per symbol
 """
 import logging
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 
@@ -23,25 +24,67 @@ class GateResult:
 
 
 class BaseGate:
-    """Base class for workflow gates"""
-    
+    """
+    Base class for workflow gates
+
+    Subclasses implement _evaluate_many(); check() and check_many() share it,
+    so a single symbol and a whole stage get the same results and actions.
+    """
+
+    # Stage name used in the audit trail, and the action when the check itself errors
+    stage: str = ""
+    error_action: Optional[str] = None
+
+    # Optional callable(workflow_id, stage, symbol, gate_name, result) -> bool that buffers
+    # results (WorkflowOrchestrator's state ledger); falls back to a direct insert if it returns False
+    result_sink: Optional[Callable[..., bool]] = None
+
     def check(self, symbol: str, date: date, workflow_id: Optional[str] = None) -> GateResult:
         """
         Check if gate passes for symbol and date
-        
+
         Args:
             symbol: Stock symbol
             date: Date to check
             workflow_id: Optional workflow ID for audit trail
-        
+
         Returns:
             GateResult with pass/fail status
         """
+        return self.check_many([symbol], date, workflow_id)[symbol]
+
+    def check_many(self, symbols: List[str], check_date: date, workflow_id: Optional[str] = None) -> Dict[str, GateResult]:
+        """
+        Check the gate for many symbols with a fixed number of queries
+
+        Returns:
+            symbol -> GateResult (every requested symbol is present)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        try:
+            results = self._evaluate_many(symbols, check_date)
+        except NotImplementedError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__} for {len(symbols)} symbols: {e}", exc_info=True)
+            results = {
+                symbol: GateResult(passed=False, reason=f"Gate check error: {str(e)}", action=self.error_action)
+                for symbol in symbols
+            }
+        for symbol in symbols:
+            self._log_gate_result(workflow_id, self.stage, symbol, results[symbol])
+        return results
+
+    def _evaluate_many(self, symbols: List[str], check_date: date) -> Dict[str, GateResult]:
         raise NotImplementedError
-    
+
     def _log_gate_result(self, workflow_id: Optional[str], stage: str, symbol: str, result: GateResult):
         """Log gate result to database for audit trail"""
         if workflow_id:
+            if self.result_sink is not None and self.result_sink(workflow_id, stage, symbol, self.__class__.__name__, result):
+                return
             try:
                 db.execute_update(
                     """
@@ -69,97 +112,91 @@ class DataIngestionGate(BaseGate):
     Gate 1: Data Ingestion
     Validates raw data exists and passes quality checks
     """
-    
-    def check(self, symbol: str, check_date: date, workflow_id: Optional[str] = None) -> GateResult:
+
+    stage = "ingestion"
+    error_action = "RETRY_INGESTION"
+
+    def _evaluate_many(self, symbols: List[str], check_date: date) -> Dict[str, GateResult]:
         """Check if data ingestion is complete and valid"""
-        try:
-            # Check 1: Raw data exists (check latest date, not necessarily check_date)
-            # This allows for data from previous trading day
-            raw_data = db.execute_query(
-                """
-                SELECT COUNT(*) as count, MAX(date) as latest_date
-                FROM raw_market_data
-                WHERE stock_symbol = :symbol
-                """,
-                {"symbol": symbol}
-            )
-            
-            if not raw_data or raw_data[0]['count'] == 0:
-                result = GateResult(
-                    passed=False,
-                    reason=f"No raw data found for {symbol}",
-                    action="RETRY_INGESTION"
-                )
-                self._log_gate_result(workflow_id, "ingestion", symbol, result)
-                return result
-            
-            # Check 2: Validation report exists and passed
-            validation = db.execute_query(
-                """
-                SELECT overall_status, critical_issues, warnings, rows_dropped
+        # Check 1 input: raw data per symbol (latest date, not necessarily check_date)
+        # This allows for data from previous trading day
+        raw_rows = db.execute_query(
+            """
+            SELECT stock_symbol, COUNT(*) as count, MAX(date) as latest_date
+            FROM raw_market_data
+            WHERE stock_symbol = ANY(:symbols)
+            GROUP BY stock_symbol
+            """,
+            {"symbols": symbols}
+        )
+        raw_data = {row['stock_symbol']: row for row in raw_rows or []}
+
+        # Check 2 input: latest validation report per symbol
+        validation_rows = db.execute_query(
+            """
+            SELECT symbol, overall_status, critical_issues, warnings, rows_dropped
+            FROM (
+                SELECT symbol, overall_status, critical_issues, warnings, rows_dropped,
+                       ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY validation_timestamp DESC) AS rn
                 FROM data_validation_reports
-                WHERE symbol = :symbol AND data_type = 'price_historical'
-                ORDER BY validation_timestamp DESC
-                LIMIT 1
-                """,
-                {"symbol": symbol}
+                WHERE symbol = ANY(:symbols) AND data_type = 'price_historical'
+            ) latest
+            WHERE rn = 1
+            """,
+            {"symbols": symbols}
+        )
+        validations = {row['symbol']: row for row in validation_rows or []}
+
+        return {
+            symbol: self._evaluate(symbol, raw_data.get(symbol), validations.get(symbol))
+            for symbol in symbols
+        }
+
+    def _evaluate(self, symbol: str, raw: Optional[Dict[str, Any]], val: Optional[Dict[str, Any]]) -> GateResult:
+        if not raw or raw['count'] == 0:
+            return GateResult(
+                passed=False,
+                reason=f"No raw data found for {symbol}",
+                action="RETRY_INGESTION"
             )
-            
-            if not validation:
-                result = GateResult(
-                    passed=False,
-                    reason=f"No validation report found for {symbol}",
-                    action="VALIDATE_DATA"
-                )
-                self._log_gate_result(workflow_id, "ingestion", symbol, result)
-                return result
-            
-            val = validation[0]
-            if val['overall_status'] == 'fail':
-                result = GateResult(
-                    passed=False,
-                    reason=f"Data validation failed: {val['critical_issues']} critical issues, {val['warnings']} warnings",
-                    action="FIX_DATA_QUALITY",
-                    metadata={
-                        "critical_issues": val['critical_issues'],
-                        "warnings": val['warnings'],
-                        "rows_dropped": val['rows_dropped']
-                    }
-                )
-                self._log_gate_result(workflow_id, "ingestion", symbol, result)
-                return result
-            
-            # Check 3: Data is recent (within last 5 days for EOD data)
-            if raw_data[0]['latest_date']:
-                latest_date = datetime.strptime(raw_data[0]['latest_date'], '%Y-%m-%d').date() if isinstance(raw_data[0]['latest_date'], str) else raw_data[0]['latest_date']
-                days_old = (date.today() - latest_date).days
-                if days_old > 5:
-                    result = GateResult(
-                        passed=False,
-                        reason=f"Data is stale: {days_old} days old",
-                        action="REFRESH_DATA"
-                    )
-                    self._log_gate_result(workflow_id, "ingestion", symbol, result)
-                    return result
-            
-            # All checks passed
-            result = GateResult(
-                passed=True,
-                reason=f"Data ingestion validated for {symbol}",
-                metadata={"row_count": raw_data[0]['count']}
+
+        # Check 2: Validation report exists and passed
+        if not val:
+            return GateResult(
+                passed=False,
+                reason=f"No validation report found for {symbol}",
+                action="VALIDATE_DATA"
             )
-            self._log_gate_result(workflow_id, "ingestion", symbol, result)
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in DataIngestionGate for {symbol}: {e}", exc_info=True)
-            result = GateResult(
+
+        if val['overall_status'] == 'fail':
+            return GateResult(
                 passed=False,
-                reason=f"Gate check error: {str(e)}",
-                action="RETRY_INGESTION"
+                reason=f"Data validation failed: {val['critical_issues']} critical issues, {val['warnings']} warnings",
+                action="FIX_DATA_QUALITY",
+                metadata={
+                    "critical_issues": val['critical_issues'],
+                    "warnings": val['warnings'],
+                    "rows_dropped": val['rows_dropped']
+                }
             )
-            self._log_gate_result(workflow_id, "ingestion", symbol, result)
-            return result
+
+        # Check 3: Data is recent (within last 5 days for EOD data)
+        if raw['latest_date']:
+            latest_date = datetime.strptime(raw['latest_date'], '%Y-%m-%d').date() if isinstance(raw['latest_date'], str) else raw['latest_date']
+            days_old = (date.today() - latest_date).days
+            if days_old > 5:
+                return GateResult(
+                    passed=False,
+                    reason=f"Data is stale: {days_old} days old",
+                    action="REFRESH_DATA"
+                )
+
+        # All checks passed
+        return GateResult(
+            passed=True,
+            reason=f"Data ingestion validated for {symbol}",
+            metadata={"row_count": raw['count']}
+        )
 
 
 class IndicatorComputationGate(BaseGate):
@@ -167,87 +204,79 @@ class IndicatorComputationGate(BaseGate):
     Gate 2: Indicator Computation
     Validates indicators are computed and valid
     """
-    
-    def check(self, symbol: str, check_date: date, workflow_id: Optional[str] = None) -> GateResult:
+
+    stage = "indicators"
+    error_action = "RECOMPUTE_INDICATORS"
+
+    def _evaluate_many(self, symbols: List[str], check_date: date) -> Dict[str, GateResult]:
         """Check if indicators are computed and valid"""
-        try:
-            # Check 1: Indicators exist (check latest date, not necessarily check_date)
-            indicators = db.execute_query(
-                """
-                SELECT 
+        # Check 1 input: latest indicator row per symbol (not necessarily check_date)
+        rows = db.execute_query(
+            """
+            SELECT stock_symbol, ema9, ema21, sma50, sma100, sma200,
+                   ema12, ema26, ema20, ema50,
+                   rsi, macd, macd_signal, atr
+            FROM (
+                SELECT
+                    stock_symbol,
                     ema9, ema21, sma50, sma100, sma200,
                     ema12, ema26, ema20, ema50,
-                    rsi, macd, macd_signal, atr
+                    rsi, macd, macd_signal, atr,
+                    ROW_NUMBER() OVER (PARTITION BY stock_symbol ORDER BY date DESC) AS rn
                 FROM aggregated_indicators
-                WHERE stock_symbol = :symbol
-                ORDER BY date DESC
-                LIMIT 1
-                """,
-                {"symbol": symbol}
-            )
-            
-            if not indicators:
-                result = GateResult(
-                    passed=False,
-                    reason=f"No indicators found for {symbol}",
-                    action="COMPUTE_INDICATORS"
-                )
-                self._log_gate_result(workflow_id, "indicators", symbol, result)
-                return result
-            
-            # Check 2: Critical indicators are not null
-            ind = indicators[0]
-            required_indicators = {
-                'ema9': ind.get('ema9'),
-                'sma50': ind.get('sma50'),
-                'sma200': ind.get('sma200'),
-                'rsi': ind.get('rsi'),
-                'macd': ind.get('macd')
-            }
-            
-            missing = [name for name, value in required_indicators.items() if value is None]
-            
-            if missing:
-                result = GateResult(
-                    passed=False,
-                    reason=f"Missing critical indicators: {', '.join(missing)}",
-                    action="RECOMPUTE_INDICATORS",
-                    metadata={"missing_indicators": missing}
-                )
-                self._log_gate_result(workflow_id, "indicators", symbol, result)
-                return result
-            
-            # Check 3: Indicators are reasonable (not NaN, not extreme)
-            # RSI should be 0-100
-            if ind.get('rsi') is not None:
-                rsi = float(ind['rsi'])
-                if rsi < 0 or rsi > 100:
-                    result = GateResult(
-                        passed=False,
-                        reason=f"Invalid RSI value: {rsi} (expected 0-100)",
-                        action="RECOMPUTE_INDICATORS"
-                    )
-                    self._log_gate_result(workflow_id, "indicators", symbol, result)
-                    return result
-            
-            # All checks passed
-            result = GateResult(
-                passed=True,
-                reason=f"Indicators validated for {symbol}",
-                metadata={"indicators_available": len([v for v in required_indicators.values() if v is not None])}
+                WHERE stock_symbol = ANY(:symbols)
+            ) latest
+            WHERE rn = 1
+            """,
+            {"symbols": symbols}
+        )
+        latest = {row['stock_symbol']: row for row in rows or []}
+        return {symbol: self._evaluate(symbol, latest.get(symbol)) for symbol in symbols}
+
+    def _evaluate(self, symbol: str, ind: Optional[Dict[str, Any]]) -> GateResult:
+        if not ind:
+            return GateResult(
+                passed=False,
+                reason=f"No indicators found for {symbol}",
+                action="COMPUTE_INDICATORS"
             )
-            self._log_gate_result(workflow_id, "indicators", symbol, result)
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in IndicatorComputationGate for {symbol}: {e}", exc_info=True)
-            result = GateResult(
+
+        # Check 2: Critical indicators are not null
+        required_indicators = {
+            'ema9': ind.get('ema9'),
+            'sma50': ind.get('sma50'),
+            'sma200': ind.get('sma200'),
+            'rsi': ind.get('rsi'),
+            'macd': ind.get('macd')
+        }
+
+        missing = [name for name, value in required_indicators.items() if value is None]
+
+        if missing:
+            return GateResult(
                 passed=False,
-                reason=f"Gate check error: {str(e)}",
-                action="RECOMPUTE_INDICATORS"
+                reason=f"Missing critical indicators: {', '.join(missing)}",
+                action="RECOMPUTE_INDICATORS",
+                metadata={"missing_indicators": missing}
             )
-            self._log_gate_result(workflow_id, "indicators", symbol, result)
-            return result
+
+        # Check 3: Indicators are reasonable (not NaN, not extreme)
+        # RSI should be 0-100
+        if ind.get('rsi') is not None:
+            rsi = float(ind['rsi'])
+            if rsi < 0 or rsi > 100:
+                return GateResult(
+                    passed=False,
+                    reason=f"Invalid RSI value: {rsi} (expected 0-100)",
+                    action="RECOMPUTE_INDICATORS"
+                )
+
+        # All checks passed
+        return GateResult(
+            passed=True,
+            reason=f"Indicators validated for {symbol}",
+            metadata={"indicators_available": len([v for v in required_indicators.values() if v is not None])}
+        )
 
 
 class SignalGenerationGate(BaseGate):
@@ -255,66 +284,53 @@ class SignalGenerationGate(BaseGate):
     Gate 3: Signal Generation
     Validates data is ready for signal generation
     """
-    
+
+    stage = "signals"
+    error_action = "RETRY_SIGNAL_CHECK"
+
     def __init__(self):
         self.readiness_validator = SignalReadinessValidator()
-    
-    def check(self, symbol: str, check_date: date, workflow_id: Optional[str] = None) -> GateResult:
+
+    def _evaluate_many(self, symbols: List[str], check_date: date) -> Dict[str, GateResult]:
         """Check if signals can be generated"""
-        try:
-            # Use SignalReadinessValidator
-            readiness = self.readiness_validator.check_readiness(symbol, "swing_trend")
-            
-            if readiness.readiness_status == "not_ready":
-                result = GateResult(
-                    passed=False,
-                    reason=f"Signal readiness check failed: {', '.join(readiness.readiness_reason)}",
-                    action="FIX_DATA_QUALITY",
-                    metadata={
-                        "readiness_status": readiness.readiness_status,
-                        "data_quality_score": readiness.data_quality_score,
-                        "missing_indicators": readiness.missing_indicators,
-                        "recommendations": readiness.recommendations
-                    }
-                )
-                self._log_gate_result(workflow_id, "signals", symbol, result)
-                return result
-            
-            if readiness.readiness_status == "partial":
-                # Partial readiness - allow but log warning
-                logger.warning(f"Partial readiness for {symbol}: {', '.join(readiness.readiness_reason)}")
-                result = GateResult(
-                    passed=True,
-                    reason=f"Partial readiness (quality score: {readiness.data_quality_score:.2f})",
-                    action="MONITOR",
-                    metadata={
-                        "readiness_status": readiness.readiness_status,
-                        "data_quality_score": readiness.data_quality_score,
-                        "warnings": readiness.readiness_reason
-                    }
-                )
-                self._log_gate_result(workflow_id, "signals", symbol, result)
-                return result
-            
-            # Ready
-            result = GateResult(
-                passed=True,
-                reason=f"Signal generation ready for {symbol}",
+        # Use SignalReadinessValidator (batched: one query per readiness check)
+        readiness = self.readiness_validator.check_readiness_many(symbols, "swing_trend")
+        return {symbol: self._evaluate(symbol, readiness[symbol]) for symbol in symbols}
+
+    def _evaluate(self, symbol: str, readiness) -> GateResult:
+        if readiness.readiness_status == "not_ready":
+            return GateResult(
+                passed=False,
+                reason=f"Signal readiness check failed: {', '.join(readiness.readiness_reason)}",
+                action="FIX_DATA_QUALITY",
                 metadata={
                     "readiness_status": readiness.readiness_status,
-                    "data_quality_score": readiness.data_quality_score
+                    "data_quality_score": readiness.data_quality_score,
+                    "missing_indicators": readiness.missing_indicators,
+                    "recommendations": readiness.recommendations
                 }
             )
-            self._log_gate_result(workflow_id, "signals", symbol, result)
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in SignalGenerationGate for {symbol}: {e}", exc_info=True)
-            result = GateResult(
-                passed=False,
-                reason=f"Gate check error: {str(e)}",
-                action="RETRY_SIGNAL_CHECK"
+
+        if readiness.readiness_status == "partial":
+            # Partial readiness - allow but log warning
+            logger.warning(f"Partial readiness for {symbol}: {', '.join(readiness.readiness_reason)}")
+            return GateResult(
+                passed=True,
+                reason=f"Partial readiness (quality score: {readiness.data_quality_score:.2f})",
+                action="MONITOR",
+                metadata={
+                    "readiness_status": readiness.readiness_status,
+                    "data_quality_score": readiness.data_quality_score,
+                    "warnings": readiness.readiness_reason
+                }
             )
-            self._log_gate_result(workflow_id, "signals", symbol, result)
-            return result
 
+        # Ready
+        return GateResult(
+            passed=True,
+            reason=f"Signal generation ready for {symbol}",
+            metadata={
+                "readiness_status": readiness.readiness_status,
+                "data_quality_score": readiness.data_quality_score
+            }
+        )
@@ -0,0 +1,336 @@
+"""
+Workflow Job Queue
+Durable Postgres-backed queue of per-symbol workflow tasks shared by any number of worker processes
+Industry Standard: SELECT ... FOR UPDATE SKIP LOCKED claims, heartbeat leases, retry with backoff, DLQ
+"""
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.database import db
+from app.workflows.recovery import DeadLetterQueue, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row enqueue statement
+ENQUEUE_BATCH_ROWS = 500
+
+_JOB_COLUMNS = (
+    "job_id, queue, job_type, symbol, payload, result, status, priority, attempts, max_attempts, "
+    "run_at, locked_by, lease_expires_at, last_error, batch_id"
+)
+
+
+class LeaseLost(Exception):
+    """Raised when a job is no longer held by the worker (lease expired and reclaimed)"""
+
+
+@dataclass
+class Job:
+    """One claimed workflow_jobs row"""
+    job_id: str
+    job_type: str
+    symbol: Optional[str] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 4
+    queue: str = "workflow"
+    batch_id: Optional[str] = None
+    status: str = "queued"
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Job":
+        return cls(
+            job_id=row["job_id"],
+            job_type=row["job_type"],
+            symbol=row.get("symbol"),
+            payload=_json(row.get("payload")) or {},
+            attempts=int(row.get("attempts") or 0),
+            max_attempts=int(row.get("max_attempts") or 1),
+            queue=row.get("queue") or "workflow",
+            batch_id=row.get("batch_id"),
+            status=row.get("status") or "queued",
+            result=_json(row.get("result")),
+            last_error=row.get("last_error"),
+        )
+
+
+def _json(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+class JobQueue:
+    """
+    Postgres job queue (workflow_jobs)
+
+    - claim(): one UPDATE ... WHERE job_id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+      statement hands each due job to exactly one worker, across processes and
+      hosts; running jobs whose lease expired (crashed worker) are claimed again
+    - heartbeat(): extends the lease of jobs a worker is still running
+    - complete()/fail(): only apply while the worker still holds the lease
+    - fail(): retryable errors (RetryPolicy) are re-queued with exponential
+      backoff; exhausted or permanent failures are marked dead (and recorded in
+      the DeadLetterQueue when the job belongs to a workflow run)
+    """
+
+    def __init__(
+        self,
+        queue: str = "workflow",
+        lease_seconds: int = 300,
+        retry_policy: Optional[RetryPolicy] = None,
+        dlq: Optional[DeadLetterQueue] = None,
+    ):
+        self.queue = queue
+        self.lease_seconds = lease_seconds
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.dlq = dlq or DeadLetterQueue()
+
+    def enqueue(
+        self,
+        job_type: str,
+        symbol: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Enqueue one job (see enqueue_many for keyword arguments)"""
+        return self.enqueue_many(job_type, [symbol], payload, **kwargs)
+
+    def enqueue_many(
+        self,
+        job_type: str,
+        symbols: Iterable[Optional[str]],
+        payload: Optional[Dict[str, Any]] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        dedupe_prefix: Optional[str] = None,
+        batch_id: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Enqueue one job per symbol
+
+        Args:
+            dedupe_prefix: Jobs get dedupe key '<prefix>:<symbol>'; a key whose job is
+                queued, running or succeeded is skipped (dead jobs can be enqueued again)
+            batch_id: Groups the jobs for wait_for_batch()
+
+        Returns:
+            job_ids that were inserted
+        """
+        max_attempts = max_attempts or self.retry_policy.max_retries + 1
+        payload_json = json.dumps(payload or {})
+        inserted: List[str] = []
+        symbols = list(symbols)
+        for start in range(0, len(symbols), ENQUEUE_BATCH_ROWS):
+            chunk = symbols[start:start + ENQUEUE_BATCH_ROWS]
+            values: List[str] = []
+            params: Dict[str, Any] = {
+                "queue": self.queue,
+                "job_type": job_type,
+                "payload": payload_json,
+                "priority": priority,
+                "max_attempts": max_attempts,
+                "batch_id": batch_id,
+            }
+            for i, symbol in enumerate(chunk):
+                values.append(
+                    f"(:job_id_{i}, :queue, :job_type, :symbol_{i}, CAST(:payload AS JSONB), :priority, "
+                    f":max_attempts, :dedupe_key_{i}, :batch_id)"
+                )
+                params[f"job_id_{i}"] = str(uuid.uuid4())
+                params[f"symbol_{i}"] = symbol
+                params[f"dedupe_key_{i}"] = f"{dedupe_prefix}:{symbol}" if dedupe_prefix else None
+            rows = db.execute_query(
+                f"""
+                INSERT INTO workflow_jobs
+                (job_id, queue, job_type, symbol, payload, priority, max_attempts, dedupe_key, batch_id)
+                VALUES {", ".join(values)}
+                ON CONFLICT (dedupe_key) WHERE dedupe_key IS NOT NULL AND status <> 'dead' DO NOTHING
+                RETURNING job_id
+                """,
+                params,
+            )
+            inserted.extend(row["job_id"] for row in rows or [])
+        if inserted:
+            logger.info(f"📬 Enqueued {len(inserted)} {job_type} jobs on {self.queue}")
+        return inserted
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Job]:
+        """Claim up to limit due jobs for worker_id (exactly-one-owner via SKIP LOCKED)"""
+        if limit <= 0:
+            return []
+        rows = db.execute_query(
+            f"""
+            UPDATE workflow_jobs j
+            SET status = 'running',
+                locked_by = :worker_id,
+                attempts = j.attempts + 1,
+                lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                heartbeat_at = NOW(),
+                updated_at = NOW()
+            WHERE j.job_id IN (
+                SELECT job_id FROM workflow_jobs
+                WHERE queue = :queue
+                  AND ((status = 'queued' AND run_at <= NOW())
+                       OR (status = 'running' AND lease_expires_at < NOW()))
+                ORDER BY priority DESC, run_at
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {", ".join(f"j.{c.strip()}" for c in _JOB_COLUMNS.split(","))}
+            """,
+            {"worker_id": worker_id, "lease_seconds": self.lease_seconds, "queue": self.queue, "limit": limit},
+        )
+        jobs = [Job.from_row(row) for row in rows or []]
+
+        # A reclaimed job whose worker kept dying has used up its attempts
+        live: List[Job] = []
+        for job in jobs:
+            if job.attempts > job.max_attempts:
+                self._dead_letter(job, worker_id, LeaseLost(f"Lease expired after {job.max_attempts} attempts"))
+            else:
+                live.append(job)
+        return live
+
+    def heartbeat(self, worker_id: str, job_ids: List[str]) -> List[str]:
+        """
+        Extend the lease of running jobs
+
+        Returns:
+            job_ids whose lease this worker no longer holds
+        """
+        if not job_ids:
+            return []
+        rows = db.execute_query(
+            """
+            UPDATE workflow_jobs
+            SET lease_expires_at = NOW() + make_interval(secs => :lease_seconds),
+                heartbeat_at = NOW(),
+                updated_at = NOW()
+            WHERE job_id = ANY(:job_ids) AND locked_by = :worker_id AND status = 'running'
+            RETURNING job_id
+            """,
+            {"lease_seconds": self.lease_seconds, "job_ids": job_ids, "worker_id": worker_id},
+        )
+        held = {row["job_id"] for row in rows or []}
+        return [job_id for job_id in job_ids if job_id not in held]
+
+    def complete(self, job: Job, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a job succeeded (False if the lease was lost meanwhile)"""
+        updated = db.execute_update(
+            """
+            UPDATE workflow_jobs
+            SET status = 'succeeded',
+                result = CAST(:result AS JSONB),
+                locked_by = NULL,
+                lease_expires_at = NULL,
+                completed_at = NOW(),
+                updated_at = NOW()
+            WHERE job_id = :job_id AND locked_by = :worker_id AND status = 'running'
+            """,
+            {"job_id": job.job_id, "worker_id": worker_id, "result": json.dumps(result) if result is not None else None},
+        )
+        if not updated:
+            logger.warning(f"Job {job.job_id} finished after its lease was lost; result discarded")
+        return bool(updated)
+
+    def fail(self, job: Job, worker_id: str, error: Exception) -> str:
+        """
+        Record a failed attempt
+
+        Returns:
+            'retrying', 'dead', or 'lost' (lease no longer held)
+        """
+        retry_count = job.attempts - 1
+        if job.attempts < job.max_attempts and self.retry_policy.should_retry(error, retry_count):
+            delay = self.retry_policy.get_delay(retry_count)
+            updated = db.execute_update(
+                """
+                UPDATE workflow_jobs
+                SET status = 'queued',
+                    run_at = NOW() + make_interval(secs => :delay),
+                    locked_by = NULL,
+                    lease_expires_at = NULL,
+                    last_error = :error,
+                    updated_at = NOW()
+                WHERE job_id = :job_id AND locked_by = :worker_id AND status = 'running'
+                """,
+                {"job_id": job.job_id, "worker_id": worker_id, "delay": delay, "error": str(error)},
+            )
+            if not updated:
+                return "lost"
+            logger.info(f"Job {job.job_id} ({job.job_type} {job.symbol}) retrying in {delay}s (attempt {job.attempts}/{job.max_attempts})")
+            return "retrying"
+        return "dead" if self._dead_letter(job, worker_id, error) else "lost"
+
+    def wait_for_batch(self, batch_id: str, timeout: float, poll_interval: float = 5.0) -> List[Job]:
+        """
+        Block until every job of a batch succeeded or is dead (or timeout)
+
+        Returns:
+            The batch's jobs in their final (or current, on timeout) state
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            jobs = self.batch_jobs(batch_id)
+            if all(job.status in ("succeeded", "dead") for job in jobs) or time.monotonic() >= deadline:
+                return jobs
+            time.sleep(poll_interval)
+
+    def batch_jobs(self, batch_id: str) -> List[Job]:
+        rows = db.execute_query(
+            f"SELECT {_JOB_COLUMNS} FROM workflow_jobs WHERE batch_id = :batch_id",
+            {"batch_id": batch_id},
+        )
+        return [Job.from_row(row) for row in rows or []]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Job counts by status for this queue"""
+        rows = db.execute_query(
+            "SELECT status, COUNT(*) AS count FROM workflow_jobs WHERE queue = :queue GROUP BY status",
+            {"queue": self.queue},
+        )
+        return {row["status"]: int(row["count"]) for row in rows or []}
+
+    def _dead_letter(self, job: Job, worker_id: str, error: Exception) -> bool:
+        updated = db.execute_update(
+            """
+            UPDATE workflow_jobs
+            SET status = 'dead',
+                locked_by = NULL,
+                lease_expires_at = NULL,
+                last_error = :error,
+                completed_at = NOW(),
+                updated_at = NOW()
+            WHERE job_id = :job_id AND locked_by = :worker_id AND status = 'running'
+            """,
+            {"job_id": job.job_id, "worker_id": worker_id, "error": str(error)},
+        )
+        if not updated:
+            return False
+        workflow_id = job.payload.get("workflow_id")
+        if workflow_id:
+            # DLQ rows belong to a workflow run; other dead jobs are kept in workflow_jobs
+            self.dlq.add_failed_item(
+                workflow_id,
+                job.symbol or "",
+                job.job_type,
+                error,
+                {"job_id": job.job_id, "queue": job.queue, "attempts": job.attempts, "worker_id": worker_id},
+            )
+        logger.error(f"❌ Job {job.job_id} ({job.job_type} {job.symbol}) dead after {job.attempts} attempts: {error}")
+        return True
+
+
+def new_batch_id(prefix: str) -> str:
+    return f"{prefix}:{datetime.now().strftime('%Y%m%dT%H%M%S')}:{uuid.uuid4().hex[:8]}"
@@ -2,13 +2,18 @@
 Workflow Orchestrator
 Industry Standard: Robust pipeline with gates, recovery, state management, and duplicate prevention
 """
+import threading
+from collections import deque
 import logging
+import time
 import uuid
 import json
-from typing import List, Dict, Any, Optional, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Optional, Callable, Iterable, Set, Tuple
 from datetime import datetime, date
 from dataclasses import dataclass
 
+from app.config import settings
 from app.database import db
 from app.workflows.gates import (
     DataIngestionGate,
@@ -16,13 +21,24 @@ from app.workflows.gates import (
     SignalGenerationGate,
     GateResult
 )
-from app.workflows.recovery import RetryPolicy, WorkflowCheckpoint, DeadLetterQueue
+from app.workflows.recovery import DelayQueue, RetryPolicy, WorkflowCheckpoint, DeadLetterQueue
+from app.workflows.state_ledger import WorkflowStateLedger
 from app.workflows.data_frequency import DataFrequency, IdempotentDataSaver
 from app.workflows.exceptions import WorkflowGateFailed, WorkflowStageFailed
 
 logger = logging.getLogger(__name__)
 
 
+def parse_stage_concurrency(spec: str) -> Dict[str, int]:
+    """Parse 'ingestion:8,financial_data:2' into {'ingestion': 8, 'financial_data': 2}"""
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition(":")
+        if name.strip() and value.strip():
+            limits[name.strip()] = int(value)
+    return limits
+
+
 @dataclass
 class WorkflowResult:
     """Result of workflow execution"""
@@ -39,6 +55,15 @@ class WorkflowResult:
             self.stages_completed = []
 
 
+@dataclass
+class WorkflowStage:
+    """One node of the workflow stage DAG"""
+    name: str
+    func: Callable[[str], Any]
+    gate: Optional[Any] = None
+    depends_on: Optional[str] = None
+
+
 class WorkflowOrchestrator:
     """
     Orchestrates multi-stage workflow with gates, recovery, and duplicate prevention
@@ -49,8 +74,16 @@ class WorkflowOrchestrator:
         self,
         retry_policy: Optional[RetryPolicy] = None,
         checkpoint: Optional[WorkflowCheckpoint] = None,
-        dlq: Optional[DeadLetterQueue] = None
+        dlq: Optional[DeadLetterQueue] = None,
+        max_workers: Optional[int] = None,
+        stage_concurrency: Optional[Dict[str, int]] = None
     ):
+        """
+        Args:
+            max_workers: Symbols processed concurrently per stage (default: settings.workflow_max_workers)
+            stage_concurrency: Per-stage overrides, e.g. {'financial_data': 2}
+                (default: settings.workflow_stage_concurrency)
+        """
         self.gates = {
             'ingestion': DataIngestionGate(),
             'indicators': IndicatorComputationGate(),
@@ -60,13 +93,27 @@ class WorkflowOrchestrator:
         self.checkpoint = checkpoint or WorkflowCheckpoint()
         self.dlq = dlq or DeadLetterQueue()
         self.current_stage = None
+        self.max_workers = max_workers or settings.workflow_max_workers
+        # Longest a run idles on pending retries before deferring them to the DLQ re-drive
+        self.retry_max_idle = settings.workflow_retry_max_idle_seconds
+        # Per-run symbol state, authoritative while the run is in progress (flushed in batches)
+        self._ledgers: Dict[str, WorkflowStateLedger] = {}
+        self._ledgers_lock = threading.Lock()
+        for gate in self.gates.values():
+            gate.result_sink = self._record_gate_result
+        self.stage_concurrency = (
+            stage_concurrency if stage_concurrency is not None
+            else parse_stage_concurrency(settings.workflow_stage_concurrency)
+        )
     
     def execute_workflow(
         self,
         workflow_type: str,
         symbols: List[str],
         data_frequency: DataFrequency = DataFrequency.DAILY,
-        force: bool = False
+        force: bool = False,
+        pipelined: Optional[bool] = None,
+        change_filter: Optional[Callable[[List[str]], Iterable[str]]] = None
     ) -> WorkflowResult:
         """
         Execute workflow with fail-fast gates and duplicate prevention
@@ -76,12 +123,20 @@ class WorkflowOrchestrator:
             symbols: List of symbols to process
             data_frequency: Data frequency (daily, quarterly, etc.)
             force: Force processing even if data exists
+            pipelined: Move each symbol to its next stage as soon as its own
+                dependency passes, instead of waiting for the whole stage
+                (default: settings.workflow_pipelined)
+            change_filter: Given symbols that passed ingestion, returns those whose
+                inputs changed; the others are marked 'skipped' in every downstream
+                stage (None: every symbol continues)
         
         Returns:
             WorkflowResult with execution status
         """
         workflow_id = str(uuid.uuid4())
         check_date = date.today()
+        if pipelined is None:
+            pipelined = settings.workflow_pipelined
         
         # Create workflow execution record
         self._create_workflow_execution(workflow_id, workflow_type, symbols, data_frequency)
@@ -90,85 +145,42 @@ class WorkflowOrchestrator:
         symbols_failed = 0
         
         try:
-            # Stage 1: Data Ingestion (with duplicate prevention)
-            stage_result = self._execute_stage(
-                workflow_id=workflow_id,
-                stage_name='ingestion',
-                symbols=symbols,
-                stage_func=lambda s: self._ingest_data(s, data_frequency, force),
-                gate=self.gates['ingestion'],
-                check_date=check_date
-            )
-            symbols_succeeded += stage_result['succeeded']
-            symbols_failed += stage_result['failed']
-            
-            if stage_result['failed'] > 0 and not force:
-                logger.warning(f"⚠️ {stage_result['failed']} symbols failed ingestion stage")
-            
-            # Stage 2: Indicator Computation
-            stage_result = self._execute_stage(
-                workflow_id=workflow_id,
-                stage_name='indicators',
-                symbols=[s for s in symbols if self._symbol_passed_stage(workflow_id, s, 'ingestion')],
-                stage_func=lambda s: self._compute_indicators(s),
-                gate=self.gates['indicators'],
-                depends_on='ingestion',
-                check_date=check_date
-            )
-            symbols_succeeded += stage_result['succeeded']
-            symbols_failed += stage_result['failed']
-            
-            # Stage 2.5: Financial Data Ingestion (Income Statements, Balance Sheets, Cash Flow)
-            stage_result = self._execute_stage(
-                workflow_id=workflow_id,
-                stage_name='financial_data',
-                symbols=[s for s in symbols if self._symbol_passed_stage(workflow_id, s, 'ingestion')],
-                stage_func=lambda s: self._ingest_financial_data(s, force),
-                gate=None,  # No gate for financial data (optional)
-                depends_on='ingestion',
-                check_date=check_date
-            )
-            symbols_succeeded += stage_result['succeeded']
-            symbols_failed += stage_result['failed']
-            
-            # Stage 2.6: Weekly Data Aggregation (for swing trading)
-            stage_result = self._execute_stage(
-                workflow_id=workflow_id,
-                stage_name='weekly_aggregation',
-                symbols=[s for s in symbols if self._symbol_passed_stage(workflow_id, s, 'indicators')],
-                stage_func=lambda s: self._aggregate_weekly_data(s, force),
-                gate=None,  # No gate for aggregation (optional)
-                depends_on='indicators',
-                check_date=check_date
-            )
-            symbols_succeeded += stage_result['succeeded']
-            symbols_failed += stage_result['failed']
-            
-            # Stage 2.7: Growth Calculations (from financial statements)
-            stage_result = self._execute_stage(
-                workflow_id=workflow_id,
-                stage_name='growth_calculations',
-                symbols=[s for s in symbols if self._symbol_passed_stage(workflow_id, s, 'financial_data')],
-                stage_func=lambda s: self._calculate_growth_metrics(s, force),
-                gate=None,  # No gate for calculations (optional)
-                depends_on='financial_data',
-                check_date=check_date
-            )
-            symbols_succeeded += stage_result['succeeded']
-            symbols_failed += stage_result['failed']
-            
-            # Stage 3: Signal Generation
-            stage_result = self._execute_stage(
-                workflow_id=workflow_id,
-                stage_name='signals',
-                symbols=[s for s in symbols if self._symbol_passed_stage(workflow_id, s, 'indicators')],
-                stage_func=lambda s: self._generate_signals(s),
-                gate=self.gates['signals'],
-                depends_on='indicators',
-                check_date=check_date
-            )
-            symbols_succeeded += stage_result['succeeded']
-            symbols_failed += stage_result['failed']
+            stages = self._workflow_stages(data_frequency, force)
+            if pipelined:
+                stage_results = self._execute_pipelined(workflow_id, stages, symbols, check_date, change_filter)
+                for stage_result in stage_results.values():
+                    symbols_succeeded += stage_result['succeeded']
+                    symbols_failed += stage_result['failed']
+            else:
+                unchanged: Set[str] = set()
+                for stage in stages:
+                    stage_symbols = symbols if stage.depends_on is None else [
+                        s for s in symbols if self._symbol_passed_stage(workflow_id, s, stage.depends_on)
+                    ]
+                    if stage.depends_on is not None and unchanged:
+                        for symbol in unchanged:
+                            self._create_symbol_state(workflow_id, symbol, stage.name, 'skipped')
+                        stage_symbols = [s for s in stage_symbols if s not in unchanged]
+                    stage_result = self._execute_stage(
+                        workflow_id=workflow_id,
+                        stage_name=stage.name,
+                        symbols=stage_symbols,
+                        stage_func=stage.func,
+                        gate=stage.gate,
+                        depends_on=stage.depends_on,
+                        check_date=check_date
+                    )
+                    symbols_succeeded += stage_result['succeeded']
+                    symbols_failed += stage_result['failed']
+                    
+                    if stage.name == 'ingestion' and stage_result['failed'] > 0 and not force:
+                        logger.warning(f"⚠️ {stage_result['failed']} symbols failed ingestion stage")
+                    
+                    if stage.depends_on is None and change_filter is not None:
+                        passed = [s for s in stage_symbols if self._symbol_passed_stage(workflow_id, s, stage.name)]
+                        unchanged = set(passed) - set(change_filter(passed)) if passed else set()
+                        if unchanged:
+                            logger.info(f"⏭️ {len(unchanged)} symbols unchanged since their last run; skipping downstream stages")
             
             # Mark workflow as completed
             self._update_workflow_status(workflow_id, 'completed', {
@@ -214,6 +226,188 @@ class WorkflowOrchestrator:
                 symbols_succeeded=symbols_succeeded,
                 symbols_failed=symbols_failed
             )
+        
+        finally:
+            self._close_ledger(workflow_id)
+    
+    def _workflow_stages(self, data_frequency: DataFrequency, force: bool) -> List[WorkflowStage]:
+        """Stage DAG in execution order (each stage depends on at most one earlier stage)"""
+        return [
+            # Stage 1: Data Ingestion (with duplicate prevention)
+            WorkflowStage('ingestion', lambda s: self._ingest_data(s, data_frequency, force), self.gates['ingestion']),
+            # Stage 2: Indicator Computation
+            WorkflowStage('indicators', lambda s: self._compute_indicators(s), self.gates['indicators'], 'ingestion'),
+            # Stage 2.5: Financial Data Ingestion (Income Statements, Balance Sheets, Cash Flow)
+            # No gate for financial data (optional)
+            WorkflowStage('financial_data', lambda s: self._ingest_financial_data(s, force), None, 'ingestion'),
+            # Stage 2.6: Weekly Data Aggregation (for swing trading)
+            WorkflowStage('weekly_aggregation', lambda s: self._aggregate_weekly_data(s, force), None, 'indicators'),
+            # Stage 2.7: Growth Calculations (from financial statements)
+            WorkflowStage('growth_calculations', lambda s: self._calculate_growth_metrics(s, force), None, 'financial_data'),
+            # Stage 3: Signal Generation
+            WorkflowStage('signals', lambda s: self._generate_signals(s), self.gates['signals'], 'indicators'),
+        ]
+    
+    def _execute_pipelined(
+        self,
+        workflow_id: str,
+        stages: List[WorkflowStage],
+        symbols: List[str],
+        check_date: date,
+        change_filter: Optional[Callable[[List[str]], Iterable[str]]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Run the stage DAG per symbol instead of stage by stage
+        
+        - A symbol enters a stage as soon as it passed that stage's dependency;
+          symbols that failed a dependency never enter its downstream stages
+        - Downstream stages get free workers first, so early symbols reach
+          signals while stragglers are still ingesting
+        - Stage records and gates keep their meaning: each stage record is
+          completed (with its counts) once every symbol has passed, failed or
+          been excluded from it; per-stage concurrency limits still apply
+        - Gates run in batches (check_many) of up to workflow_gate_batch_size
+          symbols, or sooner once the stage has nothing else in progress
+        - change_filter (if given) sees each batch that passed a root stage;
+          unchanged symbols are marked 'skipped' in every downstream stage
+        
+        Returns:
+            stage name -> {'succeeded': n, 'failed': n}
+        """
+        children: Dict[str, List[str]] = {stage.name: [] for stage in stages}
+        for stage in stages:
+            if stage.depends_on:
+                children[stage.depends_on].append(stage.name)
+        
+        def descendants(name: str) -> List[str]:
+            found = []
+            for child in children[name]:
+                found.append(child)
+                found.extend(descendants(child))
+            return found
+        
+        stage_ids = {stage.name: self._create_stage_execution(workflow_id, stage.name) for stage in stages}
+        counts = {stage.name: {'succeeded': 0, 'failed': 0} for stage in stages}
+        unresolved = {stage.name: len(symbols) for stage in stages}  # symbols not yet passed/failed/excluded
+        finished: set = set()
+        ready: Dict[str, deque] = {stage.name: deque() for stage in stages}
+        in_flight = {stage.name: 0 for stage in stages}
+        limits = {stage.name: self._stage_workers(stage.name, max(1, len(symbols))) for stage in stages}
+        retries = DelayQueue()  # (stage, symbol, retry_count, error)
+        gates = {stage.name: stage.gate for stage in stages if stage.gate and check_date}
+        awaiting_gate: Dict[str, Dict[str, Optional[int]]] = {name: {} for name in gates}
+        gate_batch = max(1, settings.workflow_gate_batch_size)
+        
+        def finish_if_resolved(name: str):
+            if unresolved[name] == 0 and name not in finished:
+                finished.add(name)
+                # Stage boundary: persist buffered symbol states before the stage record
+                self._flush_ledger(workflow_id)
+                self._update_stage_status(stage_ids[name], 'completed', {
+                    'symbols_succeeded': counts[name]['succeeded'],
+                    'symbols_failed': counts[name]['failed']
+                })
+                logger.info(f"✅ Stage {name}: {counts[name]['succeeded']} succeeded, {counts[name]['failed']} failed")
+        
+        roots = {stage.name for stage in stages if stage.depends_on is None}
+        
+        def resolve(name: str, symbol: str, passed: bool, skip_downstream: bool = False):
+            counts[name]['succeeded' if passed else 'failed'] += 1
+            unresolved[name] -= 1
+            if passed and not skip_downstream:
+                for child in children[name]:
+                    ready[child].append((symbol, None))
+            else:
+                for excluded in descendants(name):
+                    if passed:
+                        self._create_symbol_state(workflow_id, symbol, excluded, 'skipped')
+                    unresolved[excluded] -= 1
+                    finish_if_resolved(excluded)
+            finish_if_resolved(name)
+        
+        def resolve_many(name: str, outcomes: Dict[str, bool]):
+            unchanged: Set[str] = set()
+            if change_filter is not None and name in roots:
+                passed = [symbol for symbol, ok in outcomes.items() if ok]
+                if passed:
+                    unchanged = set(passed) - set(change_filter(passed))
+            for symbol, passed in outcomes.items():
+                resolve(name, symbol, passed, skip_downstream=symbol in unchanged)
+        
+        for stage in stages:
+            if stage.depends_on is None:
+                ready[stage.name].extend((symbol, None) for symbol in symbols)
+            finish_if_resolved(stage.name)
+        
+        by_priority = list(reversed(stages))  # downstream stages first
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="workflow") as pool:
+            pending: Dict[Any, Tuple[str, str, Optional[int]]] = {}
+            try:
+                while True:
+                    for name, symbol, retry_count, _ in retries.pop_due():
+                        ready[name].append((symbol, retry_count))
+                    
+                    # Gate a stage's finished symbols once the batch is full or nothing else is in progress
+                    for name, batch in awaiting_gate.items():
+                        idle = not in_flight[name] and not ready[name] and not any(r[0] == name for r in retries)
+                        if batch and (len(batch) >= gate_batch or idle):
+                            awaiting_gate[name] = {}
+                            resolve_many(name, self._apply_gate(workflow_id, name, gates[name], check_date, batch))
+                    
+                    while len(pending) < self.max_workers:
+                        stage = next(
+                            (st for st in by_priority if ready[st.name] and in_flight[st.name] < limits[st.name]),
+                            None
+                        )
+                        if stage is None:
+                            break
+                        symbol, retry_count = ready[stage.name].popleft()
+                        self.current_stage = stage.name
+                        future = pool.submit(
+                            self._run_symbol_attempt, workflow_id, symbol, stage.name,
+                            stage.func, retry_count, stage.name in gates
+                        )
+                        pending[future] = (stage.name, symbol, retry_count)
+                        in_flight[stage.name] += 1
+                    
+                    if not pending and retries and retries.next_due_in() > self.retry_max_idle:
+                        # Only retries left: hand them to the DLQ re-drive instead of idling the run
+                        for (name, symbol, retry_count, error), due_in in retries.drain():
+                            self._defer_retry(workflow_id, symbol, name, retry_count, error, due_in)
+                            resolve_many(name, {symbol: False})
+                        continue
+                    if not pending and not retries:
+                        if any(awaiting_gate.values()):
+                            continue
+                        break
+                    timeout = retries.next_due_in()
+                    if not pending:
+                        time.sleep(timeout)
+                        continue
+                    
+                    done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, symbol, attempt_retry_count = pending.pop(future)
+                        in_flight[name] -= 1
+                        passed, retry_delay, retry_count, error = future.result()
+                        if retry_delay is not None:
+                            retries.push((name, symbol, retry_count, error), retry_delay)
+                        elif passed and name in gates:
+                            awaiting_gate[name][symbol] = attempt_retry_count
+                        else:
+                            resolve_many(name, {symbol: passed})
+            except BaseException as e:
+                for future in pending:
+                    future.cancel()
+                unfinished = [stage.name for stage in stages if stage.name not in finished]
+                for name in unfinished:
+                    self._update_stage_status(stage_ids[name], 'failed', {'error': str(e)})
+                if unfinished:
+                    self.current_stage = unfinished[0]
+                if isinstance(e, Exception) and not isinstance(e, (WorkflowGateFailed, WorkflowStageFailed)):
+                    raise WorkflowStageFailed(f"Stage {self.current_stage} failed: {str(e)}", stage=self.current_stage)
+                raise
+        return counts
     
     def _execute_stage(
         self,
@@ -235,81 +429,14 @@ class WorkflowOrchestrator:
         # Create stage execution record
         stage_id = self._create_stage_execution(workflow_id, stage_name)
         
-        succeeded = 0
-        failed = 0
-        
         try:
-            # Execute stage for each symbol
-            for symbol in symbols:
-                symbol_state_id = None
-                try:
-                    # Create symbol state record
-                    symbol_state_id = self._create_symbol_state(workflow_id, symbol, stage_name, 'running')
-                    
-                    # Run stage function
-                    stage_func(symbol)
-                    
-                    # Check gate (fail-fast)
-                    if gate and check_date:
-                        gate_result = gate.check(symbol, check_date, workflow_id)
-                        if not gate_result.passed:
-                            raise WorkflowGateFailed(
-                                f"Gate failed for {symbol} at stage {stage_name}: {gate_result.reason}",
-                                action=gate_result.action,
-                                gate_name=gate.__class__.__name__
-                            )
-                    
-                    # Update symbol state
-                    self._update_symbol_state(workflow_id, symbol, stage_name, 'completed')
-                    succeeded += 1
-                    
-                except WorkflowGateFailed as e:
-                    # Gate failed - fail this symbol
-                    self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(e))
-                    self.dlq.add_failed_item(workflow_id, symbol, stage_name, e, {
-                        'gate_name': e.gate_name,
-                        'action': e.action
-                    })
-                    failed += 1
-                    logger.error(f"❌ Gate failed for {symbol} at {stage_name}: {e}")
-                    
-                except Exception as e:
-                    # Handle symbol-level failure
-                    retry_count = self._get_retry_count(workflow_id, symbol, stage_name)
-                    
-                    if self.retry_policy.should_retry(e, retry_count):
-                        # Retry with backoff
-                        self._update_symbol_state(workflow_id, symbol, stage_name, 'retrying', str(e))
-                        self._increment_retry_count(workflow_id, symbol, stage_name)
-                        self.retry_policy.wait_for_retry(retry_count)
-                        
-                        # Retry the symbol
-                        try:
-                            stage_func(symbol)
-                            if gate and check_date:
-                                gate_result = gate.check(symbol, check_date, workflow_id)
-                                if not gate_result.passed:
-                                    raise WorkflowGateFailed(
-                                        f"Gate failed on retry: {gate_result.reason}",
-                                        action=gate_result.action
-                                    )
-                            self._update_symbol_state(workflow_id, symbol, stage_name, 'completed')
-                            succeeded += 1
-                        except Exception as retry_error:
-                            # Retry failed - add to DLQ
-                            self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(retry_error))
-                            self.dlq.add_failed_item(workflow_id, symbol, stage_name, retry_error, {
-                                'retry_count': retry_count + 1
-                            })
-                            failed += 1
-                    else:
-                        # Not retryable - add to DLQ
-                        self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(e))
-                        self.dlq.add_failed_item(workflow_id, symbol, stage_name, e, {
-                            'retry_count': retry_count
-                        })
-                        failed += 1
-                        logger.error(f"❌ Failed {symbol} at {stage_name}: {e}")
+            # Execute stage for each symbol (concurrently, bounded per stage)
+            outcomes = self._run_stage_symbols(workflow_id, stage_name, symbols, stage_func, gate, check_date)
+            succeeded = sum(1 for passed in outcomes.values() if passed)
+            failed = len(outcomes) - succeeded
+            
+            # Stage boundary: persist buffered symbol states before the stage record
+            self._flush_ledger(workflow_id)
             
             # Mark stage as completed
             self._update_stage_status(stage_id, 'completed', {
@@ -328,6 +455,218 @@ class WorkflowOrchestrator:
             self._update_stage_status(stage_id, 'failed', {'error': str(e)})
             raise WorkflowStageFailed(f"Stage {stage_name} failed: {str(e)}", stage=stage_name)
     
+    def _stage_workers(self, stage_name: str, symbol_count: int) -> int:
+        """Worker count for a stage (per-stage override, else max_workers)"""
+        workers = self.stage_concurrency.get(stage_name, self.max_workers)
+        return max(1, min(workers, symbol_count))
+    
+    def _run_stage_symbols(
+        self,
+        workflow_id: str,
+        stage_name: str,
+        symbols: List[str],
+        stage_func: Callable,
+        gate: Optional[Any],
+        check_date: Optional[date]
+    ) -> Dict[str, bool]:
+        """
+        Run every symbol of a stage on a bounded thread pool
+        
+        A symbol is only ever handled by one task at a time, so its state rows
+        are written in order. Retries wait in a DelayQueue instead of
+        sleeping on a worker, so other symbols keep running meanwhile; once
+        only retries are left and none is due within retry_max_idle seconds,
+        they are deferred to the DLQ re-drive. The gate is checked once for
+        every symbol that ran successfully (check_many).
+        
+        Returns:
+            symbol -> True if it completed the stage
+        """
+        outcomes: Dict[str, bool] = {}
+        if not symbols:
+            return outcomes
+        
+        gated = bool(gate and check_date)
+        awaiting_gate: Dict[str, Optional[int]] = {}  # symbol -> retry count of its successful attempt
+        retries = DelayQueue()  # (symbol, retry_count, error)
+        workers = self._stage_workers(stage_name, len(symbols))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"workflow-{stage_name}") as pool:
+            pending = {
+                pool.submit(self._run_symbol_attempt, workflow_id, symbol, stage_name, stage_func, None, gated): (symbol, None)
+                for symbol in symbols
+            }
+            try:
+                while pending or retries:
+                    for symbol, retry_count, _ in retries.pop_due():
+                        future = pool.submit(
+                            self._run_symbol_attempt, workflow_id, symbol, stage_name, stage_func, retry_count, gated
+                        )
+                        pending[future] = (symbol, retry_count)
+                    
+                    if not pending and retries.next_due_in() > self.retry_max_idle:
+                        # Only retries left: hand them to the DLQ re-drive instead of idling the stage
+                        for (symbol, retry_count, error), due_in in retries.drain():
+                            self._defer_retry(workflow_id, symbol, stage_name, retry_count, error, due_in)
+                            outcomes[symbol] = False
+                        break
+                    
+                    timeout = retries.next_due_in()
+                    if not pending:
+                        time.sleep(timeout)
+                        continue
+                    
+                    done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        symbol, attempt_retry_count = pending.pop(future)
+                        passed, retry_delay, retry_count, error = future.result()
+                        if retry_delay is not None:
+                            retries.push((symbol, retry_count, error), retry_delay)
+                        elif passed and gated:
+                            awaiting_gate[symbol] = attempt_retry_count
+                        else:
+                            outcomes[symbol] = passed
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        
+        if awaiting_gate:
+            outcomes.update(self._apply_gate(workflow_id, stage_name, gate, check_date, awaiting_gate))
+        return outcomes
+    
+    def _apply_gate(
+        self,
+        workflow_id: str,
+        stage_name: str,
+        gate: Any,
+        check_date: date,
+        attempts: Dict[str, Optional[int]]
+    ) -> Dict[str, bool]:
+        """
+        Check the stage gate for symbols whose stage function succeeded (fail-fast)
+        
+        One check_many() call for all of them; symbols that fail the gate are
+        failed and sent to the DLQ, the rest are marked completed.
+        
+        Args:
+            attempts: symbol -> None if it passed on the first attempt, else the retry count
+        
+        Returns:
+            symbol -> True if it completed the stage
+        """
+        results = gate.check_many(list(attempts), check_date, workflow_id)
+        outcomes: Dict[str, bool] = {}
+        for symbol, retry_count in attempts.items():
+            gate_result = results[symbol]
+            if gate_result.passed:
+                self._update_symbol_state(workflow_id, symbol, stage_name, 'completed')
+                outcomes[symbol] = True
+                continue
+            
+            if retry_count is not None:
+                error = WorkflowGateFailed(f"Gate failed on retry: {gate_result.reason}", action=gate_result.action)
+                context = {'retry_count': retry_count + 1}
+            else:
+                error = WorkflowGateFailed(
+                    f"Gate failed for {symbol} at stage {stage_name}: {gate_result.reason}",
+                    action=gate_result.action,
+                    gate_name=gate.__class__.__name__
+                )
+                context = {'gate_name': error.gate_name, 'action': error.action}
+            self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(error))
+            self.dlq.add_failed_item(workflow_id, symbol, stage_name, error, context)
+            logger.error(f"❌ Gate failed for {symbol} at {stage_name}: {error}")
+            outcomes[symbol] = False
+        return outcomes
+    
+    def _run_symbol_attempt(
+        self,
+        workflow_id: str,
+        symbol: str,
+        stage_name: str,
+        stage_func: Callable,
+        retry_count: Optional[int] = None,
+        gated: bool = False
+    ) -> Tuple[bool, Optional[float], int, Optional[Exception]]:
+        """
+        Run one attempt of a stage for a symbol
+        
+        Args:
+            retry_count: None for the first attempt, else the retry count when the retry was scheduled
+            gated: Leave a successful symbol 'running' until the batched gate check (_apply_gate)
+        
+        Returns:
+            (passed, retry delay in seconds or None, retry count, error or None)
+        """
+        is_retry = retry_count is not None
+        try:
+            if not is_retry:
+                # Create symbol state record
+                self._create_symbol_state(workflow_id, symbol, stage_name, 'running')
+            
+            # Run stage function
+            stage_func(symbol)
+            
+            # Update symbol state (gated stages complete after the batched gate check)
+            if not gated:
+                self._update_symbol_state(workflow_id, symbol, stage_name, 'completed')
+            return True, None, 0, None
+        
+        except Exception as e:
+            if is_retry:
+                # Retry failed - add to DLQ
+                self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(e))
+                self.dlq.add_failed_item(workflow_id, symbol, stage_name, e, {
+                    'retry_count': retry_count + 1
+                })
+                return False, None, retry_count + 1, e
+            
+            if isinstance(e, WorkflowGateFailed):
+                # Gate failed - fail this symbol
+                self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(e))
+                self.dlq.add_failed_item(workflow_id, symbol, stage_name, e, {
+                    'gate_name': e.gate_name,
+                    'action': e.action
+                })
+                logger.error(f"❌ Gate failed for {symbol} at {stage_name}: {e}")
+                return False, None, 0, e
+            
+            # Handle symbol-level failure
+            retry_count = self._get_retry_count(workflow_id, symbol, stage_name)
+            
+            if self.retry_policy.should_retry(e, retry_count):
+                # Retry with backoff, scheduled by the stage loop (does not hold a worker)
+                self._update_symbol_state(workflow_id, symbol, stage_name, 'retrying', str(e))
+                self._increment_retry_count(workflow_id, symbol, stage_name)
+                delay = self.retry_policy.get_delay(retry_count)
+                logger.info(f"Retrying {symbol} at {stage_name} in {delay} seconds (attempt {retry_count + 1}/{self.retry_policy.max_retries})")
+                return False, delay, retry_count, e
+            
+            # Not retryable - add to DLQ
+            self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', str(e))
+            self.dlq.add_failed_item(workflow_id, symbol, stage_name, e, {
+                'retry_count': retry_count
+            })
+            logger.error(f"❌ Failed {symbol} at {stage_name}: {e}")
+            return False, None, retry_count, e
+    
+    def _defer_retry(
+        self,
+        workflow_id: str,
+        symbol: str,
+        stage_name: str,
+        retry_count: int,
+        error: Exception,
+        due_in: float
+    ):
+        """Fail a symbol whose retry is not due yet; the DLQ re-drive job retries it once due"""
+        self._update_symbol_state(workflow_id, symbol, stage_name, 'failed', f"Retry deferred: {error}")
+        self.dlq.add_failed_item(workflow_id, symbol, stage_name, error, {
+            'retry_count': retry_count,
+            'deferred': True
+        }, retry_after=due_in, error_type='transient')
+        logger.warning(f"⏭️ Deferred retry of {symbol} at {stage_name} to DLQ re-drive (due in {due_in:.0f}s)")
+    
     def _ingest_data(self, symbol: str, data_frequency: DataFrequency, force: bool):
         """
         Ingest data with duplicate prevention
@@ -526,45 +865,59 @@ class WorkflowOrchestrator:
             }
         )
     
+    def _ledger(self, workflow_id: str) -> WorkflowStateLedger:
+        """Symbol state ledger for a run (created on first use)"""
+        ledger = self._ledgers.get(workflow_id)
+        if ledger is None:
+            with self._ledgers_lock:
+                ledger = self._ledgers.get(workflow_id)
+                if ledger is None:
+                    ledger = self._ledgers[workflow_id] = WorkflowStateLedger(
+                        workflow_id, flush_every=settings.workflow_ledger_flush_every
+                    )
+        return ledger
+    
+    def _flush_ledger(self, workflow_id: str) -> int:
+        """Write buffered symbol states and gate results (raises if the write fails)"""
+        ledger = self._ledgers.get(workflow_id)
+        return ledger.flush() if ledger is not None else 0
+    
+    def _close_ledger(self, workflow_id: str):
+        """Final flush at the end of a run; the ledger is dropped either way"""
+        with self._ledgers_lock:
+            ledger = self._ledgers.pop(workflow_id, None)
+        if ledger is None:
+            return
+        try:
+            ledger.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush workflow state for {workflow_id}: {e} ({ledger.pending_count()} rows lost)")
+        logger.debug(f"Workflow {workflow_id} bookkeeping: {ledger.get_stats()}")
+    
+    def _record_gate_result(self, workflow_id: str, stage: str, symbol: str, gate_name: str, result: GateResult) -> bool:
+        """Gate result sink: buffer into the run's ledger (False = not a run of this orchestrator)"""
+        ledger = self._ledgers.get(workflow_id)
+        if ledger is None:
+            return False
+        ledger.record_gate_result(stage, symbol, gate_name, result.passed, result.reason, result.action)
+        return True
+    
     def _create_symbol_state(self, workflow_id: str, symbol: str, stage: str, status: str) -> str:
         """Create symbol state record"""
-        db.execute_update(
-            """
-            INSERT OR REPLACE INTO workflow_symbol_states
-            (workflow_id, symbol, stage, status, started_at, updated_at)
-            VALUES (:workflow_id, :symbol, :stage, :status, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            """,
-            {
-                "workflow_id": workflow_id,
-                "symbol": symbol,
-                "stage": stage,
-                "status": status
-            }
-        )
+        self._ledger(workflow_id).create(symbol, stage, status)
         return f"{workflow_id}_{symbol}_{stage}"
     
     def _update_symbol_state(self, workflow_id: str, symbol: str, stage: str, status: str, error: Optional[str] = None):
         """Update symbol state"""
-        db.execute_update(
-            """
-            UPDATE workflow_symbol_states
-            SET status = :status,
-                error_message = :error,
-                completed_at = CASE WHEN :status IN ('completed', 'failed') THEN CURRENT_TIMESTAMP ELSE completed_at END,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE workflow_id = :workflow_id AND symbol = :symbol AND stage = :stage
-            """,
-            {
-                "workflow_id": workflow_id,
-                "symbol": symbol,
-                "stage": stage,
-                "status": status,
-                "error": error
-            }
-        )
+        self._ledger(workflow_id).update(symbol, stage, status, error)
     
     def _symbol_passed_stage(self, workflow_id: str, symbol: str, stage: str) -> bool:
         """Check if symbol passed a stage"""
+        ledger = self._ledgers.get(workflow_id)
+        if ledger is not None:
+            # Authoritative while the run is in progress
+            return ledger.passed(symbol, stage)
+        
         result = db.execute_query(
             """
             SELECT status FROM workflow_symbol_states
@@ -589,23 +942,8 @@ class WorkflowOrchestrator:
     
     def _get_retry_count(self, workflow_id: str, symbol: str, stage: str) -> int:
         """Get retry count for symbol at stage"""
-        result = db.execute_query(
-            """
-            SELECT retry_count FROM workflow_symbol_states
-            WHERE workflow_id = :workflow_id AND symbol = :symbol AND stage = :stage
-            """,
-            {"workflow_id": workflow_id, "symbol": symbol, "stage": stage}
-        )
-        return result[0]['retry_count'] if result else 0
+        return self._ledger(workflow_id).retry_count(symbol, stage)
     
     def _increment_retry_count(self, workflow_id: str, symbol: str, stage: str):
         """Increment retry count"""
-        db.execute_update(
-            """
-            UPDATE workflow_symbol_states
-            SET retry_count = retry_count + 1
-            WHERE workflow_id = :workflow_id AND symbol = :symbol AND stage = :stage
-            """,
-            {"workflow_id": workflow_id, "symbol": symbol, "stage": stage}
-        )
-
+        self._ledger(workflow_id).increment_retry(symbol, stage)
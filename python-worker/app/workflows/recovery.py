@@ -1,12 +1,16 @@
 """
 Workflow Recovery Mechanisms
 Industry Standard: Retry with backoff, checkpoints, dead letter queue
+Performance: retries wait in a due-time delay queue, never by sleeping in the stage loop
 """
+import heapq
+import itertools
 import logging
 import json
 import time
 import uuid
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, Callable, Iterable, List, Set, Tuple
 from datetime import datetime
 
 from app.database import db
@@ -76,12 +80,55 @@ class RetryPolicy:
         return min(delay, self.max_delay)
     
     def wait_for_retry(self, retry_count: int):
-        """Wait for retry delay"""
+        """Wait for retry delay (blocking; stage loops schedule retries on a DelayQueue instead)"""
         delay = self.get_delay(retry_count)
         logger.info(f"Waiting {delay} seconds before retry (attempt {retry_count + 1}/{self.max_retries})")
         time.sleep(delay)
 
 
+class DelayQueue:
+    """
+    Min-heap of items keyed by due time (time.monotonic())
+
+    Stage loops push a failed symbol with its backoff delay and keep running
+    fresh work; pop_due() hands back the retries whose delay has elapsed.
+    """
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+
+    def push(self, item: Any, delay: float):
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), item))
+
+    def pop_due(self, now: Optional[float] = None) -> List[Any]:
+        """Items whose due time has passed, earliest first"""
+        now = time.monotonic() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest item is due (None if empty)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def drain(self) -> List[Tuple[Any, float]]:
+        """Remove every item, returning (item, seconds until it was due)"""
+        now = time.monotonic()
+        items = [(item, max(0.0, due - now)) for due, _, item in sorted(self._heap)]
+        self._heap.clear()
+        return items
+
+    def __iter__(self):
+        return (item for _, _, item in self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
 class WorkflowCheckpoint:
     """
     Workflow checkpoint for recovery
@@ -153,27 +200,39 @@ class WorkflowCheckpoint:
 class DeadLetterQueue:
     """
     Dead Letter Queue for failed items
-    Industry Standard: Store failed items for manual review
+    Industry Standard: Store failed items for manual review; transient failures are re-driven automatically
     """
     
+    # Error classes a later attempt can resolve (see redrive())
+    REDRIVABLE_ERROR_TYPES = ('transient',)
+    
     def add_failed_item(
         self,
         workflow_id: str,
         symbol: str,
         stage: str,
         error: Exception,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        retry_after: Optional[float] = None,
+        error_type: Optional[str] = None
     ):
-        """Add failed item to DLQ"""
+        """
+        Add failed item to DLQ
+        
+        Args:
+            retry_after: Seconds until redrive() may retry the item (deferred retries)
+            error_type: Overrides the classification of error
+        """
         try:
             dlq_id = str(uuid.uuid4())
-            error_type = self._classify_error(error)
+            error_type = error_type or self._classify_error(error)
             
             db.execute_update(
                 """
                 INSERT INTO workflow_dlq
-                (dlq_id, workflow_id, symbol, stage, error_message, error_type, context_json, created_at)
-                VALUES (:dlq_id, :workflow_id, :symbol, :stage, :error_message, :error_type, :context_json, CURRENT_TIMESTAMP)
+                (dlq_id, workflow_id, symbol, stage, error_message, error_type, context_json, created_at, next_retry_at)
+                VALUES (:dlq_id, :workflow_id, :symbol, :stage, :error_message, :error_type, :context_json, CURRENT_TIMESTAMP,
+                        CURRENT_TIMESTAMP + make_interval(secs => :retry_after))
                 """,
                 {
                     "dlq_id": dlq_id,
@@ -182,7 +241,8 @@ class DeadLetterQueue:
                     "stage": stage,
                     "error_message": str(error),
                     "error_type": error_type,
-                    "context_json": json.dumps(context or {})
+                    "context_json": json.dumps(context or {}),
+                    "retry_after": retry_after or 0
                 }
             )
             logger.warning(f"📋 Added {symbol} to DLQ (stage: {stage}, error: {error_type})")
@@ -241,4 +301,156 @@ class DeadLetterQueue:
             logger.info(f"✅ Resolved DLQ item {dlq_id}")
         except Exception as e:
             logger.error(f"Failed to resolve DLQ item: {e}", exc_info=True)
+    
+    def get_redrivable_items(
+        self,
+        stages: List[str],
+        error_types: Iterable[str] = REDRIVABLE_ERROR_TYPES,
+        max_redrives: int = 3,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Unresolved items of the given stages and error classes that are due for a retry"""
+        return db.execute_query(
+            """
+            SELECT dlq_id, workflow_id, symbol, stage, error_type, redrive_count
+            FROM workflow_dlq
+            WHERE resolved = FALSE
+              AND stage = ANY(:stages)
+              AND error_type = ANY(:error_types)
+              AND redrive_count < :max_redrives
+              AND (next_retry_at IS NULL OR next_retry_at <= CURRENT_TIMESTAMP)
+            ORDER BY created_at
+            LIMIT :limit
+            """,
+            {"stages": list(stages), "error_types": list(error_types), "max_redrives": max_redrives, "limit": limit}
+        ) or []
+    
+    def redrive(
+        self,
+        handler: Callable[[List[str]], Tuple[List[str], Iterable[Tuple[str, str]]]],
+        stages: List[str],
+        error_types: Iterable[str] = REDRIVABLE_ERROR_TYPES,
+        batch_size: int = 50,
+        max_workers: int = 2,
+        max_redrives: int = 3,
+        limit: int = 500,
+        retry_policy: Optional[RetryPolicy] = None
+    ) -> Dict[str, int]:
+        """
+        Retry due DLQ items in symbol batches
+        
+        Args:
+            handler: Re-runs a batch of symbols, returning the ids of the
+                workflow runs it started and the (symbol, stage) pairs that now
+                succeed; it is called for at most max_workers batches at a time
+        
+        Items that now succeed are resolved; the others are retried again after
+        retry_policy's backoff until max_redrives is reached. Items the re-runs
+        recorded for the re-driven pairs are resolved as superseded.
+        
+        Returns:
+            Counts of items, symbols, resolved and rescheduled items
+        """
+        error_types = list(error_types)
+        items = self.get_redrivable_items(stages, error_types, max_redrives, limit)
+        summary = {'items': len(items), 'symbols': 0, 'resolved': 0, 'rescheduled': 0}
+        if not items:
+            return summary
+        
+        symbols = list(dict.fromkeys(item['symbol'] for item in items))
+        summary['symbols'] = len(symbols)
+        batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), max(1, batch_size))]
+        succeeded: Set[Tuple[str, str]] = set()
+        workflow_ids: List[str] = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="dlq-redrive") as pool:
+            futures = {pool.submit(handler, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                try:
+                    run_ids, pairs = future.result()
+                    workflow_ids.extend(run_ids)
+                    succeeded.update(pairs)
+                except Exception as e:
+                    logger.warning(f"DLQ re-drive failed for a batch of {len(futures[future])} symbols: {e}")
+        
+        # A failed re-run records new DLQ items; the re-driven item keeps the attempt count
+        self._supersede_duplicates(items, error_types, workflow_ids)
+        resolved = [item['dlq_id'] for item in items if (item['symbol'], item['stage']) in succeeded]
+        remaining = [item['dlq_id'] for item in items if (item['symbol'], item['stage']) not in succeeded]
+        summary['resolved'] = self._resolve_items(resolved, resolved_by='redrive')
+        summary['rescheduled'] = self._reschedule_items(remaining, retry_policy or RetryPolicy())
+        logger.info(
+            f"🔁 DLQ re-drive: {summary['resolved']}/{summary['items']} items resolved "
+            f"across {summary['symbols']} symbols, {summary['rescheduled']} rescheduled"
+        )
+        return summary
+    
+    def _resolve_items(self, dlq_ids: List[str], resolved_by: str) -> int:
+        if not dlq_ids:
+            return 0
+        try:
+            return db.execute_update(
+                """
+                UPDATE workflow_dlq
+                SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP, resolved_by = :resolved_by
+                WHERE dlq_id = ANY(:dlq_ids)
+                """,
+                {"dlq_ids": dlq_ids, "resolved_by": resolved_by}
+            )
+        except Exception as e:
+            logger.error(f"Failed to resolve {len(dlq_ids)} DLQ items: {e}", exc_info=True)
+            return 0
+    
+    def _supersede_duplicates(self, items: List[Dict[str, Any]], error_types: Iterable[str], workflow_ids: List[str]):
+        """
+        Resolve the items the re-runs themselves recorded for the re-driven (symbol, stage) pairs
 
+        Only items of the re-driven error classes from the re-drive's own workflow
+        runs are superseded; items of other runs and non-transient items (manual
+        review) stay open.
+        """
+        if not workflow_ids:
+            return
+        try:
+            db.execute_update(
+                """
+                UPDATE workflow_dlq
+                SET resolved = TRUE, resolved_at = CURRENT_TIMESTAMP, resolved_by = 'redrive:superseded'
+                WHERE resolved = FALSE
+                  AND dlq_id <> ALL(:dlq_ids)
+                  AND symbol || ':' || stage = ANY(:keys)
+                  AND error_type = ANY(:error_types)
+                  AND workflow_id = ANY(:workflow_ids)
+                """,
+                {
+                    "dlq_ids": [item['dlq_id'] for item in items],
+                    "error_types": list(error_types),
+                    "workflow_ids": workflow_ids,
+                    "keys": list({f"{item['symbol']}:{item['stage']}" for item in items})
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Failed to supersede duplicate DLQ items: {e}")
+    
+    def _reschedule_items(self, dlq_ids: List[str], retry_policy: RetryPolicy) -> int:
+        """Count a failed re-drive and push the next one out by the policy's backoff"""
+        if not dlq_ids:
+            return 0
+        try:
+            return db.execute_update(
+                """
+                UPDATE workflow_dlq
+                SET redrive_count = redrive_count + 1,
+                    next_retry_at = CURRENT_TIMESTAMP + make_interval(
+                        secs => LEAST(:max_delay, :initial_delay * POWER(:multiplier, redrive_count)))
+                WHERE dlq_id = ANY(:dlq_ids)
+                """,
+                {
+                    "dlq_ids": dlq_ids,
+                    "initial_delay": retry_policy.initial_delay,
+                    "multiplier": retry_policy.backoff_multiplier,
+                    "max_delay": retry_policy.max_delay
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to reschedule {len(dlq_ids)} DLQ items: {e}", exc_info=True)
+            return 0
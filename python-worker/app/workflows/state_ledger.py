@@ -0,0 +1,265 @@
+"""
+Workflow State Ledger
+In-memory, authoritative per-symbol stage state and gate results for one workflow run
+Industry Standard: Write-behind buffer with batched upserts and flushes at stage boundaries
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row statement (9 bind params per state row)
+FLUSH_BATCH_ROWS = 500
+
+StateKey = Tuple[str, str]  # (symbol, stage)
+
+
+@dataclass
+class SymbolStageState:
+    """Mirror of one workflow_symbol_states row"""
+    status: str
+    started_at: datetime
+    updated_at: datetime
+    error_message: Optional[str] = None
+    retry_count: int = 0
+    completed_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class GateRecord:
+    """One pending workflow_gate_results row"""
+    stage: str
+    symbol: str
+    gate_name: str
+    passed: bool
+    reason: Optional[str]
+    action: Optional[str]
+    checked_at: datetime
+
+
+class WorkflowStateLedger:
+    """
+    Symbol state and gate results for one workflow, flushed in batches
+
+    - Reads (status, retry count, passed stage) are served from memory; the
+      ledger is the source of truth while the run is in progress
+    - Writes mark the row dirty; dirty rows are upserted into
+      workflow_symbol_states and gate results inserted into workflow_gate_results
+      every flush_every transitions, and on every flush() call (stage boundaries)
+    - A failed flush keeps the rows buffered for the next one
+    """
+
+    def __init__(self, workflow_id: str, flush_every: int = 500):
+        self.workflow_id = workflow_id
+        self.flush_every = max(1, flush_every)
+        self._states: Dict[StateKey, SymbolStageState] = {}
+        self._dirty: set = set()
+        self._gate_results: List[GateRecord] = []
+        self._transitions = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats = {"transitions": 0, "flushes": 0, "rows_written": 0, "flush_failures": 0}
+
+    def create(self, symbol: str, stage: str, status: str) -> None:
+        """Start (or restart) a symbol at a stage"""
+        now = datetime.now()
+        with self._lock:
+            self._states[(symbol, stage)] = SymbolStageState(status=status, started_at=now, updated_at=now)
+            self._touch((symbol, stage))
+        self._maybe_flush()
+
+    def update(self, symbol: str, stage: str, status: str, error: Optional[str] = None) -> None:
+        now = datetime.now()
+        with self._lock:
+            state = self._states.get((symbol, stage))
+            if state is None:
+                state = self._states[(symbol, stage)] = SymbolStageState(status=status, started_at=now, updated_at=now)
+            state.status = status
+            state.error_message = error
+            state.updated_at = now
+            if status in ("completed", "failed"):
+                state.completed_at = now
+            self._touch((symbol, stage))
+        self._maybe_flush()
+
+    def increment_retry(self, symbol: str, stage: str) -> int:
+        with self._lock:
+            state = self._states.get((symbol, stage))
+            if state is None:
+                return 0
+            state.retry_count += 1
+            state.updated_at = datetime.now()
+            self._touch((symbol, stage))
+            return state.retry_count
+
+    def retry_count(self, symbol: str, stage: str) -> int:
+        with self._lock:
+            state = self._states.get((symbol, stage))
+            return state.retry_count if state is not None else 0
+
+    def status(self, symbol: str, stage: str) -> Optional[str]:
+        """Current status, or None if the symbol never entered the stage in this run"""
+        with self._lock:
+            state = self._states.get((symbol, stage))
+            return state.status if state is not None else None
+
+    def passed(self, symbol: str, stage: str) -> bool:
+        return self.status(symbol, stage) == "completed"
+
+    def record_gate_result(
+        self,
+        stage: str,
+        symbol: str,
+        gate_name: str,
+        passed: bool,
+        reason: Optional[str] = None,
+        action: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._gate_results.append(GateRecord(
+                stage=stage,
+                symbol=symbol,
+                gate_name=gate_name,
+                passed=bool(passed),
+                reason=reason,
+                action=action,
+                checked_at=datetime.now(),
+            ))
+            self._transitions += 1
+        self._maybe_flush()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._dirty) + len(self._gate_results)
+
+    def flush(self) -> int:
+        """
+        Write every buffered state change and gate result
+
+        Raises:
+            Exception from the database; unwritten rows stay buffered
+        """
+        with self._flush_lock:
+            with self._lock:
+                keys = list(self._dirty)
+                states = [(key, SymbolStageState(**vars(self._states[key]))) for key in keys]
+                gates = list(self._gate_results)
+                self._dirty.clear()
+                self._gate_results.clear()
+                self._transitions = 0
+            if not states and not gates:
+                return 0
+
+            written_states = 0
+            written_gates = 0
+            try:
+                for start in range(0, len(states), FLUSH_BATCH_ROWS):
+                    batch = states[start:start + FLUSH_BATCH_ROWS]
+                    db.execute_update(*self._build_state_upsert(batch))
+                    written_states += len(batch)
+                for start in range(0, len(gates), FLUSH_BATCH_ROWS):
+                    batch = gates[start:start + FLUSH_BATCH_ROWS]
+                    db.execute_update(*self._build_gate_insert(batch))
+                    written_gates += len(batch)
+            except Exception:
+                with self._lock:
+                    self._dirty.update(key for key, _ in states[written_states:])
+                    self._gate_results[:0] = gates[written_gates:]
+                    self._stats["flush_failures"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._stats["rows_written"] += written_states + written_gates
+
+            with self._lock:
+                self._stats["flushes"] += 1
+            return written_states + written_gates
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._dirty) + len(self._gate_results)
+            stats["symbol_states"] = len(self._states)
+        return stats
+
+    # --- internals ---
+
+    def _touch(self, key: StateKey) -> None:
+        """Mark a row dirty (caller holds lock)"""
+        self._dirty.add(key)
+        self._transitions += 1
+        self._stats["transitions"] += 1
+
+    def _maybe_flush(self) -> None:
+        with self._lock:
+            due = self._transitions >= self.flush_every
+        if not due:
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Workflow ledger flush failed for {self.workflow_id} (will retry): {e}")
+
+    def _build_state_upsert(self, batch: List[Tuple[StateKey, SymbolStageState]]) -> Tuple[str, Dict[str, object]]:
+        values: List[str] = []
+        params: Dict[str, object] = {"workflow_id": self.workflow_id}
+        for i, ((symbol, stage), state) in enumerate(batch):
+            values.append(
+                f"(:workflow_id, :symbol_{i}, :stage_{i}, :status_{i}, :error_{i}, :retry_count_{i}, "
+                f":started_at_{i}, :completed_at_{i}, :updated_at_{i})"
+            )
+            params.update({
+                f"symbol_{i}": symbol,
+                f"stage_{i}": stage,
+                f"status_{i}": state.status,
+                f"error_{i}": state.error_message,
+                f"retry_count_{i}": state.retry_count,
+                f"started_at_{i}": state.started_at,
+                f"completed_at_{i}": state.completed_at,
+                f"updated_at_{i}": state.updated_at,
+            })
+        query = f"""
+            INSERT INTO workflow_symbol_states
+            (workflow_id, symbol, stage, status, error_message, retry_count, started_at, completed_at, updated_at)
+            VALUES {", ".join(values)}
+            ON CONFLICT (workflow_id, symbol, stage)
+            DO UPDATE SET
+              status = EXCLUDED.status,
+              error_message = EXCLUDED.error_message,
+              retry_count = EXCLUDED.retry_count,
+              started_at = EXCLUDED.started_at,
+              completed_at = EXCLUDED.completed_at,
+              updated_at = EXCLUDED.updated_at
+        """
+        return query, params
+
+    def _build_gate_insert(self, batch: List[GateRecord]) -> Tuple[str, Dict[str, object]]:
+        values: List[str] = []
+        params: Dict[str, object] = {"workflow_id": self.workflow_id}
+        for i, record in enumerate(batch):
+            values.append(
+                f"(:gate_id_{i}, :workflow_id, :stage_{i}, :symbol_{i}, :gate_name_{i}, "
+                f":passed_{i}, :reason_{i}, :action_{i}, :checked_at_{i})"
+            )
+            params.update({
+                f"gate_id_{i}": f"{self.workflow_id}_{record.stage}_{record.symbol}_{record.checked_at.isoformat()}",
+                f"stage_{i}": record.stage,
+                f"symbol_{i}": record.symbol,
+                f"gate_name_{i}": record.gate_name,
+                f"passed_{i}": record.passed,
+                f"reason_{i}": record.reason,
+                f"action_{i}": record.action,
+                f"checked_at_{i}": record.checked_at,
+            })
+        query = f"""
+            INSERT INTO workflow_gate_results
+            (gate_result_id, workflow_id, stage, symbol, gate_name, passed, reason, action, checked_at)
+            VALUES {", ".join(values)}
+            ON CONFLICT (gate_result_id) DO NOTHING
+        """
+        return query, params
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Offline ingestion benchmark.
+
+Record provider responses once, then replay them against a local Postgres
+(DATABASE_URL) to measure rows/sec per refresh stage:
+
+    python scripts/benchmark_ingestion.py --mode record --symbols 50
+    python scripts/benchmark_ingestion.py --symbols 50 --latency-ms 80 --error-rate 0.02
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add project root so imports work
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.data_management.ingestion_benchmark import DEFAULT_STAGES, format_report, run_ingestion_benchmark
+from app.data_management.refresh_strategy import DataType
+from app.data_sources.cassette_source import CassetteDataSource
+from app.database import init_database
+from default_symbols import DEFAULT_SYMBOLS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark a full refresh against recorded provider responses")
+    parser.add_argument("--symbols", type=int, default=25, help="Number of symbols from DEFAULT_SYMBOLS")
+    parser.add_argument("--symbol-list", default=None, help="Comma-separated symbols (overrides --symbols)")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--cassette-dir", default=settings.cassette_dir)
+    parser.add_argument("--record-source", default=settings.cassette_record_source, help="Provider to record from")
+    parser.add_argument("--latency-ms", type=float, default=settings.cassette_latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=settings.cassette_latency_jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=settings.cassette_error_rate)
+    parser.add_argument("--seed", type=int, default=settings.cassette_seed)
+    parser.add_argument(
+        "--stages",
+        default=",".join(s.value for s in DEFAULT_STAGES),
+        help="Comma-separated data types, run in order",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    symbols = (
+        [s.strip().upper() for s in args.symbol_list.split(",") if s.strip()]
+        if args.symbol_list else list(dict.fromkeys(DEFAULT_SYMBOLS))[:args.symbols]
+    )
+    stages = [DataType(s.strip()) for s in args.stages.split(",") if s.strip()]
+
+    inner = None
+    if args.mode == "record":
+        from app.data_sources import get_data_source
+        inner = get_data_source(args.record_source, use_fallback=False)
+
+    source = CassetteDataSource(
+        inner=inner,
+        cassette_dir=args.cassette_dir,
+        mode=args.mode,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    init_database()
+    report = run_ingestion_benchmark(symbols, source, stages=stages)
+    print(json.dumps(report, indent=2, default=str) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Adaptive Concurrency (AIMD) Tests
+Window grows on fast successes, halves on throttling, and honors Retry-After
+"""
+import asyncio
+
+import app.services.bulk_stock_loader as bulk_stock_loader
+from app.services.bulk_stock_loader import BulkStockLoader
+from app.utils.adaptive_concurrency import AIMDController, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_additive_increase_after_a_full_window_of_successes():
+    clock = FakeClock()
+    ctl = AIMDController(initial=2, max_limit=4, clock=clock)
+    for _ in range(2):
+        ctl.on_success(clock.now)
+    assert ctl.window == 3
+    for _ in range(3):
+        ctl.on_success(clock.now)
+    assert ctl.window == 4
+    for _ in range(10):
+        ctl.on_success(clock.now)
+    assert ctl.window == 4  # capped
+
+
+def test_throttle_halves_once_per_round_trip_and_pauses():
+    clock = FakeClock()
+    ctl = AIMDController(initial=16, clock=clock)
+    started = clock.now
+    clock.now += 1
+    ctl.on_throttle(started, retry_after=30)
+    ctl.on_throttle(started)  # same round trip: no second decrease
+    assert ctl.window == 8
+    assert ctl.snapshot()["paused_for_seconds"] == 30
+    assert ctl.snapshot()["throttled"] == 2
+
+    clock.now += 1
+    ctl.on_throttle(clock.now)
+    assert ctl.window == 4
+
+
+def test_rising_latency_shrinks_window():
+    clock = FakeClock()
+    ctl = AIMDController(initial=8, latency_tolerance=2.0, ewma_alpha=1.0, clock=clock)
+    started = clock.now
+    clock.now += 0.1
+    ctl.on_success(started)
+    started = clock.now
+    clock.now += 1.0  # 10x slower than baseline
+    ctl.on_success(started)
+    assert ctl.window == 4
+
+    # The slow level becomes the new baseline: staying slow doesn't keep halving
+    for _ in range(5):
+        started = clock.now
+        clock.now += 1.2
+        ctl.on_success(started)
+    assert ctl.snapshot()["decreases"] == 1 and ctl.window >= 4
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Thu, 01 Jan 1970 00:01:40 GMT", now=40.0) == 60.0
+
+
+def test_slot_limits_in_flight_requests():
+    ctl = AIMDController(initial=2, max_limit=2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with ctl.slot():
+            peak = max(peak, ctl.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert ctl.in_flight == 0
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    async def json(self):
+        return {"quoteSummary": {"result": [{"assetProfile": {"longName": "Apple", "sector": "Technology"}}]}}
+
+
+class FakeSession:
+    """Replays scripted outcomes per symbol; a TimeoutError outcome is raised once every caller started"""
+
+    def __init__(self, outcomes, callers):
+        self.outcomes = outcomes
+        self.started = 0
+        self.callers = callers
+        self.all_started = asyncio.Event()
+
+    def get(self, url, **kwargs):
+        session, outcome = self, self.outcomes[url.rsplit("/", 1)[-1]].pop(0)
+
+        class Request:
+            async def __aenter__(self):
+                if outcome is asyncio.TimeoutError:
+                    session.started += 1
+                    if session.started == session.callers:
+                        session.all_started.set()
+                    await session.all_started.wait()
+                    raise asyncio.TimeoutError()
+                return outcome
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Request()
+
+
+def _run_fetches(monkeypatch, ctl, outcomes):
+    loader = BulkStockLoader.__new__(BulkStockLoader)
+    real_sleep = asyncio.sleep
+    held_during_backoff = []
+
+    async def sleep(delay):
+        held_during_backoff.append(ctl.in_flight)
+        await real_sleep(0)
+
+    monkeypatch.setattr(bulk_stock_loader.asyncio, "sleep", sleep)
+    session = FakeSession(outcomes, callers=sum(asyncio.TimeoutError in o for o in outcomes.values()))
+
+    async def run():
+        return await asyncio.gather(*(loader.fetch_yahoo_finance_info(session, s, ctl) for s in outcomes))
+
+    return asyncio.run(run()), held_during_backoff
+
+
+def test_concurrent_timeouts_shrink_the_window_once(monkeypatch):
+    ctl = AIMDController(initial=8)
+    outcomes = {s: [asyncio.TimeoutError, FakeResponse(200)] for s in ("AAPL", "MSFT", "NVDA")}
+    results, _ = _run_fetches(monkeypatch, ctl, outcomes)
+    assert all(r["success"] for r in results)
+    assert ctl.snapshot()["errors"] == 3 and ctl.snapshot()["decreases"] == 1 and ctl.window == 4
+
+
+def test_backoff_waits_outside_the_slot(monkeypatch):
+    ctl = AIMDController(initial=1, max_limit=1)
+    results, held = _run_fetches(monkeypatch, ctl, {"AAPL": [FakeResponse(503), FakeResponse(200)]})
+    assert results[0]["success"] and results[0]["company_name"] == "Apple"
+    assert held == [0]
@@ -0,0 +1,105 @@
+"""
+Audit Event Writer Tests
+Events are batched into multi-row inserts; backpressure spills or drops without blocking
+"""
+import json
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.observability import audit_writer
+from app.observability.audit_writer import AuditEventWriter, build_insert
+
+
+def _event(i: int) -> dict:
+    return {"run_id": "00000000-0000-0000-0000-000000000001", "level": "info", "operation": f"op{i}", "context": "{}"}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    session = MagicMock()
+    fake = MagicMock()
+
+    @contextmanager
+    def get_session():
+        yield session
+
+    fake.get_session = get_session
+    monkeypatch.setattr(audit_writer, "db", fake)
+    return session
+
+
+def test_build_insert_is_one_multi_row_statement():
+    query, params = build_insert([_event(0), _event(1), _event(2)])
+    assert query.count("INSERT INTO data_ingestion_events") == 1
+    assert params["operation_2"] == "op2"
+    assert "CAST(:context_1 AS jsonb)" in query
+
+
+def test_events_are_flushed_in_batches(fake_db):
+    writer = AuditEventWriter(batch_size=50, flush_interval_ms=10000)
+    for i in range(120):
+        assert writer.submit(_event(i))
+    writer.shutdown()
+
+    assert writer.get_stats()["flushed"] == 120
+    assert fake_db.execute.call_count <= 4  # batches, not 120 single inserts
+
+
+def test_queue_full_spills_to_file(fake_db, tmp_path, monkeypatch):
+    spill = tmp_path / "audit_spill.jsonl"
+    writer = AuditEventWriter(max_queue_size=2, flush_interval_ms=10000, spill_path=str(spill))
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)  # no consumer: force backpressure
+
+    results = [writer.submit(_event(i)) for i in range(5)]
+
+    assert results == [True, True, False, False, False]
+    lines = spill.read_text().splitlines()
+    assert [json.loads(line)["operation"] for line in lines] == ["op2", "op3", "op4"]
+    assert writer.get_stats()["spilled"] == 3
+
+
+def test_queue_full_without_spill_drops(fake_db, monkeypatch):
+    writer = AuditEventWriter(max_queue_size=1, flush_interval_ms=10000)
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+    writer.submit(_event(0))
+    writer.submit(_event(1))
+    assert writer.get_stats()["dropped"] == 1
+
+    writer.flush()
+    assert writer.get_stats()["flushed"] == 1
+
+
+def test_failed_batch_is_retried_row_by_row(fake_db, tmp_path):
+    def execute(query, params):
+        if any(value == "op1" for key, value in params.items() if key.startswith("operation_")):
+            raise ValueError("value too long for type character varying(100)")
+
+    fake_db.execute.side_effect = execute
+    spill = tmp_path / "audit_spill.jsonl"
+    writer = AuditEventWriter(flush_interval_ms=10000, spill_path=str(spill))
+    writer._write([_event(0), _event(1), _event(2)])
+
+    stats = writer.get_stats()
+    assert stats["flushed"] == 2 and stats["failed"] == 1 and stats["spilled"] == 1
+    assert [json.loads(line)["operation"] for line in spill.read_text().splitlines()] == ["op1"]
+
+
+def test_flush_waits_for_the_batch_being_written(fake_db):
+    import threading
+
+    writing, release = threading.Event(), threading.Event()
+    fake_db.execute.side_effect = lambda query, params: writing.set() or release.wait(2)
+    writer = AuditEventWriter(batch_size=1, flush_interval_ms=10)
+    writer.submit(_event(0))
+    assert writing.wait(2)  # the flusher dequeued the event and is inserting it
+
+    flushed = threading.Thread(target=writer.flush)
+    flushed.start()
+    flushed.join(0.1)
+    assert flushed.is_alive()
+    release.set()
+    flushed.join(2)
+    assert not flushed.is_alive() and writer.get_stats()["flushed"] == 1
+    writer.shutdown()
@@ -0,0 +1,135 @@
+"""
+Intraday Bar Aggregator Tests
+Current-price ticks fold into session-aligned OHLCV bars; provider candles only reconcile
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.data_management.bar_aggregator import BarAggregator
+from app.utils.trading_calendar import session_bounds
+
+# Monday 2026-03-02: NYSE open 14:30 UTC, close 21:00 UTC
+OPEN = datetime(2026, 3, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def at(minutes: float) -> datetime:
+    return OPEN + timedelta(minutes=minutes)
+
+
+def test_session_bounds_follow_the_exchange_calendar():
+    assert session_bounds(OPEN.date())[0].to_pydatetime() == OPEN
+    assert session_bounds(datetime(2026, 3, 1).date()) is None  # Sunday
+
+
+def test_ticks_fold_into_aligned_bars_with_volume_deltas():
+    agg = BarAggregator(intervals=("1m", "5m"), ring_size=3)
+    assert agg.add_tick("AAPL", 100.0, volume=1000, ts=at(0.2)) == []
+    agg.add_tick("AAPL", 101.5, volume=1200, ts=at(0.7))
+    agg.add_tick("AAPL", 99.5, volume=1300, ts=at(0.9))
+
+    closed = agg.add_tick("AAPL", 100.5, volume=1500, ts=at(1.1))
+    assert [(b.interval, b.start) for b in closed] == [("1m", OPEN)]
+    bar = closed[0]
+    assert (bar.open, bar.high, bar.low, bar.close, bar.ticks) == (100.0, 101.5, 99.5, 99.5, 3)
+    assert bar.volume == 300
+
+    # The 5m bar closes once its end passes, even without a newer tick
+    due = agg.close_due(at(5))
+    assert sorted((b.interval, b.start) for b in due) == [("1m", at(1)), ("5m", OPEN)]
+    five_minute = next(b for b in due if b.interval == "5m")
+    assert (five_minute.open, five_minute.close, five_minute.volume) == (100.0, 100.5, 500)
+
+    for minute in range(6, 12):
+        agg.add_tick("AAPL", 100.0, ts=at(minute + 0.5))
+    assert len(agg.recent_bars("AAPL", "1m")) == 3  # ring buffer keeps the newest bars
+
+
+def test_out_of_session_and_late_ticks_are_ignored():
+    agg = BarAggregator(intervals=("15m",))
+    assert agg.add_tick("MSFT", 400.0, ts=OPEN - timedelta(minutes=5)) == []
+    agg.add_tick("MSFT", 400.0, ts=at(20))
+    assert agg.add_tick("MSFT", 401.0, ts=at(10)) == []
+    assert agg.get_stats()["ignored_ticks"] == 2
+
+
+def test_provider_candles_only_needed_to_reconcile():
+    agg = BarAggregator(intervals=("15m",), max_tick_gap=timedelta(minutes=2))
+    assert agg.needs_reconcile("NVDA", at(30))  # never reconciled
+
+    agg.mark_reconciled("NVDA", at(30))
+    agg.add_tick("NVDA", 900.0, ts=at(31))
+    assert not agg.needs_reconcile("NVDA", at(32))  # live ticks build the bars
+    assert agg.needs_reconcile("NVDA", at(45))  # ticks stopped: fall back to candles
+
+    after_close = datetime(2026, 3, 2, 22, 0, tzinfo=timezone.utc)
+    assert agg.needs_reconcile("NVDA", after_close)  # once after the close
+    agg.mark_reconciled("NVDA", after_close)
+    assert not agg.needs_reconcile("NVDA", after_close + timedelta(hours=8))
+
+
+def test_bars_not_covered_by_ticks_are_partial_and_not_persisted():
+    from types import SimpleNamespace
+    from app.data_management.refresh_manager import DataRefreshManager
+
+    agg = BarAggregator(intervals=("15m",), max_tick_gap=timedelta(minutes=2), start_tolerance=timedelta(seconds=30))
+    # Restart: ticks resume at 10:07, inside the 10:00 bar
+    for minute in range(37, 45):
+        agg.add_tick("AAPL", 100.0 + minute / 10, volume=5000 + 100 * (minute - 37), ts=at(minute))
+    closed = agg.add_tick("AAPL", 101.5, volume=6000, ts=at(45.5))
+    partial = closed[0]
+    assert partial.start == at(30) and partial.first_tick_at == at(37) and not partial.complete
+
+    # Ticks were flowing when the 10:15 bar opened and kept coming, so it is complete
+    for minute in range(46, 60):
+        agg.add_tick("AAPL", 102.0, volume=6000 + 100 * (minute - 45), ts=at(minute))
+    complete = agg.close_due(at(60))[0]
+    assert complete.start == at(45) and complete.complete
+    assert complete.volume == 6000 + 1400 - 5700  # from the last tick before the bar
+
+    # A first tick within the tolerance of the open also counts
+    assert BarAggregator(intervals=("1m",)).add_tick("MSFT", 1.0, ts=at(0.4)) == []
+
+    # One poll every 15 minutes: every bar holds a single tick and is partial
+    sparse = BarAggregator(intervals=("1m", "5m", "15m"), max_tick_gap=timedelta(minutes=2))
+    polled = []
+    for n, minute in enumerate((60.7, 75.7, 90.7)):
+        polled += sparse.add_tick("NVDA", 900.0 + n, volume=10_000 + 1490 * n, ts=at(minute))
+    polled += sparse.close_due(at(120))
+    assert len(polled) == 9
+    assert polled and all(bar.ticks == 1 and not bar.complete for bar in polled)
+
+    # Ticks stop before the bar ends
+    stopped = BarAggregator(intervals=("5m",), max_tick_gap=timedelta(minutes=2))
+    stopped.add_tick("TSLA", 200.0, ts=at(0.1))
+    stopped.add_tick("TSLA", 201.0, ts=at(1))
+    assert not stopped.close_due(at(5))[0].complete
+
+    manager = DataRefreshManager.__new__(DataRefreshManager)
+    manager.data_source = SimpleNamespace(name="fmp")
+    assert [row.ts for row in manager._bar_rows([partial, complete, *polled])] == [at(45)]
+
+
+def test_current_price_polls_only_write_bars_while_ticks_are_live(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    import app.data_management.refresh_manager as refresh_manager
+    from app.data_management.bar_aggregator import Bar
+
+    upserts = []
+    monkeypatch.setattr(refresh_manager.settings, "intraday_bar_aggregation_enabled", True)
+    monkeypatch.setattr(refresh_manager.MarketDataIntradayRepository, "upsert_many", lambda rows: upserts.append(rows) or len(rows))
+    manager = refresh_manager.DataRefreshManager.__new__(refresh_manager.DataRefreshManager)
+    manager.data_source = SimpleNamespace(name="fmp", fetch_current_price=lambda symbol: {"price": 101.0, "volume": 5000})
+    manager._audit_data_fetch = MagicMock()
+    manager.logger = MagicMock()
+    manager.bar_aggregator = MagicMock()
+    manager.bar_aggregator.add_tick.return_value = [Bar("AAPL", "1m", at(0), at(1), 100.0, 101.0, 99.0, 100.5)]
+    manager.bar_aggregator.close_due.return_value = []
+
+    manager.bar_aggregator.is_live.return_value = False
+    assert manager._refresh_price_current("AAPL")
+    assert [row.interval for row in upserts[-1]] == ["last"]
+
+    manager.bar_aggregator.is_live.return_value = True
+    assert manager._refresh_price_current("AAPL")
+    assert [row.interval for row in upserts[-1]] == ["last", "1m"]
@@ -0,0 +1,121 @@
+"""
+Cassette Data Source Tests
+Recorded provider responses replay offline with synthetic latency and errors
+"""
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.data_management.ingestion_benchmark import run_ingestion_benchmark
+from app.data_management.refresh_result import DataTypeRefreshResult, RefreshStatus
+from app.data_management.refresh_strategy import DataType
+from app.data_sources.cassette_source import CassetteDataSource, CassetteMissError, InjectedProviderError
+
+
+class StubSource:
+    name = "stub"
+
+    def __init__(self):
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    def fetch_price_data(self, symbol, start_date=None, end_date=None, period="1y", interval="1d"):
+        self.calls += 1
+        return pd.DataFrame({"close": [1.0, 2.0]}, index=pd.date_range("2026-01-02", periods=2))
+
+    def fetch_news(self, symbol, limit=10):
+        self.calls += 1
+        raise RuntimeError("provider down")
+
+    def fetch_enhanced_fundamentals(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "pe_ratio": 30.0}
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    stub = StubSource()
+    recorder = CassetteDataSource(inner=stub, cassette_dir=str(tmp_path), mode="record")
+    recorded = recorder.fetch_price_data("AAPL", period="5d")
+    assert recorder.fetch_enhanced_fundamentals("AAPL")["pe_ratio"] == 30.0
+    with pytest.raises(RuntimeError):
+        recorder.fetch_news("AAPL", limit=20)
+    assert all(p.name.endswith(".pkl.gz") for p in tmp_path.iterdir())
+
+    sleeps = []
+    player = CassetteDataSource(cassette_dir=str(tmp_path), mode="replay", latency_ms=50, error_rate=0.0, sleep=sleeps.append)
+    pd.testing.assert_frame_equal(player.fetch_price_data("AAPL", period="5d"), recorded)
+    assert hasattr(player, "fetch_enhanced_fundamentals")
+    assert not hasattr(player, "fetch_short_interest")
+    with pytest.raises(RuntimeError, match="provider down"):
+        player.fetch_news("AAPL", limit=20)
+    with pytest.raises(CassetteMissError):
+        player.fetch_price_data("MSFT", period="5d")
+
+    assert stub.calls == 3  # replay never touches the provider
+    assert sleeps == [0.05] * 3
+    assert player.get_stats()["misses"] == 1
+
+
+def test_error_injection_is_seeded(tmp_path):
+    CassetteDataSource(inner=StubSource(), cassette_dir=str(tmp_path), mode="record").fetch_price_data("AAPL")
+
+    def outcomes():
+        player = CassetteDataSource(cassette_dir=str(tmp_path), mode="replay", latency_ms=0, error_rate=0.5, seed=7)
+        result = []
+        for _ in range(20):
+            try:
+                player.fetch_price_data("AAPL")
+                result.append(True)
+            except InjectedProviderError:
+                result.append(False)
+        return result
+
+    first = outcomes()
+    assert first == outcomes()
+    assert 0 < first.count(False) < 20
+
+
+def test_benchmark_reports_rows_per_stage():
+    class FakeManager:
+        def __init__(self, data_source):
+            self.tracking_batches = 0
+
+        def tracking_batch(self):
+            manager = self
+
+            class _Batch:
+                def __enter__(self):
+                    manager.tracking_batches += 1
+
+                def __exit__(self, *exc):
+                    return False
+            return _Batch()
+
+        def refresh_data(self, symbol, data_types, mode=None, force=False):
+            dt = data_types[0].value
+            status = RefreshStatus.FAILED if symbol == "BAD" else RefreshStatus.SUCCESS
+            result = DataTypeRefreshResult(data_type=dt, status=status, message="", rows_affected=0 if symbol == "BAD" else 10)
+            return SimpleNamespace(results={dt: result})
+
+    ticks = iter(range(100))
+    report = run_ingestion_benchmark(
+        ["AAPL", "MSFT", "BAD"],
+        SimpleNamespace(name="cassette"),
+        stages=[DataType.PRICE_HISTORICAL, DataType.NEWS],
+        manager_factory=FakeManager,
+        clock=lambda: float(next(ticks)),
+    )
+
+    assert [s["stage"] for s in report["stages"]] == ["price_historical", "news"]
+    assert report["stages"][0]["rows"] == 20
+    assert report["stages"][0]["failed"] == 1
+    assert report["stages"][0]["rows_per_second"] == 20.0
+    assert report["total_rows"] == 40
+
+
+def test_cassette_is_a_registered_data_source():
+    from app.data_sources import DATA_SOURCES
+    assert DATA_SOURCES["cassette"] is CassetteDataSource
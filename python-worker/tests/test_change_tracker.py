@@ -0,0 +1,91 @@
+"""
+Symbol Change Tracker Tests
+Downstream EOD stages only run for symbols whose ingestion cursor or bar checksum changed
+"""
+import threading
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.workflows.change_tracker as change_tracker
+from app.workflows.change_tracker import SymbolChangeTracker
+from app.workflows.orchestrator import WorkflowOrchestrator, WorkflowStage
+
+TODAY = date(2026, 3, 2)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    monkeypatch.setattr(change_tracker, "db", fake)
+    return fake
+
+
+def test_only_new_or_different_fingerprints_count_as_changed(fake_db):
+    current = [
+        {"symbol": "AAPL", "cursor_date": TODAY, "row_count": 21, "checksum": "a1"},
+        {"symbol": "MSFT", "cursor_date": TODAY, "row_count": 21, "checksum": "m2"},
+        {"symbol": "NVDA", "cursor_date": TODAY, "row_count": 21, "checksum": "n1"},
+    ]
+    stored = [
+        {"symbol": "AAPL", "cursor_date": TODAY, "row_count": 21, "checksum": "a1"},  # holiday / provider no-op
+        {"symbol": "MSFT", "cursor_date": TODAY, "row_count": 21, "checksum": "m1"},  # corrected bar
+    ]
+    fake_db.execute_query.side_effect = lambda query, params: current if "raw_market_data" in query else stored
+
+    tracker = SymbolChangeTracker(window_days=30)
+    assert tracker.changed(["AAPL", "MSFT", "NVDA", "HALTED"]) == ["MSFT", "NVDA", "HALTED"]
+    assert fake_db.execute_query.call_count == 2
+
+    assert tracker.commit(["MSFT", "HALTED"]) == 1  # no bars, nothing to record
+    query, params = fake_db.execute_update.call_args[0]
+    assert "ON CONFLICT (symbol, pipeline)" in query
+    assert params["symbol_0"] == "MSFT" and params["checksum_0"] == "m2"
+
+
+def test_detection_failure_treats_everything_as_changed(fake_db):
+    fake_db.execute_query.side_effect = RuntimeError("db down")
+    tracker = SymbolChangeTracker()
+    assert tracker.changed(["AAPL", "MSFT"]) == ["AAPL", "MSFT"]
+    assert tracker.commit(["AAPL"]) == 0
+    fake_db.execute_update.assert_not_called()
+
+
+def test_unchanged_symbols_skip_downstream_stages():
+    orchestrator = WorkflowOrchestrator(checkpoint=MagicMock(), dlq=MagicMock(), max_workers=2)
+    states = {}
+    lock = threading.Lock()
+
+    def record(wf, symbol, stage, status, error=None):
+        with lock:
+            states[(symbol, stage)] = status
+
+    orchestrator._create_stage_execution = MagicMock(side_effect=lambda wf, name: name)
+    orchestrator._update_stage_status = MagicMock()
+    orchestrator._create_symbol_state = record
+    orchestrator._update_symbol_state = record
+    calls = []
+
+    def stage(name):
+        def run(symbol):
+            with lock:
+                calls.append((name, symbol))
+        return run
+
+    stages = [
+        WorkflowStage("ingestion", stage("ingestion")),
+        WorkflowStage("indicators", stage("indicators"), depends_on="ingestion"),
+        WorkflowStage("signals", stage("signals"), depends_on="indicators"),
+    ]
+    change_filter = MagicMock(side_effect=lambda symbols: [s for s in symbols if s != "AAPL"])
+
+    counts = orchestrator._execute_pipelined("wf", stages, ["AAPL", "MSFT"], None, change_filter)
+
+    assert not any(symbol == "AAPL" and name != "ingestion" for name, symbol in calls)
+    assert ("signals", "MSFT") in calls
+    assert states[("AAPL", "indicators")] == "skipped" and states[("AAPL", "signals")] == "skipped"
+    assert counts["ingestion"] == {"succeeded": 2, "failed": 0}
+    assert counts["signals"] == {"succeeded": 1, "failed": 0}
+    completed = [c for c in orchestrator._update_stage_status.call_args_list if c[0][1] == "completed"]
+    assert len(completed) == 3
@@ -0,0 +1,75 @@
+"""
+Dead Letter Queue Re-drive Tests
+Due transient DLQ items are retried in symbol batches; failures back off, successes resolve
+"""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.workflows.recovery as recovery
+from app.workflows.recovery import DeadLetterQueue, DelayQueue, RetryPolicy
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    fake.execute_update.side_effect = lambda query, params: len(params.get("dlq_ids", []))
+    monkeypatch.setattr(recovery, "db", fake)
+    return fake
+
+
+def test_delay_queue_pops_due_items_in_order():
+    queue = DelayQueue()
+    queue.push("late", 60)
+    queue.push("now-b", 0)
+    queue.push("now-a", -1)
+
+    assert queue.pop_due() == ["now-a", "now-b"]
+    assert len(queue) == 1 and 59 < queue.next_due_in() <= 60
+    assert queue.pop_due(now=time.monotonic() + 61) == ["late"]
+    assert queue.next_due_in() is None
+
+
+def test_redrive_runs_symbol_batches_and_resolves_or_reschedules(fake_db):
+    fake_db.execute_query.return_value = [
+        {"dlq_id": "d1", "workflow_id": "wf", "symbol": "AAPL", "stage": "ingestion", "error_type": "transient", "redrive_count": 0},
+        {"dlq_id": "d2", "workflow_id": "wf", "symbol": "AAPL", "stage": "signals", "error_type": "transient", "redrive_count": 0},
+        {"dlq_id": "d3", "workflow_id": "wf", "symbol": "MSFT", "stage": "ingestion", "error_type": "transient", "redrive_count": 1},
+        {"dlq_id": "d4", "workflow_id": "wf", "symbol": "NVDA", "stage": "ingestion", "error_type": "transient", "redrive_count": 0},
+    ]
+    batches = []
+
+    def handler(symbols):
+        batches.append(symbols)
+        if "NVDA" in symbols:
+            raise RuntimeError("provider down")
+        return ["wf-redrive"], [("AAPL", "ingestion"), ("AAPL", "signals"), ("MSFT", "indicators")]
+
+    summary = DeadLetterQueue().redrive(
+        handler, ["ingestion", "signals"], batch_size=2, max_workers=2,
+        retry_policy=RetryPolicy(initial_delay=30)
+    )
+
+    assert sorted(map(tuple, batches)) == [("AAPL", "MSFT"), ("NVDA",)]
+    assert summary == {"items": 4, "symbols": 3, "resolved": 2, "rescheduled": 2}
+    query, params = fake_db.execute_query.call_args[0]
+    assert "next_retry_at <= CURRENT_TIMESTAMP" in query and params["error_types"] == ["transient"]
+
+    updates = {params.get("resolved_by"): params for query, params in (c[0] for c in fake_db.execute_update.call_args_list)}
+    assert sorted(updates["redrive"]["dlq_ids"]) == ["d1", "d2"]
+    rescheduled = next(p for q, p in (c[0] for c in fake_db.execute_update.call_args_list) if "redrive_count + 1" in q)
+    assert sorted(rescheduled["dlq_ids"]) == ["d3", "d4"] and rescheduled["initial_delay"] == 30
+
+    # Only items the re-runs themselves recorded are superseded, not other runs' or manual-review ones
+    query, params = next(c[0] for c in fake_db.execute_update.call_args_list if c[0][1].get("keys"))
+    assert "error_type = ANY(:error_types)" in query and "workflow_id = ANY(:workflow_ids)" in query
+    assert params["error_types"] == ["transient"] and params["workflow_ids"] == ["wf-redrive"]
+
+
+def test_redrive_without_due_items_does_nothing(fake_db):
+    fake_db.execute_query.return_value = []
+    handler = MagicMock()
+    assert DeadLetterQueue().redrive(handler, ["ingestion"])["items"] == 0
+    handler.assert_not_called()
+    fake_db.execute_update.assert_not_called()
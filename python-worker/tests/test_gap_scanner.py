@@ -0,0 +1,85 @@
+"""
+Gap Scanner Tests
+Universe-wide anti-join results become per-symbol contiguous backfill ranges
+"""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.data_management import gap_scanner
+from app.data_management.gap_scanner import BackfillExecutor, GapScanner, group_contiguous
+
+SESSIONS = [date(2026, 1, 2), date(2026, 1, 5), date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 8)]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    monkeypatch.setattr(gap_scanner, "db", fake)
+    monkeypatch.setattr(gap_scanner, "expected_trading_days", lambda start, end: SESSIONS)
+    return fake
+
+
+def test_ranges_are_contiguous_by_session_not_calendar_day():
+    # Fri 2 Jan and Mon 5 Jan are adjacent sessions
+    ranges = group_contiguous("AAPL", "daily", [SESSIONS[4], SESSIONS[0], SESSIONS[1]], SESSIONS)
+    assert [(r.start, r.end, r.missing) for r in ranges] == [
+        (date(2026, 1, 2), date(2026, 1, 5), 2),
+        (date(2026, 1, 8), date(2026, 1, 8), 1),
+    ]
+
+
+def test_scan_daily_uses_one_query_for_the_universe(fake_db):
+    fake_db.execute_query.return_value = [
+        {"symbol": "AAPL", "date": date(2026, 1, 6)},
+        {"symbol": "AAPL", "date": date(2026, 1, 7)},
+        {"symbol": "MSFT", "date": date(2026, 1, 2)},
+    ]
+
+    plan = GapScanner().scan_daily(["AAPL", "MSFT", "NVDA"], lookback_days=10, end_date=date(2026, 1, 8))
+
+    assert fake_db.execute_query.call_count == 1
+    params = fake_db.execute_query.call_args[0][1]
+    assert params["symbols"] == ["AAPL", "MSFT", "NVDA"]
+    assert params["sessions"] == SESSIONS
+    assert plan.symbols == ["AAPL", "MSFT"]
+    assert plan.total_missing == 3
+    assert plan.fetch_window("AAPL") == (date(2026, 1, 6), date(2026, 1, 7))
+
+
+def test_scan_intraday_normalizes_returned_timestamps(fake_db, monkeypatch):
+    expected = list(pd.date_range("2026-01-02 14:30", periods=4, freq="15min", tz="UTC"))
+    monkeypatch.setattr(gap_scanner, "expected_intraday_15m_timestamps", lambda start, end: expected)
+    fake_db.execute_query.return_value = [
+        {"symbol": "AAPL", "ts": expected[1].tz_convert("America/New_York")},
+        {"symbol": "AAPL", "ts": expected[2].to_pydatetime()},
+    ]
+
+    plan = GapScanner().scan_intraday_15m(["AAPL"], end_date=date(2026, 1, 2))
+
+    [only] = plan.ranges["AAPL"]
+    assert (only.start, only.end, only.missing) == (expected[1], expected[2], 2)
+
+
+def test_executor_fetches_once_per_symbol_and_isolates_failures(fake_db):
+    fake_db.execute_query.return_value = [
+        {"symbol": "AAPL", "date": date(2026, 1, 2)},
+        {"symbol": "AAPL", "date": date(2026, 1, 8)},
+        {"symbol": "BAD", "date": date(2026, 1, 5)},
+    ]
+    plan = GapScanner().scan_daily(["AAPL", "BAD"], end_date=date(2026, 1, 8))
+    calls = []
+
+    def fetch_and_store(symbol, start, end):
+        calls.append((symbol, start, end))
+        if symbol == "BAD":
+            raise RuntimeError("provider error")
+        return 3
+
+    result = BackfillExecutor(fetch_and_store, max_workers=2).execute(plan)
+
+    assert sorted(calls) == [("AAPL", date(2026, 1, 2), date(2026, 1, 8)), ("BAD", date(2026, 1, 5), date(2026, 1, 5))]
+    assert result["succeeded"] == 1 and result["failed"] == 1 and result["rows"] == 3
+    assert "BAD" in result["errors"]
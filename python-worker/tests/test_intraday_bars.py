@@ -0,0 +1,62 @@
+"""
+Intraday Bar Normalization Tests
+Provider frames of varying shape normalize to the same canonical bars
+"""
+from datetime import timezone
+
+import numpy as np
+import pandas as pd
+
+from app.utils.intraday_bars import intraday_bar_records, normalize_intraday_bars
+
+
+def test_datetime_index_and_capitalized_columns():
+    idx = pd.date_range("2026-01-02 14:30", periods=3, freq="15min")
+    data = pd.DataFrame(
+        {"Open": [1, 2, np.nan], "High": [2, 3, 4], "Low": [0.5, 1, 2], "Close": [1.5, 2.5, 3], "Volume": [100, np.nan, 300.0]},
+        index=idx,
+    )
+
+    bars = normalize_intraday_bars(data)
+    records = intraday_bar_records(bars, symbol="NVDA", interval="15m", source="yahoo_finance")
+
+    assert len(records) == 3
+    first = records[0]
+    assert first["ts"].tzinfo == timezone.utc
+    assert first["open"] == 1.0 and isinstance(first["open"], float)
+    assert first["volume"] == 100 and isinstance(first["volume"], int)
+    assert records[1]["volume"] is None
+    assert records[2]["open"] is None
+    assert first["symbol"] == "NVDA" and first["data_source"] == "yahoo_finance"
+
+
+def test_ts_column_is_converted_to_utc_and_falls_back_to_index():
+    data = pd.DataFrame(
+        {"ts": ["2026-01-02T09:30:00-05:00", None], "close": [10.0, 11.0]},
+        index=pd.to_datetime(["2026-01-02 14:30", "2026-01-02 14:45"]),
+    )
+
+    bars = normalize_intraday_bars(data)
+
+    assert list(bars["ts"]) == [
+        pd.Timestamp("2026-01-02 14:30", tz="UTC"),
+        pd.Timestamp("2026-01-02 14:45", tz="UTC"),
+    ]
+    assert list(bars["close"]) == [10.0, 11.0]
+
+
+def test_unparseable_timestamps_and_duplicates_are_dropped():
+    data = pd.DataFrame(
+        {"ts": ["not a date", "2026-01-02 14:30", "2026-01-02 14:30"], "close": [1.0, 2.0, 3.0]},
+        index=["a", "b", "c"],
+    )
+
+    bars = normalize_intraday_bars(data)
+
+    assert len(bars) == 1
+    assert bars["close"].iloc[0] == 3.0
+
+
+def test_empty_input():
+    assert normalize_intraday_bars(None).empty
+    assert intraday_bar_records(normalize_intraday_bars(pd.DataFrame()), symbol="X", interval="15m", source=None) == []
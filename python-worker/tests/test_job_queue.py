@@ -0,0 +1,165 @@
+"""
+Workflow Job Queue Tests
+Jobs are claimed with SKIP LOCKED, retried with backoff, dead-lettered when exhausted
+"""
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.workflows.job_queue as job_queue
+from app.workers.queue_worker import QueueWorker
+from app.workflows.job_queue import Job, JobQueue
+from app.workflows.recovery import RetryPolicy
+
+MIGRATION = Path(__file__).resolve().parents[2] / "db" / "migrations_postgres" / "009_add_workflow_jobs.sql"
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    fake.execute_update.return_value = 1
+    monkeypatch.setattr(job_queue, "db", fake)
+    return fake
+
+
+def _row(job_id, symbol, attempts=1, max_attempts=4):
+    return {
+        "job_id": job_id, "queue": "workflow", "job_type": "eod_symbol", "symbol": symbol,
+        "payload": "{}", "result": None, "status": "running", "priority": 0,
+        "attempts": attempts, "max_attempts": max_attempts, "batch_id": "b1",
+    }
+
+
+def test_enqueue_is_one_statement_per_chunk_and_claim_skips_locked_rows(fake_db):
+    fake_db.execute_query.return_value = [{"job_id": "j1"}, {"job_id": "j2"}]
+    queue = JobQueue()
+    assert queue.enqueue_many("eod_symbol", ["AAPL", "MSFT"], dedupe_prefix="eod:2026-03-02", batch_id="b1") == ["j1", "j2"]
+    query, params = fake_db.execute_query.call_args[0]
+    assert "ON CONFLICT (dedupe_key)" in query and "status <> 'dead'" in query
+    assert params["dedupe_key_1"] == "eod:2026-03-02:MSFT"
+
+    fake_db.execute_query.return_value = [_row("j1", "AAPL"), _row("j2", "MSFT", attempts=5)]
+    jobs = queue.claim("w1", limit=2)
+    query, params = fake_db.execute_query.call_args[0]
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert params["limit"] == 2
+    # j2's worker kept dying: attempts exhausted, dead-lettered instead of handed out
+    assert [job.job_id for job in jobs] == ["j1"]
+    assert "status = 'dead'" in fake_db.execute_update.call_args[0][0]
+
+
+def test_fail_requeues_transient_errors_and_dead_letters_the_rest(fake_db):
+    dlq = MagicMock()
+    queue = JobQueue(retry_policy=RetryPolicy(max_retries=3, initial_delay=10), dlq=dlq)
+
+    job = Job(job_id="j1", job_type="eod_symbol", symbol="AAPL", payload={"workflow_id": "wf"}, attempts=2, max_attempts=4)
+    assert queue.fail(job, "w1", ConnectionError("connection reset")) == "retrying"
+    query, params = fake_db.execute_update.call_args[0]
+    assert "status = 'queued'" in query and params["delay"] == 20
+    dlq.add_failed_item.assert_not_called()
+
+    assert queue.fail(job, "w1", ValueError("bad symbol")) == "dead"
+    dlq.add_failed_item.assert_called_once()
+    assert dlq.add_failed_item.call_args[0][1] == "AAPL"
+
+    # Another worker reclaimed the job meanwhile: nothing is recorded
+    fake_db.execute_update.return_value = 0
+    assert queue.fail(job, "w1", ConnectionError("timeout")) == "lost"
+
+
+def test_queued_eod_run_is_a_workflow_run_and_reports_dead_jobs(monkeypatch):
+    import app.workers.batch_worker as batch_worker
+
+    queue = MagicMock()
+    queue.enqueue_many.return_value = ["j1", "j2", "j3"]
+    queue.wait_for_batch.return_value = [
+        Job(job_id="j1", job_type="eod_symbol", symbol="AAPL", status="succeeded", result={"changed": True}),
+        Job(job_id="j2", job_type="eod_symbol", symbol="MSFT", status="dead"),
+        Job(job_id="j3", job_type="eod_symbol", symbol="NVDA", status="running"),
+    ]
+    monkeypatch.setattr(batch_worker, "JobQueue", lambda *args, **kwargs: queue)
+    worker = batch_worker.BatchWorker.__new__(batch_worker.BatchWorker)
+    worker.eod_workflow = MagicMock()
+    worker.eod_workflow.update_downstream.return_value = {}
+    orchestrator = worker.eod_workflow.orchestrator
+
+    result = worker._run_eod_via_queue(["AAPL", "MSFT", "NVDA"])
+
+    # Jobs carry the run's workflow_id so queue-killed jobs reach the DLQ
+    workflow_id = orchestrator._create_workflow_execution.call_args[0][0]
+    assert queue.enqueue_many.call_args.kwargs["payload"] == {"workflow_id": workflow_id}
+    assert result["success"] and result["partial"]
+    assert result["dead_symbols"] == ["MSFT"] and result["pending_symbols"] == ["NVDA"]
+    worker.eod_workflow.update_downstream.assert_called_once_with(["AAPL"])
+    assert orchestrator._update_workflow_status.call_args[0][:2] == (workflow_id, "completed")
+
+    # Nothing succeeded: the run fails and later batch stages are skipped
+    for job in queue.wait_for_batch.return_value:
+        job.status = "dead"
+    result = worker._run_eod_via_queue(["AAPL", "MSFT", "NVDA"])
+    assert not result["success"] and "error" in result
+    assert orchestrator._update_workflow_status.call_args[0][1] == "failed"
+
+
+def test_worker_completes_or_fails_claimed_jobs():
+    queue = MagicMock(lease_seconds=300)
+    queue.claim.return_value = [
+        Job(job_id="j1", job_type="eod_symbol", symbol="AAPL"),
+        Job(job_id="j2", job_type="eod_symbol", symbol="BAD"),
+        Job(job_id="j3", job_type="unknown", symbol="MSFT"),
+    ]
+
+    def handler(job):
+        if job.symbol == "BAD":
+            raise RuntimeError("provider timeout")
+        return {"changed": True}
+
+    worker = QueueWorker(queue=queue, handlers={"eod_symbol": handler}, worker_id="w1", concurrency=3, poll_interval=0)
+    assert worker.run_once() == 3
+    queue.claim.assert_called_once_with("w1", limit=3)
+    queue.complete.assert_called_once_with(queue.claim.return_value[0], "w1", {"changed": True})
+    failed = {call.args[0].job_id for call in queue.fail.call_args_list}
+    assert failed == {"j2", "j3"}
+    assert worker._in_flight == {}
+
+
+def test_concurrent_workers_never_claim_the_same_job():
+    from app.database import db
+
+    try:
+        db.execute_query("SELECT 1")
+    except Exception as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+
+    with db.get_session() as session:
+        session.connection().exec_driver_sql(MIGRATION.read_text())
+        session.commit()
+
+    queue = JobQueue(queue="test_skip_locked")
+    db.execute_update("DELETE FROM workflow_jobs WHERE queue = :queue", {"queue": queue.queue})
+    try:
+        queue.enqueue_many("noop", [f"S{i}" for i in range(40)], batch_id="skip-locked-test")
+        claimed = {}
+        lock = threading.Lock()
+
+        def drain(worker_id):
+            while True:
+                jobs = queue.claim(worker_id, limit=3)
+                if not jobs:
+                    return
+                with lock:
+                    for job in jobs:
+                        claimed.setdefault(job.job_id, []).append(worker_id)
+
+        threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(claimed) == 40
+        assert all(len(owners) == 1 for owners in claimed.values())
+    finally:
+        db.execute_update("DELETE FROM workflow_jobs WHERE queue = :queue", {"queue": queue.queue})
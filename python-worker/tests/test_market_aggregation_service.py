@@ -0,0 +1,82 @@
+"""
+Market Aggregation Tests
+Sector, industry and market-cap groups come from one GROUPING SETS query shared by
+sector performance and market trends
+"""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.services.market_aggregation_service as market_aggregation_service
+import app.services.market_trends_service as market_trends_service
+import app.services.sector_performance_service as sector_performance_service
+from app.services.market_aggregation_service import MarketAggregationService
+from app.services.market_trends_service import MarketTrendsService
+from app.services.sector_performance_service import SectorPerformanceService
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    for module in (market_aggregation_service, market_trends_service, sector_performance_service):
+        monkeypatch.setattr(module, "db", fake)
+    return fake
+
+
+def _group_row(group_type, category, avg, total=2, top=()):
+    return {
+        "group_type": group_type, "category": category, "total_stocks": total,
+        "priced_stocks": len(top), "avg_change": avg, "gainers_count": 1, "losers_count": 0,
+        "neutral_count": 1, "top_symbols": [s for s, _ in top], "top_changes": [c for _, c in top],
+    }
+
+
+GROUP_ROWS = [
+    _group_row("sector", "Technology", 6.0, top=[("NVDA", 9.0), ("AAPL", 3.0)]),
+    _group_row("sector", "Energy", None, total=1),
+    _group_row("industry", "Semiconductors", 9.0, total=1, top=[("NVDA", 9.0)]),
+    _group_row("industry", "Oil & Gas", None, total=1),
+    _group_row("market_cap", "small", -2.0, total=1, top=[("XYZ", -2.0)]),
+    _group_row("market_cap", "mega", 6.0, top=[("NVDA", 9.0), ("AAPL", 3.0)]),
+]
+
+
+def test_group_performance_is_one_grouping_sets_query(fake_db):
+    fake_db.execute_query.return_value = GROUP_ROWS
+
+    groups = MarketAggregationService().calculate_group_performance()
+
+    fake_db.execute_query.assert_called_once()
+    assert "GROUPING SETS ((sector), (industry), (market_cap_category))" in fake_db.execute_query.call_args[0][0]
+    assert [g["category"] for g in groups["sector"]] == ["Technology", "Energy"]
+    assert groups["sector"][0]["top_stocks"] == [
+        {"symbol": "NVDA", "change_percent": 9.0},
+        {"symbol": "AAPL", "change_percent": 3.0},
+    ]
+    assert groups["industry"][1]["avg_price_change_percent"] is None
+
+
+def test_sector_performance_and_trends_share_groups_and_bulk_save(fake_db):
+    fake_db.execute_query.return_value = GROUP_ROWS
+    groups = MarketAggregationService().calculate_group_performance()
+    fake_db.reset_mock()
+
+    sectors = SectorPerformanceService().calculate_sector_performance(date(2026, 3, 2), groups=groups)
+    trends = MarketTrendsService().calculate_market_trends(date(2026, 3, 2), groups=groups)
+
+    fake_db.execute_query.assert_not_called()
+    assert fake_db.execute_update.call_count == 2  # one bulk upsert per snapshot table
+
+    assert [s["sector"] for s in sectors["sectors"]] == ["Technology", "Energy"]
+    assert sectors["sectors"][1]["avg_price_change_percent"] == 0
+
+    assert [t["category"] for t in trends["sectors"]] == ["Technology", "Energy"]
+    assert [t["category"] for t in trends["industries"]] == ["Semiconductors"]  # no returns, no trend
+    assert [t["category"] for t in trends["market_cap"]] == ["mega", "small"]  # tier order
+    assert trends["sectors"][0]["trend_score"] == 60 and trends["sectors"][0]["strength"] == "strong"
+    assert trends["overall"]["direction"] == "bullish"
+
+    query, params = fake_db.execute_update.call_args[0]
+    assert "ON CONFLICT (date, trend_type, category)" in query
+    assert params["trend_types"] == ["sector", "sector", "industry", "market_cap", "market_cap", "overall"]
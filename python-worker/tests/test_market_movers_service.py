@@ -0,0 +1,64 @@
+"""
+Market Movers Service Tests
+The whole universe is computed with one query and snapshotted with one insert
+"""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+import app.services.market_movers_service as market_movers_service
+from app.services.market_movers_service import MarketMoversService, _top_indices
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    monkeypatch.setattr(market_movers_service, "db", fake)
+    return fake
+
+
+def _row(symbol, pct, volume, sector=None):
+    return {
+        "stock_symbol": symbol, "price_change": pct, "price_change_percent": pct,
+        "total_volume": volume, "sector": sector, "industry": None,
+    }
+
+
+def test_top_indices_selects_largest_first():
+    values = np.array([3.0, 9.0, -1.0, 7.0, 5.0])
+    assert list(_top_indices(values, 3)) == [1, 3, 4]
+    assert list(_top_indices(values, 10)) == [1, 3, 4, 0, 2]
+    assert list(_top_indices(np.array([]), 3)) == []
+
+
+def test_movers_use_one_query_and_one_bulk_insert(fake_db):
+    fake_db.execute_query.return_value = [
+        _row("AAPL", 2.5, 100, "Technology"),
+        _row("MSFT", -1.0, 900),
+        _row("NVDA", 6.0, 500, "Technology"),
+        _row("TSLA", -4.0, 50),
+        _row("XOM", 0.0, 1000, "Energy"),
+    ]
+
+    result = MarketMoversService().calculate_market_movers(period="week", limit=2)
+
+    assert [m["symbol"] for m in result["gainers"]] == ["NVDA", "AAPL"]
+    assert [m["symbol"] for m in result["losers"]] == ["TSLA", "MSFT"]
+    assert [m["symbol"] for m in result["most_active"]] == ["XOM", "MSFT"]
+    assert result["gainers"][0]["sector"] == "Technology"
+
+    fake_db.execute_query.assert_called_once()
+    assert "OVER w" in fake_db.execute_query.call_args[0][0]
+    fake_db.execute_update.assert_called_once()
+    query, params = fake_db.execute_update.call_args[0]
+    assert "unnest(" in query and "ON CONFLICT" in query
+    assert params["symbols"] == ["AAPL", "MSFT", "NVDA", "TSLA", "XOM"]
+    assert params["period"] == "week"
+
+
+def test_no_prices_in_period_returns_empty_lists(fake_db):
+    fake_db.execute_query.return_value = []
+    result = MarketMoversService().calculate_market_movers(period="day")
+    assert result["gainers"] == result["losers"] == result["most_active"] == []
+    fake_db.execute_update.assert_not_called()
@@ -0,0 +1,79 @@
+"""
+Massive Fundamentals Bulk Loading Tests
+Endpoint calls fan out per (symbol, dataset); writes are multi-row upserts per table
+"""
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.data_sources import massive_fundamentals
+from app.data_sources.massive_fundamentals import FUNDAMENTALS_DATASETS, MassiveFundamentalsLoader
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = MagicMock()
+    fake_db = MagicMock()
+    fake_db.session_factory = object()
+
+    @contextmanager
+    def get_session():
+        yield session
+
+    fake_db.get_session = get_session
+    monkeypatch.setattr(massive_fundamentals, "db", fake_db)
+    return session
+
+
+def _loader(max_workers: int = 4) -> MassiveFundamentalsLoader:
+    # Bypass __init__: the massive client library is optional
+    loader = object.__new__(MassiveFundamentalsLoader)
+    loader.max_workers = max_workers
+    loader.create_fundamentals_tables = lambda: None
+    return loader
+
+
+def test_save_to_database_is_one_statement_and_dedupes_keys(session):
+    rows = [
+        {"symbol": "AAPL", "indicator_type": "RSI", "timestamp": 1, "value": 50.0, "window": 14, "source": "massive"},
+        {"symbol": "AAPL", "indicator_type": "RSI", "timestamp": 1, "value": 51.0, "window": 14, "source": "massive"},
+        {"symbol": "AAPL", "indicator_type": "MACD", "timestamp": 1, "macd_value": 1.2, "short_window": 12},
+    ]
+
+    _loader().save_to_database("massive_technical_indicators", rows)
+
+    assert session.execute.call_count == 1
+    sql, params = str(session.execute.call_args[0][0]), session.execute.call_args[0][1]
+    assert '"window"' in sql and "source" not in sql
+    assert params["value_0"] == 51.0  # last duplicate wins
+    assert params["short_window_0"] is None and params["macd_value_1"] == 1.2
+
+
+def test_load_fundamentals_for_symbols_fans_out_and_batches_writes(session, monkeypatch):
+    loader = _loader()
+    calls = []
+
+    def fake_loader(method):
+        def load(symbol):
+            calls.append((symbol, method))
+            return [{"symbol": symbol, "period_end": method, "fiscal_period": "Q1", "trading_date": method,
+                     "settlement_date": method, "indicator_type": method, "timestamp": 1}]
+        return load
+
+    for _, method, _ in FUNDAMENTALS_DATASETS:
+        monkeypatch.setattr(loader, method, fake_loader(method))
+    saved = []
+    monkeypatch.setattr(loader, "save_to_database", lambda table, rows: saved.append((table, len(rows))))
+
+    results = loader.load_fundamentals_for_symbols(["AAPL", "MSFT", "AAPL"])
+
+    assert len(calls) == 2 * len(FUNDAMENTALS_DATASETS)
+    assert results["AAPL"]["total_records"] == len(FUNDAMENTALS_DATASETS)
+    assert results["MSFT"]["rsi"] == 1
+    # One write per table, covering every symbol
+    assert sorted(saved) == sorted(
+        [(t, 2) for t in {"massive_balance_sheets", "massive_cash_flow_statements", "massive_income_statements",
+                           "massive_financial_ratios", "massive_short_interest", "massive_short_volume"}]
+        + [("massive_technical_indicators", 8)]
+    )
@@ -0,0 +1,107 @@
+"""
+Portfolio Analysis Service Tests
+One market context, one bars query and one signal_history insert per portfolio analysis
+"""
+import time
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+import app.services.portfolio_analysis_service as portfolio_analysis
+from app.services.portfolio_analysis_service import PortfolioAnalysisService, symbol_inputs
+from app.signal_engines.base import MarketContext, MarketRegime
+
+TARGET = date(2026, 3, 2)
+
+
+def _bars(symbol, days=30, base=100.0, drift=0.4, indicators_from=0):
+    bars = []
+    for n in range(days):
+        close = base + drift * n + (1.5 if n % 3 == 0 else -1.0)
+        bars.append({
+            "symbol": symbol, "date": TARGET - timedelta(days=days - 1 - n), "close": close,
+            "volume": 1_000_000 + 10_000 * n, "has_indicators": n >= indicators_from,
+            "rsi_14": 55.0, "sma_50": base, "ema_20": base + drift * n * 0.8, "macd": 0.6, "macd_signal": 0.4,
+        })
+    return bars
+
+
+def test_symbol_inputs_match_the_universal_endpoint_definitions():
+    bars = _bars("AAPL")
+    inputs = symbol_inputs(bars)
+    closes = pd.Series([bar["close"] for bar in bars])
+
+    assert inputs["close"] == bars[-1]["close"]
+    assert inputs["volatility"] == pytest.approx(closes.pct_change().std() * 100)
+    assert inputs["recent_change"] == pytest.approx((closes.iloc[-1] - closes.iloc[-4]) / closes.iloc[-4] * 100)
+    assert inputs["avg_volume_20d"] == pytest.approx(sum(bar["volume"] for bar in bars[-21:]) / 21)
+    assert inputs["ema_slope"] == pytest.approx(bars[-1]["ema_20"] - bars[-2]["ema_20"])
+
+    # Too little history: endpoint defaults; no indicator rows: nothing to evaluate
+    assert symbol_inputs(bars[-3:])["volatility"] == portfolio_analysis.DEFAULT_VOLATILITY
+    assert symbol_inputs(_bars("NEW", indicators_from=30)) is None
+
+
+def test_fifty_holdings_are_analyzed_as_one_batch(monkeypatch):
+    holdings = [(f"S{i:02d}", "3x_etf" if i % 5 == 0 else "stock") for i in range(50)]
+    fake_db = MagicMock()
+    fake_db.execute_query.return_value = [
+        bar for i, (symbol, _) in enumerate(holdings[:-1]) for bar in _bars(symbol, drift=0.2 * (i % 7 - 3))
+    ]
+    fake_db.execute_update.return_value = 49
+    monkeypatch.setattr(portfolio_analysis, "db", fake_db)
+    context_service = MagicMock()
+    context_service.get_market_context.return_value = MarketContext(
+        regime=MarketRegime.BULL, regime_confidence=0.8, vix=17.5, nasdaq_trend="bullish"
+    )
+
+    start = time.perf_counter()
+    analysis = PortfolioAnalysisService(context_service).analyze_holdings(holdings, TARGET, portfolio_id=7, user_id=3)
+    assert time.perf_counter() - start < 1.0
+
+    context_service.get_market_context.assert_called_once_with(as_of=TARGET)
+    assert fake_db.execute_query.call_count == 1
+    assert sorted(fake_db.execute_query.call_args[0][1]["symbols"]) == [symbol for symbol, _ in holdings]
+
+    assert len(analysis["results"]) == 49 and list(analysis["errors"]) == ["S49"]
+    assert analysis["market_context"] == {
+        "vix_level": 17.5, "nasdaq_trend": "bullish", "regime": "BULL", "regime_confidence": 0.8
+    }
+
+    fake_db.execute_update.assert_called_once()
+    query, params = fake_db.execute_update.call_args[0]
+    assert query.count(":symbol_") == 49
+    assert params["symbol_0"] == "S00" and params["portfolio_id_0"] == 7 and params["vix_level_12"] == 17.5
+    assert params["signal_type_3"] == analysis["results"][3]["signal"]
+
+
+def test_a_rejected_signal_history_row_only_costs_its_own_history(monkeypatch):
+    holdings = [("AAPL", "stock"), ("MOON", "stock"), ("MSFT", "stock")]
+    fake_db = MagicMock()
+    bars = [bar for symbol, _ in holdings for bar in _bars(symbol)]
+    bars[59]["close"] *= 20  # MOON's last close
+    fake_db.execute_query.return_value = bars
+
+    def insert(query, params):
+        if "symbol_1" in params or params["symbol_0"] == "MSFT":
+            raise RuntimeError("violates foreign key constraint on symbol_master")
+        return 1
+
+    fake_db.execute_update.side_effect = insert
+    monkeypatch.setattr(portfolio_analysis, "db", fake_db)
+    context_service = MagicMock()
+    context_service.get_market_context.return_value = MarketContext(
+        regime=MarketRegime.BULL, regime_confidence=0.8, vix=17.5, nasdaq_trend="bullish"
+    )
+
+    analysis = PortfolioAnalysisService(context_service).analyze_holdings(holdings, TARGET)
+
+    # Bulk insert, then one insert per row; every signal is still returned
+    assert fake_db.execute_update.call_count == 4
+    assert [result["symbol"] for result in analysis["results"]] == ["AAPL", "MOON", "MSFT"]
+    assert list(analysis["errors"]) == ["MSFT"]
+    # MOON's recent change does not fit DECIMAL(5,2) and is clamped rather than rejected
+    moon = fake_db.execute_update.call_args_list[2][0][1]
+    assert moon["symbol_0"] == "MOON" and moon["recent_change_0"] == 999.99
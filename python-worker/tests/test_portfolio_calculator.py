@@ -0,0 +1,68 @@
+"""
+Portfolio Calculator Tests
+Holding metrics of every portfolio are recomputed by one set-based UPDATE from stored prices and fundamentals
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.services.portfolio_calculator as portfolio_calculator
+import app.workflows.eod_workflow as eod_workflow
+from app.services.portfolio_calculator import PortfolioCalculatorService
+
+
+@pytest.fixture
+def calculator(monkeypatch):
+    fake_db = MagicMock()
+    fake_db.execute_update.return_value = 3
+    monkeypatch.setattr(portfolio_calculator, "db", fake_db)
+    monkeypatch.setattr(portfolio_calculator, "get_data_source", MagicMock())
+    return PortfolioCalculatorService(), fake_db
+
+
+def test_holdings_are_updated_by_one_statement(calculator):
+    service, fake_db = calculator
+
+    assert service.update_holdings(["p1", "p2"]) == 3
+    fake_db.execute_update.assert_called_once()
+    fake_db.execute_query.assert_not_called()
+    query, params = fake_db.execute_update.call_args[0]
+    assert params == {"portfolio_ids": ["p1", "p2"]} and "ANY(:portfolio_ids)" in query
+    assert "PARTITION BY o.portfolio_id" in query
+    assert "WHEN market_cap >= 200000000000 THEN 'mega'" in query and "THEN 'micro'" in query
+    # Prices and fundamentals come from stored snapshots, not one provider call per holding
+    service.data_source.fetch_current_price.assert_not_called()
+    service.data_source.fetch_fundamentals.assert_not_called()
+
+    fake_db.execute_update.reset_mock()
+    service.update_holdings()
+    query, params = fake_db.execute_update.call_args[0]
+    assert params == {} and ":portfolio_ids" not in query
+
+    fake_db.execute_update.reset_mock()
+    assert service.update_holdings([]) == 0 and service.update_portfolio_holdings("p1") == 3
+    assert fake_db.execute_update.call_args[0][1] == {"portfolio_ids": ["p1"]}
+
+
+def test_market_cap_categories_share_the_sql_tiers(calculator):
+    service, _ = calculator
+    categories = [service._get_market_cap_category(cap) for cap in (0, 5e7, 3e8, 2e9, 5e10, 3e12)]
+    assert categories == [None, 'micro', 'small', 'mid', 'large', 'mega']
+
+
+def test_eod_updates_all_affected_portfolios_at_once(monkeypatch):
+    calculators = []
+    monkeypatch.setattr(portfolio_calculator, "PortfolioCalculatorService",
+                        lambda: calculators.append(MagicMock()) or calculators[-1])
+    monkeypatch.setattr("app.services.watchlist_calculator.WatchlistCalculatorService", MagicMock)
+    workflow = eod_workflow.EODWorkflow.__new__(eod_workflow.EODWorkflow)
+    monkeypatch.setattr(workflow, "_get_portfolios_holding", lambda symbols: [{"portfolio_id": "p1"}, {"portfolio_id": "p2"}])
+    monkeypatch.setattr(workflow, "_get_watchlists_containing", lambda symbols: [])
+
+    result = workflow._update_portfolios_and_watchlists(["AAPL"])
+
+    calc = calculators[0]
+    calc.update_holdings.assert_called_once_with(["p1", "p2"])
+    calc.update_portfolio_holdings.assert_not_called()
+    assert calc.calculate_portfolio_performance.call_count == 2
+    assert result == {"portfolios_updated": 2, "watchlists_updated": 0}
@@ -0,0 +1,137 @@
+"""
+Quota-Aware Refresh Planner Tests
+Daily quotas are paced and the refresh set favors high-priority, stale symbols
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.data_management.refresh_planner import (
+    PRIORITY_HOLDING,
+    PRIORITY_UNIVERSE,
+    ProviderBudget,
+    RefreshPlanner,
+    compute_cycle_budget,
+    provider_for_source,
+)
+from app.data_management.refresh_strategy import DataType
+
+NOW = datetime(2026, 3, 2, 12, 0, 0)  # halfway through the day
+
+
+class FakeLedger:
+    def __init__(self, used=0):
+        self.used = used
+        self.synced = []
+
+    def sync(self, today):
+        self.synced.append(today)
+        return 0
+
+    def used_today(self, providers, today):
+        return {p: self.used for p in providers}
+
+
+class FakeManager:
+    def __init__(self, source_name, last_refresh):
+        self.data_source = SimpleNamespace(name=source_name)
+        self.last_refresh = last_refresh
+        self.lookups = []
+
+    def last_refresh_times(self, symbols, data_types):
+        self.lookups.append((list(symbols), list(data_types)))
+        return {(s, dt): self.last_refresh.get((s, dt)) for s in symbols for dt in data_types}
+
+
+def test_provider_for_source_maps_composite_names():
+    assert provider_for_source("fmp+yahoo_finance") == "fmp"
+    assert provider_for_source("fallback") == "yahoo_finance"
+    assert provider_for_source("alphavantage") == "alphavantage"
+
+
+def test_cycle_budget_follows_daily_burn_line():
+    budget = ProviderBudget(provider="fmp", per_minute=60.0, per_day=240, used_today=100)
+    # Halfway through the day with a 10% burst: 240 * 0.6 = 144 allowed, 44 left
+    assert compute_cycle_budget(budget, NOW, 1.0, 0.1) == 44
+
+    # Calls planned earlier in the cycle may not be in the ledger yet
+    budget.cycle_planned = 40
+    assert compute_cycle_budget(budget, NOW, 1.0, 0.1) == 4
+    budget.cycle_planned = 0
+
+    # Ahead of the burn line: nothing to spend until the line catches up
+    budget.used_today = 200
+    assert compute_cycle_budget(budget, NOW, 1.0, 0.1) == 0
+
+    # Per-minute limit caps the cycle when the daily quota has room
+    budget.used_today = 0
+    assert compute_cycle_budget(budget, NOW, 0.5, 0.1) == 30
+
+    assert compute_cycle_budget(ProviderBudget("yahoo_finance", None, None), NOW, 1.0, 0.1) is None
+
+
+def test_plan_prefers_holdings_within_budget(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "fmp_daily_quota", 10)
+    monkeypatch.setattr(settings, "refresh_quota_burst_fraction", 0.0)
+
+    fresh = NOW - timedelta(minutes=5)
+    manager = FakeManager("fmp", {
+        ("AAPL", DataType.PRICE_CURRENT): NOW - timedelta(hours=2),
+        ("ZZZ", DataType.PRICE_CURRENT): NOW - timedelta(hours=2),
+        ("MSFT", DataType.PRICE_CURRENT): fresh,
+        ("MSFT", DataType.NEWS): fresh,
+    })
+    planner = RefreshPlanner(
+        manager,
+        intervals={DataType.PRICE_CURRENT: timedelta(minutes=15), DataType.NEWS: timedelta(hours=1)},
+        ledger=FakeLedger(used=3),  # burn line allows 5 by noon -> 2 calls this cycle
+        cycle_minutes=1.0,
+        max_items=10,
+        clock=lambda: NOW,
+    )
+    plan = planner.plan(symbol_priorities={"AAPL": PRIORITY_HOLDING, "MSFT": PRIORITY_HOLDING, "ZZZ": PRIORITY_UNIVERSE})
+
+    planned = [(i.symbol, i.data_type) for i in plan.items]
+    assert planned[0] == ("AAPL", DataType.PRICE_CURRENT)
+    assert len(planned) == 2
+    assert ("MSFT", DataType.PRICE_CURRENT) not in planned  # refreshed 5 minutes ago
+    assert plan.budgets["fmp"].cycle_budget == 2
+    assert plan.budgets["fmp"].to_dict()["projected_used_today"] == 5
+    assert plan.deferred and all(i not in plan.items for i in plan.deferred)
+    assert planner.last_plan is plan
+    # The burn line allows a 6th call at 14:24 (0.6 of the day)
+    assert plan.retry_after_seconds == 2.4 * 3600
+
+
+def test_per_minute_cap_is_granted_once_per_cycle(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "fmp_rate_limit_calls", 3)
+    monkeypatch.setattr(settings, "fmp_rate_limit_window", 60)
+    monkeypatch.setattr(settings, "fmp_daily_quota", 10_000)
+
+    planner = RefreshPlanner(FakeManager("fmp", {}), ledger=FakeLedger(), cycle_minutes=1.0, max_items=10, clock=lambda: NOW)
+    batch = lambda *symbols: [planner.candidate(s, DataType.PRICE_CURRENT, PRIORITY_HOLDING, 2.0) for s in symbols]
+
+    # Due batches dispatched within one cycle share its 3 calls
+    assert len(planner.select(batch("A", "B"), NOW).items) == 2
+    second = planner.select(batch("C", "D"), NOW + timedelta(seconds=20))
+    assert [i.symbol for i in second.items] == ["C"] and second.budgets["fmp"].cycle_budget == 1
+    assert planner.select(batch("E"), NOW + timedelta(seconds=40)).items == []
+
+    # The next cycle gets a fresh per-minute allowance
+    assert len(planner.select(batch("E", "F"), NOW + timedelta(seconds=60)).items) == 2
+
+
+def test_dry_run_plans_without_writing_quota_usage(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "fmp_daily_quota", 10_000)
+
+    ledger = FakeLedger()
+    planner = RefreshPlanner(FakeManager("fmp", {}), intervals={DataType.NEWS: timedelta(hours=1)},
+                             ledger=ledger, cycle_minutes=1.0, max_items=10, clock=lambda: NOW)
+    plan = planner.plan(symbol_priorities={"AAPL": PRIORITY_HOLDING}, dry_run=True)
+
+    assert [i.symbol for i in plan.items] == ["AAPL"]
+    assert ledger.synced == [] and planner.last_plan is None
+    # Nothing was charged to the worker's cycle
+    assert planner.select([planner.candidate("AAPL", DataType.NEWS, PRIORITY_HOLDING, 2.0)]).budgets["fmp"].cycle_planned == 0
@@ -0,0 +1,134 @@
+"""
+Refresh Scheduler Tests
+Heap of next-due times per (symbol, data type) for the periodic worker
+"""
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.data_management.refresh_planner import PRIORITY_HOLDING, PRIORITY_UNIVERSE, RefreshPlanner
+from app.data_management.refresh_strategy import DataType, RefreshMode
+from app.workers.periodic_worker import PeriodicWorker
+from app.workers.refresh_scheduler import RefreshScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_pops_due_entries_in_due_order():
+    clock = FakeClock()
+    scheduler = RefreshScheduler(jitter_fraction=0.0, clock=clock)
+    scheduler.schedule("MSFT", DataType.NEWS, timedelta(hours=1), delay=30)
+    scheduler.schedule("AAPL", DataType.PRICE_CURRENT, timedelta(minutes=15), delay=10)
+    scheduler.schedule("TSLA", DataType.EARNINGS, timedelta(hours=6), delay=600)
+
+    assert scheduler.next_due(timeout=0) == []
+    assert scheduler.seconds_until_next() == 10
+
+    clock.now += 60
+    due = scheduler.next_due(timeout=0)
+    assert [(e.symbol, e.data_type) for e in due] == [("AAPL", DataType.PRICE_CURRENT), ("MSFT", DataType.NEWS)]
+
+
+def test_reschedule_replaces_and_jitters_next_due():
+    clock = FakeClock()
+    scheduler = RefreshScheduler(jitter_fraction=0.1, clock=clock, rng=random.Random(7))
+    scheduler.schedule("AAPL", DataType.PRICE_CURRENT, timedelta(minutes=15))
+    # Re-scheduling a key replaces its entry instead of adding a second one
+    scheduler.schedule("AAPL", DataType.PRICE_CURRENT, timedelta(minutes=15), delay=5)
+    assert len(scheduler) == 1
+
+    clock.now += 5
+    (entry,) = scheduler.next_due(timeout=0)
+    assert ("AAPL", DataType.PRICE_CURRENT) in scheduler  # registered while running
+
+    scheduler.reschedule(entry)
+    assert 810 <= scheduler.seconds_until_next() <= 990  # 900s +/- 10%
+    # A stale handle (already re-inserted) is ignored
+    assert scheduler.reschedule(entry) is None
+
+    scheduler.unschedule("AAPL")
+    assert len(scheduler) == 0
+    assert scheduler.seconds_until_next() is None
+
+
+def test_next_due_wakes_for_earlier_entry_and_stop():
+    scheduler = RefreshScheduler(jitter_fraction=0.0)
+    scheduler.schedule("SLOW", DataType.NEWS, timedelta(hours=1), delay=3600)
+    results = []
+
+    def consume():
+        results.append(scheduler.next_due(timeout=5))
+        results.append(scheduler.next_due(timeout=5))
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    time.sleep(0.05)
+    scheduler.schedule("FAST", DataType.PRICE_CURRENT, timedelta(minutes=1), delay=0)
+    time.sleep(0.05)
+    scheduler.stop()
+    thread.join(timeout=2)
+
+    assert [e.symbol for e in results[0]] == ["FAST"]
+    assert results[1] == []
+
+
+class NoUsageLedger:
+    def sync(self, today):
+        return 0
+
+    def used_today(self, providers, today):
+        return {p: 0 for p in providers}
+
+
+def _worker(clock):
+    worker = PeriodicWorker.__new__(PeriodicWorker)
+    worker.scheduler = RefreshScheduler(jitter_fraction=0.0, clock=clock)
+    worker._legacy_window_end, worker._legacy_counts = 0.0, {}
+    return worker
+
+
+def test_planner_ranks_every_due_entry_and_defers_the_rest(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "fmp_rate_limit_calls", 2)
+    monkeypatch.setattr(settings, "fmp_rate_limit_window", 60)
+    monkeypatch.setattr(settings, "fmp_daily_quota", 100_000)
+
+    clock = FakeClock()
+    worker = _worker(clock)
+    worker.planner = RefreshPlanner(
+        SimpleNamespace(data_source=SimpleNamespace(name="fmp")), ledger=NoUsageLedger(),
+        cycle_minutes=1.0, max_items=10, clock=datetime.now,
+    )
+    # Screener-only names came due first; holdings later in the same cycle
+    for n, symbol in enumerate(["U1", "U2", "U3"]):
+        worker.scheduler.schedule(symbol, DataType.NEWS, timedelta(hours=1), delay=n, priority=PRIORITY_UNIVERSE)
+    for symbol in ["H1", "H2"]:
+        worker.scheduler.schedule(symbol, DataType.NEWS, timedelta(hours=1), delay=10, priority=PRIORITY_HOLDING)
+    clock.now += 30
+
+    to_run = worker._plan(worker.scheduler.next_due(timeout=0))
+    assert sorted(entry.symbol for entry in to_run) == ["H1", "H2"]
+    # The deferred names wait for the next cycle instead of cycling back every pass
+    assert len(worker.scheduler) == 5 and 0 < worker.scheduler.seconds_until_next() <= 60
+
+
+def test_legacy_caps_apply_when_the_planner_is_off():
+    clock = FakeClock()
+    worker = _worker(clock)
+    for n in range(12):
+        worker.scheduler.schedule(f"S{n}", DataType.NEWS, timedelta(hours=1))
+    for n in range(7):
+        worker.scheduler.schedule(f"L{n}", DataType.PRICE_CURRENT, timedelta(minutes=1), mode=RefreshMode.LIVE)
+
+    to_run = worker._cap_legacy(worker.scheduler.next_due(timeout=0))
+    assert sum(entry.mode == RefreshMode.PERIODIC for entry in to_run) == 10
+    assert sum(entry.mode == RefreshMode.LIVE for entry in to_run) == 5
+    assert worker.scheduler.seconds_until_next() == 60
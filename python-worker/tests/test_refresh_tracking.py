@@ -0,0 +1,72 @@
+"""
+Refresh Tracking Store Tests
+Cycle state is preloaded in one query and updates are flushed as one upsert
+"""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.data_management import refresh_tracking
+from app.data_management.refresh_tracking import RefreshTrackingStore, retry_delay
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    fake.execute_query.return_value = [
+        {"symbol": "AAPL", "dataset": "news", "interval": "daily", "last_success_at": datetime(2026, 1, 2)},
+    ]
+    monkeypatch.setattr(refresh_tracking, "db", fake)
+    return fake
+
+
+def test_preload_uses_one_query_and_caches_missing_rows(fake_db):
+    store = RefreshTrackingStore()
+    keys = [(sym, "news", "daily") for sym in ("AAPL", "MSFT", "NVDA")]
+
+    assert store.preload(keys) == 3
+    assert fake_db.execute_query.call_count == 1
+    assert store.lookup(("AAPL", "news", "daily")) == (True, datetime(2026, 1, 2))
+    assert store.lookup(("MSFT", "news", "daily")) == (True, None)
+    assert store.lookup(("TSLA", "news", "daily")) == (False, None)
+
+    # Already loaded keys are not queried again
+    assert store.preload(keys, only_missing=True) == 0
+    assert fake_db.execute_query.call_count == 1
+
+
+def test_flush_writes_all_pending_updates_in_one_statement(fake_db):
+    store = RefreshTrackingStore()
+    store.record(("AAPL", "news", "daily"), source="fmp", status="success")
+    store.record(("MSFT", "news", "daily"), source="fmp", status="failed", error="timeout")
+    store.record(("MSFT", "news", "daily"), source="fmp", status="failed", error="timeout again")
+
+    assert store.pending_count() == 2
+    assert store.flush() == 2
+    assert fake_db.execute_update.call_count == 1
+
+    query, params = fake_db.execute_update.call_args[0]
+    assert "ON CONFLICT (symbol, dataset, interval)" in query
+    rows = {params[f"symbol_{i}"]: i for i in range(2)}
+    msft = rows["MSFT"]
+    assert params[f"retry_count_{msft}"] == 2
+    assert params[f"error_{msft}"] == "timeout again"
+    assert params[f"retry_count_{rows['AAPL']}"] == 0
+    assert params[f"cursor_ts_{rows['AAPL']}"] is None
+    assert store.pending_count() == 0
+    assert store.flush() == 0
+
+
+def test_memory_is_bounded():
+    store = RefreshTrackingStore(max_entries=2)
+    for sym in ("A", "B", "C"):
+        store.remember((sym, "news", "daily"), None)
+    assert store.get_stats()["entries"] == 2
+    assert store.lookup(("A", "news", "daily"))[0] is False
+
+
+def test_retry_plan_is_staged():
+    assert retry_delay(0).total_seconds() == 6 * 3600
+    assert retry_delay(1).total_seconds() == 24 * 3600
+    assert retry_delay(5).total_seconds() == 48 * 3600
@@ -0,0 +1,118 @@
+"""
+Provider Response Cache Tests
+Covers TTL expiry, LRU eviction, disk tier persistence and the client decorator
+"""
+import pandas as pd
+
+from app.utils.response_cache import ResponseCache, cached_response, make_cache_key
+import app.utils.response_cache as response_cache_module
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_dataset_ttls_expire_independently():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.set("quote", "q", {"price": 1.0})
+    cache.set("fundamentals", "f", {"pe": 20})
+
+    clock.now += 60
+    assert cache.get("quote", "q") is None
+    assert cache.get("fundamentals", "f") == {"pe": 20}
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ResponseCache(max_entries=2, clock=FakeClock())
+    cache.set("news", "a", [1])
+    cache.set("news", "b", [2])
+    assert cache.get("news", "a") == [1]  # touch a
+    cache.set("news", "c", [3])
+
+    assert cache.get("news", "b") is None
+    assert cache.get("news", "a") == [1]
+    assert cache.get("news", "c") == [3]
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_cached_values_are_isolated_from_callers():
+    cache = ResponseCache(clock=FakeClock())
+    df = pd.DataFrame({"close": [1.0, 2.0]})
+    cache.set("price_data", "k", df)
+    df.loc[0, "close"] = 99.0
+
+    first = cache.get("price_data", "k")
+    first.loc[1, "close"] = -1.0
+    second = cache.get("price_data", "k")
+    assert list(second["close"]) == [1.0, 2.0]
+
+
+def test_none_and_empty_results_are_not_cached():
+    cache = ResponseCache(clock=FakeClock())
+    cache.set("quote", "none", None)
+    cache.set("price_data", "empty", pd.DataFrame())
+    # Clients return {} / [] on HTTP or parse errors
+    cache.set("symbol_details", "dict", {})
+    cache.set("news", "list", [])
+    # Error payloads and results with nothing in them
+    cache.set("fundamentals", "fmp-error", {"Error Message": "Limit Reach . Please upgrade your plan"})
+    cache.set("fundamentals", "av-throttle", {"Note": "Thank you for using Alpha Vantage! ..."})
+    cache.set("financial_statements", "wrapped", {"symbol": "AAPL", "income_statement": [], "error": "429"})
+    cache.set("financial_statements", "blank", {"income_statement": [], "balance_sheet": [{}], "cash_flow": []})
+    cache.set("fundamentals", "no-values", {"peRatio": None, "pbRatio": None})
+    assert len(cache) == 0
+
+    cache.set("industry_peers", "ok", {"symbol": "AAPL", "peers": [], "error": None})
+    cache.set("earnings", "zero", [{"eps": 0.0}])
+    assert len(cache) == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    clock = FakeClock()
+    ResponseCache(disk_dir=str(tmp_path), clock=clock).set("symbol_details", "AAPL", {"name": "Apple"})
+    ResponseCache(disk_dir=str(tmp_path), clock=clock).set("quote", "AAPL:quote", {"price": 1.0})
+
+    restarted = ResponseCache(disk_dir=str(tmp_path), clock=clock)
+    assert restarted.get("symbol_details", "AAPL") == {"name": "Apple"}
+    assert restarted.get("quote", "AAPL:quote") is None  # too short-lived for disk
+    assert restarted.get_stats()["disk_hits"] == 1
+
+    clock.now += 8 * 24 * 3600
+    assert ResponseCache(disk_dir=str(tmp_path), clock=clock).get("symbol_details", "AAPL") is None
+
+
+def test_cached_response_decorator_dedupes_identical_calls(monkeypatch):
+    cache = ResponseCache(clock=FakeClock())
+    monkeypatch.setattr(response_cache_module, "_response_cache", cache)
+
+    class Client:
+        cache_namespace = "fake"
+
+        def __init__(self):
+            self.calls = 0
+
+        @cached_response("fundamentals")
+        def fetch_fundamentals(self, symbol: str, **kwargs):
+            self.calls += 1
+            return {"symbol": symbol, **kwargs}
+
+    client = Client()
+    assert client.fetch_fundamentals("NVDA", period="annual") == {"symbol": "NVDA", "period": "annual"}
+    assert client.fetch_fundamentals("NVDA", period="annual") == {"symbol": "NVDA", "period": "annual"}
+    client.fetch_fundamentals("NVDA", period="quarter")
+    assert client.calls == 2
+    assert cache.get_stats()["datasets"]["fundamentals"] == {"misses": 2, "hits": 1}
+
+
+def test_make_cache_key_is_order_independent_for_kwargs():
+    assert make_cache_key("fmp", "m", ("A",), {"x": 1, "y": 2}) == make_cache_key("fmp", "m", ("A",), {"y": 2, "x": 1})
@@ -0,0 +1,136 @@
+"""
+Screener Engine Tests
+Screens run as boolean masks over an in-memory feature matrix that refreshes by atomic swap
+"""
+import threading
+import time
+from datetime import date
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+import app.services.screener_engine as screener_engine
+from app.exceptions import ValidationError
+from app.services.screener_engine import FeatureMatrix, ScreenerEngine
+from app.services.stock_screener_service import StockScreenerService
+
+
+def _row(symbol, price, sma50, sma200, rsi, signal=None, confidence=None, eps=(1.0,) * 8, **extra):
+    row = {
+        "symbol": symbol, "sector": "Technology", "market_cap": 2e11, "date": date(2026, 3, 2),
+        "close_price": price, "sma_20": sma50, "sma_50": sma50, "sma_200": sma200, "rsi_14": rsi,
+        "sma_20_prev": sma50, "sma_50_prev": sma50, "sma_200_prev": sma200 and sma200 * 0.99,
+        "revenue_growth_yoy": 0.30, "net_margin": 0.25, "debt_to_equity": 0.5,
+        "ttm_eps": sum(eps[:4]), "ttm_quarters": len(eps[:4]),
+        "prior_ttm_eps": sum(eps[4:]), "prior_quarters": len(eps[4:]),
+        "signal": signal, "confidence": confidence,
+    }
+    row.update(extra)
+    return row
+
+
+ROWS = [
+    # Exponential grower in a bullish regime, P/E 240 / (4 * 3.0) = 20
+    _row("NVDA", 240.0, 220.0, 180.0, 62.0, "buy", 0.82, eps=(3.0,) * 4 + (1.5,) * 4),
+    # Pulled back below both averages, oversold, slower EPS growth
+    _row("AAPL", 150.0, 170.0, 160.0, 28.0, "BUY", 0.64, eps=(1.6,) * 4 + (1.5,) * 4),
+    # Loss-making: no P/E, no fundamentals flags
+    _row("LCID", 3.0, 4.0, 5.0, 35.0, "SELL", 0.71, eps=(-0.3,) * 8, net_margin=-1.2),
+    # Newly listed: no prices or indicators yet
+    _row("ASTL", None, None, None, None, ttm_quarters=0, prior_quarters=0, ttm_eps=None, prior_ttm_eps=None),
+]
+
+
+def test_features_are_derived_once_per_refresh():
+    matrix = FeatureMatrix.from_rows(list(reversed(ROWS)))
+    assert list(matrix.symbols) == ["AAPL", "ASTL", "LCID", "NVDA"]
+
+    nvda = matrix.row(3)
+    assert nvda["fundamentals"]["pe_ratio"] == pytest.approx(20.0)
+    assert nvda["signal"] == "BUY" and nvda["long_term_trend"] == "bullish"
+    assert nvda["is_exponential_growth"] and nvda["has_good_fundamentals"]
+    assert nvda["price_below_sma50"] is False
+
+    aapl = matrix.row(0)
+    assert aapl["price_below_sma50"] and aapl["price_below_sma200"]
+    assert aapl["discount_from_sma50_pct"] == pytest.approx((170 - 150) / 170 * 100)
+
+    lcid = matrix.row(2)
+    assert "pe_ratio" not in lcid["fundamentals"] and not lcid["has_good_fundamentals"]
+    assert lcid["long_term_trend"] == "neutral"  # SMA200 rising while price is below it
+
+    astl = matrix.row(1)
+    assert astl["current_price"] is None and astl["long_term_trend"] == "neutral"
+    assert "discount_from_sma50_pct" not in astl
+
+
+def test_filters_combine_as_masks_and_rank_top_k():
+    matrix = FeatureMatrix.from_rows(ROWS)
+    symbols = lambda **criteria: list(matrix.symbols[matrix.top_k(matrix.mask(**criteria), 10)])
+
+    assert symbols() == ["AAPL", "ASTL", "LCID", "NVDA"]
+    assert symbols(signal="buy", min_confidence_score=0.7) == ["NVDA"]
+    assert symbols(max_pe_ratio=30) == ["AAPL", "NVDA"]  # no P/E never passes a P/E bound
+    assert symbols(price_below_sma200=True, max_rsi=30) == ["AAPL"]
+    assert symbols(trend_filter="bullish", is_exponential_growth=True) == ["NVDA"]
+    assert symbols(symbols=["LCID", "NVDA", "MSFT"], min_market_cap=1e11) == ["LCID", "NVDA"]
+
+    everything = np.ones(len(matrix), dtype=bool)
+    ranked = matrix.top_k(everything, 2, sort_by="confidence_score")
+    assert list(matrix.symbols[ranked]) == ["NVDA", "LCID"]
+    # Missing values rank last
+    assert matrix.symbols[matrix.top_k(everything, 4, sort_by="rsi")][-1] == "ASTL"
+
+
+def test_engine_serves_the_current_snapshot_while_refreshing(monkeypatch):
+    loads = []
+
+    def loader(generation):
+        loads.append(generation)
+        return FeatureMatrix.from_rows(ROWS[: len(loads) + 1], generation=generation)
+
+    engine = ScreenerEngine(loader=loader, max_age_seconds=3600)
+    first = engine.matrix()
+    assert len(first) == 2 and engine.matrix() is first
+
+    started = []
+    monkeypatch.setattr(engine, "_refresh_in_background", lambda: started.append(engine.refresh()))
+    engine.invalidate()
+    # The stale snapshot is returned; its replacement is swapped in for the next screen
+    assert engine.matrix() is first
+    assert loads == [0, 1] and engine.matrix() is started[0] and len(started[0]) == 3
+
+    service = StockScreenerService(engine=engine)
+    result = service.screen_stocks(signal="BUY", sort_by="confidence_score", limit=5)
+    assert [s["symbol"] for s in result["stocks"]] == ["NVDA", "AAPL"]
+    assert result["criteria"]["signal"] == "BUY" and result["criteria"]["symbols"] is None
+    with pytest.raises(ValidationError):
+        service.screen_stocks(sort_by="volume")
+
+
+def test_concurrent_cold_starts_share_one_load():
+    loads = []
+
+    def loader(generation):
+        loads.append(generation)
+        time.sleep(0.05)
+        return FeatureMatrix.from_rows(ROWS, generation=generation)
+
+    engine = ScreenerEngine(loader=loader, max_age_seconds=3600)
+    matrices = []
+    threads = [threading.Thread(target=lambda: matrices.append(engine.matrix())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+
+    assert loads == [0] and len(matrices) == 5 and all(m is matrices[0] for m in matrices)
+
+
+def test_load_is_one_query(monkeypatch):
+    fake = MagicMock()
+    fake.execute_query.return_value = ROWS
+    monkeypatch.setattr(screener_engine, "db", fake)
+    matrix = screener_engine.load_feature_matrix(generation=7)
+    assert fake.execute_query.call_count == 1 and len(matrix) == 4 and matrix.generation == 7
@@ -0,0 +1,51 @@
+"""
+Shared Data Source Registry Tests
+One source instance, HTTP pool and rate limiter per provider for the whole process
+"""
+import app.data_sources as data_sources
+from app.config import settings
+from app.utils.http_session import close_http_sessions, get_http_session
+from app.utils.rate_limiter import get_rate_limiter
+
+
+def test_get_data_source_returns_one_instance_per_config(monkeypatch):
+    built = []
+
+    def fake_build(name, use_fallback):
+        built.append((name, use_fallback))
+        return object()
+
+    monkeypatch.setattr(data_sources, "_build_data_source", fake_build)
+    data_sources.reset_data_sources()
+    try:
+        first = data_sources.get_data_source("yahoo_finance", use_fallback=False)
+        assert data_sources.get_data_source("yahoo_finance", use_fallback=False) is first
+        assert built == [("yahoo_finance", False)]
+
+        # A config change produces a new instance instead of reusing a stale one
+        monkeypatch.setattr(settings, "fmp_timeout", settings.fmp_timeout + 1)
+        data_sources.get_data_source("fmp", use_fallback=False)
+        monkeypatch.setattr(settings, "fmp_timeout", settings.fmp_timeout + 1)
+        data_sources.get_data_source("fmp", use_fallback=False)
+        assert built.count(("fmp", False)) == 2
+    finally:
+        data_sources.reset_data_sources()
+
+
+def test_http_sessions_are_pooled_per_provider():
+    close_http_sessions()
+    try:
+        session = get_http_session("finnhub", pool_maxsize=16)
+        assert get_http_session("finnhub") is session
+        assert get_http_session("fmp") is not session
+        assert session.get_adapter("https://finnhub.io")._pool_maxsize == 16
+    finally:
+        close_http_sessions()
+
+
+def test_rate_limiter_is_shared_per_provider_budget():
+    limiter = get_rate_limiter("TestProvider", 5, 60)
+    assert get_rate_limiter("TestProvider", 5, 60) is limiter
+    # One provider, one bucket: conflicting limits keep the stricter rate
+    assert get_rate_limiter("TestProvider", 10, 60) is limiter and limiter.max_calls == 5
+    assert get_rate_limiter("TestProvider", 2, 60) is limiter and limiter.max_calls == 2
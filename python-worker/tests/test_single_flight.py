@@ -0,0 +1,118 @@
+"""
+Single-Flight Coalescing Tests
+Concurrent identical calls (threads and asyncio) must hit the provider once
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight("test_flight")
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"price": 123.0}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "yahoo:fetch_current_price('NVDA')", slow_fetch) for _ in range(8)]
+        while flight.get_stats()["coalesced"] < 7:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r == {"price": 123.0} for r in results)
+    stats = flight.get_stats()
+    assert stats["executed"] == 1
+    assert stats["coalesced"] == 7
+    assert stats["in_flight"] == 0
+
+
+def test_leader_mutation_does_not_leak_to_followers():
+    flight = SingleFlight("test_flight")
+    produced = []
+    release = threading.Event()
+
+    def slow_fetch():
+        produced.append({"price": 123.0})
+        release.wait(2)
+        return produced[0]
+
+    def call_and_mutate():
+        result = flight.do("k", slow_fetch)
+        result["price"] = -1.0
+        return result
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(call_and_mutate) for _ in range(4)]
+        while flight.get_stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert produced[0] == {"price": 123.0}
+    assert len({id(r) for r in results}) == 4
+    assert all(r is not produced[0] for r in results)
+
+
+def test_followers_receive_leader_exception():
+    flight = SingleFlight("test_flight")
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_fetch():
+        started.set()
+        release.wait(2)
+        raise ValueError("provider down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", failing_fetch)
+        started.wait(2)
+        follower = pool.submit(flight.do, "k", failing_fetch)
+        while flight.get_stats()["coalesced"] < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert flight.get_stats()["errors"] == 1
+
+
+def test_reentrant_call_from_leader_does_not_deadlock():
+    flight = SingleFlight("test_flight")
+    assert flight.do("k", lambda: flight.do("k", lambda: 42)) == 42
+
+
+def test_async_callers_share_one_call():
+    flight = SingleFlight("test_flight")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [1, 2, 3]
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("fmp:fetch_fundamentals('NVDA')", fetch) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [[1, 2, 3]] * 5
+    assert flight.get_stats()["coalesced"] == 4
+
+
+def test_distinct_keys_are_not_coalesced():
+    flight = SingleFlight("test_flight")
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.get_stats()["executed"] == 2
@@ -0,0 +1,129 @@
+"""
+Workflow Gate Tests
+check_many() evaluates a whole stage with a fixed number of queries and per-symbol results
+"""
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import app.workflows.gates as gates
+from app.workflows.gates import DataIngestionGate, GateResult, IndicatorComputationGate
+from app.workflows.orchestrator import WorkflowOrchestrator
+
+
+def fake_db(monkeypatch, responses):
+    fake = MagicMock()
+    fake.execute_query.side_effect = lambda query, params: responses(query, params)
+    monkeypatch.setattr(gates, "db", fake)
+    return fake
+
+
+def test_ingestion_gate_checks_all_symbols_with_two_queries(monkeypatch):
+    today = date.today()
+
+    def responses(query, params):
+        if "raw_market_data" in query:
+            return [
+                {"stock_symbol": "AAPL", "count": 300, "latest_date": today.isoformat()},
+                {"stock_symbol": "MSFT", "count": 300, "latest_date": today},
+                {"stock_symbol": "OLD", "count": 300, "latest_date": today - timedelta(days=30)},
+                {"stock_symbol": "NOVAL", "count": 10, "latest_date": today},
+            ]
+        assert "ROW_NUMBER() OVER (PARTITION BY symbol" in query
+        return [
+            {"symbol": "AAPL", "overall_status": "pass", "critical_issues": 0, "warnings": 0, "rows_dropped": 0},
+            {"symbol": "MSFT", "overall_status": "fail", "critical_issues": 2, "warnings": 1, "rows_dropped": 5},
+            {"symbol": "OLD", "overall_status": "pass", "critical_issues": 0, "warnings": 0, "rows_dropped": 0},
+        ]
+
+    db = fake_db(monkeypatch, responses)
+    symbols = ["AAPL", "MSFT", "OLD", "NOVAL", "NONE"]
+    results = DataIngestionGate().check_many(symbols, today)
+
+    assert db.execute_query.call_count == 2
+    assert db.execute_query.call_args_list[0][0][1] == {"symbols": symbols}
+    assert results["AAPL"].passed and results["AAPL"].metadata == {"row_count": 300}
+    assert results["MSFT"].action == "FIX_DATA_QUALITY"
+    assert results["OLD"].action == "REFRESH_DATA"
+    assert results["NOVAL"].action == "VALIDATE_DATA"
+    assert results["NONE"].action == "RETRY_INGESTION"
+
+
+def test_indicator_gate_single_check_matches_batch(monkeypatch):
+    rows = [
+        {"stock_symbol": "AAPL", "ema9": 1.0, "sma50": 1.0, "sma200": 1.0, "rsi": 55.0, "macd": 0.2},
+        {"stock_symbol": "MSFT", "ema9": 1.0, "sma50": 1.0, "sma200": None, "rsi": 55.0, "macd": 0.2},
+        {"stock_symbol": "NVDA", "ema9": 1.0, "sma50": 1.0, "sma200": 1.0, "rsi": 140.0, "macd": 0.2},
+    ]
+    fake_db(monkeypatch, lambda query, params: [r for r in rows if r["stock_symbol"] in params["symbols"]])
+    gate = IndicatorComputationGate()
+
+    batch = gate.check_many(["AAPL", "MSFT", "NVDA", "TSLA"], date.today())
+    assert batch["AAPL"].passed
+    assert batch["MSFT"].metadata == {"missing_indicators": ["sma200"]}
+    assert batch["NVDA"].action == "RECOMPUTE_INDICATORS"
+    assert batch["TSLA"].action == "COMPUTE_INDICATORS"
+    assert gate.check("MSFT", date.today()) == batch["MSFT"]
+
+
+def test_gate_query_error_fails_every_symbol(monkeypatch):
+    def responses(query, params):
+        raise RuntimeError("connection lost")
+
+    fake_db(monkeypatch, responses)
+    results = DataIngestionGate().check_many(["AAPL", "MSFT"], date.today())
+    assert all(not r.passed and r.action == "RETRY_INGESTION" for r in results.values())
+
+
+def test_stage_checks_gate_once_for_all_successful_symbols():
+    orchestrator = WorkflowOrchestrator(checkpoint=MagicMock(), dlq=MagicMock(), max_workers=4)
+    states = {}
+    orchestrator._create_stage_execution = MagicMock(return_value="stage-1")
+    orchestrator._update_stage_status = MagicMock()
+    orchestrator._create_symbol_state = lambda wf, symbol, stage, status: states.__setitem__(symbol, [status])
+    orchestrator._update_symbol_state = lambda wf, symbol, stage, status, error=None: states[symbol].append(status)
+
+    gate = MagicMock()
+    gate.check_many.side_effect = lambda symbols, check_date, workflow_id: {
+        s: GateResult(passed=s != "BAD", reason="stale", action="REFRESH_DATA") for s in symbols
+    }
+
+    def stage_func(symbol):
+        if symbol == "BROKEN":
+            raise ValueError("bad payload")
+
+    symbols = ["AAPL", "MSFT", "BAD", "BROKEN"]
+    result = orchestrator._execute_stage("wf", "ingestion", symbols, stage_func, gate=gate, check_date=date.today())
+
+    assert result == {"succeeded": 2, "failed": 2}
+    gate.check_many.assert_called_once()
+    assert sorted(gate.check_many.call_args[0][0]) == ["AAPL", "BAD", "MSFT"]
+    assert states["AAPL"] == ["running", "completed"]
+    assert states["BAD"] == ["running", "failed"]
+    dlq_context = {c[0][1]: c[0][4] for c in orchestrator.dlq.add_failed_item.call_args_list}
+    assert dlq_context["BAD"] == {"gate_name": "MagicMock", "action": "REFRESH_DATA"}
+
+
+def test_signal_readiness_is_checked_in_one_pass(monkeypatch):
+    import app.data_validation.signal_readiness as signal_readiness
+    from app.data_validation.signal_readiness import SignalReadinessValidator
+
+    indicators = {"ema9": 1.0, "ema21": 1.0, "sma50": 1.0, "rsi": 50.0, "macd": 0.1, "atr": 2.0}
+
+    def responses(query, params):
+        if "data_validation_reports" in query:
+            return []
+        if "COUNT(*)" in query:
+            return [{"symbol": "AAPL", "row_count": 300}, {"symbol": "MSFT", "row_count": 20}]
+        return [{"symbol": "AAPL", **indicators}, {"symbol": "MSFT", **indicators}]
+
+    fake = MagicMock()
+    fake.execute_query.side_effect = responses
+    monkeypatch.setattr(signal_readiness, "db", fake)
+
+    results = SignalReadinessValidator().check_readiness_many(["AAPL", "MSFT", "TSLA"], "swing_trend")
+
+    assert fake.execute_query.call_count == 3
+    assert fake.execute_update.call_count == 1  # all readiness rows in one insert
+    assert results["AAPL"].readiness_status == "partial"  # no validation report -> quality score 0
+    assert results["MSFT"].readiness_status == "not_ready"
+    assert results["TSLA"].missing_indicators == ["ema9", "ema21", "sma50", "rsi", "macd", "atr"]
@@ -0,0 +1,174 @@
+"""
+Workflow Stage Concurrency Tests
+Symbols of a stage run on a bounded pool; retries wait without holding a worker
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+from app.workflows.orchestrator import WorkflowOrchestrator, WorkflowStage, parse_stage_concurrency
+from app.workflows.recovery import RetryPolicy
+
+
+def make_orchestrator(**kwargs):
+    orchestrator = WorkflowOrchestrator(checkpoint=MagicMock(), dlq=MagicMock(), **kwargs)
+    states = {}
+    lock = threading.Lock()
+
+    def update(workflow_id, symbol, stage, status, error=None):
+        with lock:
+            states.setdefault(symbol, []).append(status)
+
+    orchestrator._create_stage_execution = MagicMock(return_value="stage-1")
+    orchestrator._update_stage_status = MagicMock()
+    orchestrator._create_symbol_state = lambda wf, symbol, stage, status: update(wf, symbol, stage, status)
+    orchestrator._update_symbol_state = update
+    orchestrator._get_retry_count = MagicMock(return_value=0)
+    orchestrator._increment_retry_count = MagicMock()
+    return orchestrator, states
+
+
+def test_parse_stage_concurrency():
+    assert parse_stage_concurrency("ingestion:8, financial_data:2") == {"ingestion": 8, "financial_data": 2}
+    assert parse_stage_concurrency("") == {}
+
+
+def test_stage_runs_symbols_concurrently_within_limit():
+    orchestrator, states = make_orchestrator(max_workers=8, stage_concurrency={"ingestion": 4})
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def stage_func(symbol):
+        with lock:
+            active.append(symbol)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(symbol)
+
+    symbols = [f"S{i}" for i in range(8)]
+    started = time.monotonic()
+    result = orchestrator._execute_stage("wf", "ingestion", symbols, stage_func)
+    elapsed = time.monotonic() - started
+
+    assert result == {"succeeded": 8, "failed": 0}
+    assert max(peak) == 4
+    assert elapsed < 0.3  # two waves of 4, not eight serial calls
+    assert all(states[s] == ["running", "completed"] for s in symbols)
+
+
+def test_retry_is_scheduled_without_blocking_other_symbols():
+    orchestrator, states = make_orchestrator(
+        max_workers=1,
+        retry_policy=RetryPolicy(initial_delay=0.2),
+    )
+    calls = []
+
+    def stage_func(symbol):
+        calls.append(symbol)
+        if symbol == "FLAKY" and calls.count("FLAKY") == 1:
+            raise ConnectionError("connection reset")
+
+    result = orchestrator._execute_stage("wf", "ingestion", ["FLAKY", "AAPL", "MSFT"], stage_func)
+
+    assert result == {"succeeded": 3, "failed": 0}
+    # With a single worker, the other symbols ran while FLAKY waited for its retry
+    assert calls == ["FLAKY", "AAPL", "MSFT", "FLAKY"]
+    assert states["FLAKY"] == ["running", "retrying", "completed"]
+    orchestrator._increment_retry_count.assert_called_once_with("wf", "FLAKY", "ingestion")
+
+
+def test_failed_retry_goes_to_dead_letter_queue():
+    orchestrator, states = make_orchestrator(max_workers=2, retry_policy=RetryPolicy(initial_delay=0))
+
+    def stage_func(symbol):
+        raise TimeoutError("timeout")
+
+    result = orchestrator._execute_stage("wf", "ingestion", ["AAPL"], stage_func)
+
+    assert result == {"succeeded": 0, "failed": 1}
+    assert states["AAPL"] == ["running", "retrying", "failed"]
+    assert orchestrator.dlq.add_failed_item.call_args[0][4] == {"retry_count": 1}
+
+
+def test_pipelined_symbols_reach_downstream_stages_first():
+    orchestrator, states = make_orchestrator(max_workers=1)
+    calls = []
+    lock = threading.Lock()
+
+    def stage(name, fail=()):
+        def run(symbol):
+            with lock:
+                calls.append((name, symbol))
+            if symbol in fail:
+                raise ValueError(f"{name} failed for {symbol}")
+        return run
+
+    stages = [
+        WorkflowStage("ingestion", stage("ingestion", fail=("BAD",))),
+        WorkflowStage("indicators", stage("indicators"), depends_on="ingestion"),
+        WorkflowStage("financial_data", stage("financial_data"), depends_on="ingestion"),
+        WorkflowStage("signals", stage("signals"), depends_on="indicators"),
+    ]
+
+    counts = orchestrator._execute_pipelined("wf", stages, ["AAPL", "BAD", "MSFT"], check_date=None)
+
+    # AAPL is fully processed before the next symbol is ingested
+    assert calls[:4] == [
+        ("ingestion", "AAPL"),
+        ("financial_data", "AAPL"),
+        ("indicators", "AAPL"),
+        ("signals", "AAPL"),
+    ]
+    # BAD never enters stages downstream of its failed ingestion
+    assert not any(symbol == "BAD" and name != "ingestion" for name, symbol in calls)
+    assert counts == {
+        "ingestion": {"succeeded": 2, "failed": 1},
+        "indicators": {"succeeded": 2, "failed": 0},
+        "financial_data": {"succeeded": 2, "failed": 0},
+        "signals": {"succeeded": 2, "failed": 0},
+    }
+    # Every stage record is completed exactly once, with its counts
+    completed = [c for c in orchestrator._update_stage_status.call_args_list if c[0][1] == "completed"]
+    assert len(completed) == 4
+
+
+def test_retry_not_due_before_stage_would_finish_is_deferred_to_dlq():
+    orchestrator, states = make_orchestrator(max_workers=2, retry_policy=RetryPolicy(initial_delay=600))
+    orchestrator.retry_max_idle = 1.0
+
+    def stage_func(symbol):
+        if symbol == "FLAKY":
+            raise ConnectionError("connection reset")
+
+    started = time.monotonic()
+    result = orchestrator._execute_stage("wf", "ingestion", ["FLAKY", "AAPL", "MSFT"], stage_func)
+
+    assert time.monotonic() - started < 1.0  # no ten-minute backoff inside the run
+    assert result == {"succeeded": 2, "failed": 1}
+    assert states["FLAKY"] == ["running", "retrying", "failed"]
+    args, kwargs = orchestrator.dlq.add_failed_item.call_args
+    assert args[4] == {"retry_count": 0, "deferred": True}
+    assert kwargs["error_type"] == "transient" and 590 < kwargs["retry_after"] <= 600
+
+
+def test_pipelined_deferred_retry_excludes_symbol_downstream():
+    orchestrator, states = make_orchestrator(max_workers=2, retry_policy=RetryPolicy(initial_delay=600))
+    orchestrator.retry_max_idle = 1.0
+
+    def ingest(symbol):
+        if symbol == "FLAKY":
+            raise TimeoutError("timeout")
+
+    stages = [
+        WorkflowStage("ingestion", ingest),
+        WorkflowStage("indicators", lambda symbol: None, depends_on="ingestion"),
+    ]
+    counts = orchestrator._execute_pipelined("wf", stages, ["FLAKY", "AAPL"], check_date=None)
+
+    assert counts == {
+        "ingestion": {"succeeded": 1, "failed": 1},
+        "indicators": {"succeeded": 1, "failed": 0},
+    }
+    assert orchestrator.dlq.add_failed_item.call_args[1]["retry_after"] > 590
@@ -0,0 +1,91 @@
+"""
+Workflow State Ledger Tests
+Symbol state and gate results are served from memory and written in batched statements
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+import app.workflows.state_ledger as state_ledger
+from app.workflows.gates import GateResult
+from app.workflows.orchestrator import WorkflowOrchestrator, WorkflowStage
+from app.workflows.state_ledger import WorkflowStateLedger
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = MagicMock()
+    fake.execute_update.return_value = 1
+    monkeypatch.setattr(state_ledger, "db", fake)
+    return fake
+
+
+def test_transitions_are_buffered_and_flushed_in_one_statement(fake_db):
+    ledger = WorkflowStateLedger("wf-1", flush_every=1000)
+    for symbol in ("AAPL", "MSFT", "NVDA"):
+        ledger.create(symbol, "ingestion", "running")
+        ledger.update(symbol, "ingestion", "completed")
+    ledger.increment_retry("AAPL", "ingestion")
+    ledger.record_gate_result("ingestion", "AAPL", "DataIngestionGate", True)
+
+    assert fake_db.execute_update.call_count == 0
+    assert ledger.passed("MSFT", "ingestion")
+    assert ledger.retry_count("AAPL", "ingestion") == 1
+    assert ledger.status("AAPL", "indicators") is None
+
+    assert ledger.flush() == 4
+    state_sql, state_params = fake_db.execute_update.call_args_list[0][0]
+    assert "ON CONFLICT (workflow_id, symbol, stage)" in state_sql
+    assert sum(1 for k in state_params if k.startswith("symbol_")) == 3  # one row per symbol, latest state
+    gate_sql, gate_params = fake_db.execute_update.call_args_list[1][0]
+    assert "workflow_gate_results" in gate_sql and gate_params["passed_0"] is True
+    assert ledger.flush() == 0
+
+
+def test_flush_every_n_transitions_and_failed_flush_keeps_rows(fake_db):
+    ledger = WorkflowStateLedger("wf-2", flush_every=4)
+    ledger.create("AAPL", "ingestion", "running")
+    ledger.update("AAPL", "ingestion", "completed")
+    ledger.create("MSFT", "ingestion", "running")
+    assert fake_db.execute_update.call_count == 0
+    ledger.update("MSFT", "ingestion", "failed", "boom")
+    assert fake_db.execute_update.call_count == 1
+
+    fake_db.execute_update.side_effect = RuntimeError("db down")
+    ledger.create("TSLA", "ingestion", "running")
+    with pytest.raises(RuntimeError):
+        ledger.flush()
+    assert ledger.pending_count() == 1
+
+    fake_db.execute_update.side_effect = None
+    assert ledger.flush() == 1
+
+
+def test_orchestrator_bookkeeping_goes_through_the_ledger(fake_db, monkeypatch):
+    monkeypatch.setattr("app.workflows.orchestrator.db", MagicMock())
+    orchestrator = WorkflowOrchestrator(checkpoint=MagicMock(), dlq=MagicMock(), max_workers=2)
+    orchestrator._create_stage_execution = MagicMock(side_effect=lambda wf, name: f"{wf}-{name}")
+    orchestrator._update_stage_status = MagicMock()
+
+    def check_many(symbols, check_date, workflow_id):
+        for symbol in symbols:
+            orchestrator._record_gate_result(workflow_id, "ingestion", symbol, "FakeGate", GateResult(passed=True))
+        return {symbol: GateResult(passed=True) for symbol in symbols}
+
+    gate = MagicMock()
+    gate.check_many.side_effect = check_many
+    stages = [
+        WorkflowStage("ingestion", lambda s: None, gate),
+        WorkflowStage("indicators", lambda s: None, None, "ingestion"),
+    ]
+    symbols = [f"S{i}" for i in range(50)]
+    orchestrator._execute_pipelined("wf-3", stages, symbols, check_date="2026-03-02")
+
+    ledger = orchestrator._ledger("wf-3")
+    assert all(orchestrator._symbol_passed_stage("wf-3", s, "indicators") for s in symbols)
+    # Two stage-boundary flushes, each a single state upsert (+ one gate insert for ingestion)
+    assert fake_db.execute_update.call_count == 3
+    assert ledger.get_stats()["rows_written"] == 150
+
+    orchestrator._close_ledger("wf-3")
+    assert "wf-3" not in orchestrator._ledgers